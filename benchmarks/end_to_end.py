@@ -0,0 +1,189 @@
+"""
+End-to-end benchmark of submit and fetch.
+
+Runs the steps of `fabric-testing-submit` and `fabric-testing-fetch` against a
+local stand-in of the Fabric API and OneLake (see `fake_fabric.py`), so the
+performance of this package can be measured without a Fabric tenant. Every
+request pays a fixed latency, and notebook provisioning, job runs and
+throttling are simulated.
+
+For submit and fetch, the benchmark reports the wall time, the number of
+requests (to the Fabric API and OneLake) and the bytes of the request and
+response bodies, followed by the stage timings of the last round.
+
+Requires the package and the `benchmarks` extra, i.e.
+`pip install -e ".[benchmarks]"`.
+
+Usage:
+    python benchmarks/end_to_end.py --files 50 --latency 0.02 --rounds 3
+    python benchmarks/end_to_end.py --shards 4 --throttle-every 10
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from azure.core.credentials import AccessToken
+from fabrictesting.fabric_api.token_provider import TokenProvider
+from fabrictesting.test_job.fetch import add_fetch_arguments, fetch_jobs
+from fabrictesting.test_job.submit import add_submit_arguments, submit_jobs
+from fabrictesting.utilities.log import configure_logging
+from fabrictesting.utilities.timing import StageTimer
+from fake_fabric import FakeFabric, FakeFabricSettings
+
+
+class StaticCredential:
+    """A credential that hands out a fake token, which the fake server accepts."""
+
+    def get_token(self, *scopes, **kwargs):
+        return AccessToken("fake-token", int(time.time()) + 3600)
+
+
+def create_tests(folder: str, number_of_files: int, file_size: int) -> str:
+    tests_path = os.path.join(folder, "tests")
+    os.makedirs(tests_path)
+    padding = "#" * max(0, file_size - 40)
+    for i in range(number_of_files):
+        with open(os.path.join(tests_path, f"test_{i}.py"), "w") as file:
+            file.write(f"def test_{i}():\n    assert True\n{padding}\n")
+    return tests_path
+
+
+def create_args(temp_dir: str, tests_path: str, options: list) -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    add_submit_arguments(parser)
+    add_fetch_arguments(parser)
+    return parser.parse_args(
+        [
+            "--tenant-id",
+            "benchmark-tenant",
+            "--tests-path",
+            tests_path,
+            "--workspace-name",
+            "Benchmark Workspace",
+            "--workspace-id",
+            "benchmark-workspace-id",
+            "--lakehouse-name",
+            "BenchmarkLakehouse",
+            "--lakehouse-id",
+            "benchmark-lakehouse-id",
+            "--manifest-file-path",
+            os.path.join(temp_dir, "manifest.json"),
+            "--results-dir",
+            os.path.join(temp_dir, "results"),
+            "--progress-interval",
+            "1",
+            *options,
+        ]
+    )
+
+
+def run_round(fabric: FakeFabric, args: argparse.Namespace) -> tuple:
+    """
+    Submits the tests and fetches their results once.
+
+    Returns:
+        tuple: The wall time and server statistics of submit and of fetch,
+            and the stage timer of the round.
+    """
+    token_provider = TokenProvider(StaticCredential(), cache_key="benchmark")
+    timer = StageTimer()
+
+    fabric.reset_stats()
+    start = time.perf_counter()
+    submission = submit_jobs(args, token_provider=token_provider, timer=timer)
+    submit_result = (time.perf_counter() - start, fabric.stats())
+
+    fabric.reset_stats()
+    start = time.perf_counter()
+    exit_code = fetch_jobs(
+        args, jobs=submission["jobs"], token_provider=token_provider, timer=timer
+    )
+    fetch_result = (time.perf_counter() - start, fabric.stats())
+
+    if exit_code != 0:
+        raise RuntimeError(f"Benchmark fetch failed with exit code {exit_code}")
+
+    return submit_result, fetch_result, timer
+
+
+def print_results(name: str, results: list):
+    seconds = [elapsed for elapsed, _ in results]
+    stats = results[-1][1]
+    print(
+        f"{name:<8} {statistics.median(seconds):>8.2f} {min(seconds):>8.2f} "
+        f"{stats['api_requests']:>9} {stats['onelake_requests']:>9} "
+        f"{stats['throttled']:>9} {stats['bytes_received'] / 1024:>10.1f} "
+        f"{stats['bytes_sent'] / 1024:>10.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark submit and fetch against a local fake Fabric"
+    )
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--file-size", type=int, default=1024)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--provisioning-delay", type=float, default=1.0)
+    parser.add_argument("--job-duration", type=float, default=2.0)
+    parser.add_argument("--throttle-every", type=int, default=0)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--shards", type=int, default=1)
+    parser.add_argument(
+        "--submit-options",
+        type=str,
+        default="",
+        help="Further options of fabric-testing-submit and fetch, "
+        "e.g. '--bundle-archive --persistent-runner'.",
+    )
+    args = parser.parse_args()
+
+    # The progress of the commands is not part of the benchmark
+    configure_logging(verbosity=-1)
+
+    settings = FakeFabricSettings(
+        latency=args.latency,
+        throttle_every=args.throttle_every,
+        provisioning_delay=args.provisioning_delay,
+        job_duration=args.job_duration,
+    )
+
+    with tempfile.TemporaryDirectory() as temp_dir, FakeFabric(settings) as fabric:
+        os.environ.update(fabric.environment())
+        tests_path = create_tests(temp_dir, args.files, args.file_size)
+        run_args = create_args(
+            temp_dir,
+            tests_path,
+            ["--shards", str(args.shards), *args.submit_options.split()],
+        )
+
+        print(
+            f"{args.files} test files, {args.shards} shard(s), "
+            f"{args.latency * 1000:.0f} ms latency per request, "
+            f"{args.provisioning_delay:.1f} s provisioning, "
+            f"{args.job_duration:.1f} s per job"
+        )
+
+        submit_results, fetch_results = [], []
+        for _ in range(args.rounds):
+            submit_result, fetch_result, timer = run_round(fabric, run_args)
+            submit_results.append(submit_result)
+            fetch_results.append(fetch_result)
+
+        print(
+            f"{'command':<8} {'median s':>8} {'min s':>8} {'API reqs':>9} "
+            f"{'OneLake':>9} {'throttled':>9} {'KB sent':>10} {'KB recv':>10}"
+        )
+        print_results("submit", submit_results)
+        print_results("fetch", fetch_results)
+
+        print("Stage timings of the last round:")
+        for name, start, duration in timer.stages:
+            print(f"    {name:<24}{duration:9.2f} s  (started at {start:.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
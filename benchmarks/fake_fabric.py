@@ -0,0 +1,699 @@
+"""
+A local stand-in for the Fabric REST API and OneLake.
+
+Serves the endpoints that fabric-testing uses over HTTPS on localhost, so the
+CLI commands can run end to end without a Fabric tenant:
+
+    Fabric REST API (under /v1)
+        POST /workspaces/{id}/notebooks                    create (long-running)
+        GET  /workspaces/{id}/notebooks                    list
+        GET  /workspaces/{id}/notebooks/{id}               get
+        POST /workspaces/{id}/notebooks/{id}/updateDefinition
+        GET  /operations/{id}, /operations/{id}/result     long-running operations
+        POST /workspaces/{id}/items/{id}/jobs/instances    run job instance
+        GET  /workspaces/{id}/items/{id}/jobs/instances/{id}
+        POST /workspaces/{id}/items/{id}/jobs/instances/{id}/cancel
+
+    OneLake (every other path, i.e. /{workspace name}/{path})
+        PUT ?resource=file, PATCH ?action=append|flush     DFS file upload
+        HEAD, GET (with ranges)                            properties and download
+        GET ?resource=filesystem                           list paths
+
+Every request is delayed by a fixed latency, every n-th Fabric API request can
+be throttled with 429 and a Retry-After header, and notebooks are provisioned
+and jobs run for a configurable time. A finished job writes a test summary, a
+JUnit report and a progress log next to its bundle, with one passed test per
+test file of the bundle, as the notebook would.
+
+The server counts the requests and the bytes of the request and response bodies.
+The clients trust its self-signed certificate through `REQUESTS_CA_BUNDLE`,
+see `FakeFabric.environment`.
+
+Usage:
+    with FakeFabric(FakeFabricSettings(latency=0.02)) as fabric:
+        os.environ.update(fabric.environment())
+        ...
+        print(fabric.stats())
+"""
+
+import base64
+import datetime
+import ipaddress
+import json
+import os
+import re
+import ssl
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+# Installed with the `benchmarks` extra, i.e. `pip install -e ".[benchmarks]"`
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+_API_PREFIX = "/v1"
+
+# Matches `name = "value"` in the parameters cell of the notebook
+_PARAMETER_PATTERN = re.compile(r'^(\w+) = "(.*)"\s*$', re.MULTILINE)
+
+# Matches the OneLake path of the bundle in the notebook
+_TESTS_PATH_PATTERN = re.compile(
+    r"abfss://([^@]+)@[^/]+/([^/]+)\.Lakehouse/Files/fabric-testing/"
+)
+
+
+@dataclass
+class FakeFabricSettings:
+    """
+    The simulated behaviour of the fake Fabric API and OneLake.
+
+    Args:
+        latency (float): The delay (in seconds) of every request.
+        throttle_every (int): Every n-th Fabric API request is throttled
+            with 429. 0 disables throttling.
+        throttle_retry_after (int): The Retry-After (in seconds) of a 429.
+        provisioning_delay (float): The time (in seconds) until a created
+            notebook is provisioned.
+        operation_retry_after (int): The Retry-After (in seconds) of
+            long-running operations and job instances.
+        job_duration (float): The time (in seconds) a job runs.
+    """
+
+    latency: float = 0.0
+    throttle_every: int = 0
+    throttle_retry_after: int = 1
+    provisioning_delay: float = 0.0
+    operation_retry_after: int = 1
+    job_duration: float = 0.0
+
+
+class FakeFabric:
+    """
+    Runs the fake Fabric API and OneLake on a local HTTPS server.
+
+    Args:
+        settings (FakeFabricSettings, optional): The simulated behaviour.
+            Defaults to no latency, throttling or delays.
+    """
+
+    def __init__(self, settings: FakeFabricSettings = None):
+        self.settings = settings or FakeFabricSettings()
+        self.lock = threading.Lock()
+        self.notebooks = {}
+        self.operations = {}
+        self.jobs = {}
+        self.files = {}
+        self.reset_stats()
+
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.ca_file, key_file = _create_certificate(self._temp_dir.name)
+
+        self._server = ThreadingHTTPServer(("localhost", 0), _Handler)
+        self._server.daemon_threads = True
+        self._server.fabric = self
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(self.ca_file, key_file)
+        self._server.socket = context.wrap_socket(self._server.socket, server_side=True)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"https://localhost:{self._server.server_address[1]}"
+
+    @property
+    def api_url(self) -> str:
+        return f"{self.url}{_API_PREFIX}"
+
+    def environment(self) -> dict:
+        """
+        Returns the environment variables that point fabric-testing to the server.
+        """
+        return {
+            "FABRIC_TESTING_API_URL": self.api_url,
+            "FABRIC_TESTING_ONELAKE_URL": self.url,
+            "REQUESTS_CA_BUNDLE": self.ca_file,
+            "NO_PROXY": "localhost",
+        }
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._temp_dir.cleanup()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def reset_stats(self):
+        with self.lock:
+            self._stats = {
+                "requests": 0,
+                "api_requests": 0,
+                "onelake_requests": 0,
+                "throttled": 0,
+                "bytes_received": 0,
+                "bytes_sent": 0,
+            }
+
+    def stats(self) -> dict:
+        """
+        Returns the number of requests and the bytes of the request bodies
+        (received) and response bodies (sent) since the last reset.
+        """
+        with self.lock:
+            return dict(self._stats)
+
+    def count(self, **increments):
+        with self.lock:
+            for key, increment in increments.items():
+                self._stats[key] += increment
+
+    def should_throttle(self) -> bool:
+        throttle_every = self.settings.throttle_every
+        with self.lock:
+            return bool(throttle_every) and (
+                self._stats["api_requests"] % throttle_every == 0
+            )
+
+    def update_jobs(self):
+        """
+        Finishes the jobs whose duration has passed and writes their results.
+        """
+        now = time.monotonic()
+        with self.lock:
+            finished = [
+                job
+                for job in self.jobs.values()
+                if job["status"] == "InProgress"
+                and now - job["started_at"] >= self.settings.job_duration
+            ]
+            for job in finished:
+                self._finish_job(job)
+
+    def _finish_job(self, job: dict):
+        notebook = self.notebooks[job["item_id"]]
+        parameters = {**notebook["parameters"], **job["parameters"]}
+        workspace_name, lakehouse_name = notebook["location"]
+        bundle_directory = (
+            f"{lakehouse_name}.Lakehouse/Files/fabric-testing/"
+            f"{parameters.get('submit_folder')}"
+        )
+
+        bundle = [
+            path
+            for (file_system, path) in self.files
+            if file_system == workspace_name and path.startswith(f"{bundle_directory}/")
+        ]
+        if not bundle:
+            job["status"] = "Failed"
+            job["failureReason"] = {
+                "errorCode": "BundleNotFound",
+                "message": f"No files found in {bundle_directory}",
+            }
+            return
+
+        # One passed test per test file of the shard, or of the bundle
+        test_folder = f"{bundle_directory}/{parameters.get('test_folder', '')}"
+        if parameters.get("test_files"):
+            test_files = parameters["test_files"].split(",")
+        else:
+            test_files = sorted(
+                os.path.relpath(path, test_folder)
+                for path in bundle
+                if path.startswith(f"{test_folder}/")
+                and os.path.basename(path).startswith("test_")
+                and path.endswith(".py")
+            ) or ["test_bundle.py"]
+
+        results_directory = (
+            f"{bundle_directory}/{parameters.get('results_name') or 'results'}"
+        )
+        self._write_results(workspace_name, results_directory, test_files)
+        job["status"] = "Completed"
+
+    def _write_results(self, workspace_name: str, results_directory: str, tests):
+        started_at = time.time()
+        events = [{"event": "collected", "count": len(tests)}]
+        cases = []
+        for test in tests:
+            events.append({"event": "started", "test": f"{test}::test"})
+            events.append({"event": "passed", "test": f"{test}::test", "duration": 0})
+            cases.append(
+                {
+                    "file": test,
+                    "classname": test.removesuffix(".py").replace("/", "."),
+                    "name": "test",
+                    "outcome": "passed",
+                    "duration": 0.0,
+                }
+            )
+        events.append({"event": "finished", "exitstatus": 0})
+
+        summary = {
+            "total": len(cases),
+            "passed": len(cases),
+            "failed": 0,
+            "error": 0,
+            "skipped": 0,
+            "duration": 0.0,
+            "tests": cases,
+        }
+        junit = "".join(
+            f'<testcase file="{case["file"]}" classname="{case["classname"]}" '
+            f'name="test" time="0"/>'
+            for case in cases
+        )
+        progress = "".join(
+            json.dumps({**event, "time": started_at}) + "\n" for event in events
+        )
+
+        for name, content in (
+            (f"{results_directory}/summary.json", json.dumps(summary)),
+            (
+                f"{results_directory}/junit.xml",
+                f'<testsuite tests="{len(cases)}">{junit}</testsuite>',
+            ),
+            (f"{results_directory}-progress.ndjson", progress),
+        ):
+            self.files[(workspace_name, name)] = _File(content.encode("utf-8"))
+
+
+class _File:
+    def __init__(self, content: bytes = b""):
+        self.content = content
+        self.pending = bytearray()
+        self.etag = f'"{uuid.uuid4().hex}"'
+        self.last_modified = formatdate(usegmt=True)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def fabric(self) -> FakeFabric:
+        return self.server.fabric
+
+    def log_message(self, format, *args):
+        # The server is silent, the benchmark reports the request counts
+        pass
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_HEAD(self):
+        self._handle("HEAD")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_PATCH(self):
+        self._handle("PATCH")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+    def _handle(self, method: str):
+        body = self._read_body()
+        self.fabric.count(requests=1, bytes_received=len(body))
+        time.sleep(self.fabric.settings.latency)
+        self.fabric.update_jobs()
+
+        parsed_url = urlparse(self.path)
+        path = unquote(parsed_url.path)
+        query = {key: values[0] for key, values in parse_qs(parsed_url.query).items()}
+
+        try:
+            if path.startswith(f"{_API_PREFIX}/"):
+                self.fabric.count(api_requests=1)
+                if self.fabric.should_throttle():
+                    self.fabric.count(throttled=1)
+                    self._send_json(
+                        429,
+                        {"errorCode": "RequestBlocked"},
+                        headers={
+                            "Retry-After": str(
+                                self.fabric.settings.throttle_retry_after
+                            )
+                        },
+                    )
+                    return
+                self._handle_api(method, path[len(_API_PREFIX) :], query, body)
+            else:
+                self.fabric.count(onelake_requests=1)
+                self._handle_onelake(method, path, query, body)
+        except Exception as e:  # noqa: BLE001
+            self._send_json(500, {"errorCode": "InternalError", "message": str(e)})
+
+    def _read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            body = bytearray()
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                chunk = self.rfile.read(size + 2)[:size]
+                if not size:
+                    return bytes(body)
+                body.extend(chunk)
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def _send(self, status: int, body: bytes = b"", headers: dict = None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if "Content-Length" not in (headers or {}):
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+            self.fabric.count(bytes_sent=len(body))
+
+    def _send_json(self, status: int, content, headers: dict = None):
+        self._send(
+            status,
+            json.dumps(content).encode("utf-8"),
+            {"Content-Type": "application/json", **(headers or {})},
+        )
+
+    # Fabric REST API
+
+    def _handle_api(self, method: str, path: str, query: dict, body: bytes):
+        parts = path.strip("/").split("/")
+        fabric = self.fabric
+
+        if parts[0] == "operations" and method == "GET":
+            self._get_operation(parts[1], result=parts[2:] == ["result"])
+        elif parts[2:] == ["notebooks"] and method == "POST":
+            self._create_notebook(parts[1], json.loads(body))
+        elif parts[2:] == ["notebooks"] and method == "GET":
+            with fabric.lock:
+                notebooks = [
+                    _describe_notebook(notebook)
+                    for notebook in fabric.notebooks.values()
+                    if notebook["workspace_id"] == parts[1] and notebook["provisioned"]
+                ]
+            self._send_json(200, {"value": notebooks})
+        elif parts[2:3] == ["notebooks"] and len(parts) == 4 and method == "GET":
+            notebook = fabric.notebooks.get(parts[3])
+            if notebook is None or not notebook["provisioned"]:
+                self._send_json(404, {"errorCode": "ItemNotFound"})
+            else:
+                self._send_json(200, _describe_notebook(notebook))
+        elif parts[4:] == ["updateDefinition"] and method == "POST":
+            with fabric.lock:
+                notebook = fabric.notebooks.get(parts[3])
+                if notebook is not None:
+                    _define_notebook(notebook, json.loads(body))
+            self._send(200 if notebook is not None else 404)
+        elif parts[4:6] == ["jobs", "instances"] and len(parts) == 6:
+            self._run_job(parts[1], parts[3], body)
+        elif parts[4:6] == ["jobs", "instances"] and len(parts) >= 7:
+            self._handle_job(method, parts[6], cancel=parts[7:] == ["cancel"])
+        else:
+            self._send_json(404, {"errorCode": "EntityNotFound", "message": path})
+
+    def _create_notebook(self, workspace_id: str, request: dict):
+        notebook = {
+            "id": str(uuid.uuid4()),
+            "workspace_id": workspace_id,
+            "displayName": request["displayName"],
+            "description": request.get("description", ""),
+            "provisioned": False,
+        }
+        _define_notebook(notebook, request)
+
+        operation_id = str(uuid.uuid4())
+        with self.fabric.lock:
+            self.fabric.notebooks[notebook["id"]] = notebook
+            self.fabric.operations[operation_id] = {
+                "created_at": time.monotonic(),
+                "notebook_id": notebook["id"],
+            }
+
+        self._send(
+            202,
+            headers={
+                "Location": f"{self.fabric.api_url}/operations/{operation_id}",
+                "Retry-After": str(self.fabric.settings.operation_retry_after),
+                "x-ms-operation-id": operation_id,
+            },
+        )
+
+    def _get_operation(self, operation_id: str, *, result: bool):
+        operation_url = f"{self.fabric.api_url}/operations/{operation_id}"
+        with self.fabric.lock:
+            operation = self.fabric.operations.get(operation_id)
+            if operation is None:
+                self._send_json(404, {"errorCode": "OperationNotFound"})
+                return
+            notebook = self.fabric.notebooks[operation["notebook_id"]]
+
+            delay = self.fabric.settings.provisioning_delay
+            elapsed = time.monotonic() - operation["created_at"]
+            if elapsed >= delay:
+                notebook["provisioned"] = True
+
+        if result:
+            self._send_json(200, _describe_notebook(notebook))
+        elif notebook["provisioned"]:
+            self._send_json(
+                200,
+                {"status": "Succeeded", "percentComplete": 100},
+                headers={"Location": f"{operation_url}/result"},
+            )
+        else:
+            self._send_json(
+                200,
+                {"status": "Running", "percentComplete": int(100 * elapsed / delay)},
+                headers={
+                    "Retry-After": str(self.fabric.settings.operation_retry_after)
+                },
+            )
+
+    def _run_job(self, workspace_id: str, item_id: str, body: bytes):
+        if item_id not in self.fabric.notebooks:
+            self._send_json(404, {"errorCode": "ItemNotFound"})
+            return
+
+        parameters = (
+            json.loads(body).get("executionData", {}).get("parameters", {})
+            if body
+            else {}
+        )
+        job_id = str(uuid.uuid4())
+        with self.fabric.lock:
+            self.fabric.jobs[job_id] = {
+                "id": job_id,
+                "item_id": item_id,
+                "status": "InProgress",
+                "started_at": time.monotonic(),
+                "parameters": {
+                    name: parameter["value"] for name, parameter in parameters.items()
+                },
+            }
+
+        self._send(
+            202,
+            headers={
+                "Location": (
+                    f"{self.fabric.api_url}/workspaces/{workspace_id}/items/"
+                    f"{item_id}/jobs/instances/{job_id}"
+                ),
+                "Retry-After": str(self.fabric.settings.operation_retry_after),
+            },
+        )
+
+    def _handle_job(self, method: str, job_id: str, *, cancel: bool):
+        with self.fabric.lock:
+            job = self.fabric.jobs.get(job_id)
+            if job is not None and cancel and job["status"] == "InProgress":
+                job["status"] = "Cancelled"
+
+        if job is None:
+            self._send_json(404, {"errorCode": "JobNotFound"})
+        elif cancel:
+            self._send(202)
+        else:
+            self._send_json(
+                200,
+                {
+                    "id": job_id,
+                    "itemId": job["item_id"],
+                    "jobType": "RunNotebook",
+                    "status": job["status"],
+                    "failureReason": job.get("failureReason"),
+                },
+            )
+
+    # OneLake
+
+    def _handle_onelake(self, method: str, path: str, query: dict, body: bytes):
+        file_system, _, file_path = path.strip("/").partition("/")
+        key = (file_system, file_path)
+        fabric = self.fabric
+
+        if method == "GET" and query.get("resource") == "filesystem":
+            self._list_paths(file_system, query.get("directory", ""))
+        elif method == "PUT" and query.get("resource") == "file":
+            with fabric.lock:
+                fabric.files[key] = _File()
+            self._send(201, headers={"ETag": fabric.files[key].etag})
+        elif method == "PATCH" and query.get("action") == "append":
+            with fabric.lock:
+                file = fabric.files[key]
+                position = int(query["position"])
+                file.pending[position : position + len(body)] = body
+            self._send(202)
+        elif method == "PATCH" and query.get("action") == "flush":
+            with fabric.lock:
+                file = fabric.files[key]
+                file.content = bytes(file.pending[: int(query["position"])])
+                file.pending = bytearray()
+                file.etag = f'"{uuid.uuid4().hex}"'
+            self._send(200, headers={"ETag": file.etag})
+        elif method in ("GET", "HEAD"):
+            self._read_file(key)
+        else:
+            self._send_json(400, {"error": {"code": "UnsupportedOperation"}})
+
+    def _read_file(self, key):
+        with self.fabric.lock:
+            file = self.fabric.files.get(key)
+        if file is None:
+            self._send(
+                404,
+                headers={
+                    "x-ms-error-code": "PathNotFound",
+                    "Content-Length": "0",
+                },
+            )
+            return
+
+        headers = {
+            "ETag": file.etag,
+            "Last-Modified": file.last_modified,
+            "x-ms-blob-type": "BlockBlob",
+            "x-ms-resource-type": "file",
+            "Content-Type": "application/octet-stream",
+        }
+        content = file.content
+
+        byte_range = self.headers.get("x-ms-range") or self.headers.get("Range")
+        if byte_range and self.command == "GET":
+            start, _, end = byte_range.removeprefix("bytes=").partition("-")
+            start = int(start)
+            end = min(int(end) if end else len(content) - 1, len(content) - 1)
+            if start >= len(content):
+                self._send(416, headers={"x-ms-error-code": "InvalidRange"})
+                return
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(content)}"
+            self._send(206, content[start : end + 1], headers)
+        elif self.command == "HEAD":
+            self._send(200, headers={**headers, "Content-Length": str(len(content))})
+        else:
+            self._send(200, content, headers)
+
+    def _list_paths(self, file_system: str, directory: str):
+        prefix = f"{directory.strip('/')}/"
+        with self.fabric.lock:
+            paths = [
+                {
+                    "name": path,
+                    "contentLength": str(len(file.content)),
+                    "etag": file.etag,
+                    "lastModified": file.last_modified,
+                }
+                for (name, path), file in sorted(self.fabric.files.items())
+                if name == file_system and path.startswith(prefix)
+            ]
+        if not paths:
+            self._send_json(
+                404,
+                {"error": {"code": "PathNotFound"}},
+                headers={"x-ms-error-code": "PathNotFound"},
+            )
+        else:
+            self._send_json(200, {"paths": paths})
+
+
+def _define_notebook(notebook: dict, request: dict):
+    # Reads the parameters and the bundle location from the rendered notebook
+    for part in request.get("definition", {}).get("parts", []):
+        if part["path"] == "artifact.content.ipynb":
+            content = base64.b64decode(part["payload"]).decode("utf-8")
+            cells = json.loads(content)["cells"]
+            sources = ["".join(cell.get("source", [])) for cell in cells]
+            notebook["parameters"] = dict(_PARAMETER_PATTERN.findall(sources[0]))
+            location = _TESTS_PATH_PATTERN.search(content)
+            notebook["location"] = (
+                (unquote(location.group(1)), unquote(location.group(2)))
+                if location
+                else (None, None)
+            )
+
+
+def _describe_notebook(notebook: dict) -> dict:
+    return {
+        "id": notebook["id"],
+        "type": "Notebook",
+        "displayName": notebook["displayName"],
+        "description": notebook["description"],
+        "workspaceId": notebook["workspace_id"],
+    }
+
+
+def _create_certificate(directory: str):
+    """
+    Creates a self-signed certificate for localhost, valid for one day.
+    """
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=5))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(
+            x509.SubjectAlternativeName(
+                [
+                    x509.DNSName("localhost"),
+                    x509.IPAddress(ipaddress.ip_address("127.0.0.1")),
+                ]
+            ),
+            critical=False,
+        )
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(key, hashes.SHA256())
+    )
+
+    certificate_file = os.path.join(directory, "localhost.pem")
+    key_file = os.path.join(directory, "localhost-key.pem")
+    with open(certificate_file, "wb") as file:
+        file.write(certificate.public_bytes(serialization.Encoding.PEM))
+    with open(key_file, "wb") as file:
+        file.write(
+            key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            )
+        )
+    return certificate_file, key_file
@@ -0,0 +1,93 @@
+"""
+Benchmark of the OneLake folder upload.
+
+Measures how the throughput of `upload_files_to_onelake` scales with the number
+of workers. The OneLake file system is replaced by a local fake client that
+sleeps for a fixed latency per request, mimicking the round trip to OneLake.
+
+Usage:
+    python benchmarks/upload_throughput.py --files 200 --latency 0.05
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from fabrictesting.onelake_api.api_file import upload_files_to_onelake
+from fabrictesting.utilities.log import configure_logging
+
+
+class FakeFileClient:
+    def __init__(self, file_system, path):
+        self._file_system = file_system
+        self._path = path
+
+    def upload_data(self, data, length=None, overwrite=False, **kwargs):
+        content = data.read()
+        time.sleep(self._file_system.latency)
+        with self._file_system.lock:
+            self._file_system.files[self._path] = content
+
+
+class FakeFileSystemClient:
+    """A local stand-in for the DataLake FileSystemClient."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.files = {}
+        self.lock = threading.Lock()
+
+    def get_file_client(self, path):
+        return FakeFileClient(self, path)
+
+
+def create_files(folder: str, number_of_files: int, file_size: int):
+    files = []
+    for i in range(number_of_files):
+        local_file_path = os.path.join(folder, f"test_{i}.py")
+        with open(local_file_path, "wb") as file:
+            file.write(os.urandom(file_size))
+        files.append((local_file_path, f"fabric-testing/bench/test_{i}.py"))
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the OneLake upload")
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--file-size", type=int, default=4 * 1024)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    # The progress summaries of the upload are not part of the benchmark
+    configure_logging(verbosity=-1)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        files = create_files(temp_dir, args.files, args.file_size)
+        total_mb = args.files * args.file_size / (1024 * 1024)
+
+        print(f"{args.files} files, {args.latency * 1000:.0f} ms latency per file")
+        print(f"{'workers':>8} {'seconds':>8} {'files/s':>8} {'MB/s':>8}")
+
+        for workers in args.workers:
+            file_system_client = FakeFileSystemClient(latency=args.latency)
+
+            start = time.perf_counter()
+            failures = upload_files_to_onelake(
+                file_system_client, files, max_workers=workers
+            )
+            elapsed = time.perf_counter() - start
+
+            if failures or len(file_system_client.files) != args.files:
+                raise RuntimeError(f"Benchmark upload failed: {failures}")
+
+            print(
+                f"{workers:>8} {elapsed:>8.2f} "
+                f"{args.files / elapsed:>8.1f} {total_mb / elapsed:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,65 @@
 from azure.identity import ClientSecretCredential, InteractiveBrowserCredential
 
+from fabrictesting.fabric_api.token_provider import FABRIC_SCOPE, TokenProvider
+
+
+def get_personal_token_provider(
+    tenant_id: str = None, cache_file_path: str = None
+) -> TokenProvider:
+    """
+    Creates a token provider that authenticates a user via a browser.
+
+    The provider uses Azure's InteractiveBrowserCredential. It caches the tokens
+    per scope and refreshes them before they expire, so the same provider can
+    be used for the Fabric API and OneLake during the whole CLI run.
+
+    Args:
+        tenant_id (str, optional): The Azure tenant ID.
+        cache_file_path (str, optional): The path of an on-disk token cache.
+            If provided, tokens are reused across CLI runs.
+
+    Returns:
+        TokenProvider: The token provider for the user.
+    """
+    interactive_browser_credential = InteractiveBrowserCredential(tenant_id=tenant_id)
+
+    return TokenProvider(
+        interactive_browser_credential,
+        cache_key=f"{tenant_id}:user",
+        cache_file_path=cache_file_path,
+    )
+
+
+def get_client_token_provider(
+    tenant_id: str, client_id: str, client_secret: str, cache_file_path: str = None
+) -> TokenProvider:
+    """
+    Creates a token provider for a service principal.
+
+    The provider uses the Azure Identity ClientSecretCredential. It caches the
+    tokens per scope and refreshes them before they expire, so the same provider
+    can be used for the Fabric API and OneLake during the whole CLI run.
+
+    Args:
+        tenant_id (str): The Azure AD tenant (directory) ID.
+        client_id (str): The client (application) ID registered in Azure AD.
+        client_secret (str): The client secret associated with the application.
+        cache_file_path (str, optional): The path of an on-disk token cache.
+            If provided, tokens are reused across CLI runs.
+
+    Returns:
+        TokenProvider: The token provider for the service principal.
+    """
+    client_secret_credential_class = ClientSecretCredential(
+        tenant_id=tenant_id, client_id=client_id, client_secret=client_secret
+    )
+
+    return TokenProvider(
+        client_secret_credential_class,
+        cache_key=f"{tenant_id}:{client_id}",
+        cache_file_path=cache_file_path,
+    )
+
 
 def get_personal_fabric_token(tenant_id: str = None) -> str:
     """
@@ -11,6 +71,9 @@ def get_personal_fabric_token(tenant_id: str = None) -> str:
     The token is returned for use in authenticated API requests.
     If no token is retrieved, an exception is raised.
 
+    Use `get_personal_token_provider` to reuse and refresh the token
+    across several calls.
+
     Args:
         tenant_id (str, optional): The Azure tenant ID.
 
@@ -21,25 +84,7 @@ def get_personal_fabric_token(tenant_id: str = None) -> str:
     Raises:
         Exception: If the token string is None.
     """
-
-    # Tenant ID and scope
-    tenant_id = tenant_id  # Your tenant ID
-    scope = "https://api.fabric.microsoft.com/.default"
-
-    # Create an InteractiveBrowserCredential object
-    interactive_browser_credential = InteractiveBrowserCredential(tenant_id=tenant_id)
-
-    # Get the access token
-    access_token = interactive_browser_credential.get_token(scope)
-    token_string = access_token.token
-
-    # You can now use token_string for authenticated API requests
-    # print(token_string)
-
-    if not token_string:
-        raise Exception("Token string was none")
-
-    return token_string
+    return get_personal_token_provider(tenant_id).get_token_string(FABRIC_SCOPE)
 
 
 def get_client_fabric_token(tenant_id: str, client_id: str, client_secret: str) -> str:
@@ -51,6 +96,9 @@ def get_client_fabric_token(tenant_id: str, client_id: str, client_secret: str)
     Azure Active Directory (AD) and obtain an access token that can be used to access
     the Fabric API.
 
+    Use `get_client_token_provider` to reuse and refresh the token
+    across several calls.
+
     Args:
         tenant_id (str): The Azure AD tenant (directory) ID.
         client_id (str): The client (application) ID registered in Azure AD.
@@ -62,15 +110,6 @@ def get_client_fabric_token(tenant_id: str, client_id: str, client_secret: str)
     Raises:
         Exception: If the token string is None, an exception is raised.
     """
-
-    scope = "https://api.fabric.microsoft.com/.default"
-    client_secret_credential_class = ClientSecretCredential(
-        tenant_id=tenant_id, client_id=client_id, client_secret=client_secret
-    )
-    access_token_class = client_secret_credential_class.get_token(scope)
-    token_string = access_token_class.token
-
-    if not token_string:
-        raise Exception("Token string was none")
-
-    return token_string
+    return get_client_token_provider(
+        tenant_id, client_id, client_secret
+    ).get_token_string(FABRIC_SCOPE)
@@ -0,0 +1,237 @@
+import logging
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from fabrictesting.utilities.tracing import get_default_tracer
+
+logger = logging.getLogger(__name__)
+
+# Status codes that signal throttling or a transient server error
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Status codes that signal the request was rejected before it was processed
+THROTTLE_STATUS_CODES = frozenset({429})
+
+# Methods that can be resent safely after a connection or server error
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF_FACTOR = 1.0
+DEFAULT_MAX_BACKOFF = 60.0
+DEFAULT_POOL_SIZE = 16
+DEFAULT_TIMEOUT = 60
+
+# Base URL of the Fabric REST API
+DEFAULT_FABRIC_API_URL = "https://api.fabric.microsoft.com/v1"
+
+# Environment variable that overrides the base URL of the Fabric REST API
+FABRIC_API_URL_VARIABLE = "FABRIC_TESTING_API_URL"
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+class FabricApiClient:
+    """
+    A client for the Fabric REST API that reuses connections and retries requests.
+
+    All requests are sent through one pooled `requests.Session`, so the TCP and
+    TLS connections are kept alive between calls and polls. Requests that are
+    throttled (429) are retried. Idempotent requests, e.g. GET, are also retried
+    on a transient server error (5xx) or a connection error. Other requests,
+    e.g. creating a notebook or triggering a job, are not, since the server may
+    have processed them already.
+    The client waits for the `Retry-After` header if the API sends one, and
+    otherwise applies an exponential backoff with full jitter.
+
+    Args:
+        max_retries (int, optional): The maximum number of retries per request.
+            Defaults to 5.
+        backoff_factor (float, optional): The base delay (in seconds)
+            of the exponential backoff. Defaults to 1.0.
+        max_backoff (float, optional): The maximum backoff delay (in seconds).
+            Defaults to 60.0.
+        pool_size (int, optional): The number of connections kept alive.
+            Defaults to 16.
+        timeout (float, optional): The default request timeout (in seconds).
+            Defaults to 60.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        if max_retries < 0:
+            raise ValueError("max_retries must be at least 0")
+
+        self._max_retries = max_retries
+        self._backoff_factor = backoff_factor
+        self._max_backoff = max_backoff
+        self._timeout = timeout
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Sends a request and retries it on throttling and transient errors.
+
+        Args:
+            method (str): The HTTP method, e.g. "GET".
+            url (str): The URL of the request.
+            **kwargs: Passed on to `requests.Session.request`.
+
+        Returns:
+            requests.Response: The response of the last attempt.
+
+        Raises:
+            requests.RequestException: If the request could not be sent
+                within the allowed number of retries.
+        """
+        kwargs.setdefault("timeout", self._timeout)
+        method = method.upper()
+
+        with get_default_tracer().span(
+            f"HTTP {method}", **{"http.request.method": method, "url.full": url}
+        ) as span:
+            response = self._request_with_retries(method, url, span, **kwargs)
+            if span.recording:
+                span.set_attribute("http.response.status_code", response.status_code)
+                span.set_attribute(
+                    "http.request.body.size",
+                    _get_content_length(response.request.headers),
+                )
+                span.set_attribute("http.response.body.size", len(response.content))
+            return response
+
+    def _request_with_retries(
+        self, method: str, url: str, span, **kwargs
+    ) -> requests.Response:
+        for attempt in range(self._max_retries + 1):
+            span.set_attribute("http.request.resend_count", attempt or None)
+            is_last_attempt = attempt == self._max_retries
+
+            # A streamed body was consumed by the previous attempt
+            if attempt and hasattr(kwargs.get("data"), "seek"):
+                kwargs["data"].seek(0)
+
+            try:
+                response = self._session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if is_last_attempt or method not in IDEMPOTENT_METHODS:
+                    raise
+                delay = self._get_backoff(attempt)
+                logger.warning(
+                    "Request failed (%s), retrying in %.1f seconds...", e, delay
+                )
+            else:
+                if is_last_attempt or response.status_code not in (
+                    RETRY_STATUS_CODES
+                    if method in IDEMPOTENT_METHODS
+                    else THROTTLE_STATUS_CODES
+                ):
+                    return response
+                delay = self._get_retry_after(response)
+                if delay is None:
+                    delay = self._get_backoff(attempt)
+                logger.info(
+                    "Fabric API responded with %s, retrying in %.1f seconds...",
+                    response.status_code,
+                    delay,
+                )
+
+            time.sleep(delay)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Sends a GET request. See `request`.
+        """
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """
+        Sends a POST request. See `request`.
+        """
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        """
+        Closes the pooled connections.
+        """
+        self._session.close()
+
+    def _get_backoff(self, attempt: int) -> float:
+        return random.uniform(
+            0, min(self._max_backoff, self._backoff_factor * 2**attempt)
+        )
+
+    @staticmethod
+    def _get_retry_after(response: requests.Response) -> float:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is None:
+            return None
+
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+
+        # Retry-After can also be an HTTP date
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def _get_content_length(headers) -> int:
+    try:
+        return int(headers.get("Content-Length"))
+    except (TypeError, ValueError):
+        return None
+
+
+def get_fabric_api_url() -> str:
+    """
+    Returns the base URL of the Fabric REST API, without a trailing slash.
+
+    The URL can be overridden with the `FABRIC_TESTING_API_URL` environment
+    variable, e.g. to run the CLI commands against a local stand-in of the API.
+
+    Returns:
+        str: The base URL, e.g. "https://api.fabric.microsoft.com/v1".
+    """
+    return os.environ.get(FABRIC_API_URL_VARIABLE, DEFAULT_FABRIC_API_URL).rstrip("/")
+
+
+def get_default_client() -> FabricApiClient:
+    """
+    Returns the Fabric API client shared by all calls in the process.
+
+    The client is created on first use.
+
+    Returns:
+        FabricApiClient: The shared client.
+    """
+    global _default_client
+
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = FabricApiClient()
+        return _default_client
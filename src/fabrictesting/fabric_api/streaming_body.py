@@ -0,0 +1,69 @@
+import io
+from typing import Callable, Iterator, List, Tuple, Union
+
+# A part of the body: bytes, or the length and a factory of an iterator of chunks
+BodyPart = Union[bytes, Tuple[int, Callable[[], Iterator[bytes]]]]
+
+
+class StreamingBody(io.RawIOBase):
+    """
+    A request body that is produced chunk by chunk while it is sent.
+
+    The body consists of parts that are either bytes or generated chunks of
+    a known length. `requests` sends it with a `Content-Length` header,
+    reading it in small blocks, so the body is never held in memory as a whole.
+    The body can be rewound with `seek(0)`, e.g. to retry the request.
+
+    Args:
+        parts (List[BodyPart]): The parts of the body, in order. A generated
+            part is a tuple of its length in bytes and a function that returns
+            a new iterator of its chunks.
+    """
+
+    def __init__(self, parts: List[BodyPart]):
+        super().__init__()
+        self._parts = [
+            (len(part), lambda part=part: iter((part,)))
+            if isinstance(part, bytes)
+            else part
+            for part in parts
+        ]
+        self._length = sum(length for length, _ in self._parts)
+        self.seek(0)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """
+        Rewinds the body. Only seeking to the start is supported.
+        """
+        if offset != 0 or whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("StreamingBody can only seek to the start")
+
+        self._chunks = (chunk for _, factory in self._parts for chunk in factory())
+        self._buffer = b""
+        self._position = 0
+        return 0
+
+    def readinto(self, buffer) -> int:
+        while not self._buffer:
+            self._buffer = next(self._chunks, None)
+            if self._buffer is None:
+                self._buffer = b""
+                return 0
+
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        self._position += size
+        return size
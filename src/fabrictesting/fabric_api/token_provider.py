@@ -0,0 +1,158 @@
+import json
+import logging
+import os
+import threading
+import time
+
+from azure.core.credentials import AccessToken, TokenCredential
+
+from fabrictesting.utilities.tracing import get_default_tracer
+
+logger = logging.getLogger(__name__)
+
+# Scope of the Fabric REST API
+FABRIC_SCOPE = "https://api.fabric.microsoft.com/.default"
+
+# Scope of OneLake (Azure Storage)
+STORAGE_SCOPE = "https://storage.azure.com/.default"
+
+# Tokens are refreshed when they expire within this number of seconds
+DEFAULT_REFRESH_MARGIN = 300
+
+
+class TokenProvider:
+    """
+    Provides access tokens for an Azure credential and caches them per scope.
+
+    A cached token is reused until it is about to expire; it is then refreshed
+    through the credential. Optionally, tokens are also cached in a local file,
+    keyed by tenant and client, so a later CLI run can skip the authentication.
+
+    The provider implements the `get_token` method of the Azure
+    `TokenCredential` protocol, so it can be passed as credential to Azure SDK
+    clients such as the `DataLakeServiceClient`.
+
+    Args:
+        credential (TokenCredential): The Azure credential that acquires tokens.
+        cache_key (str): The key of the tokens in the cache file,
+            e.g. "<tenant-id>:<client-id>".
+        cache_file_path (str, optional): The path of the on-disk token cache.
+            If not provided, tokens are only cached in memory.
+        refresh_margin (int, optional): Tokens are refreshed when they expire
+            within this number of seconds. Defaults to 300.
+    """
+
+    def __init__(
+        self,
+        credential: TokenCredential,
+        *,
+        cache_key: str,
+        cache_file_path: str = None,
+        refresh_margin: int = DEFAULT_REFRESH_MARGIN,
+    ):
+        self._credential = credential
+        self._cache_key = cache_key
+        self._cache_file_path = cache_file_path
+        self._refresh_margin = refresh_margin
+        self._tokens = {}
+        self._lock = threading.Lock()
+
+        if cache_file_path:
+            tokens = self._load_cache_file().get(cache_key, {})
+            if isinstance(tokens, dict):
+                # Drop entries that are not objects with a token and expiry
+                self._tokens = {
+                    scope_key: cached
+                    for scope_key, cached in tokens.items()
+                    if isinstance(cached, dict)
+                    and "token" in cached
+                    and "expires_on" in cached
+                }
+            else:
+                logger.warning(
+                    "Ignoring the cached tokens of %s, they are not a JSON object",
+                    cache_key,
+                )
+
+    def get_token(self, *scopes: str, **kwargs) -> AccessToken:
+        """
+        Returns a valid access token for the given scopes.
+
+        Requests with extra arguments, e.g. a claims challenge, bypass the cache.
+
+        Args:
+            *scopes (str): The scopes of the token.
+            **kwargs: Passed on to the credential.
+
+        Returns:
+            AccessToken: The access token and its expiry (epoch seconds).
+        """
+        if kwargs:
+            return self._credential.get_token(*scopes, **kwargs)
+
+        scope_key = " ".join(scopes)
+
+        with self._lock:
+            cached = self._tokens.get(scope_key)
+            if cached and cached["expires_on"] - self._refresh_margin > time.time():
+                return AccessToken(cached["token"], cached["expires_on"])
+
+            with get_default_tracer().span("token.acquire", scope=scope_key):
+                access_token = self._credential.get_token(*scopes)
+            self._tokens[scope_key] = {
+                "token": access_token.token,
+                "expires_on": access_token.expires_on,
+            }
+
+            if self._cache_file_path and access_token.token:
+                self._save_cache_file()
+
+            return access_token
+
+    def get_token_string(self, scope: str = FABRIC_SCOPE) -> str:
+        """
+        Returns a valid access token string for a single scope.
+
+        Args:
+            scope (str, optional): The scope of the token.
+                Defaults to the Fabric API scope.
+
+        Returns:
+            str: The access token string for authenticated requests.
+
+        Raises:
+            Exception: If the token string is None.
+        """
+        token_string = self.get_token(scope).token
+
+        if not token_string:
+            raise Exception("Token string was none")
+
+        return token_string
+
+    def _load_cache_file(self) -> dict:
+        try:
+            with open(self._cache_file_path, "r") as file:
+                content = json.load(file)
+            if not isinstance(content, dict):
+                raise ValueError(
+                    f"{self._cache_file_path} does not contain a JSON object"
+                )
+        except FileNotFoundError:
+            return {}
+        # json.JSONDecodeError is a ValueError as well
+        except ValueError as e:
+            logger.warning("Could not read the token cache, starting empty: %s", e)
+            return {}
+        return content
+
+    def _save_cache_file(self):
+        content = self._load_cache_file()
+        content[self._cache_key] = self._tokens
+
+        # The cache holds bearer tokens, so only the current user may read it
+        file_descriptor = os.open(
+            self._cache_file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600
+        )
+        with os.fdopen(file_descriptor, "w") as file:
+            json.dump(content, file)
@@ -0,0 +1,141 @@
+import json
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Cached notebook ids are trusted for this number of seconds
+DEFAULT_NOTEBOOK_CACHE_TTL = 300
+
+
+class NotebookIdCache:
+    """
+    A short-lived cache of notebook ids by display name, per workspace.
+
+    The cache lives in memory and, if a file path is given, also on disk,
+    so the next CLI run can skip listing the workspace. Every entry expires
+    after `ttl` seconds. The entries of a workspace are invalidated whenever
+    notebooks are created or deleted in it.
+
+    Args:
+        cache_file_path (str, optional): The path of the on-disk cache.
+            If not provided, the ids are only cached in memory.
+        ttl (float, optional): The lifetime of an entry (in seconds).
+            Defaults to 300.
+    """
+
+    def __init__(self, *, cache_file_path: str = None, ttl: float = None):
+        self._cache_file_path = cache_file_path
+        self._ttl = DEFAULT_NOTEBOOK_CACHE_TTL if ttl is None else ttl
+        self._lock = threading.Lock()
+        self._entries = self._load_cache_file() if cache_file_path else {}
+
+    def get(self, workspace_id: str, notebook_name: str) -> Optional[str]:
+        """
+        Returns the cached id of a notebook, or None if it is unknown or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(workspace_id, {}).get(notebook_name)
+            if entry is None or entry["expires_at"] <= time.time():
+                return None
+            return entry["id"]
+
+    def update(self, workspace_id: str, notebooks: Dict[str, str]):
+        """
+        Stores the ids of notebooks by display name.
+        """
+        if not notebooks:
+            return
+
+        expires_at = time.time() + self._ttl
+        with self._lock:
+            workspace_entries = self._entries.setdefault(workspace_id, {})
+            for notebook_name, notebook_id in notebooks.items():
+                workspace_entries[notebook_name] = {
+                    "id": notebook_id,
+                    "expires_at": expires_at,
+                }
+            self._save_cache_file()
+
+    def invalidate(self, workspace_id: str):
+        """
+        Removes all cached ids of a workspace.
+        """
+        with self._lock:
+            if self._entries.pop(workspace_id, None) is not None:
+                self._save_cache_file()
+
+    def _load_cache_file(self) -> dict:
+        try:
+            with open(self._cache_file_path, "r") as file:
+                content = json.load(file)
+            if not isinstance(content, dict) or not all(
+                isinstance(entries, dict) for entries in content.values()
+            ):
+                raise ValueError(
+                    f"{self._cache_file_path} does not contain a JSON object "
+                    "of workspaces"
+                )
+        except FileNotFoundError:
+            return {}
+        # json.JSONDecodeError is a ValueError as well
+        except ValueError as e:
+            logger.warning("Could not read the notebook cache, starting empty: %s", e)
+            return {}
+
+        # Drop expired entries, so the file does not grow forever
+        now = time.time()
+        return {
+            workspace_id: {
+                name: entry
+                for name, entry in entries.items()
+                if isinstance(entry, dict)
+                and "id" in entry
+                and entry.get("expires_at", 0) > now
+            }
+            for workspace_id, entries in content.items()
+        }
+
+    def _save_cache_file(self):
+        if not self._cache_file_path:
+            return
+
+        try:
+            with open(self._cache_file_path, "w") as file:
+                json.dump(self._entries, file)
+        except OSError as e:
+            logger.warning("Could not write the notebook cache: %s", e)
+
+
+_default_cache = NotebookIdCache()
+
+
+def get_default_notebook_cache() -> NotebookIdCache:
+    """
+    Returns the notebook id cache shared by all lookups in the process.
+
+    Returns:
+        NotebookIdCache: The shared cache.
+    """
+    return _default_cache
+
+
+def configure_default_notebook_cache(
+    *, cache_file_path: str = None, ttl: float = None
+) -> NotebookIdCache:
+    """
+    Replaces the shared notebook id cache, e.g. to persist it on disk.
+
+    Args:
+        cache_file_path (str, optional): The path of the on-disk cache.
+        ttl (float, optional): The lifetime of an entry (in seconds).
+
+    Returns:
+        NotebookIdCache: The new shared cache.
+    """
+    global _default_cache
+
+    _default_cache = NotebookIdCache(cache_file_path=cache_file_path, ttl=ttl)
+    return _default_cache
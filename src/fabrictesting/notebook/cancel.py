@@ -0,0 +1,123 @@
+import asyncio
+import copy
+import logging
+from typing import Dict, List
+
+from fabrictesting.fabric_api.client import get_default_client
+from fabrictesting.fabric_api.token_provider import TokenProvider
+from fabrictesting.notebook.get_notebook_status import (
+    get_job_status,
+    poll_notebook_run_status_async,
+)
+from fabrictesting.notebook.polling import PollingStrategy
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for a cancelled job to reach the Cancelled state
+DEFAULT_CANCEL_TIMEOUT = 120
+
+
+def cancel_notebook_run(
+    *, fetch_url: str, token_string: str = None, token_provider: TokenProvider = None
+) -> dict:
+    """
+    Requests the cancellation of a notebook job instance using the Fabric API.
+
+    The job is not stopped immediately; poll its fetch URL until it reaches
+    the Cancelled state.
+
+    Args:
+        fetch_url (str): The URL of the job instance, as returned by `run_notebook`.
+        https://api.fabric.microsoft.com/v1/workspaces/{workspaceId}/items/{itemId}/jobs/instances/{jobInstanceId}
+        token_string (str, optional): The authorization token for the API.
+        token_provider (TokenProvider, optional): Provides a valid authorization
+            token. Takes precedence over `token_string`.
+
+    Returns:
+        dict: A dictionary containing the following information:
+            - "status_code" (int): The HTTP status code of the API response.
+            - "retry_after" (int): The recommended number of seconds to wait
+                before checking the job status (default is 60 seconds).
+
+    Raises:
+        Exception: If the API call fails with a status code other than 202 (Accepted),
+        e.g. because the job has already finished.
+
+    See Also:
+        Fabric API documentation: https://learn.microsoft.com/en-us/rest/api/fabric/core/job-scheduler/cancel-item-job-instance?tabs=HTTP
+    """
+    if token_provider is not None:
+        token_string = token_provider.get_token_string()
+
+    header = {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {token_string}",
+    }
+
+    response = get_default_client().post(
+        url=f"{fetch_url.rstrip('/')}/cancel", headers=header
+    )
+
+    if response.status_code != 202:
+        raise Exception(
+            f"Cancelling the job failed with {response.status_code}: "
+            f"{str(response.content)}"
+        )
+
+    return {
+        "status_code": response.status_code,
+        "retry_after": int(response.headers.get("Retry-After", 60)),
+    }
+
+
+async def cancel_notebook_runs(
+    *,
+    fetch_urls: List[str],
+    token_provider: TokenProvider,
+    timeout: float = DEFAULT_CANCEL_TIMEOUT,
+) -> Dict[str, str]:
+    """
+    Cancels several notebook jobs concurrently and waits until they stopped.
+
+    Every job is cancelled and then polled until it reached a final state.
+    A job that finished before it could be cancelled keeps its own state.
+
+    Args:
+        fetch_urls (List[str]): The URLs of the job instances.
+        token_provider (TokenProvider): Provides a valid authorization token,
+            shared by all jobs.
+        timeout (float, optional): The time (in seconds) to wait for each job
+            to stop. Defaults to 120.
+
+    Returns:
+        Dict[str, str]: The final status of each job, by fetch URL, e.g.
+            "Cancelled", or "TimedOut" if the job did not stop in time.
+    """
+    polling_strategy = PollingStrategy(max_interval=10, timeout=timeout)
+
+    async def _cancel(fetch_url: str) -> str:
+        try:
+            await asyncio.to_thread(
+                cancel_notebook_run, fetch_url=fetch_url, token_provider=token_provider
+            )
+        except Exception as e:  # noqa: BLE001
+            logger.warning("Could not cancel %s: %s", fetch_url, e)
+
+        try:
+            result = await poll_notebook_run_status_async(
+                fetch_url=fetch_url,
+                token_provider=token_provider,
+                polling_strategy=copy.copy(polling_strategy),
+            )
+        except Exception as e:  # noqa: BLE001
+            logger.error("Polling %s failed: %s", fetch_url, e)
+            return "Error"
+        return get_job_status(result)
+
+    logger.info("Cancelling %d notebook job(s)...", len(fetch_urls))
+    statuses = await asyncio.gather(*(_cancel(fetch_url) for fetch_url in fetch_urls))
+
+    for fetch_url, status in zip(fetch_urls, statuses):
+        logger.info("    %s: %s", status, fetch_url)
+
+    return dict(zip(fetch_urls, statuses))
@@ -1,7 +1,30 @@
 import base64
 import json
-import os
 import uuid
+from typing import Iterator, List
+
+from fabrictesting.notebook.template import load_notebook_template
+from fabrictesting.utilities.results import DEFAULT_RESULTS_NAME
+
+# How the notebook copies the bundle from the lakehouse to the driver:
+# "sparkfiles" distributes it to every node with sc.addFile,
+# "driver" copies it to the driver only with mssparkutils.fs.cp
+BUNDLE_COPY_MODES = ("sparkfiles", "driver")
+DEFAULT_BUNDLE_COPY_MODE = "sparkfiles"
+
+# Characters of the content encoded per base64 chunk
+BASE64_CHUNK_SIZE = 3 * 64 * 1024
+
+# Cells of a custom template with these tags are left out
+# if no wheel or requirements file is submitted
+WHEEL_CELL_TAG = "fabric-testing-wheel"
+REQUIREMENTS_CELL_TAG = "fabric-testing-requirements"
+
+# The variables of the parameters cell that the tagged cells depend on
+_OPTIONAL_CELL_VARIABLES = {
+    WHEEL_CELL_TAG: "wheel_name",
+    REQUIREMENTS_CELL_TAG: "requirements_file_name",
+}
 
 
 def load_default_notebook(
@@ -14,17 +37,31 @@ def load_default_notebook(
     wheel_name: str = None,
     requirements_file_name: str = None,
     unittest_folder_name: str = "tests",
+    bundle_archive_name: str = None,
+    test_workers: int = 1,
+    dependency_cache: bool = False,
+    bundle_copy_mode: str = DEFAULT_BUNDLE_COPY_MODE,
+    results_name: str = DEFAULT_RESULTS_NAME,
+    template_path: str = None,
+    extra_cells: List[str] = None,
+    guard_optional_cells: bool = False,
 ) -> str:
     """
     Loads and modifies the default notebook content
     by replacing placeholder values with actual parameters.
 
-    This function reads the content of a notebook file (in `.ipynb` format)
-    and replaces certain placeholderswith the provided values for lakehouse IDs,
-    workspace names, and file paths. It also manages optional
-    installation of dependencies via pip by replacing or removing
-    the relevant installation commands based
-    on whether `wheel_name` or `requirements_file_name` is provided.
+    This function renders a notebook template (in `.ipynb` format), filling in
+    its placeholders with the provided values for lakehouse IDs, workspace
+    names, and file paths. The template is parsed once and reused while the
+    file is unchanged, see `load_notebook_template`. Cells of a custom template
+    tagged "fabric-testing-wheel" or "fabric-testing-requirements" are left out
+    if `wheel_name` or `requirements_file_name` is not provided, unless
+    `guard_optional_cells` is set.
+
+    The values of the test run (submit folder, wheel, requirements, test folder,
+    bundle archive, test workers, dependency cache, bundle copy mode and results
+    folder) are set in the parameters cell of the notebook, so a persistent
+    runner notebook can override them per job.
 
     Args:
         lakehouse_id (str):
@@ -48,62 +85,92 @@ def load_default_notebook(
             Defaults to None.
         unittest_folder_name (str, optional):
             The folder name where unit tests are located. Defaults to "tests".
+        bundle_archive_name (str, optional):
+            The file name of the bundle archive, if the bundle was uploaded as
+            a single archive. The notebook then unpacks the archive in its
+            first cell. Defaults to None.
+        test_workers (int, optional):
+            The number of processes running the tests that do not use Spark.
+            Tests that use Spark run in the notebook itself. Defaults to 1,
+            i.e. all tests run in the notebook.
+        dependency_cache (bool, optional):
+            Whether the notebook installs the requirements and pytest from
+            a wheelhouse cached in the lakehouse, keyed by the requirements
+            and the runtime versions. Defaults to False.
+        bundle_copy_mode (str, optional):
+            How the notebook copies the bundle to the driver, either
+            "sparkfiles" (to every node) or "driver" (to the driver only).
+            The notebook prints how long the copy took. Defaults to "sparkfiles".
+        results_name (str, optional):
+            The folder in the submit folder the notebook writes the JUnit XML
+            reports and the JSON test summary to. Defaults to "results".
+        template_path (str, optional):
+            The path to a custom notebook template, with the same placeholders
+            as the default template. Defaults to None, i.e. the default template.
+        extra_cells (List[str], optional):
+            The sources of extra code cells, run after the setup of the test run
+            and before the tests. Defaults to None.
+        guard_optional_cells (bool, optional):
+            Whether the wheel and requirements cells are kept, and only run if
+            the `wheel_name` or `requirements_file_name` parameter is set when
+            the notebook runs. Used for the persistent runner, whose parameters
+            change per job. Defaults to False.
 
     Returns:
         str: The notebook content with placeholders replaced by the provided values.
 
     Raises:
         FileNotFoundError: If the notebook file cannot be found at the expected path.
+        ValueError: If the bundle copy mode is unknown, or the template is invalid.
 
     See Also:
         Notebook definition: https://learn.microsoft.com/en-us/rest/api/fabric/articles/item-management/definitions/notebook-definition
     """
 
-    # Get the current directory of the create.py file
-    # (which should be the "notebook" folder)
-    current_dir = os.path.dirname(__file__)
-    # Path to the notebook-content.py file in the same folder
-    notebook_file_path = os.path.join(current_dir, "notebook-content.ipynb")
-
-    # Load the content of the notebook-content.py file
-    try:
-        with open(notebook_file_path, "r") as file:
-            notebook_content = file.read()
-    except FileNotFoundError:
-        raise FileNotFoundError(f"The file {notebook_file_path} could not be found.")
-
-    if wheel_name is None:
-        _whl_content_to_remove = "!pip install builtin/XXSUBMITFOLDERXX/XXWHEELNAMEXX"
-        notebook_content = notebook_content.replace(_whl_content_to_remove, "#")
+    if bundle_copy_mode not in BUNDLE_COPY_MODES:
+        raise ValueError(
+            f"Unknown bundle copy mode {bundle_copy_mode}, "
+            f"expected one of {', '.join(BUNDLE_COPY_MODES)}"
+        )
 
-    else:
-        notebook_content = notebook_content.replace("XXWHEELNAMEXX", wheel_name)
+    template = load_notebook_template(template_path)
 
-    if requirements_file_name is None:
-        _rqs_content_to_remove = (
-            "!pip install -r builtin/XXSUBMITFOLDERXX/XXREQUIREMENTSFILENAMEXX"
-        )
-        notebook_content = notebook_content.replace(_rqs_content_to_remove, "#")
+    # Cells that only install the wheel or the requirements are left out
+    # without them, or skip themselves at run time if their parameter is empty.
+    # The default template checks this at run time itself.
+    exclude_tags = []
+    guard_tags = None
+    if guard_optional_cells:
+        guard_tags = _OPTIONAL_CELL_VARIABLES
     else:
-        notebook_content = notebook_content.replace(
-            "XXREQUIREMENTSFILENAMEXX", requirements_file_name
-        )
-
-    # Replace placeholders with actual values
-    notebook_content = notebook_content.replace("XXLAKEHOUSEIDXX", lakehouse_id)
-    notebook_content = notebook_content.replace(
-        "XXDEFAULTLAKEHOUSENAMEXX", default_lakehouse_name
-    )
-    notebook_content = notebook_content.replace(
-        "XXDEFAULTLAKEHOUSEWORKSPACEIDXX", default_lakehouse_workspace_id
+        if wheel_name is None:
+            exclude_tags.append(WHEEL_CELL_TAG)
+        if requirements_file_name is None:
+            exclude_tags.append(REQUIREMENTS_CELL_TAG)
+
+    return template.render(
+        {
+            "XXLAKEHOUSEIDXX": lakehouse_id,
+            "XXDEFAULTLAKEHOUSENAMEXX": default_lakehouse_name,
+            "XXDEFAULTLAKEHOUSEWORKSPACEIDXX": default_lakehouse_workspace_id,
+            "XXWORKSPACENAMEXX": workspace_name,
+            "XXSUBMITFOLDERXX": submit_folder,
+            "XXWHEELNAMEXX": wheel_name or "",
+            "XXREQUIREMENTSFILENAMEXX": requirements_file_name or "",
+            "XXTESTFOLDERXX": unittest_folder_name,
+            "XXBUNDLEARCHIVENAMEXX": bundle_archive_name or "",
+            # The notebook runs all tests, unless a shard passes its test files
+            # as an execution parameter
+            "XXTESTFILESXX": "",
+            "XXTESTWORKERSXX": str(test_workers),
+            "XXDEPENDENCYCACHEXX": "True" if dependency_cache else "",
+            "XXBUNDLECOPYMODEXX": bundle_copy_mode,
+            "XXRESULTSNAMEXX": results_name,
+        },
+        exclude_tags=exclude_tags,
+        guard_tags=guard_tags,
+        extra_cells=extra_cells,
     )
-    notebook_content = notebook_content.replace("XXWORKSPACENAMEXX", workspace_name)
-    notebook_content = notebook_content.replace("XXSUBMITFOLDERXX", submit_folder)
-
-    notebook_content = notebook_content.replace("XXTESTFOLDERXX", unittest_folder_name)
-
-    # Return the modified notebook content as a string
-    return notebook_content
 
 
 def convert_notebook_into_inlinebase64(notebook_content: str) -> str:
@@ -129,6 +196,56 @@ def convert_notebook_into_inlinebase64(notebook_content: str) -> str:
     return base64_string
 
 
+def iter_inlinebase64(
+    content: str, chunk_size: int = BASE64_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Encodes a string into Base64 chunk by chunk.
+
+    The content is encoded to UTF-8 piece by piece, and every chunk encodes a
+    multiple of 3 bytes, so the chunks join to the same Base64 string as
+    `convert_notebook_into_inlinebase64`, without holding it in memory.
+
+    Args:
+        content (str): The content to encode, e.g. a notebook definition.
+        chunk_size (int, optional): The number of characters encoded per chunk.
+            Defaults to 196608.
+
+    Yields:
+        bytes: The next chunk of the Base64-encoded content.
+    """
+    remainder = b""
+    for start in range(0, len(content), chunk_size):
+        data = remainder + content[start : start + chunk_size].encode("utf-8")
+        # Base64 encodes groups of 3 bytes, the rest is carried to the next chunk
+        split = len(data) - len(data) % 3
+        remainder = data[split:]
+        if split:
+            yield base64.b64encode(data[:split])
+
+    if remainder:
+        yield base64.b64encode(remainder)
+
+
+def get_inlinebase64_length(content: str, chunk_size: int = BASE64_CHUNK_SIZE) -> int:
+    """
+    Returns the length of the Base64-encoded content, without encoding it.
+
+    Args:
+        content (str): The content to encode.
+        chunk_size (int, optional): The number of characters measured at once.
+            Defaults to 196608.
+
+    Returns:
+        int: The number of Base64 characters.
+    """
+    byte_length = sum(
+        len(content[start : start + chunk_size].encode("utf-8"))
+        for start in range(0, len(content), chunk_size)
+    )
+    return 4 * ((byte_length + 2) // 3)
+
+
 def create_platform_file_content(*, display_name: str, description: str = "") -> str:
     """
     Creates a JSON-formatted string representing platform file content with metadata
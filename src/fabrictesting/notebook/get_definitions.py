@@ -1,27 +1,36 @@
 import json
+import logging
+import time
+from typing import Dict, Iterator
+from urllib.parse import quote
 
-import requests
+from fabrictesting.fabric_api.client import get_default_client, get_fabric_api_url
+from fabrictesting.notebook.cache import NotebookIdCache, get_default_notebook_cache
+from fabrictesting.utilities.tracing import get_default_tracer
 
+logger = logging.getLogger(__name__)
 
-def list_notebooks(*, workspace_id: str, token_string: str):
+
+def iter_notebook_pages(
+    *, workspace_id: str, token_string: str
+) -> Iterator[Dict[str, str]]:
     """
-    Lists all notebooks within a specific workspace by calling the Fabric API.
+    Lists the notebooks within a workspace page by page.
 
-    This function sends an authenticated GET request to the Fabric API to retrieve
-    a list of notebooks within the given workspace.
-    It extracts and returns a dictionary that maps notebook display names
-    to their corresponding IDs.
+    The pages are requested lazily: the next page is only requested when the
+    caller asks for it, following the `continuationUri` (or `continuationToken`)
+    of the previous page.
 
     Args:
         workspace_id (str): The ID of the workspace from which to list notebooks.
         token_string (str): The bearer token used for authenticating the API request.
 
-    Returns:
-        dict: A dictionary where the keys are notebook display names
-                and the values are their IDs.
+    Yields:
+        Dict[str, str]: A dictionary per page, mapping notebook display names
+            to their IDs.
 
     Raises:
-        Exception: If the API call fails or if the response status is not 200.
+        Exception: If an API call fails or if the response status is not 200.
 
     See Also:
         Fabric API documentation: https://learn.microsoft.com/en-us/rest/api/fabric/notebook/items/list-notebooks?tabs=HTTP
@@ -32,36 +41,112 @@ def list_notebooks(*, workspace_id: str, token_string: str):
         "Authorization": f"Bearer {token_string}",
     }
 
-    print("Get notebook definitions...")
-    response = requests.get(
-        url=f"https://api.fabric.microsoft.com/v1/workspaces/{workspace_id}/notebooks",
-        headers=header,
-    )
+    base_url = f"{get_fabric_api_url()}/workspaces/{workspace_id}/notebooks"
+    url = base_url
 
-    # Raise an exception if the API call fails (non-2xx status code)
-    if response.status_code != 200:
-        raise Exception(
-            f"API call failed with status "
-            f"{response.status_code}: {response.content.decode('utf-8')}"
+    logger.debug("Get notebook definitions...")
+    while url:
+        response = get_default_client().get(url=url, headers=header)
+
+        # Raise an exception if the API call fails (non-2xx status code)
+        if response.status_code != 200:
+            raise Exception(
+                f"API call failed with status "
+                f"{response.status_code}: {response.content.decode('utf-8')}"
+            )
+
+        response_json = json.loads(response.content)
+
+        yield {
+            notebook["displayName"]: notebook["id"]
+            for notebook in response_json.get("value", [])
+            if "displayName" in notebook and "id" in notebook
+        }
+
+        continuation_token = response_json.get("continuationToken")
+        url = response_json.get("continuationUri") or (
+            f"{base_url}?continuationToken={quote(continuation_token)}"
+            if continuation_token
+            else None
         )
 
-    response_json = json.loads(response.content)
 
-    workspaces_dict = {
-        workspace["displayName"]: workspace["id"]
-        for workspace in response_json.get("value", [])
-        if "displayName" in workspace and "id" in workspace
-    }
+def list_notebooks(*, workspace_id: str, token_string: str):
+    """
+    Lists all notebooks within a specific workspace by calling the Fabric API.
+
+    This function requests every page of the notebook list of the given
+    workspace. It extracts and returns a dictionary that maps notebook
+    display names to their corresponding IDs.
+
+    Args:
+        workspace_id (str): The ID of the workspace from which to list notebooks.
+        token_string (str): The bearer token used for authenticating the API request.
+
+    Returns:
+        dict: A dictionary where the keys are notebook display names
+                and the values are their IDs.
+
+    Raises:
+        Exception: If the API call fails or if the response status is not 200.
+
+    See Also:
+        Fabric API documentation: https://learn.microsoft.com/en-us/rest/api/fabric/notebook/items/list-notebooks?tabs=HTTP
+    """
+    workspaces_dict = {}
+    for page in iter_notebook_pages(
+        workspace_id=workspace_id, token_string=token_string
+    ):
+        workspaces_dict.update(page)
     return workspaces_dict
 
 
+def find_notebook_id(
+    *,
+    notebook_name: str,
+    workspace_id: str,
+    token_string: str,
+    cache: NotebookIdCache = None,
+):
+    """
+    Finds the ID of a notebook by name, or returns None if it does not exist.
+
+    The cache is checked first. Otherwise the notebook list is requested page by
+    page until the notebook is found, and every listed notebook is cached.
+
+    Args:
+        notebook_name (str): The name of the notebook to search for.
+        workspace_id (str): The ID of the workspace where the notebook is located.
+        token_string (str): The bearer token used for authenticating the API request.
+        cache (NotebookIdCache, optional): The cache of notebook ids.
+            Defaults to the cache shared by the process.
+
+    Returns:
+        str: The ID of the notebook, or None if it was not found.
+    """
+    cache = cache or get_default_notebook_cache()
+
+    notebook_id = cache.get(workspace_id, notebook_name)
+    if notebook_id is not None:
+        return notebook_id
+
+    for page in iter_notebook_pages(
+        workspace_id=workspace_id, token_string=token_string
+    ):
+        cache.update(workspace_id, page)
+        if notebook_name in page:
+            return page[notebook_name]
+
+    return None
+
+
 def get_notebook_id(*, notebook_name: str, workspace_id: str, token_string):
     """
     Retrieves the ID of a specific notebook by name within a given workspace.
 
-    This function calls `list_notebooks` to get all available notebooks
-    in the specified workspace, then attempts to return the ID of the notebook
-    with the given name. If the notebook is not found, an exception is raised.
+    This function calls `find_notebook_id`, which uses the cached ID or lists
+    the notebooks of the workspace until the notebook is found.
+    If the notebook is not found, an exception is raised.
 
     Args:
         notebook_name (str): The name of the notebook to search for.
@@ -74,15 +159,115 @@ def get_notebook_id(*, notebook_name: str, workspace_id: str, token_string):
     Raises:
         Exception: If the notebook is not found in the workspace.
     """
-    workspaces_dict = list_notebooks(
-        workspace_id=workspace_id, token_string=token_string
+    notebook_id = find_notebook_id(
+        notebook_name=notebook_name,
+        workspace_id=workspace_id,
+        token_string=token_string,
     )
 
-    try:
-        return workspaces_dict[notebook_name]
-
-    except KeyError:
+    if notebook_id is None:
         raise Exception(
             f"The notebook {notebook_name} was not found "
             f"in the workspace {workspace_id}"
         )
+
+    return notebook_id
+
+
+def wait_for_notebook_id(
+    *,
+    notebook_name: str,
+    workspace_id: str,
+    token_string: str,
+    timeout: float = 60,
+    initial_delay: float = 0.5,
+    max_delay: float = 8,
+) -> str:
+    """
+    Retrieves the ID of a notebook by name, waiting until it is listed.
+
+    A newly created notebook can take a moment to show up in the notebook list.
+    The list is requested again with an exponentially growing delay
+    until the notebook is found or the timeout is reached.
+
+    Args:
+        notebook_name (str): The name of the notebook to search for.
+        workspace_id (str): The ID of the workspace where the notebook is located.
+        token_string (str): The bearer token used for authenticating the API request.
+        timeout (float, optional): The maximum time to wait (in seconds).
+            Defaults to 60.
+        initial_delay (float, optional): The first delay (in seconds). Defaults to 0.5.
+        max_delay (float, optional): The maximum delay (in seconds). Defaults to 8.
+
+    Returns:
+        str: The ID of the notebook.
+
+    Raises:
+        Exception: If the notebook is not found before the timeout.
+    """
+    with get_default_tracer().span("notebook.lookup_id", notebook=notebook_name):
+        deadline = time.monotonic() + timeout
+        delay = initial_delay
+
+        while True:
+            notebook_id = find_notebook_id(
+                notebook_name=notebook_name,
+                workspace_id=workspace_id,
+                token_string=token_string,
+            )
+            if notebook_id is not None:
+                return notebook_id
+
+            if time.monotonic() + delay > deadline:
+                raise Exception(
+                    f"The notebook {notebook_name} was not found "
+                    f"in the workspace {workspace_id}"
+                )
+
+            logger.debug(
+                "Notebook %s is not listed yet, retrying in %ss...",
+                notebook_name,
+                delay,
+            )
+            time.sleep(delay)
+            delay = min(delay * 2, max_delay)
+
+
+def get_notebook(*, notebook_id: str, workspace_id: str, token_string: str):
+    """
+    Retrieves the properties of a notebook, e.g. its display name and description.
+
+    Args:
+        notebook_id (str): The ID of the notebook.
+        workspace_id (str): The ID of the workspace where the notebook is located.
+        token_string (str): The bearer token used for authenticating the API request.
+
+    Returns:
+        dict: The notebook properties, or None if the notebook does not exist.
+
+    Raises:
+        Exception: If the API call fails with a status other than 200 or 404.
+
+    See Also:
+        Fabric API documentation: https://learn.microsoft.com/en-us/rest/api/fabric/notebook/items/get-notebook?tabs=HTTP
+    """
+    header = {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {token_string}",
+    }
+
+    response = get_default_client().get(
+        url=f"{get_fabric_api_url()}/workspaces/{workspace_id}/notebooks/{notebook_id}",
+        headers=header,
+    )
+
+    if response.status_code == 404:
+        return None
+
+    if response.status_code != 200:
+        raise Exception(
+            f"API call failed with status "
+            f"{response.status_code}: {response.content.decode('utf-8')}"
+        )
+
+    return json.loads(response.content)
@@ -1,7 +1,22 @@
+import asyncio
+import copy
+import json
+import logging
 import time
+from typing import Dict, List, Tuple
 
 import requests
 
+from fabrictesting.fabric_api.client import get_default_client
+from fabrictesting.fabric_api.token_provider import TokenProvider
+from fabrictesting.notebook.polling import PollingStrategy
+from fabrictesting.utilities.tracing import get_default_tracer
+
+logger = logging.getLogger(__name__)
+
+# Seconds between two messages that a polled job is still running
+STATUS_LOG_INTERVAL = 60
+
 
 def handle_successful_response(response: requests.Response) -> dict:
     """
@@ -12,7 +27,7 @@ def handle_successful_response(response: requests.Response) -> dict:
 
     Returns:
         dict: Dictionary containing the response status
-        and content if job completes or fails.
+        and content if job completes, fails or is cancelled.
     """
     response_data = response.json()
     job_status = response_data.get("status")
@@ -21,14 +36,18 @@ def handle_successful_response(response: requests.Response) -> dict:
         raise Exception("There was no job_status in the fetch url response")
 
     if job_status == "Completed":
-        print("Notebook job completed successfully.")
+        logger.info("Notebook job completed successfully.")
         return {"status_code": response.status_code, "content": response.content}
 
     elif job_status == "Failed":
         return handle_failed_job(response_data, response)
 
+    elif job_status == "Cancelled":
+        logger.info("Notebook job was cancelled.")
+        return {"status_code": response.status_code, "content": response.content}
+
     else:
-        print("Notebook job is still in progress...")
+        logger.debug("Notebook job is still in progress...")
         return None  # Job still running
 
 
@@ -54,11 +73,14 @@ def handle_failed_job(response_data: dict, response: requests.Response) -> dict:
         raise Exception("There was no message in the fetch url response")
 
     if "No notebook execution state found" in response_message:
-        print("No execution state found, retrying...")
+        logger.debug("No execution state found, retrying...")
     else:
-        print("Failure reason unknown, returning...")
-        print(f"Status code: {response.status_code}")
-        print(f"Content: {str(response.content)}")
+        logger.warning(
+            "Notebook job failed for an unknown reason, status code: %s, "
+            "content: %s",
+            response.status_code,
+            response.content,
+        )
         return {"status_code": response.status_code, "content": response.content}
 
     return None  # To signify retry
@@ -75,48 +97,260 @@ def handle_non_successful_response(response: requests.Response) -> dict:
         dict: The status and content when an unexpected status code is encountered.
     """
     if response.status_code == 202:
-        print("Job still running, retrying...")
+        logger.debug("Job still running, retrying...")
         return None  # Job still running
 
-    print(
-        f"Unexpected status code: {response.status_code}. Response: {response.content}"
+    logger.warning(
+        "Unexpected status code: %s. Response: %s",
+        response.status_code,
+        response.content,
     )
     return {"status_code": response.status_code, "content": response.content}
 
 
 def poll_notebook_run_status(
-    *, fetch_url: str, retry_after: int, token_string: str
+    *,
+    fetch_url: str,
+    retry_after: int = None,
+    token_string: str = None,
+    token_provider: TokenProvider = None,
+    polling_strategy: PollingStrategy = None,
 ) -> dict:
     """
     Polls the notebook run status at the given URL until the job completes.
 
+    Polling starts fast and backs off to `retry_after`, see `PollingStrategy`.
+    If the deadline or the maximum number of attempts of the strategy is
+    reached, polling stops and a timeout result is returned.
+
+    If a `token_provider` is given, the token is requested from it before every
+    poll, so a token that expires during a long run is refreshed.
+
     Args:
         fetch_url (str): The URL to poll for the job status.
         https://api.fabric.microsoft.com/v1/workspaces/{workspaceId}/items/{itemId}/jobs/instances/{jobInstanceId}
-        retry_after (int): The time to wait (in seconds) between polling attempts.
-        token_string (str): The authorization token for the API.
+        retry_after (int, optional): The interval (in seconds) suggested by the
+            server, i.e. the longest time to wait between polling attempts.
+        token_string (str, optional): The authorization token for the API.
+        token_provider (TokenProvider, optional): Provides a valid authorization
+            token for each poll. Takes precedence over `token_string`.
+        polling_strategy (PollingStrategy, optional): Decides the intervals
+            between polls and when to give up. Defaults to a strategy
+            without deadline.
 
     Returns:
-        dict: The final status of the notebook job.
+        dict: The final status of the notebook job. On timeout, the dictionary
+            has a `status_code` of None and `timed_out` set to True.
+    """
+    if token_string is None and token_provider is None:
+        raise ValueError("Either token_string or token_provider must be provided")
 
-    Todo:
-        Implement functionality to avoid infinity loop
+    polling_strategy = polling_strategy or PollingStrategy()
+    polling_strategy.start()
+    logged_at = 0.0
 
+    while True:
+        result = poll_notebook_run_status_once(
+            fetch_url=fetch_url,
+            token_string=token_string,
+            token_provider=token_provider,
+        )
+        if result is not None:
+            return result
+
+        delay = polling_strategy.next_delay(retry_after)
+        if delay is None:
+            return _create_timeout_result(polling_strategy)
+        logged_at = _log_still_running(fetch_url, polling_strategy, logged_at)
+
+        # Wait before polling again
+        time.sleep(delay)
+
+
+def poll_notebook_run_status_once(
+    *,
+    fetch_url: str,
+    token_string: str = None,
+    token_provider: TokenProvider = None,
+):
     """
-    headers = {"Authorization": f"Bearer {token_string}"}
+    Requests the notebook run status once.
 
-    while True:
-        response = requests.get(fetch_url, headers=headers)
+    Args:
+        fetch_url (str): The URL to poll for the job status.
+        token_string (str, optional): The authorization token for the API.
+        token_provider (TokenProvider, optional): Provides a valid authorization
+            token. Takes precedence over `token_string`.
+
+    Returns:
+        dict: The final status of the notebook job,
+            or None if the job is still running.
+    """
+    with get_default_tracer().span("notebook.status_poll", url=fetch_url) as span:
+        if token_provider is not None:
+            token_string = token_provider.get_token_string()
+        headers = {"Authorization": f"Bearer {token_string}"}
+
+        response = get_default_client().get(fetch_url, headers=headers)
+        span.set_attribute("http.response.status_code", response.status_code)
 
         if response.status_code == 200:
             result = handle_successful_response(response)
-            if result is not None:
-                return result
-
         else:
             result = handle_non_successful_response(response)
-            if result is not None:
-                return result
 
-        # Wait for the specified retry time before polling again
-        time.sleep(retry_after)
+        if span.recording and result is not None:
+            span.set_attribute("job.status", get_job_status(result))
+        return result
+
+
+def _log_still_running(
+    fetch_url: str, polling_strategy: PollingStrategy, logged_at: float
+) -> float:
+    # The single polls are only logged at the debug level, so a summary is
+    # logged every STATUS_LOG_INTERVAL seconds instead
+    if polling_strategy.elapsed - logged_at < STATUS_LOG_INTERVAL:
+        return logged_at
+
+    logger.info(
+        "Notebook job is still running after %.0f seconds and %d polls: %s",
+        polling_strategy.elapsed,
+        polling_strategy.attempts,
+        fetch_url,
+    )
+    return polling_strategy.elapsed
+
+
+def _create_timeout_result(polling_strategy: PollingStrategy) -> dict:
+    message = (
+        f"Stopped polling after {polling_strategy.attempts} attempts "
+        f"and {polling_strategy.elapsed:.0f} seconds."
+    )
+    logger.warning(message)
+    return {
+        "status_code": None,
+        "content": message.encode("utf-8"),
+        "timed_out": True,
+    }
+
+
+async def poll_notebook_run_status_async(
+    *,
+    fetch_url: str,
+    retry_after: int = None,
+    token_string: str = None,
+    token_provider: TokenProvider = None,
+    polling_strategy: PollingStrategy = None,
+) -> dict:
+    """
+    Polls the notebook run status like `poll_notebook_run_status`,
+    but waits on the asyncio event loop between polls.
+
+    The requests themselves run in a worker thread on the shared Fabric API
+    client, so many jobs can be polled concurrently over one connection pool.
+
+    Args:
+        fetch_url (str): The URL to poll for the job status.
+        retry_after (int, optional): The interval (in seconds) suggested by the
+            server, i.e. the longest time to wait between polling attempts.
+        token_string (str, optional): The authorization token for the API.
+        token_provider (TokenProvider, optional): Provides a valid authorization
+            token for each poll. Takes precedence over `token_string`.
+        polling_strategy (PollingStrategy, optional): Decides the intervals
+            between polls and when to give up. Defaults to a strategy
+            without deadline.
+
+    Returns:
+        dict: The final status of the notebook job. On timeout, the dictionary
+            has a `status_code` of None and `timed_out` set to True.
+    """
+    if token_string is None and token_provider is None:
+        raise ValueError("Either token_string or token_provider must be provided")
+
+    polling_strategy = polling_strategy or PollingStrategy()
+    polling_strategy.start()
+    logged_at = 0.0
+
+    while True:
+        result = await asyncio.to_thread(
+            poll_notebook_run_status_once,
+            fetch_url=fetch_url,
+            token_string=token_string,
+            token_provider=token_provider,
+        )
+        if result is not None:
+            return result
+
+        delay = polling_strategy.next_delay(retry_after)
+        if delay is None:
+            return _create_timeout_result(polling_strategy)
+        logged_at = _log_still_running(fetch_url, polling_strategy, logged_at)
+
+        await asyncio.sleep(delay)
+
+
+async def poll_notebook_runs(
+    *,
+    fetch_urls: List[Tuple[str, int]],
+    token_provider: TokenProvider,
+    polling_strategy: PollingStrategy = None,
+) -> Dict[str, dict]:
+    """
+    Polls the status of several notebook runs concurrently.
+
+    Args:
+        fetch_urls (List[Tuple[str, int]]): The URL of each job, together with
+            its suggested polling interval (in seconds).
+        token_provider (TokenProvider): Provides a valid authorization token,
+            shared by all jobs.
+        polling_strategy (PollingStrategy, optional): The polling strategy.
+            Every job is polled with its own copy. Defaults to a strategy
+            without deadline.
+
+    Returns:
+        Dict[str, dict]: The final status of each job, by fetch URL.
+            If polling a job raised an exception, the result has a
+            `status_code` of None and the exception message as content.
+    """
+    polling_strategy = polling_strategy or PollingStrategy()
+
+    async def _poll(fetch_url: str, retry_after: int) -> dict:
+        try:
+            return await poll_notebook_run_status_async(
+                fetch_url=fetch_url,
+                retry_after=retry_after,
+                token_provider=token_provider,
+                polling_strategy=copy.copy(polling_strategy),
+            )
+        except Exception as e:  # noqa: BLE001
+            logger.error("Polling %s failed: %s", fetch_url, e)
+            return {"status_code": None, "content": str(e).encode("utf-8")}
+
+    results = await asyncio.gather(
+        *(_poll(fetch_url, retry_after) for fetch_url, retry_after in fetch_urls)
+    )
+
+    return {fetch_url: result for (fetch_url, _), result in zip(fetch_urls, results)}
+
+
+def get_job_status(result: dict) -> str:
+    """
+    Returns the job status of a polling result, e.g. "Completed" or "Failed".
+
+    Args:
+        result (dict): A result of `poll_notebook_run_status`.
+
+    Returns:
+        str: The job status, "TimedOut" if polling timed out, or "Error"
+            if the status could not be determined.
+    """
+    if result.get("timed_out"):
+        return "TimedOut"
+
+    if result.get("status_code") != 200:
+        return "Error"
+
+    try:
+        return json.loads(result["content"]).get("status") or "Error"
+    except (TypeError, ValueError, AttributeError):
+        return "Error"
@@ -0,0 +1,96 @@
+import time
+
+DEFAULT_INITIAL_INTERVAL = 2.0
+DEFAULT_MAX_INTERVAL = 60.0
+DEFAULT_BACKOFF_FACTOR = 1.5
+
+
+class PollingStrategy:
+    """
+    Decides how long to wait between polls and when to give up.
+
+    Polling starts fast, so short runs are reported within seconds, and the
+    interval then grows by `backoff_factor` up to `max_interval`. A server
+    suggested interval, e.g. the `Retry-After` header of the job, replaces
+    `max_interval`. Polling stops when the total `timeout` or `max_attempts`
+    is reached.
+
+    Call `start` before the first poll and `next_delay` after every poll.
+
+    Args:
+        initial_interval (float, optional): The first interval (in seconds).
+            Defaults to 2.
+        max_interval (float, optional): The longest interval (in seconds).
+            Defaults to 60.
+        backoff_factor (float, optional): The growth of the interval per poll.
+            Defaults to 1.5.
+        timeout (float, optional): The total time (in seconds) after which
+            polling stops. Defaults to None, i.e. no deadline.
+        max_attempts (int, optional): The maximum number of polls.
+            Defaults to None, i.e. no limit.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_interval: float = DEFAULT_INITIAL_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        timeout: float = None,
+        max_attempts: int = None,
+    ):
+        if initial_interval <= 0 or max_interval <= 0:
+            raise ValueError("Polling intervals must be positive")
+        if backoff_factor < 1:
+            raise ValueError("backoff_factor must be at least 1")
+
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.start()
+
+    def start(self):
+        """
+        Resets the strategy for a new polling loop.
+        """
+        self.attempts = 0
+        self._started_at = time.monotonic()
+        self._interval = min(self.initial_interval, self.max_interval)
+
+    @property
+    def elapsed(self) -> float:
+        """
+        The time (in seconds) since polling started.
+        """
+        return time.monotonic() - self._started_at
+
+    def next_delay(self, retry_after: float = None):
+        """
+        Registers a poll and returns the time to wait before the next one.
+
+        Args:
+            retry_after (float, optional): The interval suggested by the server.
+                It replaces the longest interval of the strategy.
+
+        Returns:
+            float: The delay (in seconds), or None if polling should stop
+                because the deadline or the maximum number of attempts is reached.
+        """
+        self.attempts += 1
+
+        if self.max_attempts is not None and self.attempts >= self.max_attempts:
+            return None
+
+        max_interval = self.max_interval if retry_after is None else retry_after
+        delay = min(self._interval, max_interval)
+        self._interval = min(self._interval * self.backoff_factor, max_interval)
+
+        if self.timeout is not None:
+            remaining = self.timeout - self.elapsed
+            if remaining <= 0:
+                return None
+            delay = min(delay, remaining)
+
+        return delay
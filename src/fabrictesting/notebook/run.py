@@ -1,4 +1,9 @@
-import requests
+import logging
+
+from fabrictesting.fabric_api.client import get_default_client, get_fabric_api_url
+from fabrictesting.utilities.tracing import get_default_tracer
+
+logger = logging.getLogger(__name__)
 
 
 def run_notebook(
@@ -7,6 +12,7 @@ def run_notebook(
     workspace_id: str,
     token_string: str,
     job_type: str = "RunNotebook",
+    parameters: dict = None,
 ):
     """
     Triggers the execution of a notebook in a specified workspace using the Fabric API.
@@ -24,6 +30,9 @@ def run_notebook(
         workspace_id (str): The ID of the workspace where the notebook resides.
         token_string (str): The bearer token used to authenticate the API request.
         job_type (str, optional): The type of job to trigger. Defaults to "RunNotebook".
+        parameters (dict, optional): Execution parameters of the notebook, mapping
+            each parameter name to its string value. They override the values
+            in the parameters cell of the notebook. Defaults to None.
 
     Returns:
         dict: A dictionary containing the following information:
@@ -48,11 +57,25 @@ def run_notebook(
         "Authorization": f"Bearer {token_string}",
     }
 
-    print("Trigger notebook...")
-    response = requests.post(
-        url=f"https://api.fabric.microsoft.com/v1/workspaces/{workspace_id}/items/{item_id}/jobs/instances?jobType={job_type}",
-        headers=header,
-    )
+    request_kwargs = {}
+    if parameters:
+        request_kwargs["json"] = {
+            "executionData": {
+                "parameters": {
+                    name: {"value": value, "type": "string"}
+                    for name, value in parameters.items()
+                }
+            }
+        }
+
+    logger.debug("Trigger notebook...")
+    with get_default_tracer().span("notebook.trigger", item_id=item_id) as span:
+        response = get_default_client().post(
+            url=f"{get_fabric_api_url()}/workspaces/{workspace_id}/items/{item_id}/jobs/instances?jobType={job_type}",
+            headers=header,
+            **request_kwargs,
+        )
+        span.set_attribute("http.response.status_code", response.status_code)
 
     fetch_url = response.headers.get("Location")
     retry_after = int(response.headers.get("Retry-After", 60))
@@ -64,7 +87,7 @@ def run_notebook(
             f"Triggering notebook failed with {status_code}: {str(response.content)}"
         )
 
-    print("Trigger finished!")
+    logger.info("Notebook job was triggered: %s", fetch_url)
 
     return {
         "status_code": response.status_code,
@@ -0,0 +1,195 @@
+import hashlib
+import logging
+from typing import List
+
+from fabrictesting.notebook.cache import get_default_notebook_cache
+from fabrictesting.notebook.create import (
+    DEFAULT_BUNDLE_COPY_MODE,
+    create_platform_file_content,
+)
+from fabrictesting.notebook.get_definitions import (
+    find_notebook_id,
+    get_notebook,
+    wait_for_notebook_id,
+)
+from fabrictesting.notebook.upload import update_notebook_definition, upload_notebook
+from fabrictesting.utilities.results import DEFAULT_RESULTS_NAME
+
+logger = logging.getLogger(__name__)
+
+# Display name of the persistent runner notebook
+RUNNER_NOTEBOOK_NAME = "fabric-testing-runner"
+
+_RUNNER_DESCRIPTION = "This is a fabric-testing runner notebook. Template hash: {}"
+
+
+def compute_template_hash(notebook_content: str) -> str:
+    """
+    Computes the SHA-256 hash of a rendered notebook definition.
+
+    Args:
+        notebook_content (str): The notebook content.
+
+    Returns:
+        str: The hex encoded SHA-256 hash.
+    """
+    return hashlib.sha256(notebook_content.encode("utf-8")).hexdigest()
+
+
+def create_runner_parameters(
+    *,
+    submit_folder: str,
+    wheel_name: str = None,
+    requirements_file_name: str = None,
+    unittest_folder_name: str = "tests",
+    bundle_archive_name: str = None,
+    test_files: List[str] = None,
+    test_workers: int = 1,
+    dependency_cache: bool = False,
+    bundle_copy_mode: str = DEFAULT_BUNDLE_COPY_MODE,
+    results_name: str = DEFAULT_RESULTS_NAME,
+) -> dict:
+    """
+    Creates the execution parameters of a test run on the runner notebook.
+
+    The names match the variables in the parameters cell of the notebook.
+
+    Args:
+        submit_folder (str): The folder of the uploaded bundle.
+        wheel_name (str, optional): The name of the wheel file. Defaults to None.
+        requirements_file_name (str, optional): The name of the requirements file.
+            Defaults to None.
+        unittest_folder_name (str, optional): The folder name where unit tests
+            are located. Defaults to "tests".
+        bundle_archive_name (str, optional): The file name of the bundle archive.
+            Defaults to None.
+        test_files (List[str], optional): The test files of a shard, relative
+            to the test folder. Defaults to None, i.e. all tests.
+        test_workers (int, optional): The number of processes running the tests
+            that do not use Spark. Defaults to 1.
+        dependency_cache (bool, optional): Whether the requirements are installed
+            from the dependency cache in the lakehouse. Defaults to False.
+        bundle_copy_mode (str, optional): How the bundle is copied to the driver,
+            "sparkfiles" or "driver". Defaults to "sparkfiles".
+        results_name (str, optional): The folder in the submit folder that
+            receives the test results. Defaults to "results".
+
+    Returns:
+        dict: The execution parameters, mapping each name to its string value.
+    """
+    return {
+        "submit_folder": submit_folder,
+        "wheel_name": wheel_name or "",
+        "requirements_file_name": requirements_file_name or "",
+        "test_folder": unittest_folder_name,
+        "bundle_archive_name": bundle_archive_name or "",
+        "test_files": ",".join(test_files or []),
+        "test_workers": str(test_workers),
+        "dependency_cache": "True" if dependency_cache else "",
+        "bundle_copy_mode": bundle_copy_mode,
+        "results_name": results_name,
+    }
+
+
+def _find_runner_notebook(
+    *, notebook_name: str, workspace_id: str, token_string: str
+) -> dict:
+    notebook_id = find_notebook_id(
+        notebook_name=notebook_name,
+        workspace_id=workspace_id,
+        token_string=token_string,
+    )
+    if notebook_id is None:
+        return None
+
+    notebook = get_notebook(
+        notebook_id=notebook_id, workspace_id=workspace_id, token_string=token_string
+    )
+    if notebook is not None:
+        return notebook
+
+    # The cached id belongs to a deleted notebook, so look it up again
+    get_default_notebook_cache().invalidate(workspace_id)
+    notebook_id = find_notebook_id(
+        notebook_name=notebook_name,
+        workspace_id=workspace_id,
+        token_string=token_string,
+    )
+    if notebook_id is None:
+        return None
+
+    return get_notebook(
+        notebook_id=notebook_id, workspace_id=workspace_id, token_string=token_string
+    )
+
+
+def ensure_runner_notebook(
+    *,
+    notebook_name: str,
+    notebook_definition: str,
+    workspace_id: str,
+    token_string: str,
+) -> str:
+    """
+    Makes sure the persistent runner notebook exists with the given definition.
+
+    The runner notebook is created on first use. The hash of its definition
+    is stored in the notebook description; the definition is only updated
+    when the hash changed, e.g. after a new fabric-testing release.
+    Otherwise no notebook is created or updated at all.
+
+    Args:
+        notebook_name (str): The display name of the runner notebook.
+        notebook_definition (str): The rendered runner notebook content.
+        workspace_id (str): The ID of the workspace of the runner notebook.
+        token_string (str): The bearer token used to authenticate the API request.
+
+    Returns:
+        str: The ID of the runner notebook.
+    """
+    template_hash = compute_template_hash(notebook_definition)
+    description = _RUNNER_DESCRIPTION.format(template_hash)
+    platform_definition = create_platform_file_content(
+        display_name=notebook_name, description=description
+    )
+
+    notebook = _find_runner_notebook(
+        notebook_name=notebook_name,
+        workspace_id=workspace_id,
+        token_string=token_string,
+    )
+
+    if notebook is None:
+        logger.info("Creating runner notebook %s...", notebook_name)
+        upload_response = upload_notebook(
+            display_name=notebook_name,
+            description=description,
+            notebook_definition=notebook_definition,
+            platform_definition=platform_definition,
+            workspace_id=workspace_id,
+            token_string=token_string,
+        )
+        notebook_id = upload_response.get("item_id")
+        if notebook_id is None:
+            notebook_id = wait_for_notebook_id(
+                notebook_name=notebook_name,
+                workspace_id=workspace_id,
+                token_string=token_string,
+            )
+        return notebook_id
+
+    notebook_id = notebook["id"]
+
+    if template_hash in (notebook.get("description") or ""):
+        logger.info("Runner notebook %s is up to date.", notebook_name)
+        return notebook_id
+
+    logger.info("Runner notebook %s changed, updating its definition...", notebook_name)
+    update_notebook_definition(
+        notebook_id=notebook_id,
+        notebook_definition=notebook_definition,
+        platform_definition=platform_definition,
+        workspace_id=workspace_id,
+        token_string=token_string,
+    )
+    return notebook_id
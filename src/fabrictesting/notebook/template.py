@@ -0,0 +1,237 @@
+import functools
+import json
+import os
+import re
+import uuid
+from typing import Dict, Iterable, List, Tuple
+
+# Path to the notebook template shipped with fabric-testing
+DEFAULT_TEMPLATE_PATH = os.path.join(
+    os.path.dirname(__file__), "notebook-content.ipynb"
+)
+
+# Placeholders of the template, e.g. XXSUBMITFOLDERXX
+PLACEHOLDER_PATTERN = re.compile(r"(XX[A-Z]+XX)")
+
+# Extra cells are inserted before the first cell with this tag,
+# i.e. after the setup of the test run and before the tests run
+RUN_TESTS_TAG = "fabric-testing-run"
+
+# Metadata of the extra code cells, matching the cells of the template
+_CODE_CELL_METADATA = {
+    "jupyter": {"outputs_hidden": False, "source_hidden": False},
+    "microsoft": {"language": "python", "language_group": "synapse_pyspark"},
+    "nteract": {"transient": {"deleting": False}},
+}
+
+
+def _serialize(value) -> str:
+    # The compact format of the template file, so rendering does not reformat it
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def _compile(text: str) -> Tuple[str, ...]:
+    # Alternating literal text and placeholders, starting with literal text
+    return tuple(PLACEHOLDER_PATTERN.split(text))
+
+
+def _render_parts(parts: Tuple[str, ...], values: Dict[str, str]) -> str:
+    return "".join(
+        values[part] if index % 2 else part for index, part in enumerate(parts)
+    )
+
+
+class NotebookTemplate:
+    """
+    A notebook template that is parsed once and rendered many times.
+
+    The template is a notebook in `.ipynb` format whose cells and metadata
+    contain placeholders such as XXSUBMITFOLDERXX. When the template is
+    loaded, every cell is serialized and split into literal text and
+    placeholders, so rendering is a single pass that joins the parts with
+    the values. The values are JSON escaped, so they cannot break the notebook.
+
+    Cells are included, excluded or guarded by their tags (`metadata.tags`),
+    and extra code cells can be inserted before the cell tagged
+    "fabric-testing-run".
+
+    Args:
+        notebook (dict): The parsed notebook template.
+    """
+
+    def __init__(self, notebook: dict):
+        cells = notebook.get("cells", [])
+        header = {key: value for key, value in notebook.items() if key != "cells"}
+
+        self._cells = [
+            (
+                frozenset(cell.get("metadata", {}).get("tags", [])),
+                _compile(_serialize(cell)),
+                cell,
+            )
+            for cell in cells
+        ]
+        # The notebook metadata, e.g. the default lakehouse, after the cells
+        self._header_parts = _compile(_serialize(header)[1:])
+        self.placeholders = frozenset(
+            part
+            for parts in [self._header_parts, *(parts for _, parts, _ in self._cells)]
+            for part in parts[1::2]
+        )
+
+    def render(
+        self,
+        values: Dict[str, str],
+        *,
+        exclude_tags: Iterable[str] = (),
+        guard_tags: Dict[str, str] = None,
+        extra_cells: List[str] = None,
+    ) -> str:
+        """
+        Renders the notebook content.
+
+        Args:
+            values (Dict[str, str]): The value of every placeholder,
+                e.g. {"XXSUBMITFOLDERXX": "my-folder"}.
+            exclude_tags (Iterable[str], optional): The cells with any of
+                these tags are left out. Defaults to no tags.
+            guard_tags (Dict[str, str], optional): The cells with one of these
+                tags only run if the notebook variable the tag maps to is set
+                at run time, e.g. {"fabric-testing-wheel": "wheel_name"}.
+                Defaults to None.
+            extra_cells (List[str], optional): The sources of extra code cells.
+                They are not rendered, so they may contain any text.
+                Defaults to None.
+
+        Returns:
+            str: The notebook content.
+
+        Raises:
+            ValueError: If a placeholder of the template has no value.
+        """
+        missing = self.placeholders.difference(values)
+        if missing:
+            raise ValueError(
+                f"Missing values for the placeholders {', '.join(sorted(missing))}"
+            )
+
+        # Only the JSON escaped value is inserted into the JSON string
+        escaped_values = {
+            placeholder: _serialize(str(values[placeholder]))[1:-1]
+            for placeholder in self.placeholders
+        }
+        exclude_tags = frozenset(exclude_tags)
+
+        rendered_cells = []
+        extra_cells_pending = bool(extra_cells)
+        for tags, parts, cell in self._cells:
+            if tags & exclude_tags:
+                continue
+            guards = [
+                variable for tag, variable in (guard_tags or {}).items() if tag in tags
+            ]
+            if guards:
+                parts = _compile(_serialize(create_guarded_cell(cell, guards)))
+            if extra_cells_pending and RUN_TESTS_TAG in tags:
+                rendered_cells.extend(
+                    _serialize(create_code_cell(source)) for source in extra_cells
+                )
+                extra_cells_pending = False
+            rendered_cells.append(_render_parts(parts, escaped_values))
+
+        if extra_cells_pending:
+            rendered_cells.extend(
+                _serialize(create_code_cell(source)) for source in extra_cells
+            )
+
+        header = _render_parts(self._header_parts, escaped_values)
+        separator = "," if header != "}" else ""
+        return f'{{"cells":[{",".join(rendered_cells)}]{separator}{header}\n'
+
+
+def create_guarded_cell(cell: dict, variables: List[str]) -> dict:
+    """
+    Wraps a cell, so its source only runs if the notebook variables are set.
+
+    The source is run with `run_cell` of the notebook kernel, so it may contain
+    magics such as `!pip`, and its errors are raised in the cell.
+
+    Args:
+        cell (dict): The cell in `.ipynb` format.
+        variables (List[str]): The names of the notebook variables, e.g.
+            "wheel_name". The cell is skipped if any of them is empty.
+
+    Returns:
+        dict: The guarded cell in `.ipynb` format.
+    """
+    source = cell.get("source", "")
+    if not isinstance(source, str):
+        source = "".join(source)
+
+    return {
+        **cell,
+        "source": [
+            f"if {' and '.join(variables)}:\n",
+            f"    get_ipython().run_cell({source!r}).raise_error()\n",
+        ],
+    }
+
+
+def create_code_cell(source: str) -> dict:
+    """
+    Creates a code cell of a Fabric notebook.
+
+    The id of the cell is derived from its source, so a runner notebook with
+    the same extra cells renders to the same definition.
+
+    Args:
+        source (str): The source code of the cell.
+
+    Returns:
+        dict: The cell in `.ipynb` format.
+    """
+    return {
+        "cell_type": "code",
+        "execution_count": None,
+        "id": str(uuid.uuid5(uuid.NAMESPACE_OID, source)),
+        "metadata": _CODE_CELL_METADATA,
+        "outputs": [],
+        "source": source.splitlines(keepends=True),
+    }
+
+
+def load_notebook_template(template_path: str = None) -> NotebookTemplate:
+    """
+    Loads a notebook template, reusing the parsed template while the file is unchanged.
+
+    Args:
+        template_path (str, optional): The path to the template.
+            Defaults to the template shipped with fabric-testing.
+
+    Returns:
+        NotebookTemplate: The parsed template.
+
+    Raises:
+        FileNotFoundError: If the template cannot be found.
+        ValueError: If the template is not a valid notebook.
+    """
+    template_path = template_path or DEFAULT_TEMPLATE_PATH
+
+    try:
+        modified_at = os.stat(template_path).st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"The file {template_path} could not be found.")
+
+    return _load_notebook_template(template_path, modified_at)
+
+
+@functools.lru_cache(maxsize=16)
+def _load_notebook_template(template_path: str, modified_at: int) -> NotebookTemplate:
+    # The modification time is part of the key, so an edited template is reloaded
+    try:
+        with open(template_path, "r", encoding="utf-8") as file:
+            notebook = json.load(file)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"The notebook template {template_path} is invalid: {e}")
+
+    return NotebookTemplate(notebook)
@@ -1,12 +1,15 @@
 import json
+import logging
 import time
+import uuid
 
-import requests
+from fabrictesting.fabric_api.client import get_default_client, get_fabric_api_url
+from fabrictesting.fabric_api.streaming_body import StreamingBody
+from fabrictesting.notebook.cache import get_default_notebook_cache
+from fabrictesting.notebook.create import get_inlinebase64_length, iter_inlinebase64
+from fabrictesting.utilities.tracing import get_default_tracer
 
-from fabrictesting.notebook.create import (
-    convert_notebook_into_inlinebase64,
-    convert_platform_into_inlinebase64,
-)
+logger = logging.getLogger(__name__)
 
 
 def upload_notebook(
@@ -24,7 +27,9 @@ def upload_notebook(
     This function prepares and uploads a notebook by converting the notebook
      and platform definitions into base64-encoded format. It sends a POST request
      to the Fabric API to create a notebook within the specified
-    workspace. If the notebook upload is accepted for provisioning (HTTP 202),
+    workspace. The request body is streamed: the definitions are encoded chunk
+    by chunk while the body is sent, so it is never built in memory.
+    If the notebook upload is accepted for provisioning (HTTP 202),
     it polls the notebook creation status until it completes.
 
     Args:
@@ -39,6 +44,8 @@ def upload_notebook(
         dict: A dictionary containing the status code and response
             content of the API request, or the result of polling the
             upload status if the notebook provisioning is in progress.
+            The "item_id" key holds the id of the created notebook,
+            or None if the API response did not contain it.
 
     Raises:
         Exception: If the notebook upload fails with a status code
@@ -47,81 +54,257 @@ def upload_notebook(
     See Also:
         Fabric API documentation: https://learn.microsoft.com/en-us/rest/api/fabric/notebook/items/create-notebook?tabs=HTTP
     """
+    with get_default_tracer().span("notebook.create", notebook=display_name) as span:
+        logger.info(
+            "Uploading notebook %s to workspace with id %s...",
+            display_name,
+            workspace_id,
+        )
+
+        data = _create_notebook_request_body(
+            {"displayName": display_name, "description": description},
+            notebook_definition,
+            platform_definition,
+        )
+        span.set_attribute("bytes", len(data))
+
+        header = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {token_string}",
+        }
+
+        logger.debug("Posting notebook...")
+        response = get_default_client().post(
+            url=f"{get_fabric_api_url()}/workspaces/{workspace_id}/notebooks",
+            headers=header,
+            data=data,
+        )
+        logger.debug("Posting finished!")
+        span.set_attribute("http.response.status_code", response.status_code)
+
+        if response.status_code == 201:
+            logger.info("Notebook was successfully created!")
+            item_id = _parse_item_id(response.content)
+            _refresh_notebook_cache(workspace_id, display_name, item_id)
+            return {
+                "status_code": response.status_code,
+                "content": response.content,
+                "item_id": item_id,
+            }
+        elif response.status_code == 202:
+            logger.info(
+                "Notebook request accepted, notebook provisioning in progress..."
+            )
+            # Extract Location header to check the notebook status
+
+            location_url = response.headers.get("Location")
+            retry_after = int(
+                response.headers.get("Retry-After", 20)
+            )  # Default to 20 seconds if not provided
+
+            if location_url:
+                logger.debug(
+                    "To check the status, polling the following URL: %s", location_url
+                )
 
-    print("Prepare uploading notebook...")
-    print(f"    Display Name: {display_name}")
-    print(f"    To workspace with id: {workspace_id}")
+                response_poll = poll_notebook_upload_status(
+                    location_url, retry_after, token_string
+                )
+
+                item_id = None
+                if response_poll.status_code == 200:
+                    item_id = get_notebook_upload_result(
+                        location_url, response_poll, token_string
+                    )
+                _refresh_notebook_cache(workspace_id, display_name, item_id)
+
+                return {
+                    "status_code": response_poll.status_code,
+                    "content": response_poll.content,
+                    "item_id": item_id,
+                }
+            else:
+                logger.warning("No Location header found in the response. Continues...")
+        else:
+            raise Exception(
+                f"Notebook upload failed with status code {response.status_code}"
+                f"\n"
+                f"Content: {response.content}"
+            )
 
-    print("Converting notebook payload to base64...")
-    _notebook_payload = convert_notebook_into_inlinebase64(notebook_definition)
+        _refresh_notebook_cache(workspace_id, display_name, None)
+        return {
+            "status_code": response.status_code,
+            "content": response.content,
+            "item_id": None,
+        }
 
-    print("Converting platform payload to base64...")
-    _platform_payload = convert_platform_into_inlinebase64(platform_definition)
 
+def _create_notebook_request_body(
+    data: dict, notebook_definition: str, platform_definition: str
+) -> StreamingBody:
+    # The JSON around the payloads is serialized once, with a marker in place of
+    # each payload, and the payloads are streamed into the gaps as base64
+    marker = f"payload-{uuid.uuid4().hex}"
     data = {
-        "displayName": display_name,
-        "description": description,
+        **data,
         "definition": {
             "format": "ipynb",
             "parts": [
                 {
                     "path": "artifact.content.ipynb",
-                    "payload": _notebook_payload,
+                    "payload": marker,
                     "payloadType": "InlineBase64",
                 },
                 {
                     "path": ".platform",
-                    "payload": _platform_payload,
+                    "payload": marker,
                     "payloadType": "InlineBase64",
                 },
             ],
         },
     }
+    envelope = json.dumps(data).encode("utf-8").split(marker.encode("utf-8"))
+
+    logger.debug("Streaming notebook and platform payloads as base64...")
+    parts = [envelope[0]]
+    for payload, text in zip((notebook_definition, platform_definition), envelope[1:]):
+        parts.append(
+            (
+                get_inlinebase64_length(payload),
+                lambda payload=payload: iter_inlinebase64(payload),
+            )
+        )
+        parts.append(text)
+    return StreamingBody(parts)
 
-    header = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {token_string}",
-    }
 
-    print("Posting notebook...")
-    response = requests.post(
-        url=f"https://api.fabric.microsoft.com/v1/workspaces/{workspace_id}/notebooks",
-        headers=header,
-        data=json.dumps(data),
-    )
-    print("Posting finished!")
+def update_notebook_definition(
+    *,
+    notebook_id: str,
+    notebook_definition: str,
+    platform_definition: str,
+    workspace_id: str,
+    token_string: str,
+):
+    """
+    Overrides the definition of an existing notebook in the Fabric API.
 
-    if response.status_code == 201:
-        print("Notebook was successfully created!")
-    elif response.status_code == 202:
-        print("Notebook Request accepted, notebook provisioning in progress...")
-        # Extract Location header to check the notebook status
+    The display name and description are updated from the platform definition.
+    If the update is accepted as a long-running operation (HTTP 202),
+    it polls the operation until it completes.
 
-        location_url = response.headers.get("Location")
-        retry_after = int(
-            response.headers.get("Retry-After", 20)
-        )  # Default to 20 seconds if not provided
+    Args:
+        notebook_id (str): The ID of the notebook to update.
+        notebook_definition (str): The notebook definition content in JSON format.
+        platform_definition (str): The platform definition content in JSON format.
+        workspace_id (str): The ID of the workspace where the notebook resides.
+        token_string (str): The bearer token used to authenticate the API request.
 
-        if location_url:
-            print(f"To check the status, polling the following URL: {location_url}")
+    Returns:
+        dict: A dictionary containing the status code and response content
+            of the API request, or of the last poll if the update was accepted.
+
+    Raises:
+        Exception: If the update fails with a status code other than 200 or 202.
+
+    See Also:
+        Fabric API documentation: https://learn.microsoft.com/en-us/rest/api/fabric/notebook/items/update-notebook-definition?tabs=HTTP
+    """
+    with get_default_tracer().span("notebook.update", notebook_id=notebook_id) as span:
+        logger.info("Updating definition of notebook %s...", notebook_id)
+
+        data = _create_notebook_request_body(
+            {}, notebook_definition, platform_definition
+        )
+        span.set_attribute("bytes", len(data))
 
-            response_poll = poll_notebook_upload_status(
-                location_url, retry_after, token_string
+        header = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {token_string}",
+        }
+
+        response = get_default_client().post(
+            url=f"{get_fabric_api_url()}/workspaces/{workspace_id}/notebooks/{notebook_id}/updateDefinition?updateMetadata=True",
+            headers=header,
+            data=data,
+        )
+
+        span.set_attribute("http.response.status_code", response.status_code)
+
+        if response.status_code == 202 and response.headers.get("Location"):
+            response = poll_notebook_upload_status(
+                response.headers["Location"],
+                int(response.headers.get("Retry-After", 20)),
+                token_string,
             )
-            return {
-                "status_code": response_poll.status_code,
-                "content": response_poll.content,
-            }
-        else:
-            print("No Location header found in the response. Continues...")
-    else:
-        raise Exception(
-            f"Notebook upload failed with status code {response.status_code}"
-            f"\n"
-            f"Content: {response.content}"
+
+        if response.status_code != 200:
+            raise Exception(
+                f"Notebook update failed with status code {response.status_code}"
+                f"\n"
+                f"Content: {response.content}"
+            )
+
+        logger.info("Notebook definition was updated!")
+        return {"status_code": response.status_code, "content": response.content}
+
+
+def _refresh_notebook_cache(workspace_id: str, display_name: str, item_id: str):
+    # The workspace changed, so cached notebook ids may be stale
+    cache = get_default_notebook_cache()
+    cache.invalidate(workspace_id)
+    if item_id:
+        cache.update(workspace_id, {display_name: item_id})
+
+
+def _parse_item_id(response_content: bytes):
+    try:
+        return json.loads(response_content).get("id")
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def get_notebook_upload_result(
+    location_url: str, response_poll, token_string: str
+) -> str:
+    """
+    Retrieves the id of the notebook created by a finished upload operation.
+
+    The result of the long-running operation is fetched from the `Location`
+    header of the final poll response, or from `<location_url>/result`
+    if the header is missing.
+
+    Args:
+        location_url (str): The URL of the upload operation.
+        response_poll (requests.Response): The final poll response.
+        token_string (str): The bearer token used to authenticate the API request.
+
+    Returns:
+        str: The id of the created notebook, or None if it could not be retrieved.
+
+    See Also:
+        Fabric API documentation: https://learn.microsoft.com/en-us/rest/api/fabric/core/long-running-operations/get-operation-result?tabs=HTTP
+    """
+    result_url = response_poll.headers.get("Location") or (
+        f"{location_url.rstrip('/')}/result"
+    )
+
+    headers = {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {token_string}",
+    }
+
+    response = get_default_client().get(result_url, headers=headers)
+    if response.status_code != 200:
+        logger.warning(
+            "Could not retrieve the created notebook: %s, details: %s",
+            response.status_code,
+            response.content,
         )
+        return None
 
-    return {"status_code": response.status_code, "content": response.content}
+    return _parse_item_id(response.content)
 
 
 def poll_notebook_upload_status(location_url: str, retry_after: int, token_string: str):
@@ -149,55 +332,68 @@ def poll_notebook_upload_status(location_url: str, retry_after: int, token_strin
         Exception: If the API returns unexpected status
                 codes or an error occurs during polling.
     """
-
-    def _retrieve_percent_complete(response_content: bytes):
-        try:
-            response_json = json.loads(response_content)
-            _percent_complete = response_json.get("percentComplete", None)
-
-            if _percent_complete is None:
-                return "0"
-            return str(_percent_complete)
-        except json.JSONDecodeError:
-            # Handle non-JSON responses like errors
-            print("Could not retrieve percenComplete value. Continues...")
-            return None
-
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {token_string}",
-    }
-
-    while True:
-        response = requests.get(location_url, headers=headers)
-        if response.status_code in [200, 202]:
-            percent_complete = _retrieve_percent_complete(response.content)
-
-            if percent_complete != "100":
-                print(f"Notebook creation is at {percent_complete}/100 %...")
-                print(f"Retrying after {retry_after} seconds...")
-                time.sleep(retry_after)
-            elif response.status_code == 200:
-                print(f"Notebook creation is at {percent_complete}/100 %!")
-                print("Notebook creation completed.")
-                return response
-            elif response.status_code == 202:
-                print(f"Notebook creation is at {percent_complete} percent...")
-                print("Notebook creation still in progress...")
-
-                # Wait for the recommended time before retrying
-                print(f"Retrying after {retry_after} seconds...")
-                time.sleep(retry_after)
+    with get_default_tracer().span("notebook.create.poll") as span:
+
+        def _retrieve_percent_complete(response_content: bytes):
+            try:
+                response_json = json.loads(response_content)
+                _percent_complete = response_json.get("percentComplete", None)
+
+                if _percent_complete is None:
+                    return "0"
+                return str(_percent_complete)
+            except json.JSONDecodeError:
+                # Handle non-JSON responses like errors
+                logger.warning("Could not retrieve percentComplete value. Continues...")
+                return None
+
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {token_string}",
+        }
+
+        polls = 0
+        while True:
+            response = get_default_client().get(location_url, headers=headers)
+            polls += 1
+            span.set_attribute("polls", polls)
+            if response.status_code in [200, 202]:
+                percent_complete = _retrieve_percent_complete(response.content)
+
+                if percent_complete != "100":
+                    logger.debug(
+                        "Notebook creation is at %s/100 %%, "
+                        "retrying after %s seconds...",
+                        percent_complete,
+                        retry_after,
+                    )
+                    time.sleep(retry_after)
+                elif response.status_code == 200:
+                    logger.info("Notebook creation completed after %d polls.", polls)
+                    return response
+                elif response.status_code == 202:
+                    logger.debug(
+                        "Notebook creation is at %s percent, still in progress...",
+                        percent_complete,
+                    )
+
+                    # Wait for the recommended time before retrying
+                    logger.debug("Retrying after %s seconds...", retry_after)
+                    time.sleep(retry_after)
+                else:
+                    logger.warning(
+                        "Unexpected status code: %s, details: %s",
+                        response.status_code,
+                        response.content,
+                    )
+                    break
             else:
-                print(
-                    f"Unexpected status code: {response.status_code},"
-                    f" details: {response.content}"
+                # For unexpected status codes, return the response and break the loop
+                logger.warning(
+                    "Unexpected status code: %s, details: %s",
+                    response.status_code,
+                    response.content,
+                )
+                return (
+                    response  # Ensures the loop is exited for unexpected status codes
                 )
-                break
-        else:
-            # For unexpected status codes, return the response and break the loop
-            print(
-                f"Unexpected status code: {response.status_code}, "
-                f"details: {response.content}"
-            )
-            return response  # Ensures the loop is exited for unexpected status codes
@@ -1,18 +1,46 @@
+import os
+
+from azure.core.credentials import TokenCredential
 from azure.identity import DefaultAzureCredential
 from azure.storage.filedatalake import (
     DataLakeServiceClient,
 )
 
+# Account URL of OneLake's DataLake (DFS) endpoint
+DEFAULT_ONELAKE_ACCOUNT_URL = "https://onelake.dfs.fabric.microsoft.com"
+
+# Environment variable that overrides the account URL of OneLake
+ONELAKE_ACCOUNT_URL_VARIABLE = "FABRIC_TESTING_ONELAKE_URL"
+
 
-def get_service_client() -> DataLakeServiceClient:
+def get_onelake_account_url() -> str:
+    """
+    Returns the account URL of OneLake's DataLake endpoint.
+
+    The URL can be overridden with the `FABRIC_TESTING_ONELAKE_URL` environment
+    variable, e.g. to run the CLI commands against a local stand-in of OneLake.
+
+    Returns:
+        str: The account URL, e.g. "https://onelake.dfs.fabric.microsoft.com".
+    """
+    return os.environ.get(ONELAKE_ACCOUNT_URL_VARIABLE, DEFAULT_ONELAKE_ACCOUNT_URL)
+
+
+def get_service_client(credential: TokenCredential = None) -> DataLakeServiceClient:
     """
     Creates and returns an authenticated DataLakeServiceClient
     for accessing OneLake.
 
-    This function uses the `DefaultAzureCredential` to authenticate with Azure and
-    returns a `DataLakeServiceClient` object, which can be used to interact with
+    This function authenticates with Azure using the given credential, e.g. the
+    `TokenProvider` shared with the Fabric API calls, or the
+    `DefaultAzureCredential` if no credential is given. It returns a
+    `DataLakeServiceClient` object, which can be used to interact with
     OneLake's Data Lake storage.
 
+    Args:
+        credential (TokenCredential, optional): The credential used to
+            authenticate. Defaults to a new `DefaultAzureCredential`.
+
     Returns:
         DataLakeServiceClient: An authenticated client for interacting
         with Azure Data Lake Storage.
@@ -21,8 +49,8 @@ def get_service_client() -> DataLakeServiceClient:
         OneLake Access Documentation:
         https://learn.microsoft.com/en-us/fabric/onelake/onelake-access-python
     """
-    account_url = "https://onelake.dfs.fabric.microsoft.com"
-    token_credential = DefaultAzureCredential()
+    account_url = get_onelake_account_url()
+    token_credential = credential or DefaultAzureCredential()
 
     service_client = DataLakeServiceClient(account_url, credential=token_credential)
 
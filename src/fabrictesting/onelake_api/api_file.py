@@ -1,10 +1,50 @@
+import contextvars
+import json
+import logging
+import mmap
 import os
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from typing import Dict, List, Tuple
 
+from azure.core.credentials import TokenCredential
+from azure.storage.blob import BlobClient
 from azure.storage.filedatalake import FileSystemClient
 
 from fabrictesting.onelake_api.api_access import get_service_client
+from fabrictesting.utilities.log import ProgressLogger
+from fabrictesting.utilities.manifest import MANIFEST_FILE_NAME
+from fabrictesting.utilities.tracing import get_default_tracer
+
+logger = logging.getLogger(__name__)
+
+# Number of files uploaded concurrently by default
+DEFAULT_UPLOAD_WORKERS = 8
+
+# Files larger than this are uploaded in chunks of this size (4 MiB)
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def create_submit_folder_name() -> str:
+    """
+    Generates a unique name for the folder of a submitted bundle.
+
+    The name combines the current timestamp in 'ddmmyyyy-hhmm' format with
+    a shortened UUID, e.g. 'fabric-testing-01012025-1200_1a2b3c4d'.
+    Generating the name before the upload lets the notebook, which refers to
+    the folder, be created while the bundle is still uploading.
+
+    :return
+        test_folder: Name of the test folder
+    """
+    # Shorten UUID to first 8 characters
+    _uuid = uuid.uuid4().hex[:8]
+    # Timestamp format: ddmmyyyy-hhmm
+    _timestamp = datetime.now().strftime("%d%m%Y-%H%M")
+    # Combine timestamp and UUID to form test folder name
+    return f"fabric-testing-{_timestamp}_{_uuid}"
 
 
 def upload_folder_to_onelake(
@@ -13,10 +53,77 @@ def upload_folder_to_onelake(
     workspace_name: str,
     lakehouse_name: str,
     custom_folder: str = None,
+    **kwargs,
+) -> str:
+    """
+    Uploads the contents of a local folder to OneLake DataLake.
+
+    The files of the folder keep their path relative to `temp_folder`.
+    See `upload_bundle_to_onelake` for the target directory and the
+    supported keyword arguments.
+
+    Args:
+        temp_folder (str): The path to the local folder containing the files to upload.
+        workspace_name (str): The name of the file system (equivalent to a container).
+        lakehouse_name (str): The name of the lakehouse.
+        custom_folder (str, optional): A custom folder name for the destination.
+            If not provided, a folder name is generated using a UUID and timestamp.
+        **kwargs: Passed on to `upload_bundle_to_onelake`.
+
+    Raises:
+        RuntimeError: If any file upload fails.
+
+    :return
+        test_folder: Name of the test folder
+    """
+    files = {}
+    for root, _, file_names in os.walk(temp_folder):
+        for file_name in file_names:
+            file_path = os.path.join(root, file_name)
+            # OneLake paths always use forward slashes
+            relative_path = os.path.relpath(file_path, temp_folder).replace(os.sep, "/")
+            files[relative_path] = file_path
+
+    return upload_bundle_to_onelake(
+        files=files,
+        workspace_name=workspace_name,
+        lakehouse_name=lakehouse_name,
+        custom_folder=custom_folder,
+        **kwargs,
+    )
+
+
+def upload_bundle_to_onelake(
+    *,
+    files: Dict[str, str],
+    workspace_name: str,
+    lakehouse_name: str,
+    custom_folder: str = None,
+    max_workers: int = DEFAULT_UPLOAD_WORKERS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    memory_map: bool = False,
+    manifest: Dict[str, str] = None,
+    previous_submit_folder: str = None,
+    previous_manifest: Dict[str, str] = None,
+    credential: TokenCredential = None,
 ) -> str:
     """
-    Uploads the contents of the temporary folder to
-    OneLake DataLake.
+    Uploads a bundle of files to OneLake DataLake.
+
+    The bundle is a mapping from the path of each file inside the bundle to
+    its local source path. The files are streamed straight from their source
+    locations, so no local copy of the bundle is needed.
+
+    The files are uploaded concurrently by a bounded pool of workers,
+    see `upload_files_to_onelake`.
+
+    If a `manifest` of the bundle is given, it is uploaded alongside the files.
+    If additionally a previously uploaded bundle is given (`previous_submit_folder`
+    and `previous_manifest`), only the files whose digest changed are uploaded:
+        - If no file changed and the previous bundle still exists in OneLake,
+          nothing is uploaded and the previous folder is returned.
+        - Otherwise unchanged files are copied server-side from the previous
+          bundle. Files that cannot be copied are uploaded instead.
 
     The target directory is defined as:
         - 'fabric-testing'
@@ -26,66 +133,148 @@ def upload_folder_to_onelake(
 
 
     Args:
-        temp_folder (str): The path to the local folder containing the files to upload.
+        files (Dict[str, str]): A mapping from the path of each file in the bundle
+            (with forward slashes) to its local source path.
         workspace_name (str): The name of the file system (equivalent to a container).
         lakehouse_name (str): The name of the lakehouse.
         custom_folder (str, optional): A custom folder name for the destination.
             If not provided, a folder name is generated using a UUID and timestamp.
+        max_workers (int, optional): The number of files uploaded concurrently.
+            Defaults to 8.
+        chunk_size (int, optional): Files larger than this (in bytes) are
+            uploaded in chunks of this size. Defaults to 4 MiB.
+        memory_map (bool, optional): Read files larger than `chunk_size` through
+            a memory map instead of buffered reads. Defaults to False.
+        manifest (Dict[str, str], optional): The manifest of the bundle,
+            mapping bundle paths to their digest.
+        previous_submit_folder (str, optional): The folder name of a previously
+            uploaded bundle.
+        previous_manifest (Dict[str, str], optional): The manifest of the
+            previously uploaded bundle.
+        credential (TokenCredential, optional): The credential used to
+            authenticate with OneLake, e.g. a `TokenProvider`.
+            Defaults to the `DefaultAzureCredential`.
 
     Raises:
-        RuntimeError: If any file upload fails.
+        RuntimeError: If any file upload fails. The message lists every
+            file that failed together with its error.
 
     :return
-        test_folder: Name of the test folder
+        test_folder: Name of the test folder. This is the previous folder
+            if the bundle did not change.
     """
     try:
-        # Generate UUID and timestamp
-        if custom_folder:
-            _test_folder = custom_folder
-        else:
-            # Shorten UUID to first 8 characters
-            _uuid = uuid.uuid4().hex[:8]
-            # Timestamp format: ddmmyyyy-hhmm
-            _timestamp = datetime.now().strftime("%d%m%Y-%H%M")
-            # Combine timestamp and UUID to form test folder name
-            _test_folder = f"fabric-testing-{_timestamp}_{_uuid}"
+        # Generate the folder name from a UUID and timestamp, unless given
+        _test_folder = custom_folder or create_submit_folder_name()
 
         # Define the target directory path based on lakehouse_name
-        target_directory = (
-            f"{lakehouse_name}.Lakehouse/Files/fabric-testing/{_test_folder}"
+        files_directory = f"{lakehouse_name}.Lakehouse/Files/fabric-testing"
+        target_directory = f"{files_directory}/{_test_folder}"
+
+        _incremental = (
+            manifest is not None
+            and previous_submit_folder is not None
+            and previous_manifest is not None
         )
 
-        print(
-            f"Authenticating and getting the service "
-            f"client for workspace: {workspace_name}"
+        logger.debug(
+            "Authenticating and getting the service client for workspace: %s",
+            workspace_name,
         )
         # Step 1: Authenticate and get service
-        # client using the provided token
-        service_client = get_service_client()
+        # client using the provided credential
+        service_client = get_service_client(credential)
 
-        print(f"Creating FileSystemClient for workspace: {workspace_name}")
+        logger.debug("Creating FileSystemClient for workspace: %s", workspace_name)
         # Step 2: Create FileSystemClient for the desired file system (workspace)
         file_system_client = service_client.get_file_system_client(
             file_system=workspace_name
         )
 
-        print(
-            f"Starting to upload files from folder: {temp_folder} to {target_directory}"
+        logger.info("Starting to upload %d files to %s", len(files), target_directory)
+        previous_directory = f"{files_directory}/{previous_submit_folder}"
+
+        if (
+            _incremental
+            and manifest == previous_manifest
+            and file_system_client.get_file_client(
+                f"{previous_directory}/{MANIFEST_FILE_NAME}"
+            ).exists()
+        ):
+            logger.info(
+                "No files changed since the bundle in %s. "
+                "Reusing it instead of uploading.",
+                previous_directory,
+            )
+            return previous_submit_folder
+
+        # Step 3: Define the target path of each file
+        files_to_upload = []
+        files_to_copy = []
+        for bundle_path, file_path in files.items():
+            upload_path = f"{target_directory}/{bundle_path}"
+
+            # A file missing from the previous manifest has nothing to copy from
+            if (
+                _incremental
+                and bundle_path in previous_manifest
+                and previous_manifest[bundle_path] == manifest.get(bundle_path)
+            ):
+                files_to_copy.append(
+                    (file_path, f"{previous_directory}/{bundle_path}", upload_path)
+                )
+            else:
+                files_to_upload.append((file_path, upload_path))
+        # Step 4: Copy the unchanged files server-side from the previous bundle
+        if files_to_copy:
+            logger.info(
+                "Copying %d unchanged files from %s",
+                len(files_to_copy),
+                previous_directory,
+            )
+            copy_failures = copy_files_in_onelake(
+                file_system_client,
+                [(source, destination) for _, source, destination in files_to_copy],
+                max_workers=max_workers,
+            )
+            # Fall back to uploading the files that could not be copied
+            for file_path, source, destination in files_to_copy:
+                if source in copy_failures:
+                    files_to_upload.append((file_path, destination))
+
+        # Step 5: Upload the (changed) files concurrently to OneLake
+        logger.debug("Uploading %d files", len(files_to_upload))
+        failures = upload_files_to_onelake(
+            file_system_client,
+            files_to_upload,
+            max_workers=max_workers,
+            chunk_size=chunk_size,
+            memory_map=memory_map,
         )
-        print("=" * 50)
-        # Step 3: Upload files from the temp folder to OneLake
-        for root, _, files in os.walk(temp_folder):
-            for file in files:
-                file_path = os.path.join(root, file)
-                relative_path = os.path.relpath(file_path, temp_folder)
-                upload_path = f"{target_directory}/{relative_path}"
-
-                # Upload each file
-                upload_file_to_onelake(file_system_client, upload_path, file_path)
-        print("=" * 50)
-        print(
-            f"Successfully uploaded folder to "
-            f"{lakehouse_name}.Lakehouse/Files/fabric-testing/{_test_folder}"
+
+        if failures:
+            failed_files = "\n".join(
+                f"    {local_file_path}: {error}"
+                for local_file_path, error in failures.items()
+            )
+            raise RuntimeError(
+                f"{len(failures)} of {len(files_to_upload)} files "
+                f"failed to upload:\n{failed_files}"
+            )
+
+        # Step 6: Store the manifest alongside the bundle
+        if manifest is not None:
+            file_client = file_system_client.get_file_client(
+                f"{target_directory}/{MANIFEST_FILE_NAME}"
+            )
+            file_client.upload_data(
+                json.dumps(manifest, indent=2, sort_keys=True), overwrite=True
+            )
+
+        logger.info(
+            "Successfully uploaded folder to %s.Lakehouse/Files/fabric-testing/%s",
+            lakehouse_name,
+            _test_folder,
         )
 
         return _test_folder
@@ -93,9 +282,192 @@ def upload_folder_to_onelake(
         raise RuntimeError(f"Failed to upload folder: {str(e)}")
 
 
-def upload_file_to_onelake(
-    file_system_client: FileSystemClient, destination_path: str, local_file_path: str
+def upload_files_to_onelake(
+    file_system_client: FileSystemClient,
+    files: List[Tuple[str, str]],
+    *,
+    max_workers: int = DEFAULT_UPLOAD_WORKERS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    memory_map: bool = False,
+) -> Dict[str, str]:
+    """
+    Uploads many files to OneLake's DataLake using a bounded pool of workers.
+
+    Every file is uploaded by `upload_file_to_onelake` on one of at most
+    `max_workers` threads. A failing file does not stop the other uploads;
+    instead the failure is collected and returned, so the caller can report
+    every file that failed. The progress is logged as a periodic summary
+    (files/s and MB/s), the single files only at the debug level.
+
+    Args:
+        file_system_client (FileSystemClient):
+            The client for interacting with the OneLake file system.
+        files (List[Tuple[str, str]]):
+            Pairs of (local file path, destination path in OneLake).
+        max_workers (int, optional):
+            The maximum number of concurrent uploads. Defaults to 8.
+        chunk_size (int, optional):
+            Files larger than this (in bytes) are uploaded in chunks of this size.
+            Defaults to 4 MiB.
+        memory_map (bool, optional):
+            Read files larger than `chunk_size` through a memory map.
+            Defaults to False.
+
+    Returns:
+        Dict[str, str]: A dictionary mapping the local path of each failed file
+            to its error message. The dictionary is empty if all uploads succeeded.
+
+    Raises:
+        ValueError: If `max_workers` is smaller than 1.
+    """
+    if max_workers < 1:
+        raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+
+    failures = {}
+    progress = ProgressLogger(logger, action="Uploaded", total=len(files))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Each upload runs in a copy of the context, so its span is a child
+        # of the current span
+        futures = {
+            executor.submit(
+                contextvars.copy_context().run,
+                upload_file_to_onelake,
+                file_system_client,
+                destination_path,
+                local_file_path,
+                chunk_size=chunk_size,
+                memory_map=memory_map,
+            ): local_file_path
+            for local_file_path, destination_path in files
+        }
+
+        for future in as_completed(futures):
+            local_file_path = futures[future]
+            try:
+                progress.update(size=future.result())
+            except Exception as e:  # noqa: BLE001
+                logger.warning("Failed to upload %s: %s", local_file_path, e)
+                failures[local_file_path] = str(e)
+
+    progress.finish()
+    return failures
+
+
+def copy_files_in_onelake(
+    file_system_client: FileSystemClient,
+    files: List[Tuple[str, str]],
+    *,
+    max_workers: int = DEFAULT_UPLOAD_WORKERS,
+) -> Dict[str, str]:
+    """
+    Copies many files server-side within OneLake using a bounded pool of workers.
+
+    Args:
+        file_system_client (FileSystemClient):
+            The client for interacting with the OneLake file system.
+        files (List[Tuple[str, str]]):
+            Pairs of (source path, destination path) in OneLake.
+        max_workers (int, optional):
+            The maximum number of concurrent copies. Defaults to 8.
+
+    Returns:
+        Dict[str, str]: A dictionary mapping the source path of each failed copy
+            to its error message. The dictionary is empty if all copies succeeded.
+    """
+    failures = {}
+    progress = ProgressLogger(logger, action="Copied", total=len(files))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                contextvars.copy_context().run,
+                copy_file_in_onelake,
+                file_system_client,
+                source_path,
+                destination_path,
+            ): source_path
+            for source_path, destination_path in files
+        }
+
+        for future in as_completed(futures):
+            source_path = futures[future]
+            try:
+                future.result()
+                progress.update()
+            except Exception as e:  # noqa: BLE001
+                logger.warning("Failed to copy %s: %s", source_path, e)
+                failures[source_path] = str(e)
+
+    progress.finish()
+    return failures
+
+
+def copy_file_in_onelake(
+    file_system_client: FileSystemClient,
+    source_path: str,
+    destination_path: str,
+    *,
+    poll_interval: float = 1.0,
 ):
+    """
+    Copies a single file server-side within OneLake.
+
+    The DataLake API has no copy operation, so the copy is made through
+    the Blob endpoint of OneLake, using the credential of the file system client.
+    Copies within OneLake usually complete immediately; if the copy is pending,
+    its status is polled until it completes.
+
+    Args:
+        file_system_client (FileSystemClient):
+            The client for interacting with the OneLake file system.
+        source_path (str):
+            The path in OneLake of the file to copy.
+        destination_path (str):
+            The path in OneLake the file is copied to.
+        poll_interval (float, optional):
+            Seconds to wait between polls of a pending copy. Defaults to 1.
+
+    Raises:
+        RuntimeError: If the copy fails.
+    """
+
+    def _to_blob_url(dfs_url: str) -> str:
+        return dfs_url.replace(".dfs.", ".blob.", 1)
+
+    try:
+        with get_default_tracer().span("onelake.copy_file", path=destination_path):
+            source_url = _to_blob_url(
+                file_system_client.get_file_client(source_path).url
+            )
+            destination_url = _to_blob_url(
+                file_system_client.get_file_client(destination_path).url
+            )
+
+            blob_client = BlobClient.from_blob_url(
+                destination_url, credential=file_system_client.credential
+            )
+            copy_status = blob_client.start_copy_from_url(source_url)["copy_status"]
+
+            while copy_status == "pending":
+                time.sleep(poll_interval)
+                copy_status = blob_client.get_blob_properties().copy.status
+
+            if copy_status != "success":
+                raise RuntimeError(f"Copy ended with status {copy_status}")
+
+    except Exception as e:  # noqa: BLE001
+        raise RuntimeError(f"Failed to copy file {source_path}: {str(e)}")
+
+
+def upload_file_to_onelake(
+    file_system_client: FileSystemClient,
+    destination_path: str,
+    local_file_path: str,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    memory_map: bool = False,
+) -> int:
     """
     Uploads a single file to OneLake's DataLake.
 
@@ -103,6 +475,9 @@ def upload_file_to_onelake(
     to a designated path in OneLake. It creates a DataLake file client
     and handles the file upload to the OneLake storage.
 
+    Files larger than `chunk_size` are split into chunks of that size,
+    which the DataLake client uploads in parallel before committing the file.
+
     Args:
         file_system_client (FileSystemClient):
             The client for interacting with the OneLake file system.
@@ -110,22 +485,72 @@ def upload_file_to_onelake(
             The target path in OneLake where the file will be uploaded.
         local_file_path (str):
             The path to the local file to be uploaded.
+        chunk_size (int, optional):
+            The chunk size (in bytes) used for large files. Defaults to 4 MiB.
+        memory_map (bool, optional):
+            Read a large file through a memory map instead of buffered reads,
+            which avoids copying it through Python's file buffers.
+            Defaults to False.
+
+    Returns:
+        int: The size (in bytes) of the uploaded file.
 
     Raises:
         RuntimeError: If the file upload fails due to any exception.
     """
 
     try:
-        print(f"Creating DataLake file client for path: {destination_path}")
-        # Create a DataLake file client to interact with the destination path
-        file_client = file_system_client.get_file_client(destination_path)
+        with get_default_tracer().span(
+            "onelake.upload_file", path=destination_path
+        ) as span:
+            # Create a DataLake file client to interact with the destination path
+            file_client = file_system_client.get_file_client(destination_path)
+
+            # Upload the file
+            file_size = os.path.getsize(local_file_path)
+            span.set_attribute("bytes", file_size)
+
+            upload_kwargs = {}
+            if span.recording:
+                # Record the status code of the last request of the upload
+                upload_kwargs["raw_response_hook"] = lambda response: (
+                    span.set_attribute(
+                        "http.response.status_code", response.http_response.status_code
+                    )
+                )
 
-        print(f"Preparing {local_file_path} for {destination_path}")
-        # Upload the file
-        with open(local_file_path, "rb") as file_data:
-            file_client.upload_data(file_data, overwrite=True)
+            with open(local_file_path, "rb") as file_data:
+                if file_size > chunk_size and memory_map:
+                    with mmap.mmap(
+                        file_data.fileno(), 0, access=mmap.ACCESS_READ
+                    ) as mapped_data:
+                        file_client.upload_data(
+                            mapped_data,
+                            length=file_size,
+                            overwrite=True,
+                            chunk_size=chunk_size,
+                            max_concurrency=4,
+                            **upload_kwargs,
+                        )
+                elif file_size > chunk_size:
+                    file_client.upload_data(
+                        file_data,
+                        length=file_size,
+                        overwrite=True,
+                        chunk_size=chunk_size,
+                        max_concurrency=4,
+                        **upload_kwargs,
+                    )
+                else:
+                    file_client.upload_data(file_data, overwrite=True, **upload_kwargs)
 
-        print(f"Uploaded {local_file_path} to {destination_path}")
+            logger.debug(
+                "Uploaded %s to %s (%d bytes)",
+                local_file_path,
+                destination_path,
+                file_size,
+            )
+            return file_size
 
     except Exception as e:  # noqa: BLE001
         raise RuntimeError(f"Failed to upload file {local_file_path}: {str(e)}")
@@ -0,0 +1,145 @@
+import asyncio
+import json
+import logging
+from typing import Dict, List
+
+from azure.core.credentials import TokenCredential
+from azure.core.exceptions import ResourceNotFoundError
+
+from fabrictesting.onelake_api.api_access import get_service_client
+from fabrictesting.utilities.results import (
+    FAILURE_EVENTS,
+    format_progress_event,
+    get_progress_path,
+    parse_results_url,
+)
+
+logger = logging.getLogger(__name__)
+
+# Seconds between two reads of the test progress logs
+DEFAULT_PROGRESS_INTERVAL = 10
+
+
+class ProgressLog:
+    """
+    Tails the NDJSON test progress log that a notebook job writes to OneLake.
+
+    The log only grows while the job runs. Every call of `read_events` downloads
+    the bytes after the last complete line that was read, with a ranged read,
+    so the log is never downloaded twice. If the log is shorter than what was
+    already read, it was written anew, and it is read again from the start.
+
+    Args:
+        results_url (str): The OneLake URL of the results folder of the job,
+            see `create_results_url`. The progress log is next to it.
+        credential (TokenCredential, optional): The credential used to
+            authenticate, e.g. the token provider of fetch.
+    """
+
+    def __init__(self, *, results_url: str, credential: TokenCredential = None):
+        workspace_name, results_directory = parse_results_url(results_url)
+        self.results_url = results_url
+        self._file_client = (
+            get_service_client(credential)
+            .get_file_system_client(file_system=workspace_name)
+            .get_file_client(get_progress_path(results_directory))
+        )
+        self.offset = 0
+
+    def read_events(self) -> List[dict]:
+        """
+        Reads the events appended to the log since the previous call.
+
+        Returns:
+            List[dict]: The new events, or an empty list if the log does not
+                exist yet or did not grow.
+        """
+        try:
+            size = self._file_client.get_file_properties().size
+            if size < self.offset:
+                logger.warning(
+                    "The test progress log of %s was replaced, reading it again",
+                    self.results_url,
+                )
+                self.offset = 0
+            if size <= self.offset:
+                return []
+
+            content = self._file_client.download_file(
+                offset=self.offset, length=size - self.offset
+            ).readall()
+        except ResourceNotFoundError:
+            return []
+
+        # Only consume complete lines, a partly written line is read next time
+        complete_length = content.rfind(b"\n") + 1
+        self.offset += complete_length
+
+        events = []
+        for line in content[:complete_length].decode("utf-8").splitlines():
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning("Skipping an invalid progress event: %s", line)
+        return events
+
+
+async def follow_test_progress(
+    *,
+    progress_logs: Dict[str, ProgressLog],
+    fail_fast: bool = False,
+    interval: float = DEFAULT_PROGRESS_INTERVAL,
+) -> dict:
+    """
+    Prints the test progress of several jobs until a test fails or it is cancelled.
+
+    Args:
+        progress_logs (Dict[str, ProgressLog]): The progress log of each job,
+            by label, e.g. the fetch URL.
+        fail_fast (bool, optional): Whether to return at the first failed test.
+            Defaults to False, i.e. follow the logs until cancelled.
+        interval (float, optional): The time (in seconds) between two reads.
+            Defaults to 10.
+
+    Returns:
+        dict: The first failure event, with the label of its job, if `fail_fast`
+            is set. Otherwise the function only returns when it is cancelled.
+    """
+    while True:
+        failure = await asyncio.to_thread(
+            read_test_progress, progress_logs=progress_logs
+        )
+        if fail_fast and failure is not None:
+            return failure
+
+        await asyncio.sleep(interval)
+
+
+def read_test_progress(*, progress_logs: Dict[str, ProgressLog]) -> dict:
+    """
+    Reads and prints the new progress events of several jobs.
+
+    Args:
+        progress_logs (Dict[str, ProgressLog]): The progress log of each job,
+            by label.
+
+    Returns:
+        dict: The first new failure event, with the label of its job in `job`,
+            or None if no test failed.
+    """
+    failure = None
+    for label, progress_log in progress_logs.items():
+        try:
+            events = progress_log.read_events()
+        except Exception as e:  # noqa: BLE001
+            logger.warning("Could not read the test progress of %s: %s", label, e)
+            continue
+
+        for event in events:
+            message = format_progress_event(event)
+            if message is not None:
+                prefix = f"[{label}] " if len(progress_logs) > 1 else ""
+                logger.info("%s%s", prefix, message)
+            if failure is None and event.get("event") in FAILURE_EVENTS:
+                failure = {**event, "job": label}
+    return failure
@@ -0,0 +1,72 @@
+import json
+import logging
+import os
+
+from azure.core.credentials import TokenCredential
+from azure.core.exceptions import ResourceNotFoundError
+
+from fabrictesting.onelake_api.api_access import get_service_client
+from fabrictesting.utilities.results import SUMMARY_FILE_NAME, parse_results_url
+
+logger = logging.getLogger(__name__)
+
+
+def download_test_results(
+    *, results_url: str, local_dir: str, credential: TokenCredential = None
+) -> dict:
+    """
+    Downloads the test results of a notebook job from OneLake.
+
+    Every file of the results folder, i.e. the JUnit XML reports and the JSON
+    summary, is downloaded to `local_dir`.
+
+    Args:
+        results_url (str): The OneLake URL of the results folder,
+            see `create_results_url`.
+        local_dir (str): The local folder the files are written to.
+        credential (TokenCredential, optional): The credential used to
+            authenticate, e.g. the token provider of fetch.
+
+    Returns:
+        dict: The test summary, or None if the job did not write any results,
+            e.g. because it failed before the tests ran.
+
+    Raises:
+        RuntimeError: If the results cannot be downloaded.
+    """
+    workspace_name, results_directory = parse_results_url(results_url)
+
+    try:
+        service_client = get_service_client(credential)
+        file_system_client = service_client.get_file_system_client(
+            file_system=workspace_name
+        )
+
+        for path in file_system_client.get_paths(path=results_directory):
+            if path.is_directory:
+                continue
+
+            relative_path = os.path.relpath(path.name, results_directory)
+            local_path = os.path.join(local_dir, relative_path)
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+
+            with open(local_path, "wb") as file:
+                file_system_client.get_file_client(path.name).download_file().readinto(
+                    file
+                )
+
+    except ResourceNotFoundError:
+        logger.warning("No test results found at %s", results_url)
+        return None
+
+    except Exception as e:  # noqa: BLE001
+        raise RuntimeError(f"Failed to download the test results: {str(e)}")
+
+    summary_path = os.path.join(local_dir, SUMMARY_FILE_NAME)
+    if not os.path.exists(summary_path):
+        logger.warning("No test summary found at %s", results_url)
+        return None
+
+    logger.info("Test results downloaded to %s", local_dir)
+    with open(summary_path, "r") as file:
+        return json.load(file)
@@ -1,13 +1,54 @@
 import argparse
+import asyncio
+import logging
+import os
+import signal
+import sys
 
 from fabrictesting.fabric_api.api_access import (
-    get_client_fabric_token,
-    get_personal_fabric_token,
+    get_client_token_provider,
+    get_personal_token_provider,
 )
-from fabrictesting.notebook.get_notebook_status import poll_notebook_run_status
-from fabrictesting.utilities.load_fetch_url_log import load_fetch_url
+from fabrictesting.notebook.cancel import DEFAULT_CANCEL_TIMEOUT, cancel_notebook_runs
+from fabrictesting.notebook.get_notebook_status import (
+    get_job_status,
+    poll_notebook_runs,
+)
+from fabrictesting.notebook.polling import PollingStrategy
+from fabrictesting.onelake_api.api_progress import (
+    DEFAULT_PROGRESS_INTERVAL,
+    ProgressLog,
+    follow_test_progress,
+    read_test_progress,
+)
+from fabrictesting.onelake_api.api_results import download_test_results
+from fabrictesting.utilities.load_fetch_url_log import load_fetch_url_logs
+from fabrictesting.utilities.log import (
+    add_logging_arguments,
+    configure_logging_from_args,
+)
+from fabrictesting.utilities.results import (
+    TEST_DURATIONS_FILE_NAME,
+    log_test_summary,
+    merge_test_durations,
+    parse_results_url,
+    save_test_durations,
+)
+from fabrictesting.utilities.timing import StageTimer
+from fabrictesting.utilities.tracing import add_trace_arguments, trace_to_file
 from fabrictesting.utilities.validate_args import validate_args
 
+logger = logging.getLogger(__name__)
+
+# Longest interval between polls, if neither the CLI nor the log defines it
+DEFAULT_RETRY_AFTER = 60
+
+# Polling stops after 6 hours by default, so a hung job cannot block forever
+DEFAULT_FETCH_TIMEOUT = 6 * 60 * 60
+
+# Local folder that receives the downloaded test results
+DEFAULT_RESULTS_DIR = "fabric-testing-results"
+
 
 def fetch_args():
     parser = argparse.ArgumentParser(description="Fetch test from Microsoft Fabric")
@@ -30,28 +71,36 @@ def fetch_args():
     )
 
     parser.add_argument(
-        "--retry-after",
-        type=int,
-        default=60,
+        "--token-cache-file-path",
+        type=str,
         required=False,
-        help="Define the frequency of the re-fetching",
+        default=None,
+        help="Cache access tokens in this file to reuse them across runs",
     )
 
+    add_fetch_arguments(parser)
+
     # Create a mutually exclusive group for --fetch-url-log-file-path and --url
     fetch_url_group = parser.add_mutually_exclusive_group(required=True)
 
     fetch_url_group.add_argument(
         "--fetch-url-log-file-path",
         type=str,
-        help="The path to the logged fetch url",
+        nargs="+",
+        help="The paths to logged fetch urls, or directories of logs",
     )
 
     fetch_url_group.add_argument(
         "--url",
         type=str,
-        help="Fetch url",
+        nargs="+",
+        help="Fetch urls",
     )
 
+    add_trace_arguments(parser)
+
+    add_logging_arguments(parser)
+
     args = parser.parse_args()
 
     validate_args(args, parser)
@@ -59,6 +108,91 @@ def fetch_args():
     return args
 
 
+def add_fetch_arguments(parser: argparse.ArgumentParser):
+    """
+    Adds the arguments that control how jobs are polled and their results
+    fetched to a parser, i.e. all arguments of `fabric-testing-fetch` except
+    the authentication and the fetch URLs.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser of the CLI command.
+    """
+    parser.add_argument(
+        "--retry-after",
+        type=int,
+        default=None,
+        required=False,
+        help="The longest interval (in seconds) between polls. Defaults to the "
+        "interval logged by submit, or 60.",
+    )
+
+    parser.add_argument(
+        "--timeout",
+        type=int,
+        default=DEFAULT_FETCH_TIMEOUT,
+        required=False,
+        help="Stop polling after this number of seconds. Use 0 for no deadline.",
+    )
+
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=None,
+        required=False,
+        help="Stop polling after this number of polls.",
+    )
+
+    parser.add_argument(
+        "--results-dir",
+        type=str,
+        default=DEFAULT_RESULTS_DIR,
+        required=False,
+        help="The local folder the JUnit XML and JSON test results are "
+        "downloaded to.",
+    )
+
+    parser.add_argument(
+        "--skip-results",
+        action="store_true",
+        help="Do not download the test results.",
+    )
+
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop at the first failed test, instead of waiting for the jobs.",
+    )
+
+    parser.add_argument(
+        "--skip-progress",
+        action="store_true",
+        help="Do not print the live test progress of the jobs.",
+    )
+
+    parser.add_argument(
+        "--progress-interval",
+        type=float,
+        default=DEFAULT_PROGRESS_INTERVAL,
+        required=False,
+        help="The interval (in seconds) between two reads of the test progress.",
+    )
+
+    parser.add_argument(
+        "--keep-jobs",
+        action="store_true",
+        help="Do not cancel the jobs when fetch stops early, i.e. at the "
+        "--timeout deadline, on SIGINT/SIGTERM or with --fail-fast.",
+    )
+
+    parser.add_argument(
+        "--cancel-timeout",
+        type=int,
+        default=DEFAULT_CANCEL_TIMEOUT,
+        required=False,
+        help="The time (in seconds) to wait for a cancelled job to stop.",
+    )
+
+
 def fetch(args):
     """
     Command-line utility to fetch test results from Microsoft Fabric.
@@ -68,8 +202,25 @@ def fetch(args):
     using a service principal or a personal user token.
     It polls the status of a notebook run by calling the appropriate Fabric API.
 
-    The tool provides an option to specify a URL directly or
-    load the fetch URL from a log file.
+    The tool provides an option to specify URLs directly or
+    load the fetch URLs from log files. All jobs are polled concurrently
+    on one event loop, sharing one token and one connection pool.
+    A summary of all jobs is printed at the end.
+
+    While the jobs run, the test progress that the notebooks stream to OneLake
+    is followed and every finished test is printed. Only the new part of each
+    progress log is downloaded on every read. With `--fail-fast`, fetch stops
+    at the first failed test instead of waiting for the jobs to finish.
+
+    When fetch stops before the jobs finished, i.e. at the `--timeout` deadline,
+    on SIGINT/SIGTERM (e.g. a cancelled CI step) or with `--fail-fast`,
+    the jobs are cancelled through the Fabric API, so they do not keep using
+    capacity. Fetch then waits until they reached the Cancelled state.
+
+    When a job has finished, its JUnit XML reports and JSON test summary are
+    downloaded from OneLake to `--results-dir`, if submit logged their location.
+    The failed tests are printed, and the durations of all test files are merged
+    into `test-durations.json`, which submit can use to balance shards.
 
     Arguments:
         --service-principal (bool, optional):
@@ -81,14 +232,39 @@ def fetch(args):
         --client-secret (str, optional):
             The Azure client secret for the service principal
             (required if using service principal authentication).
+        --token-cache-file-path (str, optional):
+            A file in which access tokens are cached across runs.
         --retry-after (int, optional):
-            Defines how often to poll the status of the notebook run.
-            Default is 60 seconds.
+            The longest interval between polls of the notebook run status.
+            Polling starts every few seconds and backs off to this interval.
+            Defaults to the interval logged by submit, or 60 seconds.
+        --timeout (int, optional):
+            Stop polling after this number of seconds. Default is 6 hours,
+            0 disables the deadline.
+        --max-attempts (int, optional):
+            Stop polling after this number of polls.
+        --results-dir (str, optional):
+            The local folder the test results are downloaded to.
+            Default is "fabric-testing-results".
+        --skip-results (bool, optional):
+            If provided, the test results are not downloaded.
+        --fail-fast (bool, optional):
+            If provided, fetch returns 1 at the first failed test.
+        --skip-progress (bool, optional):
+            If provided, the live test progress is not printed.
+        --progress-interval (float, optional):
+            The interval between two reads of the test progress.
+            Default is 10 seconds.
+        --keep-jobs (bool, optional):
+            If provided, the jobs are not cancelled when fetch stops early.
+        --cancel-timeout (int, optional):
+            The time to wait for a cancelled job to stop. Default is 120 seconds.
 
         --fetch-url-log-file-path (str, optional, mutually exclusive with --url):
-            The path to a log file containing the fetch URL.
+            The paths to log files containing fetch URLs (one per line),
+            or to directories of such log files.
         --url (str, optional, mutually exclusive with --fetch-url-log-file-path):
-            The URL used to fetch the status or results directly.
+            The URLs used to fetch the status or results directly.
 
     Usage:
         To run the tool using a service principal:
@@ -102,33 +278,340 @@ def fetch(args):
         To run the tool using a personal token:
             fabric-testing-fetch --tenant-id <tenant_id> --url <fetch_url>
 
-    Raises:
-        RuntimeError: If argument validation fails or the API polling encounters issues.
+        To wait for several jobs at once:
+            fabric-testing-fetch --tenant-id <tenant_id> --url <fetch_url> <fetch_url>
+            fabric-testing-fetch --tenant-id <tenant_id>
+                --fetch-url-log-file-path <directory_of_log_files>
+
+    Returns:
+        int: The exit code, 0 if every job completed and 1 otherwise.
 
     Notes:
         - The `fetch_url` parameter can be provided
             either directly or loaded from a log file.
         - The CLI uses `argparse` for argument parsing and validation.
         - Polling frequency can be customized using the `--retry-after` argument.
+        - Polling stops at the `--timeout` deadline or after `--max-attempts` polls.
     """
 
     if args.service_principal:
-        _fabric_token = get_client_fabric_token(
-            args.tenant_id, args.client_id, args.client_secret
+        _token_provider = get_client_token_provider(
+            args.tenant_id,
+            args.client_id,
+            args.client_secret,
+            cache_file_path=args.token_cache_file_path,
+        )
+    else:
+        _token_provider = get_personal_token_provider(
+            args.tenant_id, cache_file_path=args.token_cache_file_path
         )
+
+    if args.url:
+        _fetch_urls = [(url, None, None) for url in _as_list(args.url)]
     else:
-        _fabric_token = get_personal_fabric_token(args.tenant_id)
+        _fetch_urls = [
+            fetch_url
+            for path in _as_list(args.fetch_url_log_file_path)
+            for fetch_url in load_fetch_url_logs(path)
+        ]
+
+    if not _fetch_urls:
+        raise RuntimeError("No fetch urls were found.")
 
-    _fetch_url = args.url or load_fetch_url(args.fetch_url_log_file_path)
+    return fetch_jobs(args, jobs=_fetch_urls, token_provider=_token_provider)
 
-    poll_notebook_run_status(
-        fetch_url=_fetch_url, retry_after=args.retry_after, token_string=_fabric_token
+
+def fetch_jobs(args, *, jobs: list, token_provider, timer: StageTimer = None) -> int:
+    """
+    Waits for notebook jobs and fetches their test results.
+
+    These are the steps of `fetch` once the fetch URLs are known: polling the
+    jobs while following their test progress, cancelling them when fetch stops
+    early, downloading the test results and printing the summary.
+
+    Args:
+        args (argparse.Namespace): The arguments added by `add_fetch_arguments`.
+        jobs (list): The fetch URL, the suggested polling interval (or None)
+            and the OneLake URL of the test results (or None) of every job.
+        token_provider (TokenProvider): The credential used for all requests.
+        timer (StageTimer, optional): Records the duration of every stage.
+            Defaults to None.
+
+    Returns:
+        int: The exit code, 0 if every job completed and 1 otherwise.
+    """
+    timer = timer or StageTimer()
+
+    _results_urls = {url: results_url for url, _, results_url in jobs if results_url}
+    _fetch_urls = [
+        (url, args.retry_after or logged_retry_after or DEFAULT_RETRY_AFTER)
+        for url, logged_retry_after, _ in jobs
+    ]
+
+    _polling_strategy = PollingStrategy(
+        timeout=args.timeout or None, max_attempts=args.max_attempts
     )
 
+    # Failing fast relies on the progress logs, even with --skip-progress
+    _progress_logs = {}
+    if not args.skip_progress or args.fail_fast:
+        _progress_logs = {
+            url: ProgressLog(results_url=results_url, credential=token_provider)
+            for url, results_url in _results_urls.items()
+        }
+
+    logger.info("Polling %d notebook job(s)...", len(_fetch_urls))
+    with timer.stage("wait for jobs"):
+        results, failure, interrupted = asyncio.run(
+            wait_for_jobs(
+                fetch_urls=_fetch_urls,
+                token_provider=token_provider,
+                polling_strategy=_polling_strategy,
+                progress_logs=_progress_logs,
+                fail_fast=args.fail_fast,
+                progress_interval=args.progress_interval,
+            )
+        )
+
+    if failure is not None or interrupted:
+        if failure is not None:
+            logger.warning(
+                "Failing fast: %s %s in %s",
+                failure.get("test"),
+                failure.get("event"),
+                failure.get("job"),
+            )
+        else:
+            logger.warning("Fetch was interrupted.")
+
+        if not args.keep_jobs:
+            with timer.stage("cancel jobs"):
+                asyncio.run(
+                    cancel_notebook_runs(
+                        fetch_urls=[url for url, _ in _fetch_urls],
+                        token_provider=token_provider,
+                        timeout=args.cancel_timeout,
+                    )
+                )
+        return 1
+
+    _timed_out_urls = [
+        url for url, result in results.items() if get_job_status(result) == "TimedOut"
+    ]
+    if _timed_out_urls and not args.keep_jobs:
+        with timer.stage("cancel jobs"):
+            asyncio.run(
+                cancel_notebook_runs(
+                    fetch_urls=_timed_out_urls,
+                    token_provider=token_provider,
+                    timeout=args.cancel_timeout,
+                )
+            )
+
+    if not args.skip_results:
+        with timer.stage("download results"):
+            fetch_test_results(
+                results=results,
+                results_urls=_results_urls,
+                results_dir=args.results_dir,
+                token_provider=token_provider,
+            )
+
+    return summarize_results(results)
+
+
+async def wait_for_jobs(
+    *,
+    fetch_urls: list,
+    token_provider,
+    polling_strategy: PollingStrategy,
+    progress_logs: dict = None,
+    fail_fast: bool = False,
+    progress_interval: float = DEFAULT_PROGRESS_INTERVAL,
+) -> tuple:
+    """
+    Polls the jobs while following their test progress.
+
+    Polling and following the progress logs run as two tasks on the same event
+    loop. When polling is done, the progress logs are read one last time.
+    Polling is cancelled at the first failed test if `fail_fast` is set,
+    and on SIGINT or SIGTERM. The jobs themselves keep running.
+
+    Args:
+        fetch_urls (list): The fetch URL and longest polling interval of each job.
+        token_provider (TokenProvider): The credential used for all requests.
+        polling_strategy (PollingStrategy): The polling intervals and deadline.
+        progress_logs (dict, optional): The progress log of each job, by fetch URL.
+            Defaults to None, i.e. the progress is not followed.
+        fail_fast (bool, optional): Whether to stop at the first failed test.
+            Defaults to False.
+        progress_interval (float, optional): The time (in seconds) between two
+            reads of the progress logs. Defaults to 10.
+
+    Returns:
+        tuple: The final status of each job by fetch URL, the first failure
+            event or None, and whether fetch was interrupted by a signal.
+            The statuses are None when polling was cancelled.
+    """
+    stop_event = asyncio.Event()
+    previous_handlers = _set_stop_handlers(stop_event)
+
+    poll_task = asyncio.create_task(
+        poll_notebook_runs(
+            fetch_urls=fetch_urls,
+            token_provider=token_provider,
+            polling_strategy=polling_strategy,
+        )
+    )
+    stop_task = asyncio.create_task(stop_event.wait())
+    progress_task = None
+    if progress_logs:
+        progress_task = asyncio.create_task(
+            follow_test_progress(
+                progress_logs=progress_logs,
+                fail_fast=fail_fast,
+                interval=progress_interval,
+            )
+        )
+
+    try:
+        await asyncio.wait(
+            [task for task in (poll_task, stop_task, progress_task) if task],
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+    finally:
+        for signal_number, handler in previous_handlers.items():
+            signal.signal(signal_number, handler)
+
+    if not poll_task.done():
+        failure = (
+            progress_task.result() if progress_task and progress_task.done() else None
+        )
+        for task in (poll_task, stop_task, progress_task):
+            if task:
+                task.cancel()
+        await asyncio.gather(
+            *(task for task in (poll_task, stop_task, progress_task) if task),
+            return_exceptions=True,
+        )
+        return None, failure, failure is None
+
+    stop_task.cancel()
+    if progress_task is not None:
+        progress_task.cancel()
+        await asyncio.gather(progress_task, return_exceptions=True)
+
+        # Print the tests that finished since the last read
+        await asyncio.to_thread(read_test_progress, progress_logs=progress_logs)
+    return poll_task.result(), None, False
+
+
+def _set_stop_handlers(stop_event: asyncio.Event) -> dict:
+    """
+    Sets `stop_event` on SIGINT and SIGTERM, instead of raising KeyboardInterrupt.
+
+    Returns:
+        dict: The previous handler of each signal, to restore them.
+    """
+    loop = asyncio.get_running_loop()
+
+    def _handle_stop(signal_number, frame):
+        logger.warning("Received %s, stopping...", signal.Signals(signal_number).name)
+        loop.call_soon_threadsafe(stop_event.set)
+
+    previous_handlers = {}
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        try:
+            previous_handlers[signal_number] = signal.signal(
+                signal_number, _handle_stop
+            )
+        except ValueError:
+            # Signals can only be handled in the main thread
+            break
+    return previous_handlers
+
+
+def fetch_test_results(
+    *, results: dict, results_urls: dict, results_dir: str, token_provider
+) -> list:
+    """
+    Downloads and prints the test results of every finished job.
+
+    The results of each job are downloaded to a folder named after its
+    submit folder and results folder. The durations of the test files of
+    all jobs are merged into `test-durations.json` in `results_dir`.
+
+    Args:
+        results (dict): The final status of each job, by fetch URL.
+        results_urls (dict): The OneLake URL of the test results, by fetch URL.
+        results_dir (str): The local folder the results are downloaded to.
+        token_provider (TokenProvider): The credential used to read OneLake.
+
+    Returns:
+        list: The test summaries that were downloaded.
+    """
+    summaries = []
+    for fetch_url, results_url in results_urls.items():
+        if get_job_status(results.get(fetch_url, {})) not in ("Completed", "Failed"):
+            continue
+
+        try:
+            _, results_directory = parse_results_url(results_url)
+            local_dir = os.path.join(results_dir, *results_directory.split("/")[-2:])
+            summary = download_test_results(
+                results_url=results_url,
+                local_dir=local_dir,
+                credential=token_provider,
+            )
+        except (RuntimeError, ValueError) as e:
+            logger.warning("Could not fetch the test results of %s: %s", fetch_url, e)
+            continue
+
+        if summary is not None:
+            log_test_summary(summary, label=fetch_url)
+            summaries.append(summary)
+
+    if summaries:
+        durations_file = os.path.join(results_dir, TEST_DURATIONS_FILE_NAME)
+        save_test_durations(merge_test_durations(summaries), durations_file)
+        logger.info("Test durations written to %s", durations_file)
+
+    return summaries
+
+
+def _as_list(value) -> list:
+    return [value] if isinstance(value, str) else list(value)
+
+
+def summarize_results(results: dict) -> int:
+    """
+    Logs the status of every job and returns the aggregated exit code.
+
+    Args:
+        results (dict): The final status of each job, by fetch URL.
+
+    Returns:
+        int: 0 if every job completed, otherwise 1.
+    """
+    statuses = {url: get_job_status(result) for url, result in results.items()}
+    completed = sum(status == "Completed" for status in statuses.values())
+
+    logger.info("Fetch summary:")
+    for url, status in statuses.items():
+        logger.info("    %s: %s", status, url)
+    logger.info("%d of %d job(s) completed.", completed, len(statuses))
+
+    return 0 if completed == len(statuses) else 1
+
 
 def main():
     args = fetch_args()
-    fetch(args)
+    configure_logging_from_args(args)
+    with trace_to_file(
+        args.trace_file, name="fabric-testing-fetch", trace_format=args.trace_format
+    ):
+        exit_code = fetch(args)
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,134 @@
+import argparse
+import logging
+import sys
+
+from fabrictesting.fabric_api.token_provider import STORAGE_SCOPE
+from fabrictesting.test_job.fetch import add_fetch_arguments, fetch_jobs
+from fabrictesting.test_job.submit import (
+    add_submit_arguments,
+    create_token_provider,
+    submit_jobs,
+)
+from fabrictesting.utilities.log import (
+    add_logging_arguments,
+    configure_logging_from_args,
+)
+from fabrictesting.utilities.save_fetch_url_log import (
+    save_fetch_url_log,
+    save_fetch_url_logs,
+)
+from fabrictesting.utilities.timing import StageTimer
+from fabrictesting.utilities.tracing import add_trace_arguments, trace_to_file
+from fabrictesting.utilities.validate_args import validate_args
+
+logger = logging.getLogger(__name__)
+
+
+def run_args():
+    parser = argparse.ArgumentParser(
+        description="Submit tests to Microsoft Fabric and fetch their results"
+    )
+
+    add_submit_arguments(parser)
+    add_fetch_arguments(parser)
+    add_trace_arguments(parser)
+    add_logging_arguments(parser)
+
+    args = parser.parse_args()
+
+    validate_args(args, parser)
+
+    return args
+
+
+def run(args) -> int:
+    """
+    Submits a set of tests to Microsoft Fabric and waits for their results.
+
+    This is the core function of the CLI command `fabric-testing-run`, which
+    combines `fabric-testing-submit` and `fabric-testing-fetch` in one process:
+
+    1. Authenticates once, for both the Fabric API and OneLake. The tokens are
+        kept in memory (and in `--token-cache-file-path` if given) for all
+        following stages, so there is no second (browser) login.
+    2. Uploads the bundle to OneLake, while the notebook is generated.
+    3. Creates the notebook and triggers the job(s) as soon as the bundle
+        is uploaded.
+    4. Polls the job(s) right away, starting with short intervals, while the
+        live test progress is printed, and downloads the test results.
+    5. Logs the duration of every stage.
+
+    It accepts all arguments of `fabric-testing-submit`, and all arguments of
+    `fabric-testing-fetch` except `--url` and `--fetch-url-log-file-path`.
+    With `--output-log-file-path` the fetch URLs are logged as by submit, so
+    `fabric-testing-fetch` can attach to the jobs again if the run is stopped
+    with `--keep-jobs`.
+
+    Returns:
+        int: The exit code, 0 if every job completed and 1 otherwise.
+
+    Usage:
+        fabric-testing-run
+            --tenant-id <tenant_id>
+            --whl-path <path_to_wheel_file>
+            --tests-path <path_to_tests>
+            --requirements-file <path_to_requirements_file>
+            --workspace-name <workspace_name>
+            --workspace-id <workspace_id>
+            --lakehouse-name <lakehouse_name>
+            --lakehouse-id <lakehouse_id>
+            --timeout <seconds>
+            --results-dir <path_to_results>
+
+    See Also:
+        - `fabric-testing-submit` and `fabric-testing-fetch`:
+            The CLI commands of the single stages.
+    """
+    logger.info("Starting fabric-testing run...")
+    timer = StageTimer()
+
+    try:
+        # 1 Authenticate once for all stages, before they run concurrently
+        with timer.stage("authenticate"):
+            token_provider = create_token_provider(args)
+            token_provider.get_token_string()
+            token_provider.get_token_string(STORAGE_SCOPE)
+
+        # 2-3 Upload the bundle, create the notebook and trigger the job(s)
+        submission = submit_jobs(args, token_provider=token_provider, timer=timer)
+        jobs = submission["jobs"]
+
+        if args.output_log_file_path:
+            if submission["sharded"]:
+                save_fetch_url_logs(jobs, file_name=args.output_log_file_path)
+            else:
+                fetch_url, retry_after, results_url = jobs[0]
+                save_fetch_url_log(
+                    fetch_url,
+                    file_name=args.output_log_file_path,
+                    retry_after=retry_after,
+                    results_url=results_url,
+                )
+
+        logger.info("Notebook has the name: %s", submission["notebook_name"])
+        logger.info("Notebook has id %s", submission["notebook_id"])
+
+        # 4 Poll the job(s) with the same token provider and HTTP session
+        return fetch_jobs(args, jobs=jobs, token_provider=token_provider, timer=timer)
+    finally:
+        # 5 Log the duration of every stage, also if a stage failed
+        timer.log_summary()
+
+
+def main():
+    args = run_args()
+    configure_logging_from_args(args)
+    with trace_to_file(
+        args.trace_file, name="fabric-testing-run", trace_format=args.trace_format
+    ):
+        exit_code = run(args)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,89 @@
 import argparse
-import time
+import contextvars
+import logging
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 
 from fabrictesting.fabric_api.api_access import (
-    get_client_fabric_token,
-    get_personal_fabric_token,
+    get_client_token_provider,
+    get_personal_token_provider,
 )
+from fabrictesting.fabric_api.token_provider import TokenProvider
+from fabrictesting.notebook.cache import configure_default_notebook_cache
 from fabrictesting.notebook.create import (
+    BUNDLE_COPY_MODES,
+    DEFAULT_BUNDLE_COPY_MODE,
     create_platform_file_content,
     load_default_notebook,
 )
-from fabrictesting.notebook.get_definitions import get_notebook_id
+from fabrictesting.notebook.get_definitions import wait_for_notebook_id
 from fabrictesting.notebook.run import run_notebook
+from fabrictesting.notebook.runner import (
+    RUNNER_NOTEBOOK_NAME,
+    create_runner_parameters,
+    ensure_runner_notebook,
+)
 from fabrictesting.notebook.upload import upload_notebook
-from fabrictesting.onelake_api.api_file import upload_folder_to_onelake
-from fabrictesting.utilities.collect import create_temp_folder_with_files
-from fabrictesting.utilities.save_fetch_url_log import save_fetch_url_log
+from fabrictesting.onelake_api.api_file import (
+    DEFAULT_UPLOAD_WORKERS,
+    create_submit_folder_name,
+    upload_bundle_to_onelake,
+)
+from fabrictesting.utilities.collect import (
+    collect_bundle_files,
+    create_bundle_archive,
+)
+from fabrictesting.utilities.log import (
+    add_logging_arguments,
+    configure_logging_from_args,
+)
+from fabrictesting.utilities.manifest import (
+    MANIFEST_FILE_NAME,
+    create_manifest,
+    load_manifest_log,
+    save_manifest_log,
+)
+from fabrictesting.utilities.results import create_results_name, create_results_url
+from fabrictesting.utilities.save_fetch_url_log import (
+    save_fetch_url_log,
+    save_fetch_url_logs,
+)
+from fabrictesting.utilities.shard import (
+    collect_test_files,
+    load_test_durations,
+    split_test_files,
+)
+from fabrictesting.utilities.timing import StageTimer
+from fabrictesting.utilities.tracing import add_trace_arguments, trace_to_file
 from fabrictesting.utilities.validate_args import validate_args
 
+logger = logging.getLogger(__name__)
+
 
 def submit_args():
     parser = argparse.ArgumentParser(description="Submit tests to Microsoft Fabric")
 
+    add_submit_arguments(parser)
+
+    add_trace_arguments(parser)
+
+    add_logging_arguments(parser)
+
+    args = parser.parse_args()
+
+    validate_args(args, parser)
+
+    return args
+
+
+def add_submit_arguments(parser: argparse.ArgumentParser):
+    """
+    Adds the arguments of `fabric-testing-submit` to a parser.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser of the CLI command.
+    """
     parser.add_argument(
         "--tenant-id", type=str, required=True, help="The Azure tenant ID"
     )
@@ -89,11 +152,138 @@ def submit_args():
         "--client-secret", type=str, required=False, help="The Azure client secret"
     )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        "--token-cache-file-path",
+        type=str,
+        required=False,
+        default=None,
+        help="Cache access tokens in this file to reuse them across runs.",
+    )
 
-    validate_args(args, parser)
+    parser.add_argument(
+        "--notebook-cache-file-path",
+        type=str,
+        required=False,
+        default=None,
+        help="Cache notebook ids by name in this file to skip listing "
+        "the workspace on the next run.",
+    )
 
-    return args
+    parser.add_argument(
+        "--upload-workers",
+        type=int,
+        required=False,
+        default=DEFAULT_UPLOAD_WORKERS,
+        help="The number of files uploaded concurrently to OneLake.",
+    )
+
+    parser.add_argument(
+        "--incremental-upload",
+        action="store_true",
+        help="Only upload files that changed since the previous submit. "
+        "Unchanged files are copied from the previous bundle in OneLake.",
+    )
+
+    parser.add_argument(
+        "--manifest-file-path",
+        type=str,
+        required=False,
+        default=MANIFEST_FILE_NAME,
+        help="The local file that stores the manifest of the previous submit.",
+    )
+
+    parser.add_argument(
+        "--bundle-archive",
+        action="store_true",
+        help="Upload the wheel, tests and requirements as a single zip archive, "
+        "which the notebook unpacks before running the tests.",
+    )
+
+    parser.add_argument(
+        "--persistent-runner",
+        action="store_true",
+        help="Run the tests on a single runner notebook, which is created once "
+        "and reused, instead of creating a notebook per submit.",
+    )
+
+    parser.add_argument(
+        "--runner-notebook-name",
+        type=str,
+        required=False,
+        default=RUNNER_NOTEBOOK_NAME,
+        help="The display name of the persistent runner notebook.",
+    )
+
+    parser.add_argument(
+        "--shards",
+        type=int,
+        required=False,
+        default=1,
+        help="Split the test files into this number of shards, "
+        "each run as a separate notebook job in parallel.",
+    )
+
+    parser.add_argument(
+        "--test-durations-file",
+        type=str,
+        required=False,
+        default=None,
+        help="A JSON file with the duration (in seconds) of each test file, "
+        "used to balance the shards. Without it, shards get the same number of files.",
+    )
+
+    parser.add_argument(
+        "--test-workers",
+        type=int,
+        required=False,
+        default=1,
+        help="Run the tests that do not use Spark in this number of processes "
+        "inside the notebook. Tests that use the spark fixture or the spark "
+        "marker run in the notebook on the shared SparkSession.",
+    )
+
+    parser.add_argument(
+        "--dependency-cache",
+        action="store_true",
+        help="Install the requirements and pytest from a wheelhouse cached in "
+        "the lakehouse. The cache is keyed by the requirements file and the "
+        "runtime versions, and is built on the first run.",
+    )
+
+    parser.add_argument(
+        "--bundle-copy-mode",
+        type=str,
+        required=False,
+        choices=BUNDLE_COPY_MODES,
+        default=DEFAULT_BUNDLE_COPY_MODE,
+        help="How the notebook copies the bundle from the lakehouse: 'sparkfiles' "
+        "distributes it to every node, 'driver' copies it to the driver only.",
+    )
+
+    parser.add_argument(
+        "--notebook-template",
+        type=str,
+        required=False,
+        default=None,
+        help="The path to a custom notebook template (.ipynb) with the same "
+        "placeholders as the default template.",
+    )
+
+    parser.add_argument(
+        "--extra-cells",
+        type=str,
+        nargs="+",
+        required=False,
+        default=None,
+        help="Python files that are added as code cells to the notebook, "
+        "run before the tests.",
+    )
+
+    parser.add_argument(
+        "--memory-map",
+        action="store_true",
+        help="Read large files, e.g. wheels, through a memory map when uploading.",
+    )
 
 
 def submit(args) -> str:
@@ -104,18 +294,51 @@ def submit(args) -> str:
     This is the core function of the CLI command `fabric-testing-submit` command.
     It performs the following steps:
 
-    1. Creates a temporary folder containing the `.whl` file, tests,
-        and requirements file.
-    2. Uploads the temporary folder to OneLake DataLake.
+    1. Collects the `.whl` file, tests, and requirements file into a bundle.
+        The bundle maps each file to its original location, nothing is copied.
+    2. Uploads the bundle to OneLake DataLake, in the background.
     3. Generates a Jupyter notebook to install dependencies,
-        load and install custom wheel files, and run the unit tests from OneLake.
-    4. Uploads the generated notebook to the specified Fabric workspace.
-    5. Retrieves the notebook's unique ID.
-    6. Executes the notebook using the Fabric API
+        load and install custom wheel files, and run the unit tests from OneLake,
+        while the bundle is uploading.
+    4. Uploads the generated notebook to the specified Fabric workspace,
+        while the bundle is still uploading.
+    5. Retrieves the notebook's unique ID from the upload response,
+        falling back to a lookup by name.
+    6. Waits for the bundle upload, executes the notebook using the Fabric API
         and returns the URL for fetching the results.
 
+    With `--persistent-runner`, steps 4 and 5 are replaced by a single runner
+    notebook that is only created or updated when its definition changed.
+    The submit folder, wheel, requirements and test folder are then passed
+    as execution parameters of the notebook job.
+
+    With `--shards`, the test files are split into shards, balanced by the
+    durations in `--test-durations-file` or else by file count. The notebook
+    is run once per shard in parallel, on the same uploaded bundle, and
+    the test files of each shard are passed as an execution parameter.
+    All fetch URLs are logged, so fetch polls and summarizes all shards.
+
+    The notebook writes JUnit XML reports and a JSON summary of the tests to
+    the submit folder in OneLake. The OneLake URL of these results is logged
+    next to the fetch URL, so fetch can download them.
+
+    With `--test-workers`, the notebook runs the tests that do not use Spark
+    in several processes, while the tests that use Spark run on the
+    SparkSession of the notebook.
+
+    With `--dependency-cache`, the notebook installs the requirements offline
+    from a wheelhouse in the lakehouse, and builds the wheelhouse on a miss.
+
+    With `--bundle-copy-mode driver`, the notebook copies the bundle to the
+    driver only, instead of distributing it to every node with SparkFiles.
+
+    With `--notebook-template`, the notebook is rendered from a custom template,
+    and `--extra-cells` adds the given Python files as code cells that run
+    before the tests.
+
     Returns:
-        str: The URL to fetch the results of the notebook execution.
+        str: The URL to fetch the results of the notebook execution,
+            or a list of URLs, one per shard, if the tests were sharded.
 
     Raises:
         RuntimeError: If any part of the process
@@ -137,6 +360,22 @@ def submit(args) -> str:
                 --lakehouse-name <lakehouse_name>
                 --lakehouse-id <lakehouse_id>
                 --output-log-file-path <path_to_log_file>
+                --token-cache-file-path <path_to_token_cache>
+                --notebook-cache-file-path <path_to_notebook_cache>
+                --upload-workers <number_of_concurrent_uploads>
+                --incremental-upload
+                --manifest-file-path <path_to_manifest_file>
+                --bundle-archive
+                --memory-map
+                --persistent-runner
+                --runner-notebook-name <runner_notebook_name>
+                --shards <number_of_shards>
+                --test-durations-file <path_to_test_durations>
+                --test-workers <number_of_test_processes>
+                --dependency-cache
+                --bundle-copy-mode <sparkfiles_or_driver>
+                --notebook-template <path_to_notebook_template>
+                --extra-cells <path_to_python_file> <path_to_python_file>
 
         To submit the tests using a personal token:
             fabric-testing-submit
@@ -155,91 +394,442 @@ def submit(args) -> str:
             CLI command for fetching the status and results of submitted tests.
     """
 
-    print("Starting fabric-testing submit...")
+    logger.info("Starting fabric-testing submit...")
 
-    # 1 Create temp folder with wheel, tests and requirement file
-    temp_dir, wheel_name, rqs_name = create_temp_folder_with_files(
-        whl_path=args.whl_path,
-        tests_path=args.tests_path,
-        requirements_file=args.requirements_file,
-    )
+    # 0 Create the token provider shared by OneLake and the Fabric API
+    _token_provider = create_token_provider(args)
 
-    # 2 Upload folder to OneLake
-    folder_name = upload_folder_to_onelake(
-        temp_folder=temp_dir,
-        workspace_name=args.workspace_name,
-        lakehouse_name=args.lakehouse_name,
-    )
+    submission = submit_jobs(args, token_provider=_token_provider)
+    notebook_name = submission["notebook_name"]
+    notebook_id = submission["notebook_id"]
+    _jobs = submission["jobs"]
 
-    notebook_name = folder_name
+    if submission["sharded"]:
+        if args.output_log_file_path:
+            save_fetch_url_logs(_jobs, file_name=args.output_log_file_path)
 
-    # 3 Generate notebook for that execute tests in Microsoft Fabric
-    _notebook_contents = load_default_notebook(
-        lakehouse_id=args.lakehouse_id,
-        default_lakehouse_name=args.lakehouse_name,
-        default_lakehouse_workspace_id=args.workspace_id,
-        workspace_name=args.workspace_name,
-        submit_folder=folder_name,
-        wheel_name=wheel_name,
-        requirements_file_name=rqs_name,
-        unittest_folder_name="tests",
-    )
+        logger.info("Notebook has the name: %s", notebook_name)
+        logger.info("Notebook has id %s", notebook_id)
+        for index, (fetch_url, _, _) in enumerate(_jobs, start=1):
+            logger.info("Fetch results of shard %d at %s", index, fetch_url)
+        logger.info("Fabric-testing submit ran successfully!")
+        return [fetch_url for fetch_url, _, _ in _jobs]
 
-    _platform_contents = create_platform_file_content(
-        display_name=notebook_name, description="This is a fabric-testing notebook"
-    )
+    _fetch_url, _retry_after, _results_url = _jobs[0]
 
-    # 4a Retrieve token for interaction with Fabric API
-    if args.service_principal:
-        _fabric_token = get_client_fabric_token(
-            args.tenant_id, args.client_id, args.client_secret
+    if args.output_log_file_path:
+        save_fetch_url_log(
+            _fetch_url,
+            file_name=args.output_log_file_path,
+            retry_after=_retry_after,
+            results_url=_results_url,
         )
-    else:
-        _fabric_token = get_personal_fabric_token(args.tenant_id)
 
-    # 4b Upload the notebook to Fabric
-    upload_notebook(
-        display_name=notebook_name,
-        description="This is a fabric-testing notebook",
-        notebook_definition=_notebook_contents,
-        platform_definition=_platform_contents,
-        workspace_id=args.workspace_id,
-        token_string=_fabric_token,
-    )
+    logger.info("Notebook triggered with status %s", submission["status_code"])
+    logger.info("Notebook has the name: %s", notebook_name)
+    logger.info("Notebook has id %s", notebook_id)
+    logger.info("Fetch results at %s", _fetch_url)
+    logger.info("Fabric-testing submit ran successfully!")
+    return _fetch_url
 
-    print("Give Fabric API 5 seconds to upload notebook...")
-    time.sleep(5)
 
-    # 5 Retrieve the notebook id
-    notebook_id = get_notebook_id(
-        notebook_name=notebook_name,
-        workspace_id=args.workspace_id,
-        token_string=_fabric_token,
-    )
+def create_token_provider(args) -> TokenProvider:
+    """
+    Creates the token provider of a CLI run from its arguments.
 
-    # 6 Run the notebook
-    run_response = run_notebook(
-        item_id=notebook_id,
-        workspace_id=args.workspace_id,
-        token_string=_fabric_token,
+    Args:
+        args (argparse.Namespace): The arguments of the CLI command.
+
+    Returns:
+        TokenProvider: The token provider of the service principal if
+            `--service-principal` is set, and of the user otherwise.
+    """
+    if args.service_principal:
+        return get_client_token_provider(
+            args.tenant_id,
+            args.client_id,
+            args.client_secret,
+            cache_file_path=args.token_cache_file_path,
+        )
+    return get_personal_token_provider(
+        args.tenant_id, cache_file_path=args.token_cache_file_path
     )
-    _run_status = run_response["status_code"]
-    _fetch_url = run_response["fetch_url"]
 
-    if args.output_log_file_path:
-        save_fetch_url_log(_fetch_url)
 
-    print(f"Notebook triggered with status {_run_status}")
-    print(f"Notebook has the name: {notebook_name}")
-    print(f"Notebook has id {notebook_id}")
-    print(f"Fetch results at {_fetch_url}")
-    print("Fabric-testing submit ran successfully!")
-    return _fetch_url
+def submit_jobs(args, *, token_provider, timer: StageTimer = None) -> dict:
+    """
+    Uploads the bundle, creates the notebook and triggers the notebook jobs.
+
+    These are the steps of `submit`, without creating the token provider and
+    logging the fetch URLs. The bundle is uploaded to OneLake in a background
+    thread, under a folder name that is generated up front, while the notebook
+    is generated, created and provisioned. Both are joined before the jobs are
+    triggered. If the upload reuses an unchanged bundle from its previous
+    folder, that folder is passed to the jobs as execution parameter.
+
+    Args:
+        args (argparse.Namespace): The arguments of `fabric-testing-submit`.
+        token_provider (TokenProvider): The credential used for OneLake and
+            the Fabric API.
+        timer (StageTimer, optional): Records the duration of every stage.
+            Defaults to None.
+
+    Returns:
+        dict: A dictionary containing the following information:
+            - "notebook_name" (str): The display name of the notebook.
+            - "notebook_id" (str): The ID of the notebook.
+            - "submit_folder" (str): The OneLake folder of the bundle.
+            - "status_code" (int): The status code of the (first) job trigger.
+            - "sharded" (bool): Whether the tests were split into shards.
+            - "jobs" (list): The fetch URL, the suggested polling interval and
+                the OneLake URL of the test results of every job.
+    """
+    timer = timer or StageTimer()
+
+    if args.notebook_cache_file_path:
+        configure_default_notebook_cache(cache_file_path=args.notebook_cache_file_path)
+
+    # 1 Collect wheel, tests and requirement file into a bundle
+    with timer.stage("collect files") as span:
+        bundle, wheel_name, rqs_name = collect_bundle_files(
+            whl_path=args.whl_path,
+            tests_path=args.tests_path,
+            requirements_file=args.requirements_file,
+        )
+        span.set_attribute("files", len(bundle))
+    _collected_files = bundle
+    _extra_cells = _read_extra_cells(args.extra_cells)
+
+    # The notebook of this submit is named after the folder of the bundle,
+    # so both names are generated before anything is uploaded
+    _submit_folder = create_submit_folder_name()
+    # Every run writes its results to a folder of its own, also when the bundle
+    # folder of an earlier run is reused
+    _results_name = create_results_name()
+
+    with ExitStack() as stack:
+        # 1b Optionally pack the bundle into a single archive,
+        # which is removed again when the upload is done
+        _archive_name = None
+        if args.bundle_archive:
+            _staging_dir = stack.enter_context(
+                tempfile.TemporaryDirectory(prefix="fabric-testing-")
+            )
+            with timer.stage("archive bundle"):
+                bundle, _archive_name = create_bundle_archive(
+                    files=bundle, archive_dir=_staging_dir
+                )
+
+        # 2a Compare the content with the previously uploaded bundle
+        _manifest = None
+        _previous_manifest_log = None
+        if args.incremental_upload:
+            _manifest = create_manifest(bundle)
+            _previous_manifest_log = load_manifest_log(
+                workspace_name=args.workspace_name,
+                lakehouse_name=args.lakehouse_name,
+                file_name=args.manifest_file_path,
+            )
+
+        # 2b Upload the bundle to OneLake in the background
+        def _upload_bundle():
+            with timer.stage("upload bundle"):
+                return upload_bundle_to_onelake(
+                    files=bundle,
+                    workspace_name=args.workspace_name,
+                    lakehouse_name=args.lakehouse_name,
+                    custom_folder=_submit_folder,
+                    max_workers=args.upload_workers,
+                    memory_map=args.memory_map,
+                    manifest=_manifest,
+                    previous_submit_folder=(
+                        _previous_manifest_log["submit_folder"]
+                        if _previous_manifest_log
+                        else None
+                    ),
+                    previous_manifest=(
+                        _previous_manifest_log["files"]
+                        if _previous_manifest_log
+                        else None
+                    ),
+                    credential=token_provider,
+                )
+
+        _executor = stack.enter_context(ThreadPoolExecutor(max_workers=1))
+        # The upload runs in a copy of the context, so its spans are traced
+        # as part of this submit
+        _upload_future = _executor.submit(
+            contextvars.copy_context().run, _upload_bundle
+        )
+
+        # 3 Generate the notebook while the bundle is uploading
+        with timer.stage("generate notebook"):
+            if args.persistent_runner:
+                # The values of this test run are passed as
+                # execution parameters of the runner notebook instead
+                _notebook_contents = load_default_notebook(
+                    lakehouse_id=args.lakehouse_id,
+                    default_lakehouse_name=args.lakehouse_name,
+                    default_lakehouse_workspace_id=args.workspace_id,
+                    workspace_name=args.workspace_name,
+                    submit_folder="",
+                    template_path=args.notebook_template,
+                    extra_cells=_extra_cells,
+                    guard_optional_cells=True,
+                )
+            else:
+                _notebook_contents = load_default_notebook(
+                    lakehouse_id=args.lakehouse_id,
+                    default_lakehouse_name=args.lakehouse_name,
+                    default_lakehouse_workspace_id=args.workspace_id,
+                    workspace_name=args.workspace_name,
+                    submit_folder=_submit_folder,
+                    wheel_name=wheel_name,
+                    requirements_file_name=rqs_name,
+                    unittest_folder_name="tests",
+                    bundle_archive_name=_archive_name,
+                    test_workers=args.test_workers,
+                    dependency_cache=args.dependency_cache,
+                    bundle_copy_mode=args.bundle_copy_mode,
+                    results_name=_results_name,
+                    template_path=args.notebook_template,
+                    extra_cells=_extra_cells,
+                )
+
+        # 4a Retrieve token for interaction with Fabric API
+        with timer.stage("fabric token"):
+            _fabric_token = token_provider.get_token_string()
+
+        # 4b Create the notebook while the bundle is still uploading,
+        # both only have to be done when the job is triggered
+        if args.persistent_runner:
+            notebook_name = args.runner_notebook_name
+
+            # Create the runner notebook, or update it if its definition changed
+            with timer.stage("create notebook"):
+                notebook_id = ensure_runner_notebook(
+                    notebook_name=notebook_name,
+                    notebook_definition=_notebook_contents,
+                    workspace_id=args.workspace_id,
+                    token_string=_fabric_token,
+                )
+
+        else:
+            notebook_name = _submit_folder
+
+            _platform_contents = create_platform_file_content(
+                display_name=notebook_name,
+                description="This is a fabric-testing notebook",
+            )
+
+            # Upload the notebook to Fabric, and wait until it is provisioned
+            with timer.stage("create notebook"):
+                upload_response = upload_notebook(
+                    display_name=notebook_name,
+                    description="This is a fabric-testing notebook",
+                    notebook_definition=_notebook_contents,
+                    platform_definition=_platform_contents,
+                    workspace_id=args.workspace_id,
+                    token_string=_fabric_token,
+                )
+
+            # 5 Retrieve the notebook id from the upload,
+            # or look it up by name if the API did not return it
+            notebook_id = upload_response.get("item_id")
+            if notebook_id is None:
+                with timer.stage("look up notebook id"):
+                    notebook_id = wait_for_notebook_id(
+                        notebook_name=notebook_name,
+                        workspace_id=args.workspace_id,
+                        token_string=_fabric_token,
+                    )
+
+        # Join the bundle upload before any job is triggered
+        with timer.stage("wait for upload"):
+            folder_name = _upload_future.result()
+
+    if args.incremental_upload:
+        save_manifest_log(
+            manifest=_manifest,
+            submit_folder=folder_name,
+            workspace_name=args.workspace_name,
+            lakehouse_name=args.lakehouse_name,
+            file_name=args.manifest_file_path,
+        )
+
+    if args.persistent_runner:
+        _run_parameters = create_runner_parameters(
+            submit_folder=folder_name,
+            wheel_name=wheel_name,
+            requirements_file_name=rqs_name,
+            unittest_folder_name="tests",
+            bundle_archive_name=_archive_name,
+            test_workers=args.test_workers,
+            dependency_cache=args.dependency_cache,
+            bundle_copy_mode=args.bundle_copy_mode,
+            results_name=_results_name,
+        )
+    elif folder_name != _submit_folder:
+        # The unchanged bundle is reused from its previous folder, which the
+        # notebook created during the upload does not know yet
+        _run_parameters = {"submit_folder": folder_name}
+    else:
+        _run_parameters = None
+
+    # 6a Split the tests into shards, each run as a separate job
+    _shards = []
+    if args.shards > 1:
+        _shards = split_test_files(
+            test_files=collect_test_files(_collected_files),
+            shard_count=args.shards,
+            durations=(
+                load_test_durations(args.test_durations_file)
+                if args.test_durations_file
+                else None
+            ),
+        )
+
+    if len(_shards) > 1:
+        with timer.stage("trigger jobs"):
+            _shard_jobs = _run_shards(
+                shards=_shards,
+                notebook_id=notebook_id,
+                workspace_id=args.workspace_id,
+                token_string=_fabric_token,
+                results_name=_results_name,
+                run_parameters=_run_parameters,
+            )
+
+        return {
+            "notebook_name": notebook_name,
+            "notebook_id": notebook_id,
+            "submit_folder": folder_name,
+            "status_code": 202,
+            "sharded": True,
+            "jobs": [
+                (
+                    fetch_url,
+                    retry_after,
+                    create_results_url(
+                        workspace_name=args.workspace_name,
+                        lakehouse_name=args.lakehouse_name,
+                        submit_folder=folder_name,
+                        results_name=results_name,
+                    ),
+                )
+                for fetch_url, retry_after, results_name in _shard_jobs
+            ],
+        }
+
+    # 6b Run the notebook
+    with timer.stage("trigger job"):
+        run_response = run_notebook(
+            item_id=notebook_id,
+            workspace_id=args.workspace_id,
+            token_string=_fabric_token,
+            parameters=_run_parameters,
+        )
+
+    return {
+        "notebook_name": notebook_name,
+        "notebook_id": notebook_id,
+        "submit_folder": folder_name,
+        "status_code": run_response["status_code"],
+        "sharded": False,
+        "jobs": [
+            (
+                run_response["fetch_url"],
+                run_response.get("retry_after"),
+                create_results_url(
+                    workspace_name=args.workspace_name,
+                    lakehouse_name=args.lakehouse_name,
+                    submit_folder=folder_name,
+                    results_name=_results_name,
+                ),
+            )
+        ],
+    }
+
+
+def _read_extra_cells(file_paths: list) -> list:
+    if not file_paths:
+        return None
+
+    extra_cells = []
+    for file_path in file_paths:
+        with open(file_path, "r", encoding="utf-8") as file:
+            extra_cells.append(file.read())
+    return extra_cells
+
+
+def _run_shards(
+    *,
+    shards: list,
+    notebook_id: str,
+    workspace_id: str,
+    token_string: str,
+    results_name: str,
+    run_parameters: dict = None,
+) -> list:
+    """
+    Triggers one notebook job per shard in parallel.
+
+    Args:
+        shards (list): The test files of each shard.
+        notebook_id (str): The ID of the notebook to run.
+        workspace_id (str): The ID of the workspace of the notebook.
+        token_string (str): The bearer token used to authenticate the API request.
+        results_name (str): The name of the results folder of the test run,
+            each shard writes to a folder with its index appended.
+        run_parameters (dict, optional): The execution parameters shared by
+            all shards, e.g. of the persistent runner. Defaults to None.
+
+    Returns:
+        list: The fetch URL, the suggested polling interval and the name of the
+            results folder of each shard.
+    """
+
+    def _run_shard(index_and_shard):
+        index, test_files = index_and_shard
+        shard_results_name = f"{results_name}-shard-{index}"
+        parameters = dict(run_parameters or {})
+        parameters["test_files"] = ",".join(test_files)
+        parameters["results_name"] = shard_results_name
+
+        run_response = run_notebook(
+            item_id=notebook_id,
+            workspace_id=workspace_id,
+            token_string=token_string,
+            parameters=parameters,
+        )
+        logger.info(
+            "Shard %d with %d test files triggered with status %s",
+            index,
+            len(test_files),
+            run_response["status_code"],
+        )
+        return (
+            run_response["fetch_url"],
+            run_response.get("retry_after"),
+            shard_results_name,
+        )
+
+    logger.info("Running the tests in %d shards...", len(shards))
+    with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+        futures = [
+            executor.submit(contextvars.copy_context().run, _run_shard, shard)
+            for shard in enumerate(shards, start=1)
+        ]
+        return [future.result() for future in futures]
 
 
 def main():
     args = submit_args()
-    submit(args)
+    configure_logging_from_args(args)
+    with trace_to_file(
+        args.trace_file, name="fabric-testing-submit", trace_format=args.trace_format
+    ):
+        submit(args)
 
 
 if __name__ == "__main__":
@@ -1,63 +1,135 @@
+import logging
+import os
 import shutil
-import tempfile
+import zipfile
 from pathlib import Path
-from typing import Tuple
+from typing import Dict, Tuple
 
+logger = logging.getLogger(__name__)
 
-def create_temp_folder_with_files(
+# Name of the archive uploaded in the single-archive bundle mode
+BUNDLE_ARCHIVE_NAME = "fabric-testing-bundle.zip"
+
+# Timestamp and permissions of every archive member, so the archive only
+# depends on the content of the files and not on when they were checked out
+_ARCHIVE_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+_ARCHIVE_FILE_MODE = 0o644
+
+
+def collect_bundle_files(
     *, tests_path: str, whl_path: str = None, requirements_file: str = None
-) -> Tuple[str, str, str]:
+) -> Tuple[Dict[str, str], str, str]:
     """
-    Creates a temporary folder, renames the files as needed, and copies the
-    specified wheel file, test folder, and requirements file into it.
+    Collects the wheel file, test folder, and requirements file into a bundle.
 
-    The files will be saved as:
-        - custom.whl for the wheel file
+    The bundle is a virtual mapping from the path of each file inside the bundle
+    to its original location. Nothing is copied; the uploader streams each file
+    straight from its source path.
+
+    The files are placed in the bundle as:
+        - <wheel file name> for the wheel file
         - tests/ for the test folder
-        - requirements.txt for the requirements file
+        - <requirements file name> for the requirements file
 
     Args:
-        whl_path (str): The path to the wheel file (.whl) to copy.
         tests_path (str): The path to the directory containing unit tests.
-        requirements_file (str): The path to the requirements.txt file to copy.
+        whl_path (str, optional): The path to the wheel file (.whl).
+        requirements_file (str, optional): The path to the requirements file.
 
     Returns:
-        str: The path to the created temporary directory.
-    """
-    # Create a temporary directory
-    temp_dir = tempfile.mkdtemp()
+        Tuple[Dict[str, str], str, str]: The mapping from bundle paths
+            (with forward slashes) to source paths, the name of the wheel file
+            and the name of the requirements file.
+            The names are None if the files are not provided.
 
+    Raises:
+        RuntimeError: If the test folder or one of the files does not exist.
+    """
     try:
-        # Define the destination of tests
-        temp_tests_dir = Path(temp_dir) / "tests"
+        if not os.path.isdir(tests_path):
+            raise FileNotFoundError(f"The test folder {tests_path} does not exist")
 
-        # Copy and rename the tests folder to 'tests'
-        shutil.copytree(tests_path, temp_tests_dir)
+        files = {}
+
+        # Map the tests folder to 'tests'
+        for root, _, file_names in os.walk(tests_path, followlinks=True):
+            for file_name in file_names:
+                file_path = os.path.join(root, file_name)
+                relative_path = os.path.relpath(file_path, tests_path)
+                files[f"tests/{Path(relative_path).as_posix()}"] = file_path
 
         if whl_path:
-            # Define the destination of whl
-            temp_whl_path = Path(temp_dir) / Path(whl_path).name
-            # Copy and rename the wheel file to 'custom.whl'
-            shutil.copy2(whl_path, temp_whl_path)
+            if not os.path.isfile(whl_path):
+                raise FileNotFoundError(f"The wheel file {whl_path} does not exist")
             _whl_name = Path(whl_path).name
+            files[_whl_name] = whl_path
         else:
             _whl_name = None
 
         if requirements_file:
-            # Define the destination of reqs
-            temp_requirements_file = (
-                Path(temp_dir) / Path(requirements_file).name
-            )  # "requirements.txt"
-            # Copy and rename the requirements file to 'requirements.txt'
-            shutil.copy2(requirements_file, temp_requirements_file)
+            if not os.path.isfile(requirements_file):
+                raise FileNotFoundError(
+                    f"The requirements file {requirements_file} does not exist"
+                )
             _rqs_name = Path(requirements_file).name
+            files[_rqs_name] = requirements_file
         else:
             _rqs_name = None
 
-        print(f"Temporary folder created at: {temp_dir}")
-        return temp_dir, _whl_name, _rqs_name
+        logger.info("Collected %d files for the bundle", len(files))
+        return files, _whl_name, _rqs_name
+
+    except Exception as e:  # noqa: BLE001
+        raise RuntimeError(f"Failed to collect files: {str(e)}")
+
+
+def create_bundle_archive(
+    *, files: Dict[str, str], archive_dir: str, archive_name: str = BUNDLE_ARCHIVE_NAME
+) -> Tuple[Dict[str, str], str]:
+    """
+    Packs the files of a bundle into a single compressed zip archive.
+
+    The archive is written to `archive_dir`, which is owned by the caller, e.g.
+    a `tempfile.TemporaryDirectory`, so it is cleaned up deterministically.
+    The files are added in sorted order, with a fixed timestamp and fixed
+    permissions, so unchanged content gives an identical archive, e.g. after
+    a fresh checkout in CI.
+
+    Args:
+        files (Dict[str, str]): The bundle, as returned by `collect_bundle_files`.
+        archive_dir (str): The folder the archive is written to.
+        archive_name (str, optional): The file name of the archive.
+            Defaults to "fabric-testing-bundle.zip".
+
+    Returns:
+        Tuple[Dict[str, str], str]: A bundle containing only the archive,
+            and the file name of the archive.
+
+    Raises:
+        RuntimeError: If the archive cannot be created.
+    """
+    archive_path = os.path.join(archive_dir, archive_name)
+
+    try:
+        with zipfile.ZipFile(
+            archive_path, "w", compression=zipfile.ZIP_DEFLATED
+        ) as archive:
+            for bundle_path in sorted(files):
+                member = zipfile.ZipInfo(bundle_path, date_time=_ARCHIVE_DATE_TIME)
+                member.compress_type = zipfile.ZIP_DEFLATED
+                member.external_attr = _ARCHIVE_FILE_MODE << 16
+                # Streamed, so large wheels are never read into memory at once
+                with (
+                    open(files[bundle_path], "rb") as source,
+                    archive.open(member, "w") as target,
+                ):
+                    shutil.copyfileobj(source, target)
+
+        logger.info("Bundle archive created at: %s", archive_path)
+        return {archive_name: archive_path}, archive_name
 
     except Exception as e:  # noqa: BLE001
-        # Clean up the temp folder in case of failure
-        shutil.rmtree(temp_dir)
-        raise RuntimeError(f"Failed to create temporary folder: {str(e)}")
+        # Remove a partially written archive
+        if os.path.exists(archive_path):
+            os.remove(archive_path)
+        raise RuntimeError(f"Failed to create bundle archive: {str(e)}")
@@ -1,3 +1,69 @@
+import os
+from typing import List, Optional, Tuple
+
+
+def _parse_fetch_url_line(line: str) -> Tuple[str, Optional[int], Optional[str]]:
+    # Each line is "<fetch_url> [<retry_after>] [<results_url>]"
+    fetch_url, *rest = line.split()
+    retry_after = next((int(value) for value in rest if value.isdigit()), None)
+    results_url = next((value for value in rest if "://" in value), None)
+    return fetch_url, retry_after, results_url
+
+
+def load_fetch_url_log(file_name: str = "fetch_url.txt") -> Tuple[str, Optional[int]]:
+    """
+    Reads the URL and the suggested polling interval from a .txt file.
+
+    Returns:
+        Tuple[str, Optional[int]]: The URL stored in the file, and the polling
+            interval (in seconds) suggested by Fabric, or None if it was not logged.
+    """
+    # Open the file in read mode
+    with open(file_name, "r") as file:
+        # Read the first line, i.e. "<fetch_url> [<retry_after>]"
+        lines = file.read().strip().splitlines()
+
+    if not lines:
+        return "", None
+
+    fetch_url, retry_after, _ = _parse_fetch_url_line(lines[0])
+    return fetch_url, retry_after
+
+
+def load_fetch_url_logs(path: str) -> List[Tuple[str, Optional[int], Optional[str]]]:
+    """
+    Reads all fetch URLs from a log file, or from every file in a directory.
+
+    Every non-empty line of a log holds one fetch URL, optionally followed by
+    the polling interval suggested by Fabric and the OneLake URL of the
+    test results.
+
+    Args:
+        path (str): The path to a log file, or a directory of log files.
+
+    Returns:
+        List[Tuple[str, Optional[int], Optional[str]]]: The fetch URLs, their
+            polling intervals (in seconds) and the URLs of their test results.
+            The interval and the results URL are None if they were not logged.
+    """
+    if os.path.isdir(path):
+        file_names = [
+            os.path.join(path, name)
+            for name in sorted(os.listdir(path))
+            if os.path.isfile(os.path.join(path, name))
+        ]
+    else:
+        file_names = [path]
+
+    fetch_urls = []
+    for file_name in file_names:
+        with open(file_name, "r") as file:
+            for line in file.read().splitlines():
+                if line.strip():
+                    fetch_urls.append(_parse_fetch_url_line(line))
+    return fetch_urls
+
+
 def load_fetch_url(file_name: str = "fetch_url.txt") -> str:
     """
     Reads the URL from a .txt file and returns it.
@@ -5,8 +71,5 @@ def load_fetch_url(file_name: str = "fetch_url.txt") -> str:
     Returns:
         str: The URL stored in the file.
     """
-    # Open the file in read mode
-    with open(file_name, "r") as file:
-        # Read the contents of the file and return it
-        fetch_url = file.read().strip()
+    fetch_url, _ = load_fetch_url_log(file_name)
     return fetch_url
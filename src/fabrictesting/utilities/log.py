@@ -0,0 +1,229 @@
+import argparse
+import json
+import logging
+import sys
+import threading
+import time
+
+# Formats of the log output: plain messages, or one JSON object per line
+LOG_FORMATS = ("text", "json")
+DEFAULT_LOG_FORMAT = "text"
+
+# Seconds between two progress summaries of a long-running operation
+DEFAULT_PROGRESS_LOG_INTERVAL = 5.0
+
+# The logger of the package, all module loggers are its children
+PACKAGE_LOGGER_NAME = "fabrictesting"
+
+# Attributes of every log record, the other attributes are passed with `extra`
+_RECORD_ATTRIBUTES = frozenset(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__
+) | {"message", "asctime"}
+
+_handler = None
+_handler_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats a log record as a single-line JSON object.
+
+    The object holds the time, level, logger name and message of the record,
+    the fields passed with `extra`, and the traceback of an exception, if any.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(*, verbosity: int = 0, log_format: str = DEFAULT_LOG_FORMAT):
+    """
+    Sends the log messages of the package to the standard output.
+
+    By default, informational messages are shown, e.g. the stages of submit
+    and progress summaries of uploads and polls. Verbose output adds the
+    messages per file and per poll; quiet output only shows warnings and errors.
+    Calling the function again replaces the previous configuration.
+
+    Args:
+        verbosity (int, optional): -1 for quiet, 0 for the default and 1 for
+            verbose output. Defaults to 0.
+        log_format (str, optional): "text" or "json". Defaults to "text".
+
+    Raises:
+        ValueError: If the log format is unknown.
+    """
+    global _handler
+
+    if log_format == "json":
+        formatter = JsonFormatter()
+    elif log_format == "text":
+        formatter = logging.Formatter(
+            "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+            if verbosity > 0
+            else "%(message)s"
+        )
+    else:
+        raise ValueError(
+            f"Unknown log format {log_format}, "
+            f"expected one of {', '.join(LOG_FORMATS)}"
+        )
+
+    if verbosity < 0:
+        level = logging.WARNING
+    elif verbosity > 0:
+        level = logging.DEBUG
+    else:
+        level = logging.INFO
+
+    logger = logging.getLogger(PACKAGE_LOGGER_NAME)
+    with _handler_lock:
+        if _handler is not None:
+            logger.removeHandler(_handler)
+        _handler = logging.StreamHandler(sys.stdout)
+        _handler.setFormatter(formatter)
+        logger.addHandler(_handler)
+        logger.setLevel(level)
+
+
+def add_logging_arguments(parser: argparse.ArgumentParser):
+    """
+    Adds the `--quiet`, `--verbose` and `--log-format` arguments to a parser.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser of the CLI command.
+    """
+    verbosity_group = parser.add_mutually_exclusive_group()
+
+    verbosity_group.add_argument(
+        "--quiet",
+        "-q",
+        action="store_true",
+        help="Only print warnings and errors.",
+    )
+
+    verbosity_group.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="Also print a message per uploaded file and per poll.",
+    )
+
+    parser.add_argument(
+        "--log-format",
+        type=str,
+        required=False,
+        choices=LOG_FORMATS,
+        default=DEFAULT_LOG_FORMAT,
+        help="The format of the output: 'text', or 'json' for one JSON "
+        "object per line.",
+    )
+
+
+def configure_logging_from_args(args: argparse.Namespace):
+    """
+    Configures the logging from the arguments added by `add_logging_arguments`.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments of the CLI command.
+    """
+    configure_logging(
+        verbosity=-1 if args.quiet else 1 if args.verbose else 0,
+        log_format=args.log_format,
+    )
+
+
+class ProgressLogger:
+    """
+    Summarizes the progress of many small operations, e.g. file uploads.
+
+    Instead of a message per file, the number of finished files and bytes and
+    the throughput (files/s and MB/s) are logged every few seconds, and once
+    more when all files are done. In the JSON format the numbers are also
+    fields of the log record.
+
+    Args:
+        logger (logging.Logger): The logger of the operation.
+        action (str): What is done to the files, e.g. "Uploaded".
+        total (int): The number of files.
+        interval (float, optional): The time (in seconds) between two
+            summaries. Defaults to 5.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        *,
+        action: str,
+        total: int,
+        interval: float = DEFAULT_PROGRESS_LOG_INTERVAL,
+    ):
+        self._logger = logger
+        self._action = action
+        self._total = total
+        self._interval = interval
+        self._files = 0
+        self._bytes = 0
+        self._started_at = time.monotonic()
+        self._logged_at = self._started_at
+        self._lock = threading.Lock()
+
+    def update(self, *, files: int = 1, size: int = 0):
+        """
+        Records finished files, and logs a summary if the interval has passed.
+
+        Args:
+            files (int, optional): The number of finished files. Defaults to 1.
+            size (int, optional): Their size (in bytes). Defaults to 0.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._files += files
+            self._bytes += size
+            if now - self._logged_at < self._interval:
+                return
+            self._logged_at = now
+            files_done, bytes_done = self._files, self._bytes
+        self._log(files_done, bytes_done, now - self._started_at)
+
+    def finish(self):
+        """
+        Logs the final summary.
+        """
+        with self._lock:
+            files_done, bytes_done = self._files, self._bytes
+        self._log(files_done, bytes_done, time.monotonic() - self._started_at)
+
+    def _log(self, files: int, size: int, elapsed: float):
+        megabytes = size / (1024 * 1024)
+        files_per_second = files / elapsed if elapsed > 0 else 0.0
+        megabytes_per_second = megabytes / elapsed if elapsed > 0 else 0.0
+        self._logger.info(
+            "%s %d/%d files (%.1f MB) in %.1f s, %.1f files/s, %.2f MB/s",
+            self._action,
+            files,
+            self._total,
+            megabytes,
+            elapsed,
+            files_per_second,
+            megabytes_per_second,
+            extra={
+                "files": files,
+                "total": self._total,
+                "bytes": size,
+                "seconds": round(elapsed, 3),
+                "files_per_second": round(files_per_second, 3),
+                "megabytes_per_second": round(megabytes_per_second, 3),
+            },
+        )
@@ -0,0 +1,110 @@
+import hashlib
+import json
+from typing import Dict, Optional
+
+# Name of the manifest file stored alongside the bundle in OneLake
+MANIFEST_FILE_NAME = "fabric-testing-manifest.json"
+
+# Read files in blocks of 1 MiB when hashing
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def compute_file_digest(file_path: str) -> str:
+    """
+    Computes the SHA-256 digest of a file.
+
+    The file is read in blocks, so large wheels are never fully loaded in memory.
+
+    Args:
+        file_path (str): The path to the file.
+
+    Returns:
+        str: The hex encoded SHA-256 digest of the file content.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def create_manifest(files: Dict[str, str]) -> Dict[str, str]:
+    """
+    Creates a content-hash manifest of all files in a bundle.
+
+    Args:
+        files (Dict[str, str]): A mapping from the path of each file in the bundle
+            to its local source path, as returned by `collect_bundle_files`.
+
+    Returns:
+        Dict[str, str]: A dictionary mapping the bundle path of each file
+            to its SHA-256 digest.
+    """
+    return {
+        bundle_path: compute_file_digest(file_path)
+        for bundle_path, file_path in files.items()
+    }
+
+
+def save_manifest_log(
+    *,
+    manifest: Dict[str, str],
+    submit_folder: str,
+    workspace_name: str,
+    lakehouse_name: str,
+    file_name: str = MANIFEST_FILE_NAME,
+) -> None:
+    """
+    Writes the manifest of an uploaded bundle to a local .json file.
+
+    Besides the manifest, the file records where the bundle was uploaded to,
+    so a later submit can reuse the unchanged files of this bundle.
+
+    Args:
+        manifest (Dict[str, str]): The manifest of the uploaded bundle.
+        submit_folder (str): The OneLake folder the bundle was uploaded to.
+        workspace_name (str): The name of the workspace.
+        lakehouse_name (str): The name of the lakehouse.
+        file_name (str, optional): The path of the local manifest file.
+    """
+    content = {
+        "workspace_name": workspace_name,
+        "lakehouse_name": lakehouse_name,
+        "submit_folder": submit_folder,
+        "files": manifest,
+    }
+    with open(file_name, "w") as file:
+        json.dump(content, file, indent=2, sort_keys=True)
+
+
+def load_manifest_log(
+    *, workspace_name: str, lakehouse_name: str, file_name: str = MANIFEST_FILE_NAME
+) -> Optional[dict]:
+    """
+    Reads the manifest of a previously uploaded bundle from a local .json file.
+
+    Args:
+        workspace_name (str): The name of the workspace of the current submit.
+        lakehouse_name (str): The name of the lakehouse of the current submit.
+        file_name (str, optional): The path of the local manifest file.
+
+    Returns:
+        Optional[dict]: The content written by `save_manifest_log`, or None if the
+            file does not exist, cannot be read, or belongs to another
+            workspace or lakehouse.
+    """
+    try:
+        with open(file_name, "r") as file:
+            content = json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+    if (
+        content.get("workspace_name") != workspace_name
+        or content.get("lakehouse_name") != lakehouse_name
+        or not content.get("submit_folder")
+        or not isinstance(content.get("files"), dict)
+    ):
+        return None
+
+    return content
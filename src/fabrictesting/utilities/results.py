@@ -0,0 +1,192 @@
+import json
+import logging
+import uuid
+from typing import Dict, List, Tuple
+from urllib.parse import quote, unquote, urlparse
+
+logger = logging.getLogger(__name__)
+
+# Prefix of the folders in the submit folder that receive the test results
+DEFAULT_RESULTS_NAME = "results"
+
+# Name of the JSON summary written by the notebook
+SUMMARY_FILE_NAME = "summary.json"
+
+# Name of the merged test durations written by fetch
+TEST_DURATIONS_FILE_NAME = "test-durations.json"
+
+# Suffix of the NDJSON test progress log, next to the results folder
+PROGRESS_FILE_SUFFIX = "-progress.ndjson"
+
+# Progress events of tests that did not pass
+FAILURE_EVENTS = ("failed", "error")
+
+_ONELAKE_HOST = "onelake.dfs.fabric.microsoft.com"
+
+
+def create_results_name() -> str:
+    """
+    Generates a unique name for the results folder of a test run.
+
+    The bundle folder is reused by later runs if the bundle did not change, and
+    the persistent runner runs every job in it, so the results of each run go to
+    a folder of their own, e.g. 'results-1a2b3c4d'. Otherwise the reports and
+    the progress log of earlier runs would be read as part of this run.
+
+    Returns:
+        str: The name of the results folder.
+    """
+    return f"{DEFAULT_RESULTS_NAME}-{uuid.uuid4().hex[:8]}"
+
+
+def create_results_url(
+    *,
+    workspace_name: str,
+    lakehouse_name: str,
+    submit_folder: str,
+    results_name: str = DEFAULT_RESULTS_NAME,
+) -> str:
+    """
+    Creates the OneLake URL of the folder the notebook writes the test results to.
+
+    The names are URL encoded, so the URL never contains whitespace and can be
+    logged on the same line as the fetch URL.
+
+    Args:
+        workspace_name (str): The name of the workspace.
+        lakehouse_name (str): The name of the lakehouse.
+        submit_folder (str): The OneLake folder of the bundle.
+        results_name (str, optional): The folder of the results in the submit
+            folder. Defaults to "results".
+
+    Returns:
+        str: The abfss URL of the results folder.
+    """
+    return (
+        f"abfss://{quote(workspace_name)}@{_ONELAKE_HOST}/"
+        f"{quote(lakehouse_name)}.Lakehouse/Files/fabric-testing/"
+        f"{quote(submit_folder)}/{quote(results_name)}"
+    )
+
+
+def parse_results_url(results_url: str) -> Tuple[str, str]:
+    """
+    Splits the OneLake URL of a results folder into workspace and directory.
+
+    Args:
+        results_url (str): The URL created by `create_results_url`.
+
+    Returns:
+        Tuple[str, str]: The name of the workspace, i.e. the file system,
+            and the path of the results folder in it.
+
+    Raises:
+        ValueError: If the URL is not a OneLake abfss URL.
+    """
+    parsed_url = urlparse(results_url)
+    workspace_name, _, host = parsed_url.netloc.partition("@")
+
+    if parsed_url.scheme != "abfss" or host != _ONELAKE_HOST or not workspace_name:
+        raise ValueError(f"{results_url} is not a OneLake results URL")
+
+    return unquote(workspace_name), unquote(parsed_url.path.lstrip("/"))
+
+
+def get_progress_path(results_directory: str) -> str:
+    """
+    Returns the path of the NDJSON test progress log of a results folder.
+
+    Args:
+        results_directory (str): The path of the results folder in OneLake.
+
+    Returns:
+        str: The path of the progress log, next to the results folder.
+    """
+    return f"{results_directory}{PROGRESS_FILE_SUFFIX}"
+
+
+def format_progress_event(event: dict) -> str:
+    """
+    Formats a test progress event of the notebook as a single line.
+
+    Args:
+        event (dict): The progress event, e.g.
+            {"event": "failed", "test": "test_a.py::test_b", "duration": 0.1}.
+
+    Returns:
+        str: The formatted event, or None for events that are not printed,
+            i.e. started tests.
+    """
+    name = event.get("event")
+
+    if name == "collected":
+        return f"Collected {event.get('count', 0)} tests"
+    if name == "finished":
+        return f"Test session finished with exit status {event.get('exitstatus')}"
+    if name in ("passed", "skipped", *FAILURE_EVENTS):
+        return f"{name.upper()} {event.get('test')} ({event.get('duration', 0)}s)"
+    return None
+
+
+def log_test_summary(summary: dict, *, label: str) -> None:
+    """
+    Logs the counts of a test summary and the tests that did not pass.
+
+    Args:
+        summary (dict): The test summary written by the notebook.
+        label (str): The name of the job, logged as the title.
+    """
+    logger.info(
+        "Test results of %s: %s passed, %s failed, %s errors, %s skipped "
+        "in %s seconds",
+        label,
+        summary.get("passed", 0),
+        summary.get("failed", 0),
+        summary.get("error", 0),
+        summary.get("skipped", 0),
+        summary.get("duration", 0),
+    )
+    for test in summary.get("tests", []):
+        if test.get("outcome") in ("failed", "error"):
+            logger.info(
+                "    %s: %s::%s",
+                test["outcome"].upper(),
+                test.get("file"),
+                test.get("name"),
+            )
+
+
+def merge_test_durations(summaries: List[dict]) -> Dict[str, float]:
+    """
+    Sums the durations of the tests per test file, over several test summaries.
+
+    The result has the format of the `--test-durations-file` of submit, so the
+    durations of a run balance the shards of the next run.
+
+    Args:
+        summaries (List[dict]): The test summaries written by the notebook.
+
+    Returns:
+        Dict[str, float]: The duration (in seconds) of each test file,
+            relative to the test folder.
+    """
+    durations = {}
+    for summary in summaries:
+        for test in summary.get("tests", []):
+            if test.get("file"):
+                durations[test["file"]] = round(
+                    durations.get(test["file"], 0.0) + test.get("duration", 0.0), 3
+                )
+    return durations
+
+
+def save_test_durations(durations: Dict[str, float], file_name: str) -> None:
+    """
+    Writes the durations of the test files to a .json file.
+
+    Args:
+        durations (Dict[str, float]): The duration (in seconds) of each test file.
+        file_name (str): The path of the file.
+    """
+    with open(file_name, "w") as file:
+        json.dump(durations, file, indent=2, sort_keys=True)
@@ -1,11 +1,60 @@
-def save_fetch_url_log(fetch_url: str, file_name: str = "fetch_url.txt") -> None:
+from typing import List, Optional, Tuple
+
+
+def _format_fetch_url_line(
+    fetch_url: str, retry_after: int = None, results_url: str = None
+) -> str:
+    return " ".join(
+        str(value) for value in (fetch_url, retry_after, results_url) if value
+    )
+
+
+def save_fetch_url_log(
+    fetch_url: str,
+    file_name: str = "fetch_url.txt",
+    retry_after: int = None,
+    results_url: str = None,
+) -> None:
     """
     Writes the given URL to a .txt file.
 
+    If `retry_after` is given, the polling interval suggested by Fabric is
+    written after the URL on the same line, so fetch can use it. If
+    `results_url` is given, the OneLake folder of the test results follows,
+    so fetch can download them.
+
     Args:
         fetch_url (str): The URL to be written into the file.
+        file_name (str, optional): The name of the file.
+        retry_after (int, optional): The polling interval (in seconds)
+            suggested by Fabric.
+        results_url (str, optional): The OneLake URL of the test results.
     """
     # Open a file named "output.txt" in write mode
     with open(file_name, "w") as file:
         # Write the URL string to the file
-        file.write(fetch_url)
+        file.write(_format_fetch_url_line(fetch_url, retry_after, results_url))
+
+
+def save_fetch_url_logs(
+    fetch_urls: List[Tuple[str, Optional[int], Optional[str]]],
+    file_name: str = "fetch_url.txt",
+) -> None:
+    """
+    Writes several URLs to a .txt file, one per line.
+
+    Every line has the same format as `save_fetch_url_log`,
+    so fetch can poll all jobs at once.
+
+    Args:
+        fetch_urls (List[Tuple[str, Optional[int], Optional[str]]]): The URLs
+            to be written into the file, together with the polling interval
+            (in seconds) suggested by Fabric and the OneLake URL of the test
+            results, or None.
+        file_name (str, optional): The name of the file.
+    """
+    with open(file_name, "w") as file:
+        for fetch_url, retry_after, results_url in fetch_urls:
+            file.write(
+                f"{_format_fetch_url_line(fetch_url, retry_after, results_url)}\n"
+            )
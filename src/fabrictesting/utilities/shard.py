@@ -0,0 +1,118 @@
+import fnmatch
+import heapq
+import json
+import logging
+import posixpath
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Folder of the tests inside the bundle, see `collect_bundle_files`
+TESTS_BUNDLE_FOLDER = "tests"
+
+# File name patterns pytest collects by default
+TEST_FILE_PATTERNS = ("test_*.py", "*_test.py")
+
+
+def collect_test_files(bundle: Dict[str, str]) -> List[str]:
+    """
+    Lists the test files of a bundle.
+
+    Args:
+        bundle (Dict[str, str]): The bundle, as returned by `collect_bundle_files`.
+
+    Returns:
+        List[str]: The sorted paths of the test files,
+            relative to the test folder and with forward slashes.
+    """
+    prefix = f"{TESTS_BUNDLE_FOLDER}/"
+    return sorted(
+        bundle_path[len(prefix) :]
+        for bundle_path in bundle
+        if bundle_path.startswith(prefix)
+        and any(
+            fnmatch.fnmatch(posixpath.basename(bundle_path), pattern)
+            for pattern in TEST_FILE_PATTERNS
+        )
+    )
+
+
+def load_test_durations(file_name: str) -> Dict[str, float]:
+    """
+    Reads the historical durations of the test files from a JSON file.
+
+    The file maps the path of each test file, relative to the test folder,
+    to its duration in seconds, e.g. {"test_io.py": 12.5}.
+
+    Args:
+        file_name (str): The path to the JSON file.
+
+    Returns:
+        Dict[str, float]: The durations (in seconds) by test file,
+            or an empty dictionary if the file does not exist or is invalid.
+    """
+    try:
+        with open(file_name, "r") as file:
+            content = json.load(file)
+        if not isinstance(content, dict):
+            raise ValueError(f"{file_name} does not contain a JSON object")
+    # json.JSONDecodeError is a ValueError as well
+    except (FileNotFoundError, ValueError) as e:
+        logger.warning(
+            "Could not read the test durations, sharding by file count: %s", e
+        )
+        return {}
+
+    return {
+        test_file: float(duration)
+        for test_file, duration in content.items()
+        if isinstance(duration, (int, float))
+    }
+
+
+def split_test_files(
+    *, test_files: List[str], shard_count: int, durations: Dict[str, float] = None
+) -> List[List[str]]:
+    """
+    Splits test files into shards with roughly the same total duration.
+
+    Files are assigned longest first, each to the shard with the smallest
+    total so far. Files without a known duration count as the average of the
+    known durations, so without any durations the shards get the same number
+    of files.
+
+    Args:
+        test_files (List[str]): The test files to split.
+        shard_count (int): The maximum number of shards.
+        durations (Dict[str, float], optional): The historical durations
+            (in seconds) by test file. Defaults to None.
+
+    Returns:
+        List[List[str]]: The sorted test files of each shard. There are never
+            more shards than test files, and no shard is empty.
+    """
+    if shard_count < 1:
+        raise ValueError("shard_count must be at least 1")
+
+    durations = durations or {}
+    known_durations = [durations[f] for f in test_files if f in durations]
+    default_duration = (
+        sum(known_durations) / len(known_durations) if known_durations else 1.0
+    )
+
+    weighted_files = sorted(
+        ((durations.get(f, default_duration), f) for f in test_files),
+        key=lambda item: (-item[0], item[1]),
+    )
+
+    shard_count = min(shard_count, len(test_files))
+    shards = [[] for _ in range(shard_count)]
+    # Heap of (total duration, shard index), the lightest shard comes first
+    totals = [(0.0, index) for index in range(shard_count)]
+
+    for duration, test_file in weighted_files:
+        total, index = heapq.heappop(totals)
+        shards[index].append(test_file)
+        heapq.heappush(totals, (total + duration, index))
+
+    return [sorted(shard) for shard in shards]
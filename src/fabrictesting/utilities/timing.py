@@ -0,0 +1,86 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+
+from fabrictesting.utilities.tracing import get_default_tracer
+
+logger = logging.getLogger(__name__)
+
+
+class StageTimer:
+    """
+    Measures the wall-clock duration of the stages of a test run.
+
+    Stages may run concurrently, e.g. the bundle upload in a background thread
+    while the notebook is generated, so every stage records when it started
+    relative to the timer, next to its duration.
+
+    Usage:
+        timer = StageTimer()
+        with timer.stage("bundle upload"):
+            ...
+        timer.log_summary()
+    """
+
+    def __init__(self):
+        self._started_at = time.monotonic()
+        self._stages = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Measures the stage that runs inside the `with` block.
+
+        The stage is recorded even if the block raises. It is also recorded
+        as a span of the default tracer, see `get_default_tracer`.
+
+        Args:
+            name (str): The name of the stage.
+
+        Yields:
+            Span: The span of the stage, to set attributes on.
+        """
+        started_at = time.monotonic()
+        try:
+            with get_default_tracer().span(name) as span:
+                yield span
+        finally:
+            finished_at = time.monotonic()
+            with self._lock:
+                self._stages.append(
+                    (name, started_at - self._started_at, finished_at - started_at)
+                )
+
+    @property
+    def stages(self) -> List[Tuple[str, float, float]]:
+        """
+        The name, start (in seconds since the timer was created) and duration
+        (in seconds) of every finished stage, in the order they started.
+        """
+        with self._lock:
+            return sorted(self._stages, key=lambda stage: stage[1])
+
+    @property
+    def elapsed(self) -> float:
+        """
+        The time (in seconds) since the timer was created.
+        """
+        return time.monotonic() - self._started_at
+
+    def log_summary(self):
+        """
+        Logs the start and duration of every stage, and the total duration.
+        """
+        logger.info("Stage timings:")
+        for name, start, duration in self.stages:
+            logger.info(
+                "    %-24s%9.2f s  (started at %.2f s)",
+                name,
+                duration,
+                start,
+                extra={"stage": name, "seconds": round(duration, 3)},
+            )
+        logger.info("    %-24s%9.2f s", "total", self.elapsed)
@@ -0,0 +1,356 @@
+import argparse
+import contextvars
+import json
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+# Formats of the trace file: the spans as plain JSON, or OTLP/JSON
+# (the OpenTelemetry protocol), which OpenTelemetry collectors can import
+TRACE_FORMATS = ("json", "otlp")
+DEFAULT_TRACE_FORMAT = "json"
+
+# Name of the instrumentation scope and service in OTLP traces
+TRACE_SERVICE_NAME = "fabric-testing"
+
+# The span that is active in the current thread or asyncio task
+_current_span = contextvars.ContextVar("fabrictesting_current_span", default=None)
+
+_default_tracer = None
+_default_tracer_lock = threading.Lock()
+
+
+class Span:
+    """
+    A timed operation of a trace, e.g. a file upload or an HTTP request.
+
+    Args:
+        name (str): The name of the operation.
+        trace_id (str): The ID of the trace, as 32 hex characters.
+        parent_id (str, optional): The ID of the enclosing span. Defaults to None.
+        attributes (dict, optional): The initial attributes. Defaults to None.
+    """
+
+    # Whether the span is recorded, see `_NoopSpan`
+    recording = True
+
+    def __init__(
+        self, name: str, *, trace_id: str, parent_id: str = None, attributes=None
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes = {}
+        self.error = None
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns = None
+
+        for key, value in (attributes or {}).items():
+            self.set_attribute(key, value)
+
+    def set_attribute(self, key: str, value):
+        """
+        Sets an attribute of the span, e.g. a byte count or an HTTP status code.
+
+        Values of None are ignored.
+
+        Args:
+            key (str): The name of the attribute, e.g. "http.response.status_code".
+            value (str, int, float or bool): The value of the attribute.
+        """
+        if value is not None:
+            self.attributes[key] = value
+
+    @property
+    def duration(self) -> float:
+        """
+        The duration (in seconds) of the span, or None if it has not ended.
+        """
+        if self.end_time_ns is None:
+            return None
+        return (self.end_time_ns - self.start_time_ns) / 1e9
+
+    def to_dict(self) -> dict:
+        """
+        Returns the span in the plain JSON format of the trace file.
+        """
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time_ns / 1e9,
+            "duration": self.duration,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+    def to_otlp(self) -> dict:
+        """
+        Returns the span in the OTLP/JSON format of OpenTelemetry.
+        """
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            # SPAN_KIND_INTERNAL, or SPAN_KIND_CLIENT for outgoing requests
+            "kind": 3 if self.name.startswith("HTTP ") else 1,
+            "startTimeUnixNano": str(self.start_time_ns),
+            "endTimeUnixNano": str(self.end_time_ns or self.start_time_ns),
+            "attributes": [
+                {"key": key, "value": _to_otlp_value(value)}
+                for key, value in self.attributes.items()
+            ],
+            # STATUS_CODE_ERROR or STATUS_CODE_UNSET
+            "status": {"code": 2, "message": self.error} if self.error else {},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class _NoopSpan:
+    """
+    The span of a disabled tracer, which records nothing.
+    """
+
+    recording = False
+
+    def set_attribute(self, key: str, value):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def _to_otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # 64 bit integers are encoded as strings in OTLP/JSON
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class Tracer:
+    """
+    Records the spans of a CLI run, so its time can be attributed to stages.
+
+    Spans are opened with `span`, which measures the `with` block. A span opened
+    inside another span becomes its child. The active span is tracked per thread
+    and asyncio task, so worker threads only inherit it if they run in a copy of
+    the context (`contextvars.copy_context`).
+
+    A disabled tracer hands out a span that records nothing, so instrumented
+    code costs next to nothing unless a trace is requested.
+
+    Args:
+        enabled (bool, optional): Whether spans are recorded. Defaults to True.
+    """
+
+    def __init__(self, *, enabled: bool = True):
+        self.enabled = enabled
+        self.trace_id = uuid.uuid4().hex
+        self._spans = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """
+        Records the operation that runs inside the `with` block.
+
+        If the block raises, the error is recorded on the span and re-raised.
+
+        Args:
+            name (str): The name of the operation, e.g. "onelake.upload_file".
+            **attributes: The initial attributes of the span.
+
+        Yields:
+            Span: The span, to set further attributes on.
+        """
+        if not self.enabled:
+            yield _NOOP_SPAN
+            return
+
+        parent = _current_span.get()
+        span = Span(
+            name,
+            trace_id=self.trace_id,
+            parent_id=parent.span_id if parent is not None else None,
+            attributes=attributes,
+        )
+        context_token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(context_token)
+            span.end_time_ns = time.time_ns()
+            with self._lock:
+                self._spans.append(span)
+
+    @property
+    def spans(self) -> List[Span]:
+        """
+        The finished spans, in the order they started.
+        """
+        with self._lock:
+            return sorted(self._spans, key=lambda span: span.start_time_ns)
+
+    def to_json(self) -> dict:
+        """
+        Returns the trace in the plain JSON format.
+        """
+        return {
+            "trace_id": self.trace_id,
+            "spans": [span.to_dict() for span in self.spans],
+        }
+
+    def to_otlp(self) -> dict:
+        """
+        Returns the trace in the OTLP/JSON format of OpenTelemetry,
+        i.e. an `ExportTraceServiceRequest` with a single resource and scope.
+        """
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {
+                                "key": "service.name",
+                                "value": {"stringValue": TRACE_SERVICE_NAME},
+                            }
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "fabrictesting"},
+                            "spans": [span.to_otlp() for span in self.spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def export(self, file_path: str, *, trace_format: str = DEFAULT_TRACE_FORMAT):
+        """
+        Writes the trace to a file.
+
+        Args:
+            file_path (str): The path of the trace file.
+            trace_format (str, optional): "json" or "otlp". Defaults to "json".
+
+        Raises:
+            ValueError: If the trace format is unknown.
+        """
+        if trace_format == "json":
+            trace = self.to_json()
+        elif trace_format == "otlp":
+            trace = self.to_otlp()
+        else:
+            raise ValueError(
+                f"Unknown trace format {trace_format}, "
+                f"expected one of {', '.join(TRACE_FORMATS)}"
+            )
+
+        with open(file_path, "w", encoding="utf-8") as file:
+            json.dump(trace, file, indent=2)
+
+
+def get_default_tracer() -> Tracer:
+    """
+    Returns the tracer shared by all instrumented code in the process.
+
+    The tracer is disabled until `configure_default_tracer` is called.
+
+    Returns:
+        Tracer: The shared tracer.
+    """
+    global _default_tracer
+
+    with _default_tracer_lock:
+        if _default_tracer is None:
+            _default_tracer = Tracer(enabled=False)
+        return _default_tracer
+
+
+def configure_default_tracer(*, enabled: bool = True) -> Tracer:
+    """
+    Replaces the shared tracer, e.g. to start recording a new trace.
+
+    Args:
+        enabled (bool, optional): Whether spans are recorded. Defaults to True.
+
+    Returns:
+        Tracer: The new shared tracer.
+    """
+    global _default_tracer
+
+    with _default_tracer_lock:
+        _default_tracer = Tracer(enabled=enabled)
+        return _default_tracer
+
+
+@contextmanager
+def trace_to_file(
+    file_path: str, *, name: str, trace_format: str = DEFAULT_TRACE_FORMAT
+):
+    """
+    Records a trace of the `with` block and writes it to a file.
+
+    The whole block is recorded as a root span, and the file is written even
+    if the block raises. Nothing is recorded if no file path is given.
+
+    Args:
+        file_path (str): The path of the trace file, or None.
+        name (str): The name of the root span, e.g. "fabric-testing-submit".
+        trace_format (str, optional): "json" or "otlp". Defaults to "json".
+    """
+    if not file_path:
+        yield
+        return
+
+    tracer = configure_default_tracer()
+    try:
+        with tracer.span(name):
+            yield
+    finally:
+        tracer.export(file_path, trace_format=trace_format)
+        configure_default_tracer(enabled=False)
+        logger.info("Trace written to %s", file_path)
+
+
+def add_trace_arguments(parser: argparse.ArgumentParser):
+    """
+    Adds the `--trace-file` and `--trace-format` arguments to a parser.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser of the CLI command.
+    """
+    parser.add_argument(
+        "--trace-file",
+        type=str,
+        required=False,
+        default=None,
+        help="Record the duration, byte counts and HTTP status codes of every "
+        "stage, file upload and request, and write them to this file.",
+    )
+
+    parser.add_argument(
+        "--trace-format",
+        type=str,
+        required=False,
+        choices=TRACE_FORMATS,
+        default=DEFAULT_TRACE_FORMAT,
+        help="The format of the trace file: 'json', or 'otlp' for the "
+        "OpenTelemetry (OTLP/JSON) format.",
+    )
@@ -12,6 +12,10 @@ def validate_args(args, parser: argparse):
     1. If either `--client-id` or `--client-secret` is provided, both must be present.
     2. If `--service-principal` is set to `True`,
         both `--client-id` and `--client-secret` must be provided together.
+    3. If `--upload-workers`, `--shards` or `--test-workers` is provided,
+        it must be at least 1.
+    4. If `--retry-after` or `--max-attempts` is provided, it must be at least 1,
+        and `--timeout` and `--cancel-timeout` must not be negative.
 
     Args:
         args (argparse.Namespace): Parsed command-line arguments.
@@ -39,3 +43,17 @@ def validate_args(args, parser: argparse):
             "Expecting service principal but missing "
             "either --client-id or --client-secret."
         )
+
+    upload_workers = getattr(args, "upload_workers", None)
+    if upload_workers is not None and upload_workers < 1:
+        parser.error("--upload-workers must be at least 1.")
+
+    for name in ("shards", "test_workers", "retry_after", "max_attempts"):
+        value = getattr(args, name, None)
+        if value is not None and value < 1:
+            parser.error(f"--{name.replace('_', '-')} must be at least 1.")
+
+    for name in ("timeout", "cancel_timeout"):
+        value = getattr(args, name, None)
+        if value is not None and value < 0:
+            parser.error(f"--{name.replace('_', '-')} must not be negative.")
@@ -1,9 +1,12 @@
+import time
 import unittest
 from unittest.mock import MagicMock, patch
 
 from fabrictesting.fabric_api.api_access import (
     get_client_fabric_token,
+    get_client_token_provider,
     get_personal_fabric_token,
+    get_personal_token_provider,
 )
 
 
@@ -87,3 +90,51 @@ class TestFabricApiAccess(unittest.TestCase):
             )
 
         self.assertEqual(str(context.exception), "Token string was none")
+
+
+class TestTokenProviderFactories(unittest.TestCase):
+    @patch("fabrictesting.fabric_api.api_access.InteractiveBrowserCredential")
+    def test_get_personal_token_provider_reuses_token(
+        self, mock_interactive_credential
+    ):
+        """
+        Test the personal token provider authenticates once for repeated requests.
+        """
+        # Mocking the token with an expiry one hour ahead
+        mock_instance = mock_interactive_credential.return_value
+        mock_instance.get_token.return_value = MagicMock(
+            token="mock_token_string", expires_on=time.time() + 3600
+        )
+
+        provider = get_personal_token_provider("mock_tenant_id")
+
+        self.assertEqual(provider.get_token_string(), "mock_token_string")
+        self.assertEqual(provider.get_token_string(), "mock_token_string")
+        mock_interactive_credential.assert_called_once_with(tenant_id="mock_tenant_id")
+        mock_instance.get_token.assert_called_once_with(
+            "https://api.fabric.microsoft.com/.default"
+        )
+
+    @patch("fabrictesting.fabric_api.api_access.ClientSecretCredential")
+    def test_get_client_token_provider(self, mock_client_secret_credential):
+        """
+        Test the client token provider uses the client secret credential.
+        """
+        mock_instance = mock_client_secret_credential.return_value
+        mock_instance.get_token.return_value = MagicMock(
+            token="mock_client_token_string", expires_on=time.time() + 3600
+        )
+
+        provider = get_client_token_provider(
+            "mock_tenant_id", "mock_client_id", "mock_client_secret"
+        )
+
+        self.assertEqual(
+            provider.get_token_string("https://storage.azure.com/.default"),
+            "mock_client_token_string",
+        )
+        mock_client_secret_credential.assert_called_once_with(
+            tenant_id="mock_tenant_id",
+            client_id="mock_client_id",
+            client_secret="mock_client_secret",
+        )
@@ -0,0 +1,202 @@
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+from fabrictesting.fabric_api.client import (
+    FabricApiClient,
+    get_default_client,
+    get_fabric_api_url,
+)
+from fabrictesting.fabric_api.streaming_body import StreamingBody
+from fabrictesting.utilities.tracing import configure_default_tracer
+
+
+def _response(status_code: int, headers: dict = None) -> MagicMock:
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+
+class TestFabricApiClient(unittest.TestCase):
+    """
+    Test Plan:
+    Test 1: A successful response is returned without retries.
+    Test 2: A throttled request waits for the Retry-After header and is retried.
+    Test 3: A server error without Retry-After is retried with a jittered backoff.
+    Test 4: The last response is returned when the retries are exhausted.
+    Test 5: Connection errors are retried for GET but not for POST.
+    Test 6: A streamed body is rewound before a retry.
+    Test 7: The default client is shared.
+    Test 8: A traced request records its status code and body sizes.
+    Test 9: The base URL of the API can be overridden by an environment variable.
+    Test 10: A server error is not resent for POST, only throttling is.
+    """
+
+    def setUp(self):
+        self.client = FabricApiClient(max_retries=2, backoff_factor=1.0)
+        self.mock_request = MagicMock()
+        self.client._session.request = self.mock_request
+
+    @patch("fabrictesting.fabric_api.client.time.sleep")
+    def test_success_is_not_retried(self, mock_sleep):
+        """
+        Test a successful response is returned directly.
+        """
+        self.mock_request.return_value = _response(200)
+
+        response = self.client.get("https://example.com", headers={"a": "b"})
+
+        self.assertEqual(response.status_code, 200)
+        self.mock_request.assert_called_once_with(
+            "GET", "https://example.com", headers={"a": "b"}, timeout=60
+        )
+        mock_sleep.assert_not_called()
+
+    @patch("fabrictesting.fabric_api.client.time.sleep")
+    def test_throttled_request_honours_retry_after(self, mock_sleep):
+        """
+        Test a 429 response is retried after the Retry-After delay.
+        """
+        self.mock_request.side_effect = [
+            _response(429, {"Retry-After": "7"}),
+            _response(202),
+        ]
+
+        response = self.client.post("https://example.com")
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(self.mock_request.call_count, 2)
+        mock_sleep.assert_called_once_with(7.0)
+
+    @patch("fabrictesting.fabric_api.client.random.uniform", return_value=0.5)
+    @patch("fabrictesting.fabric_api.client.time.sleep")
+    def test_server_error_uses_jittered_backoff(self, mock_sleep, mock_uniform):
+        """
+        Test a 503 response without Retry-After is retried with exponential backoff.
+        """
+        self.mock_request.side_effect = [_response(503), _response(503), _response(200)]
+
+        response = self.client.get("https://example.com")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [c.args for c in mock_uniform.call_args_list], [(0, 1.0), (0, 2.0)]
+        )
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    @patch("fabrictesting.fabric_api.client.time.sleep")
+    def test_retries_exhausted_returns_last_response(self, mock_sleep):
+        """
+        Test the last response is returned when every attempt is throttled.
+        """
+        self.mock_request.return_value = _response(429, {"Retry-After": "1"})
+
+        response = self.client.get("https://example.com")
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(self.mock_request.call_count, 3)
+
+    @patch("fabrictesting.fabric_api.client.time.sleep")
+    def test_connection_error_retried_only_for_get(self, mock_sleep):
+        """
+        Test connection errors are retried for GET and raised for POST.
+        """
+        self.mock_request.side_effect = [requests.ConnectionError(), _response(200)]
+        self.assertEqual(self.client.get("https://example.com").status_code, 200)
+
+        self.mock_request.side_effect = [requests.ConnectionError(), _response(200)]
+        with self.assertRaises(requests.ConnectionError):
+            self.client.post("https://example.com")
+
+    @patch("fabrictesting.fabric_api.client.time.sleep")
+    def test_server_error_not_retried_for_post(self, mock_sleep):
+        """
+        Test a 503 response to a POST is returned without resending the request.
+        """
+        self.mock_request.side_effect = [_response(503), _response(202)]
+
+        response = self.client.post("https://example.com")
+
+        self.assertEqual(response.status_code, 503)
+        self.mock_request.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    @patch("fabrictesting.fabric_api.client.time.sleep")
+    def test_streamed_body_rewound_on_retry(self, mock_sleep):
+        """
+        Test every attempt sends the whole streamed body.
+        """
+        body = StreamingBody([b"streamed ", b"body"])
+        sent_bodies = []
+
+        def _send(method, url, data, timeout):
+            sent_bodies.append(data.read())
+            return _response(429 if len(sent_bodies) == 1 else 201)
+
+        self.mock_request.side_effect = _send
+
+        response = self.client.post("https://example.com", data=body)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(sent_bodies, [b"streamed body", b"streamed body"])
+
+    def test_default_client_is_shared(self):
+        """
+        Test get_default_client returns the same client for every call.
+        """
+        self.assertIs(get_default_client(), get_default_client())
+
+    def test_fabric_api_url_override(self):
+        """
+        Test get_fabric_api_url defaults to the Fabric API and can be overridden.
+        """
+        with patch.dict(os.environ, clear=True):
+            default_url = get_fabric_api_url()
+        with patch.dict(
+            os.environ, {"FABRIC_TESTING_API_URL": "https://localhost/v1/"}
+        ):
+            override_url = get_fabric_api_url()
+
+        # Assert: The trailing slash is stripped
+        self.assertEqual(default_url, "https://api.fabric.microsoft.com/v1")
+        self.assertEqual(override_url, "https://localhost/v1")
+
+    @patch("fabrictesting.fabric_api.client.time.sleep")
+    def test_request_is_traced(self, mock_sleep):
+        """
+        Test the span of a request records the final status code,
+        the body sizes and the number of retries.
+        """
+        # Arrange
+        response = _response(202)
+        response.request.headers = {"Content-Length": "512"}
+        response.content = b"{}"
+        self.mock_request.side_effect = [_response(429), response]
+        tracer = configure_default_tracer()
+
+        try:
+            # Act
+            self.client.post("https://example.com", data=b"x" * 512)
+        finally:
+            configure_default_tracer(enabled=False)
+
+        # Assert
+        (span,) = tracer.spans
+        self.assertEqual(span.name, "HTTP POST")
+        self.assertEqual(
+            span.attributes,
+            {
+                "http.request.method": "POST",
+                "url.full": "https://example.com",
+                "http.request.resend_count": 1,
+                "http.response.status_code": 202,
+                "http.request.body.size": 512,
+                "http.response.body.size": 2,
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
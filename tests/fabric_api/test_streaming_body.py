@@ -0,0 +1,62 @@
+import io
+import unittest
+
+import requests
+from fabrictesting.fabric_api.streaming_body import StreamingBody
+
+
+class TestStreamingBody(unittest.TestCase):
+    """
+    Test Plan:
+    Test 1: The parts are read in order, in blocks of any size.
+    Test 2: The body can be rewound and read again.
+    Test 3: requests sends the body with a Content-Length header.
+    """
+
+    def setUp(self):
+        self.body = StreamingBody(
+            [b'{"payload":"', (6, lambda: iter((b"YWJj", b"", b"ZA"))), b'"}']
+        )
+
+    def test_read_in_blocks(self):
+        """
+        Test the body is read in order across the parts.
+        """
+        blocks = []
+        while True:
+            block = self.body.read(5)
+            if not block:
+                break
+            blocks.append(block)
+
+        self.assertEqual(b"".join(blocks), b'{"payload":"YWJjZA"}')
+        self.assertTrue(all(len(block) <= 5 for block in blocks))
+        self.assertEqual(len(self.body), 20)
+        self.assertEqual(self.body.tell(), 20)
+
+    def test_rewind(self):
+        """
+        Test the generated parts are produced again after seek(0).
+        """
+        first = self.body.read()
+        self.body.seek(0)
+        second = self.body.read()
+
+        self.assertEqual(first, second)
+        with self.assertRaises(io.UnsupportedOperation):
+            self.body.seek(3)
+
+    def test_content_length(self):
+        """
+        Test requests uses the length of the body instead of chunked encoding.
+        """
+        request = requests.Request(
+            "POST", "https://example.com", data=self.body
+        ).prepare()
+
+        self.assertEqual(request.headers["Content-Length"], "20")
+        self.assertNotIn("Transfer-Encoding", request.headers)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from azure.core.credentials import AccessToken
+from fabrictesting.fabric_api.token_provider import (
+    FABRIC_SCOPE,
+    STORAGE_SCOPE,
+    TokenProvider,
+)
+
+
+class TestTokenProvider(unittest.TestCase):
+    """
+    Test Plan:
+    Test 1: A valid token is cached per scope and reused.
+    Test 2: A token that is about to expire is refreshed.
+    Test 3: Requests with extra arguments bypass the cache.
+    Test 4: Tokens are shared across providers through the cache file.
+    Test 5: An empty token string raises an exception.
+    Test 6: An invalid cache file is treated as empty and overwritten.
+    """
+
+    def setUp(self):
+        self.mock_credential = MagicMock()
+        self.mock_credential.get_token.side_effect = lambda *scopes: AccessToken(
+            f"token-{scopes[0]}-{self.mock_credential.get_token.call_count}",
+            int(time.time()) + 3600,
+        )
+
+    def test_token_is_cached_per_scope(self):
+        """
+        Test the provider reuses a valid token for the same scope.
+        """
+        provider = TokenProvider(self.mock_credential, cache_key="tenant:user")
+
+        first = provider.get_token_string(FABRIC_SCOPE)
+        second = provider.get_token_string(FABRIC_SCOPE)
+        storage = provider.get_token_string(STORAGE_SCOPE)
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, storage)
+        self.assertEqual(self.mock_credential.get_token.call_count, 2)
+
+    def test_token_is_refreshed_before_expiry(self):
+        """
+        Test the provider refreshes a token that expires within the refresh margin.
+        """
+        # Arrange: Tokens that expire within the refresh margin
+        self.mock_credential.get_token.side_effect = None
+        self.mock_credential.get_token.return_value = AccessToken(
+            "short-lived", int(time.time()) + 60
+        )
+        provider = TokenProvider(
+            self.mock_credential, cache_key="tenant:user", refresh_margin=300
+        )
+
+        # Act
+        provider.get_token(FABRIC_SCOPE)
+        provider.get_token(FABRIC_SCOPE)
+
+        # Assert: Every request went to the credential
+        self.assertEqual(self.mock_credential.get_token.call_count, 2)
+
+    def test_extra_arguments_bypass_cache(self):
+        """
+        Test a claims challenge is passed on to the credential.
+        """
+        provider = TokenProvider(self.mock_credential, cache_key="tenant:user")
+        self.mock_credential.get_token.side_effect = None
+
+        provider.get_token(STORAGE_SCOPE)
+        provider.get_token(STORAGE_SCOPE, claims="challenge")
+
+        self.mock_credential.get_token.assert_called_with(
+            STORAGE_SCOPE, claims="challenge"
+        )
+        self.assertEqual(self.mock_credential.get_token.call_count, 2)
+
+    def test_cache_file_is_shared(self):
+        """
+        Test a second provider reuses the token from the cache file.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_file_path = os.path.join(temp_dir, "token-cache.json")
+
+            first_provider = TokenProvider(
+                self.mock_credential,
+                cache_key="tenant:client",
+                cache_file_path=cache_file_path,
+            )
+            token = first_provider.get_token_string()
+
+            second_credential = MagicMock()
+            second_provider = TokenProvider(
+                second_credential,
+                cache_key="tenant:client",
+                cache_file_path=cache_file_path,
+            )
+
+            self.assertEqual(second_provider.get_token_string(), token)
+            second_credential.get_token.assert_not_called()
+
+            with open(cache_file_path, "r") as file:
+                self.assertIn(FABRIC_SCOPE, json.load(file)["tenant:client"])
+
+            if os.name == "posix":
+                self.assertEqual(os.stat(cache_file_path).st_mode & 0o777, 0o600)
+
+    def test_empty_token_raises(self):
+        """
+        Test get_token_string raises an exception when the token is empty.
+        """
+        self.mock_credential.get_token.side_effect = None
+        self.mock_credential.get_token.return_value = AccessToken("", 0)
+        provider = TokenProvider(self.mock_credential, cache_key="tenant:user")
+
+        with self.assertRaises(Exception) as context:
+            provider.get_token_string()
+
+        self.assertEqual(str(context.exception), "Token string was none")
+
+    def test_invalid_cache_file_is_ignored(self):
+        """
+        Test a cache file that is not a JSON object of objects is treated as empty.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_file_path = os.path.join(temp_dir, "token-cache.json")
+
+            for content in ["[1]", '{"tenant:client": [1]}']:
+                # Arrange
+                with open(cache_file_path, "w") as file:
+                    file.write(content)
+
+                # Act
+                with self.assertLogs(
+                    "fabrictesting.fabric_api.token_provider", level="WARNING"
+                ):
+                    provider = TokenProvider(
+                        self.mock_credential,
+                        cache_key="tenant:client",
+                        cache_file_path=cache_file_path,
+                    )
+                    provider.get_token_string()
+
+                # Assert: The token is requested and the cache file is repaired
+                with open(cache_file_path, "r") as file:
+                    self.assertIn(FABRIC_SCOPE, json.load(file)["tenant:client"])
+
+            self.assertEqual(self.mock_credential.get_token.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
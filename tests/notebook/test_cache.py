@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from fabrictesting.notebook.cache import NotebookIdCache
+
+
+class TestNotebookIdCache(unittest.TestCase):
+    """
+    Test Plan:
+    Test 1: A cached id is returned until it expires.
+    Test 2: Invalidating a workspace removes its ids only.
+    Test 3: The ids are shared with a new cache through the cache file.
+    Test 4: An invalid cache file is ignored with a warning.
+    """
+
+    @patch("fabrictesting.notebook.cache.time.time")
+    def test_entries_expire(self, mock_time):
+        """
+        Test a cached id is only returned within its TTL.
+        """
+        mock_time.return_value = 1000
+        cache = NotebookIdCache(ttl=60)
+        cache.update("ws", {"Notebook": "id"})
+
+        self.assertEqual(cache.get("ws", "Notebook"), "id")
+        self.assertIsNone(cache.get("ws", "Other"))
+
+        mock_time.return_value = 1061
+        self.assertIsNone(cache.get("ws", "Notebook"))
+
+    def test_invalidate_workspace(self):
+        """
+        Test invalidate removes the ids of one workspace.
+        """
+        cache = NotebookIdCache()
+        cache.update("ws-1", {"Notebook": "id-1"})
+        cache.update("ws-2", {"Notebook": "id-2"})
+
+        cache.invalidate("ws-1")
+
+        self.assertIsNone(cache.get("ws-1", "Notebook"))
+        self.assertEqual(cache.get("ws-2", "Notebook"), "id-2")
+
+    def test_cache_file_is_shared(self):
+        """
+        Test a new cache loads the ids from the cache file.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_file_path = os.path.join(temp_dir, "notebook-cache.json")
+            NotebookIdCache(cache_file_path=cache_file_path).update(
+                "ws", {"Notebook": "id"}
+            )
+
+            cache = NotebookIdCache(cache_file_path=cache_file_path)
+
+            self.assertEqual(cache.get("ws", "Notebook"), "id")
+
+    def test_invalid_cache_file_is_ignored(self):
+        """
+        Test a cache file that is not a JSON object of objects starts empty.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_file_path = os.path.join(temp_dir, "notebook-cache.json")
+
+            for content in ["[1]", '{"ws": [1]}', "not json"]:
+                # Arrange
+                with open(cache_file_path, "w") as file:
+                    file.write(content)
+
+                # Act
+                with self.assertLogs(
+                    "fabrictesting.notebook.cache", level="WARNING"
+                ) as logs:
+                    cache = NotebookIdCache(cache_file_path=cache_file_path)
+
+                # Assert
+                self.assertIn("Could not read the notebook cache", logs.output[0])
+                self.assertIsNone(cache.get("ws", "Notebook"))
+
+            # Assert: Entries that are not objects with an id are dropped
+            with open(cache_file_path, "w") as file:
+                file.write('{"ws": {"Notebook": 1, "Other": {"expires_at": 1e12}}}')
+            cache = NotebookIdCache(cache_file_path=cache_file_path)
+            self.assertIsNone(cache.get("ws", "Notebook"))
+            self.assertIsNone(cache.get("ws", "Other"))
+
+
+if __name__ == "__main__":
+    unittest.main()
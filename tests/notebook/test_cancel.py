@@ -0,0 +1,123 @@
+"""
+Test Plan:
+Test 1: Cancelling a job posts to the cancel endpoint of the job instance.
+Test 2: A failed cancel request raises an exception.
+Test 3: Cancelled jobs are polled until they reached the Cancelled state.
+Test 4: A job that finished before it was cancelled keeps its status.
+"""
+
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fabrictesting.notebook.cancel import cancel_notebook_run, cancel_notebook_runs
+
+_FETCH_URL = (
+    "https://api.fabric.microsoft.com/v1/workspaces/test_workspace"
+    "/items/test_item/jobs/instances/test_job_instance"
+)
+
+
+def _status_response(status: str) -> MagicMock:
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = {"status": status}
+    response.content = f'{{"status": "{status}"}}'.encode("utf-8")
+    return response
+
+
+class TestCancelNotebookRun(unittest.TestCase):
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.post")
+    def test_cancel_notebook_run(self, mock_post):
+        """
+        Test the cancel endpoint of the job instance is called.
+        """
+        # Arrange
+        mock_post.return_value = MagicMock(
+            status_code=202, headers={"Retry-After": "10"}
+        )
+
+        # Act
+        result = cancel_notebook_run(fetch_url=_FETCH_URL, token_string="test_token")
+
+        # Assert
+        self.assertEqual(result, {"status_code": 202, "retry_after": 10})
+        mock_post.assert_called_once_with(
+            url=f"{_FETCH_URL}/cancel",
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": "Bearer test_token",
+            },
+        )
+
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.post")
+    def test_cancel_notebook_run_failure(self, mock_post):
+        """
+        Test an exception is raised if the job cannot be cancelled.
+        """
+        # Arrange
+        mock_post.return_value = MagicMock(status_code=400, content=b"Bad request")
+
+        # Act & Assert
+        with self.assertRaises(Exception) as context:
+            cancel_notebook_run(fetch_url=_FETCH_URL, token_string="test_token")
+
+        self.assertIn("Cancelling the job failed with 400", str(context.exception))
+
+
+class TestCancelNotebookRuns(unittest.TestCase):
+    @patch("asyncio.sleep", new_callable=AsyncMock)
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.get")
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.post")
+    def test_cancel_notebook_runs(self, mock_post, mock_get, mock_sleep):
+        """
+        Test the jobs are polled until they stopped.
+        """
+        # Arrange
+        mock_post.return_value = MagicMock(status_code=202, headers={})
+        mock_get.side_effect = [
+            _status_response("InProgress"),
+            _status_response("Cancelled"),
+        ]
+        token_provider = MagicMock()
+        token_provider.get_token_string.return_value = "test_token"
+
+        # Act
+        with self.assertLogs("fabrictesting.notebook.cancel", level="INFO") as logs:
+            statuses = asyncio.run(
+                cancel_notebook_runs(
+                    fetch_urls=[_FETCH_URL], token_provider=token_provider
+                )
+            )
+
+        # Assert
+        self.assertEqual(statuses, {_FETCH_URL: "Cancelled"})
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertIn(
+            f"    Cancelled: {_FETCH_URL}",
+            [record.getMessage() for record in logs.records],
+        )
+
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.get")
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.post")
+    def test_cancel_finished_notebook_run(self, mock_post, mock_get):
+        """
+        Test a job that already completed keeps its status.
+        """
+        # Arrange
+        mock_post.return_value = MagicMock(status_code=400, content=b"Completed")
+        mock_get.return_value = _status_response("Completed")
+        token_provider = MagicMock()
+        token_provider.get_token_string.return_value = "test_token"
+
+        # Act
+        statuses = asyncio.run(
+            cancel_notebook_runs(fetch_urls=[_FETCH_URL], token_provider=token_provider)
+        )
+
+        # Assert
+        self.assertEqual(statuses, {_FETCH_URL: "Completed"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,11 @@
 import base64
 import unittest
 
-from fabrictesting.notebook.create import convert_notebook_into_inlinebase64
+from fabrictesting.notebook.create import (
+    convert_notebook_into_inlinebase64,
+    get_inlinebase64_length,
+    iter_inlinebase64,
+)
 
 
 class TestConvertNotebookIntoInlineBase64(unittest.TestCase):
@@ -20,6 +24,29 @@ class TestConvertNotebookIntoInlineBase64(unittest.TestCase):
         # Assert: Check if the output matches the expected Base64 encoded string
         self.assertEqual(result, expected_base64)
 
+    def test_iter_inlinebase64(self):
+        # Arrange: Multi-byte characters split the UTF-8 bytes across chunks
+        notebook_content = "Notebook with ü, € and 😀 characters." * 10
+
+        for chunk_size in (1, 2, 5, 64, 1024):
+            # Act: Encode the content chunk by chunk
+            chunks = list(iter_inlinebase64(notebook_content, chunk_size))
+
+            # Assert: The chunks join to the Base64 string of the whole content
+            self.assertEqual(
+                b"".join(chunks).decode("utf-8"),
+                convert_notebook_into_inlinebase64(notebook_content),
+            )
+            self.assertEqual(
+                get_inlinebase64_length(notebook_content, chunk_size),
+                len(convert_notebook_into_inlinebase64(notebook_content)),
+            )
+
+    def test_iter_inlinebase64_empty(self):
+        # Act & Assert: Empty content has no chunks
+        self.assertEqual(list(iter_inlinebase64("")), [])
+        self.assertEqual(get_inlinebase64_length(""), 0)
+
 
 if __name__ == "__main__":
     unittest.main()
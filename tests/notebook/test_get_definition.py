@@ -2,11 +2,21 @@ import json
 import unittest
 from unittest.mock import MagicMock, patch
 
-from fabrictesting.notebook.get_definitions import get_notebook_id, list_notebooks
+from fabrictesting.notebook.cache import configure_default_notebook_cache
+from fabrictesting.notebook.get_definitions import (
+    find_notebook_id,
+    get_notebook_id,
+    list_notebooks,
+    wait_for_notebook_id,
+)
 
 
 class TestNotebookDefinitions(unittest.TestCase):
-    @patch("fabrictesting.notebook.get_definitions.requests.get")
+    def setUp(self):
+        # Start every test with an empty notebook id cache
+        configure_default_notebook_cache()
+
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.get")
     def test_list_notebooks_success(self, mock_get):
         """
         Test list_notebooks when the API returns a valid response with notebooks.
@@ -43,7 +53,7 @@ class TestNotebookDefinitions(unittest.TestCase):
             },
         )
 
-    @patch("fabrictesting.notebook.get_definitions.requests.get")
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.get")
     def test_list_notebooks_empty(self, mock_get):
         """
         Test list_notebooks when the API returns no notebooks.
@@ -73,7 +83,7 @@ class TestNotebookDefinitions(unittest.TestCase):
             },
         )
 
-    @patch("fabrictesting.notebook.get_definitions.requests.get")
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.get")
     def test_list_notebooks_api_error(self, mock_get):
         """
         Test list_notebooks when the API returns an error response.
@@ -92,16 +102,16 @@ class TestNotebookDefinitions(unittest.TestCase):
 
         self.assertIn("Unauthorized", str(context.exception))
 
-    @patch("fabrictesting.notebook.get_definitions.list_notebooks")
-    def test_get_notebook_id_success(self, mock_list_notebooks):
+    @patch("fabrictesting.notebook.get_definitions.iter_notebook_pages")
+    def test_get_notebook_id_success(self, mock_iter_notebook_pages):
         """
         Test get_notebook_id when the notebook is found.
         """
-        # Arrange: Mock the list_notebooks function
+        # Arrange: Mock the notebook list
         # to return a valid notebook dictionary
-        mock_list_notebooks.return_value = {
-            "Notebook Name 1": "3546052c-ae64-4526-b1a8-52af7761426f"
-        }
+        mock_iter_notebook_pages.return_value = iter(
+            [{"Notebook Name 1": "3546052c-ae64-4526-b1a8-52af7761426f"}]
+        )
 
         # Act: Call the get_notebook_id function
         result = get_notebook_id(
@@ -113,13 +123,13 @@ class TestNotebookDefinitions(unittest.TestCase):
         # Assert: Check if the correct notebook ID is returned
         self.assertEqual(result, "3546052c-ae64-4526-b1a8-52af7761426f")
 
-    @patch("fabrictesting.notebook.get_definitions.list_notebooks")
-    def test_get_notebook_id_not_found(self, mock_list_notebooks):
+    @patch("fabrictesting.notebook.get_definitions.iter_notebook_pages")
+    def test_get_notebook_id_not_found(self, mock_iter_notebook_pages):
         """
         Test get_notebook_id when the notebook is not found.
         """
-        # Arrange: Mock the list_notebooks function to return an empty dictionary
-        mock_list_notebooks.return_value = {}
+        # Arrange: Mock the notebook list to return a single empty page
+        mock_iter_notebook_pages.return_value = iter([{}])
 
         # Act & Assert: The get_notebook_id function
         # should raise an exception when the notebook is not found
@@ -131,3 +141,107 @@ class TestNotebookDefinitions(unittest.TestCase):
             )
 
         self.assertIn("not found", str(context.exception))
+
+    @patch("fabrictesting.notebook.get_definitions.time.sleep")
+    @patch("fabrictesting.notebook.get_definitions.iter_notebook_pages")
+    def test_wait_for_notebook_id_retries_until_listed(
+        self, mock_iter_notebook_pages, mock_sleep
+    ):
+        """
+        Test wait_for_notebook_id retries with a growing delay until
+        the notebook is listed.
+        """
+        # Arrange: The notebook shows up on the third listing
+        mock_iter_notebook_pages.side_effect = [
+            iter([{}]),
+            iter([{}]),
+            iter([{"New Notebook": "new-id"}]),
+        ]
+
+        # Act
+        result = wait_for_notebook_id(
+            notebook_name="New Notebook",
+            workspace_id="workspace_123",
+            token_string="test_token",
+        )
+
+        # Assert
+        self.assertEqual(result, "new-id")
+        self.assertEqual([c.args[0] for c in mock_sleep.call_args_list], [0.5, 1.0])
+
+    @patch("fabrictesting.notebook.get_definitions.time.sleep")
+    @patch("fabrictesting.notebook.get_definitions.iter_notebook_pages")
+    def test_wait_for_notebook_id_timeout(self, mock_iter_notebook_pages, mock_sleep):
+        """
+        Test wait_for_notebook_id raises an exception after the timeout.
+        """
+        mock_iter_notebook_pages.return_value = iter([{}])
+
+        with self.assertRaises(Exception) as context:
+            wait_for_notebook_id(
+                notebook_name="Unknown Notebook",
+                workspace_id="workspace_123",
+                token_string="test_token",
+                timeout=0,
+            )
+
+        self.assertIn("not found", str(context.exception))
+        mock_sleep.assert_not_called()
+
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.get")
+    def test_list_notebooks_follows_continuation(self, mock_get):
+        """
+        Test list_notebooks requests every page of the notebook list.
+        """
+        # Arrange: Two pages linked by a continuation URI
+        first_page = MagicMock(status_code=200)
+        first_page.content = json.dumps(
+            {
+                "value": [{"id": "id-1", "displayName": "Notebook 1"}],
+                "continuationToken": "token",
+                "continuationUri": "https://api.fabric.microsoft.com/next",
+            }
+        ).encode("utf-8")
+        second_page = MagicMock(status_code=200)
+        second_page.content = json.dumps(
+            {"value": [{"id": "id-2", "displayName": "Notebook 2"}]}
+        ).encode("utf-8")
+        mock_get.side_effect = [first_page, second_page]
+
+        # Act
+        result = list_notebooks(workspace_id="workspace_123", token_string="token")
+
+        # Assert
+        self.assertEqual(result, {"Notebook 1": "id-1", "Notebook 2": "id-2"})
+        self.assertEqual(
+            mock_get.call_args.kwargs["url"], "https://api.fabric.microsoft.com/next"
+        )
+
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.get")
+    def test_find_notebook_id_stops_early_and_caches(self, mock_get):
+        """
+        Test find_notebook_id stops at the page with the notebook
+        and answers the next lookup from the cache.
+        """
+        # Arrange: The first page has the notebook and a next page
+        first_page = MagicMock(status_code=200)
+        first_page.content = json.dumps(
+            {
+                "value": [{"id": "id-1", "displayName": "Notebook 1"}],
+                "continuationToken": "token",
+            }
+        ).encode("utf-8")
+        mock_get.return_value = first_page
+
+        # Act: Look up the notebook twice
+        first = find_notebook_id(
+            notebook_name="Notebook 1", workspace_id="ws", token_string="token"
+        )
+        second = find_notebook_id(
+            notebook_name="Notebook 1", workspace_id="ws", token_string="token"
+        )
+
+        # Assert: Only the first page was requested, once
+        self.assertEqual(first, "id-1")
+        self.assertEqual(second, "id-1")
+        mock_get.assert_called_once()
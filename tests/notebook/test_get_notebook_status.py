@@ -8,18 +8,26 @@ which indicates the job is still running.
 Test 5: Simulate a failure without a proper failure reason or message,
 ensuring the correct exceptions are raised.
 Test 6: Simulate handling unexpected status codes.
+Test 7: Request a fresh token from the token provider for every poll.
+Test 8: Return a timeout result when the polling strategy gives up.
+Test 9: Poll several jobs concurrently and collect the result of each.
+Test 10: Derive the job status from a polling result.
 """
 
+import asyncio
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from fabrictesting.notebook.get_notebook_status import (
+    get_job_status,
     poll_notebook_run_status,
+    poll_notebook_runs,
 )
+from fabrictesting.notebook.polling import PollingStrategy
 
 
 class TestNotebookStatus(unittest.TestCase):
-    @patch("fabrictesting.notebook.get_notebook_status.requests.get")
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.get")
     def test_poll_notebook_run_status_completed(self, mock_get):
         """
         Test poll_notebook_run_status for a job that completes successfully.
@@ -46,7 +54,7 @@ class TestNotebookStatus(unittest.TestCase):
         self.assertEqual(result, {"status_code": 200, "content": b"Job content"})
         mock_get.assert_called()
 
-    @patch("fabrictesting.notebook.get_notebook_status.requests.get")
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.get")
     def test_poll_notebook_run_status_failed(self, mock_get):
         """
         Test poll_notebook_run_status for a job that fails.
@@ -72,7 +80,7 @@ class TestNotebookStatus(unittest.TestCase):
         self.assertEqual(result, {"status_code": 200, "content": b"Job content"})
         mock_get.assert_called()
 
-    @patch("fabrictesting.notebook.get_notebook_status.requests.get")
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.get")
     def test_poll_notebook_run_status_in_progress(self, mock_get):
         """
         Test poll_notebook_run_status for a job
@@ -112,7 +120,7 @@ class TestNotebookStatus(unittest.TestCase):
         self.assertEqual(result, {"status_code": 200, "content": b"Job completed"})
         mock_get.assert_called()
 
-    @patch("fabrictesting.notebook.get_notebook_status.requests.get")
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.get")
     def test_poll_notebook_run_status_non_successful_response(self, mock_get):
         """
         Test poll_notebook_run_status for a job that
@@ -151,7 +159,7 @@ class TestNotebookStatus(unittest.TestCase):
         self.assertEqual(result, {"status_code": 200, "content": b"Job completed"})
         mock_get.assert_called()
 
-    @patch("fabrictesting.notebook.get_notebook_status.requests.get")
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.get")
     def test_poll_notebook_run_status_failed_no_reason(self, mock_get):
         """
         Test poll_notebook_run_status for a job that fails without a failure reason.
@@ -173,7 +181,7 @@ class TestNotebookStatus(unittest.TestCase):
             )
         self.assertIn("There was no failure reason", str(context.exception))
 
-    @patch("fabrictesting.notebook.get_notebook_status.requests.get")
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.get")
     def test_poll_notebook_run_status_unexpected_status(self, mock_get):
         """
         Test poll_notebook_run_status for an unexpected status code.
@@ -196,3 +204,152 @@ class TestNotebookStatus(unittest.TestCase):
             result, {"status_code": 500, "content": b"Internal Server Error"}
         )
         mock_get.assert_called()
+
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.get")
+    def test_poll_notebook_run_status_token_provider(self, mock_get):
+        """
+        Test poll_notebook_run_status requests the token for every poll.
+        """
+        # Arrange: The job is in progress once, then completes
+        mock_in_progress_response = MagicMock()
+        mock_in_progress_response.status_code = 200
+        mock_in_progress_response.json.return_value = {"status": "InProgress"}
+
+        mock_completed_response = MagicMock()
+        mock_completed_response.status_code = 200
+        mock_completed_response.json.return_value = {"status": "Completed"}
+        mock_completed_response.content = b"Job completed"
+
+        mock_get.side_effect = [mock_in_progress_response, mock_completed_response]
+
+        # Arrange: The token is refreshed between the polls
+        mock_token_provider = MagicMock()
+        mock_token_provider.get_token_string.side_effect = ["token-1", "token-2"]
+
+        # Act
+        with patch("time.sleep", return_value=None):
+            result = poll_notebook_run_status(
+                fetch_url="https://api.fabric.microsoft.com/v1/workspaces/workspaceId/items/itemId/jobs/instances/jobInstanceId",
+                retry_after=1,
+                token_provider=mock_token_provider,
+            )
+
+        # Assert: Each poll used the current token
+        self.assertEqual(result, {"status_code": 200, "content": b"Job completed"})
+        self.assertEqual(
+            [c.kwargs["headers"]["Authorization"] for c in mock_get.call_args_list],
+            ["Bearer token-1", "Bearer token-2"],
+        )
+
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.get")
+    def test_poll_notebook_run_status_timeout(self, mock_get):
+        """
+        Test poll_notebook_run_status stops after the maximum number of attempts.
+        """
+        # Arrange: The job never finishes
+        mock_in_progress_response = MagicMock()
+        mock_in_progress_response.status_code = 200
+        mock_in_progress_response.json.return_value = {"status": "InProgress"}
+        mock_get.return_value = mock_in_progress_response
+
+        # Act
+        with patch("time.sleep", return_value=None) as mock_sleep:
+            result = poll_notebook_run_status(
+                fetch_url="https://api.fabric.microsoft.com/v1/workspaces/workspaceId/items/itemId/jobs/instances/jobInstanceId",
+                retry_after=60,
+                token_string="test_token",
+                polling_strategy=PollingStrategy(
+                    initial_interval=2, backoff_factor=2, max_attempts=3
+                ),
+            )
+
+        # Assert: Three polls, fast intervals in between, then a timeout result
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual([c.args[0] for c in mock_sleep.call_args_list], [2, 4])
+        self.assertIsNone(result["status_code"])
+        self.assertTrue(result["timed_out"])
+
+
+def _status_response(status: str) -> MagicMock:
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = {
+        "status": status,
+        "failureReason": {"message": "Some tests failed"},
+    }
+    response.content = f'{{"status": "{status}"}}'.encode("utf-8")
+    return response
+
+
+class TestPollNotebookRuns(unittest.TestCase):
+    @patch("asyncio.sleep", new_callable=AsyncMock)
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.get")
+    def test_poll_notebook_runs(self, mock_get, mock_sleep):
+        """
+        Test poll_notebook_runs polls every job until it finishes,
+        sharing the token provider, and isolates a failing job.
+        """
+        # Arrange: Job 1 needs two polls, job 2 fails, job 3 raises
+        responses = {
+            "https://example.com/job-1": [
+                _status_response("InProgress"),
+                _status_response("Completed"),
+            ],
+            "https://example.com/job-2": [_status_response("Failed")],
+        }
+
+        def _get(url, headers):
+            if url not in responses:
+                raise ConnectionError("Connection refused")
+            return responses[url].pop(0)
+
+        mock_get.side_effect = _get
+        mock_token_provider = MagicMock()
+        mock_token_provider.get_token_string.return_value = "test_token"
+
+        # Act
+        results = asyncio.run(
+            poll_notebook_runs(
+                fetch_urls=[
+                    ("https://example.com/job-1", 10),
+                    ("https://example.com/job-2", 10),
+                    ("https://example.com/job-3", 10),
+                ],
+                token_provider=mock_token_provider,
+                polling_strategy=PollingStrategy(initial_interval=2),
+            )
+        )
+
+        # Assert
+        self.assertEqual(
+            {url: get_job_status(result) for url, result in results.items()},
+            {
+                "https://example.com/job-1": "Completed",
+                "https://example.com/job-2": "Failed",
+                "https://example.com/job-3": "Error",
+            },
+        )
+        mock_sleep.assert_awaited_once_with(2)
+        self.assertEqual(mock_get.call_count, 4)
+        self.assertEqual(mock_token_provider.get_token_string.call_count, 4)
+
+
+class TestGetJobStatus(unittest.TestCase):
+    def test_get_job_status(self):
+        """
+        Test get_job_status for completed, timed out and failed polls.
+        """
+        self.assertEqual(
+            get_job_status({"status_code": 200, "content": b'{"status": "Completed"}'}),
+            "Completed",
+        )
+        self.assertEqual(
+            get_job_status({"status_code": None, "content": b"", "timed_out": True}),
+            "TimedOut",
+        )
+        self.assertEqual(
+            get_job_status({"status_code": 500, "content": b"Server error"}), "Error"
+        )
+        self.assertEqual(
+            get_job_status({"status_code": 200, "content": b"not json"}), "Error"
+        )
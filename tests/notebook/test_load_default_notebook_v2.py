@@ -1,117 +1,330 @@
+import json
 import os
+import tempfile
 import unittest
-from unittest.mock import mock_open, patch
+from unittest.mock import MagicMock
 
 from fabrictesting.notebook.create import load_default_notebook
 
+_KWARGS = dict(
+    lakehouse_id="lakehouse_id_123",
+    default_lakehouse_name="default_lakehouse_name",
+    default_lakehouse_workspace_id="workspace_id_123",
+    workspace_name="mock_workspace",
+    submit_folder="mock_folder",
+)
+
 
 class TestNotebookCreate(unittest.TestCase):
-    @patch("fabrictesting.notebook.create.os.path.dirname")
-    @patch(
-        "builtins.open",
-        new_callable=mock_open,
-        read_data="XXLAKEHOUSEIDXX "
-        "XXDEFAULTLAKEHOUSENAMEXX "
-        "XXDEFAULTLAKEHOUSEWORKSPACEIDXX "
-        "XXWORKSPACENAMEXX "
-        "XXSUBMITFOLDERXX "
-        "XXWHEELNAMEXX "
-        "XXREQUIREMENTSFILENAMEXX XXTESTFOLDERXX",
-    )
-    def test_load_default_notebook_with_all_arguments(self, mock_file, mock_dirname):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_template(self, *cells, metadata=None):
+        """
+        Writes a notebook template with a code cell per (source, tags).
+        """
+        template_path = os.path.join(self.temp_dir.name, "notebook-content.ipynb")
+        notebook = {
+            "cells": [
+                {
+                    "cell_type": "code",
+                    "metadata": {"tags": list(tags)},
+                    "outputs": [],
+                    "source": source.splitlines(keepends=True),
+                }
+                for source, tags in cells
+            ],
+            "metadata": metadata or {},
+            "nbformat": 4,
+            "nbformat_minor": 5,
+        }
+        with open(template_path, "w") as file:
+            json.dump(notebook, file)
+        return template_path
+
+    def render_sources(self, template_path, **kwargs):
+        """
+        Renders the template and returns the notebook and its cell sources.
+        """
+        notebook = json.loads(
+            load_default_notebook(template_path=template_path, **_KWARGS, **kwargs)
+        )
+        return notebook, ["".join(cell["source"]) for cell in notebook["cells"]]
+
+    def test_load_default_notebook_with_all_arguments(self):
         """
         Test load_default_notebook when all arguments are provided.
         """
-        mock_dirname.return_value = "/mock/path"
+        template_path = self.write_template(
+            (
+                "XXWORKSPACENAMEXX XXSUBMITFOLDERXX XXWHEELNAMEXX "
+                "XXREQUIREMENTSFILENAMEXX XXTESTFOLDERXX",
+                [],
+            ),
+            metadata={
+                "lakehouse": {
+                    "default_lakehouse": "XXLAKEHOUSEIDXX",
+                    "default_lakehouse_name": "XXDEFAULTLAKEHOUSENAMEXX",
+                    "default_lakehouse_workspace_id": "XXDEFAULTLAKEHOUSEWORKSPACEIDXX",
+                }
+            },
+        )
 
         # Call the function with all arguments
-        result = load_default_notebook(
-            lakehouse_id="lakehouse_id_123",
-            default_lakehouse_name="default_lakehouse_name",
-            default_lakehouse_workspace_id="workspace_id_123",
-            workspace_name="mock_workspace",
-            submit_folder="mock_folder",
+        notebook, sources = self.render_sources(
+            template_path,
             wheel_name="mock_wheel.whl",
             requirements_file_name="requirements.txt",
             unittest_folder_name="unittest_folder",
         )
 
-        # Create the expected path using os.path.join to make it cross-platform
-        expected_path = os.path.join("/mock/path", "notebook-content.ipynb")
+        # Assert the placeholders were correctly replaced
+        self.assertEqual(
+            sources,
+            [
+                "mock_workspace mock_folder mock_wheel.whl "
+                "requirements.txt unittest_folder"
+            ],
+        )
+        self.assertEqual(
+            notebook["metadata"]["lakehouse"],
+            {
+                "default_lakehouse": "lakehouse_id_123",
+                "default_lakehouse_name": "default_lakehouse_name",
+                "default_lakehouse_workspace_id": "workspace_id_123",
+            },
+        )
 
-        # Assert the file was opened correctly
-        mock_file.assert_called_once_with(expected_path, "r")
+    def test_load_default_notebook_with_missing_wheel_and_requirements(self):
+        """
+        Test load_default_notebook leaves out the wheel and requirements cells
+        when wheel_name and requirements_file_name are None.
+        """
+        template_path = self.write_template(
+            ("XXSUBMITFOLDERXX", []),
+            (
+                "!pip install builtin/XXSUBMITFOLDERXX/XXWHEELNAMEXX",
+                ["fabric-testing-wheel"],
+            ),
+            (
+                "!pip install -r builtin/XXSUBMITFOLDERXX/XXREQUIREMENTSFILENAMEXX",
+                ["fabric-testing-requirements"],
+            ),
+        )
 
-        # Assert the placeholders were correctly replaced
-        expected_result = (
-            "lakehouse_id_123 default_lakehouse_name workspace_id_123 mock_workspace "
-            "mock_folder mock_wheel.whl requirements.txt unittest_folder"
-        )
-        self.assertEqual(result, expected_result)
-
-    @patch("fabrictesting.notebook.create.os.path.dirname")
-    @patch(
-        "builtins.open",
-        new_callable=mock_open,
-        read_data="XXLAKEHOUSEIDXX "
-        "XXDEFAULTLAKEHOUSENAMEXX "
-        "XXDEFAULTLAKEHOUSEWORKSPACEIDXX "
-        "XXWORKSPACENAMEXX "
-        "XXSUBMITFOLDERXX "
-        "!pip install builtin/XXSUBMITFOLDERXX/XXWHEELNAMEXX "
-        "!pip install -r "
-        "builtin/XXSUBMITFOLDERXX/XXREQUIREMENTSFILENAMEXX "
-        "XXTESTFOLDERXX",
-    )
-    def test_load_default_notebook_with_missing_wheel_and_requirements(
-        self, mock_file, mock_dirname
-    ):
-        """
-        Test load_default_notebook when wheel_name and requirements_file_name are None.
-        """
-        mock_dirname.return_value = "/mock/path"
-
-        # Call the function without wheel_name and requirements_file_name
-        result = load_default_notebook(
-            lakehouse_id="lakehouse_id_123",
-            default_lakehouse_name="default_lakehouse_name",
-            default_lakehouse_workspace_id="workspace_id_123",
-            workspace_name="mock_workspace",
-            submit_folder="mock_folder",
-            wheel_name=None,
-            requirements_file_name=None,
-            unittest_folder_name="unittest_folder",
+        # Call the function with and without wheel_name and requirements_file_name
+        _, sources_missing = self.render_sources(template_path)
+        _, sources_present = self.render_sources(
+            template_path, wheel_name="a.whl", requirements_file_name="r.txt"
+        )
+
+        # Assert that the wheel and requirements cells were left out
+        self.assertEqual(sources_missing, ["mock_folder"])
+        self.assertEqual(
+            sources_present,
+            [
+                "mock_folder",
+                "!pip install builtin/mock_folder/a.whl",
+                "!pip install -r builtin/mock_folder/r.txt",
+            ],
+        )
+
+    def test_load_default_notebook_with_guarded_optional_cells(self):
+        """
+        Test load_default_notebook keeps the wheel and requirements cells of a
+        runner, and they only run if their parameter is set.
+        """
+        template_path = self.write_template(
+            (
+                "!pip install builtin/{submit_folder}/{wheel_name}",
+                ["fabric-testing-wheel"],
+            ),
+            (
+                "!pip install -r builtin/{submit_folder}/{requirements_file_name}",
+                ["fabric-testing-requirements"],
+            ),
         )
 
-        # Create the expected path using os.path.join to make it cross-platform
-        expected_path = os.path.join("/mock/path", "notebook-content.ipynb")
+        # Call the function as for the persistent runner
+        _, sources = self.render_sources(template_path, guard_optional_cells=True)
+
+        # Assert that both cells were kept
+        self.assertEqual(len(sources), 2)
+
+        # Run the wheel cell with and without a wheel name
+        for wheel_name, expected_runs in [("a.whl", 1), ("", 0)]:
+            mock_ipython = MagicMock()
+            exec(
+                sources[0],
+                {"get_ipython": lambda: mock_ipython, "wheel_name": wheel_name},
+            )
+
+            # Assert the original source only runs with a wheel name
+            self.assertEqual(mock_ipython.run_cell.call_count, expected_runs)
+            if expected_runs:
+                mock_ipython.run_cell.assert_called_once_with(
+                    "!pip install builtin/{submit_folder}/{wheel_name}"
+                )
+                mock_ipython.run_cell.return_value.raise_error.assert_called_once()
+
+    def test_load_default_notebook_with_bundle_archive(self):
+        """
+        Test load_default_notebook with and without a bundle archive name.
+        """
+        template_path = self.write_template(
+            ('_bundle_archive_name = "XXBUNDLEARCHIVENAMEXX"', [])
+        )
 
-        # Assert the file was opened correctly
-        mock_file.assert_called_once_with(expected_path, "r")
+        # Call the function with and without an archive
+        _, result_archive = self.render_sources(
+            template_path, bundle_archive_name="fabric-testing-bundle.zip"
+        )
+        _, result_no_archive = self.render_sources(template_path)
 
-        # Assert that the wheel and requirements commands were commented out
-        expected_result = (
-            "lakehouse_id_123 default_lakehouse_name workspace_id_123 mock_workspace "
-            "mock_folder # # unittest_folder"
+        # Assert the archive name is filled in, or left empty
+        self.assertEqual(
+            result_archive, ['_bundle_archive_name = "fabric-testing-bundle.zip"']
         )
-        self.assertEqual(result, expected_result)
+        self.assertEqual(result_no_archive, ['_bundle_archive_name = ""'])
 
-    @patch("fabrictesting.notebook.create.os.path.dirname")
-    @patch("builtins.open", new_callable=mock_open, read_data="")
-    def test_load_default_notebook_file_not_found(self, mock_file, mock_dirname):
+    def test_load_default_notebook_with_test_workers(self):
         """
-        Test load_default_notebook raises FileNotFoundError when the file is missing.
+        Test load_default_notebook fills in the number of test workers
+        and runs all test files by default.
         """
-        mock_dirname.return_value = "/mock/path"
-        mock_file.side_effect = FileNotFoundError
+        template_path = self.write_template(
+            ('test_files = "XXTESTFILESXX"\ntest_workers = "XXTESTWORKERSXX"', [])
+        )
+
+        # Call the function with four test workers
+        _, sources = self.render_sources(template_path, test_workers=4)
+
+        # Assert the placeholders were replaced
+        self.assertEqual(sources, ['test_files = ""\ntest_workers = "4"'])
 
+    def test_load_default_notebook_with_dependency_cache(self):
+        """
+        Test load_default_notebook enables the dependency cache only if requested.
+        """
+        template_path = self.write_template(
+            ('dependency_cache = "XXDEPENDENCYCACHEXX"', [])
+        )
+
+        # Call the function with and without the dependency cache
+        _, result_cache = self.render_sources(template_path, dependency_cache=True)
+        _, result_no_cache = self.render_sources(template_path)
+
+        # Assert the flag is set, or left empty so the notebook skips the cache
+        self.assertEqual(result_cache, ['dependency_cache = "True"'])
+        self.assertEqual(result_no_cache, ['dependency_cache = ""'])
+
+    def test_load_default_notebook_with_bundle_copy_mode(self):
+        """
+        Test load_default_notebook fills in the bundle copy mode
+        and rejects unknown modes.
+        """
+        template_path = self.write_template(
+            ('bundle_copy_mode = "XXBUNDLECOPYMODEXX"', [])
+        )
+
+        # Call the function with the default and the driver mode
+        _, result_default = self.render_sources(template_path)
+        _, result_driver = self.render_sources(template_path, bundle_copy_mode="driver")
+
+        # Assert
+        self.assertEqual(result_default, ['bundle_copy_mode = "sparkfiles"'])
+        self.assertEqual(result_driver, ['bundle_copy_mode = "driver"'])
+        with self.assertRaises(ValueError):
+            self.render_sources(template_path, bundle_copy_mode="executors")
+
+    def test_load_default_notebook_escapes_values(self):
+        """
+        Test values with quotes and backslashes keep the notebook valid JSON.
+        """
+        template_path = self.write_template(("XXSUBMITFOLDERXX", []))
+
+        # Call the function with a folder that needs escaping
+        notebook = json.loads(
+            load_default_notebook(
+                template_path=template_path,
+                **{**_KWARGS, "submit_folder": 'a "quoted" \\ folder'},
+            )
+        )
+
+        # Assert
+        self.assertEqual(notebook["cells"][0]["source"], ['a "quoted" \\ folder'])
+
+    def test_load_default_notebook_with_extra_cells(self):
+        """
+        Test extra cells are inserted before the cell that runs the tests.
+        """
+        template_path = self.write_template(
+            ("setup", []), ("run", ["fabric-testing-run"]), ("teardown", [])
+        )
+
+        # Call the function with two extra cells
+        _, sources = self.render_sources(
+            template_path,
+            extra_cells=["spark.conf.set('a', 'b')\n", "XXNOTAPLACEHOLDERXX"],
+        )
+
+        # Assert
+        self.assertEqual(
+            sources,
+            [
+                "setup",
+                "spark.conf.set('a', 'b')\n",
+                "XXNOTAPLACEHOLDERXX",
+                "run",
+                "teardown",
+            ],
+        )
+
+    def test_load_default_notebook_template_reloaded(self):
+        """
+        Test an edited template is parsed again.
+        """
+        template_path = self.write_template(("first XXSUBMITFOLDERXX", []))
+        _, first = self.render_sources(template_path)
+
+        # Rewrite the template with a later modification time
+        self.write_template(("second XXSUBMITFOLDERXX", []))
+        stat = os.stat(template_path)
+        os.utime(template_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        _, second = self.render_sources(template_path)
+
+        # Assert
+        self.assertEqual(first, ["first mock_folder"])
+        self.assertEqual(second, ["second mock_folder"])
+
+    def test_load_default_notebook_default_template(self):
+        """
+        Test the default template renders to a valid notebook without placeholders.
+        """
+        # Call the function with the default template
+        content = load_default_notebook(**_KWARGS, test_workers=2)
+
+        # Assert
+        notebook = json.loads(content)
+        parameters = "".join(notebook["cells"][0]["source"])
+        self.assertNotIn("XX", parameters)
+        self.assertIn('submit_folder = "mock_folder"', parameters)
+        self.assertEqual(
+            notebook["metadata"]["dependencies"]["lakehouse"]["default_lakehouse"],
+            "lakehouse_id_123",
+        )
+
+    def test_load_default_notebook_file_not_found(self):
+        """
+        Test load_default_notebook raises FileNotFoundError when the file is missing.
+        """
         with self.assertRaises(FileNotFoundError):
             load_default_notebook(
-                lakehouse_id="lakehouse_id_123",
-                default_lakehouse_name="default_lakehouse_name",
-                default_lakehouse_workspace_id="workspace_id_123",
-                workspace_name="mock_workspace",
-                submit_folder="mock_folder",
+                template_path=os.path.join(self.temp_dir.name, "missing.ipynb"),
+                **_KWARGS,
             )
 
 
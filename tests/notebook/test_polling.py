@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import patch
+
+from fabrictesting.notebook.polling import PollingStrategy
+
+
+class TestPollingStrategy(unittest.TestCase):
+    """
+    Test Plan:
+    Test 1: The interval starts fast and backs off to the longest interval.
+    Test 2: A server suggested interval replaces the longest interval.
+    Test 3: Polling stops after the maximum number of attempts.
+    Test 4: Polling stops at the deadline, and the last delay is shortened.
+    Test 5: Invalid intervals raise a ValueError.
+    """
+
+    def test_backoff_to_max_interval(self):
+        """
+        Test the delays grow by the backoff factor up to the longest interval.
+        """
+        strategy = PollingStrategy(initial_interval=1, max_interval=5, backoff_factor=2)
+
+        delays = [strategy.next_delay() for _ in range(5)]
+
+        self.assertEqual(delays, [1, 2, 4, 5, 5])
+
+    def test_server_suggested_interval(self):
+        """
+        Test the Retry-After value caps the interval.
+        """
+        strategy = PollingStrategy(
+            initial_interval=2, max_interval=60, backoff_factor=2
+        )
+
+        delays = [strategy.next_delay(retry_after=5) for _ in range(4)]
+
+        self.assertEqual(delays, [2, 4, 5, 5])
+
+    def test_max_attempts(self):
+        """
+        Test next_delay returns None once the maximum number of polls is reached.
+        """
+        strategy = PollingStrategy(max_attempts=3)
+
+        delays = [strategy.next_delay() for _ in range(3)]
+
+        self.assertIsNotNone(delays[1])
+        self.assertIsNone(delays[2])
+        self.assertEqual(strategy.attempts, 3)
+
+    @patch("fabrictesting.notebook.polling.time.monotonic")
+    def test_deadline(self, mock_monotonic):
+        """
+        Test the last delay ends at the deadline and polling then stops.
+        """
+        mock_monotonic.return_value = 100
+        strategy = PollingStrategy(initial_interval=10, timeout=15)
+
+        mock_monotonic.return_value = 108
+        self.assertEqual(strategy.next_delay(), 7)
+
+        mock_monotonic.return_value = 115
+        self.assertIsNone(strategy.next_delay())
+
+    def test_invalid_intervals(self):
+        """
+        Test non-positive intervals raise a ValueError.
+        """
+        with self.assertRaises(ValueError):
+            PollingStrategy(initial_interval=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,6 +12,9 @@ which should raise an exception.
 Test 3: Handle missing headers (e.g., Retry-After):
 Simulate a response where the Retry-After header is missing,
 and the function should use the default value (60 seconds).
+
+Test 4: Execution parameters:
+The parameters are sent as string parameters in the execution data.
 """
 
 import unittest
@@ -21,7 +24,7 @@ from fabrictesting.notebook.run import run_notebook
 
 
 class TestRunNotebook(unittest.TestCase):
-    @patch("fabrictesting.notebook.run.requests.post")
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.post")
     def test_run_notebook_success(self, mock_post):
         """
         Test successful run_notebook triggering with valid headers and 202 response.
@@ -57,7 +60,7 @@ class TestRunNotebook(unittest.TestCase):
             },
         )
 
-    @patch("fabrictesting.notebook.run.requests.post")
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.post")
     def test_run_notebook_failure(self, mock_post):
         """
         Test run_notebook triggering with a non-202 response code,
@@ -86,7 +89,7 @@ class TestRunNotebook(unittest.TestCase):
             },
         )
 
-    @patch("fabrictesting.notebook.run.requests.post")
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.post")
     def test_run_notebook_missing_retry_after_header(self, mock_post):
         """
         Test run_notebook triggering where the Retry-After header is missing,
@@ -124,6 +127,37 @@ class TestRunNotebook(unittest.TestCase):
             },
         )
 
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.post")
+    def test_run_notebook_with_parameters(self, mock_post):
+        """
+        Test run_notebook sends the execution parameters in the request body.
+        """
+        # Arrange
+        mock_response = MagicMock()
+        mock_response.status_code = 202
+        mock_response.headers = {"Location": "https://mock-fetch-url.com"}
+        mock_post.return_value = mock_response
+
+        # Act
+        run_notebook(
+            item_id="test_item",
+            workspace_id="test_workspace",
+            token_string="test_token",
+            parameters={"submit_folder": "mock_folder"},
+        )
+
+        # Assert
+        self.assertEqual(
+            mock_post.call_args.kwargs["json"],
+            {
+                "executionData": {
+                    "parameters": {
+                        "submit_folder": {"value": "mock_folder", "type": "string"}
+                    }
+                }
+            },
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,161 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from fabrictesting.notebook.create import load_default_notebook
+from fabrictesting.notebook.runner import (
+    compute_template_hash,
+    create_runner_parameters,
+    ensure_runner_notebook,
+)
+
+
+class TestRunnerNotebook(unittest.TestCase):
+    """
+    Test Plan:
+    Test 1: The runner notebook is created when it does not exist.
+    Test 2: An up-to-date runner notebook is reused as is.
+    Test 3: A runner notebook with another template hash is updated.
+    Test 4: The execution parameters match the parameters cell of the notebook.
+    """
+
+    def setUp(self):
+        self.notebook_definition = '{"cells": []}'
+        self.template_hash = compute_template_hash(self.notebook_definition)
+
+    @patch("fabrictesting.notebook.runner.update_notebook_definition")
+    @patch(
+        "fabrictesting.notebook.runner.upload_notebook",
+        return_value={"status_code": 201, "content": b"", "item_id": "runner-id"},
+    )
+    @patch("fabrictesting.notebook.runner.get_notebook")
+    @patch("fabrictesting.notebook.runner.find_notebook_id", return_value=None)
+    def test_runner_notebook_is_created(
+        self,
+        mock_find_notebook_id,
+        mock_get_notebook,
+        mock_upload_notebook,
+        mock_update_notebook_definition,
+    ):
+        """
+        Test ensure_runner_notebook creates a missing runner notebook.
+        """
+        # Act
+        notebook_id = ensure_runner_notebook(
+            notebook_name="runner",
+            notebook_definition=self.notebook_definition,
+            workspace_id="ws",
+            token_string="token",
+        )
+
+        # Assert: The notebook was created with the template hash
+        self.assertEqual(notebook_id, "runner-id")
+        self.assertIn(
+            self.template_hash, mock_upload_notebook.call_args.kwargs["description"]
+        )
+        mock_get_notebook.assert_not_called()
+        mock_update_notebook_definition.assert_not_called()
+
+    @patch("fabrictesting.notebook.runner.update_notebook_definition")
+    @patch("fabrictesting.notebook.runner.upload_notebook")
+    @patch("fabrictesting.notebook.runner.get_notebook")
+    @patch("fabrictesting.notebook.runner.find_notebook_id", return_value="runner-id")
+    def test_up_to_date_runner_notebook_is_reused(
+        self,
+        mock_find_notebook_id,
+        mock_get_notebook,
+        mock_upload_notebook,
+        mock_update_notebook_definition,
+    ):
+        """
+        Test ensure_runner_notebook neither creates nor updates
+        a runner notebook with the same template hash.
+        """
+        # Arrange
+        mock_get_notebook.return_value = {
+            "id": "runner-id",
+            "description": f"Template hash: {self.template_hash}",
+        }
+
+        # Act
+        notebook_id = ensure_runner_notebook(
+            notebook_name="runner",
+            notebook_definition=self.notebook_definition,
+            workspace_id="ws",
+            token_string="token",
+        )
+
+        # Assert
+        self.assertEqual(notebook_id, "runner-id")
+        mock_upload_notebook.assert_not_called()
+        mock_update_notebook_definition.assert_not_called()
+
+    @patch("fabrictesting.notebook.runner.update_notebook_definition")
+    @patch("fabrictesting.notebook.runner.upload_notebook")
+    @patch("fabrictesting.notebook.runner.get_notebook")
+    @patch("fabrictesting.notebook.runner.find_notebook_id", return_value="runner-id")
+    def test_changed_runner_notebook_is_updated(
+        self,
+        mock_find_notebook_id,
+        mock_get_notebook,
+        mock_upload_notebook,
+        mock_update_notebook_definition,
+    ):
+        """
+        Test ensure_runner_notebook updates a runner notebook
+        with another template hash.
+        """
+        # Arrange
+        mock_get_notebook.return_value = {
+            "id": "runner-id",
+            "description": "Template hash: outdated",
+        }
+
+        # Act
+        notebook_id = ensure_runner_notebook(
+            notebook_name="runner",
+            notebook_definition=self.notebook_definition,
+            workspace_id="ws",
+            token_string="token",
+        )
+
+        # Assert
+        self.assertEqual(notebook_id, "runner-id")
+        mock_upload_notebook.assert_not_called()
+        kwargs = mock_update_notebook_definition.call_args.kwargs
+        self.assertEqual(kwargs["notebook_id"], "runner-id")
+        self.assertEqual(kwargs["notebook_definition"], self.notebook_definition)
+
+    def test_runner_parameters_match_parameters_cell(self):
+        """
+        Test the execution parameters are the variables of the parameters cell.
+        """
+        # Arrange: Render the runner notebook from the real template
+        notebook = json.loads(
+            load_default_notebook(
+                lakehouse_id="lakehouse-id",
+                default_lakehouse_name="lakehouse",
+                default_lakehouse_workspace_id="ws",
+                workspace_name="workspace",
+                submit_folder="",
+            )
+        )
+        parameters_cell = notebook["cells"][0]
+
+        # Act
+        parameters = create_runner_parameters(
+            submit_folder="folder", wheel_name="package.whl"
+        )
+
+        # Assert
+        self.assertEqual(parameters_cell["metadata"]["tags"], ["parameters"])
+        source = "".join(parameters_cell["source"])
+        for name in parameters:
+            self.assertIn(f"{name} = ", source)
+        self.assertNotIn("XX", source)
+        self.assertEqual(parameters["requirements_file_name"], "")
+        self.assertEqual(parameters["test_workers"], "1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,12 @@
+import base64
+import json
 import unittest
-from unittest.mock import MagicMock, call, patch
+from unittest.mock import MagicMock, patch
 
-from fabrictesting.notebook.upload import upload_notebook
+from fabrictesting.notebook.upload import (
+    get_notebook_upload_result,
+    upload_notebook,
+)
 
 
 class TestUploadNotebook(unittest.TestCase):
@@ -19,19 +24,15 @@ class TestUploadNotebook(unittest.TestCase):
     3: Simulate a response with a status code
     other than 201 or 202 to trigger an exception.
 
+    4: The created notebook id is read from the operation result.
+
 
     """
 
     @patch("fabrictesting.notebook.upload.poll_notebook_upload_status")
-    @patch("fabrictesting.notebook.upload.requests.post")
-    @patch("fabrictesting.notebook.upload.convert_notebook_into_inlinebase64")
-    @patch("fabrictesting.notebook.upload.convert_platform_into_inlinebase64")
-    @patch("builtins.print")  # Mock the print function
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.post")
     def test_upload_notebook_success(
         self,
-        mock_print,
-        mock_convert_platform,
-        mock_convert_notebook,
         mock_post,
         mock_poll,
     ):
@@ -39,62 +40,68 @@ class TestUploadNotebook(unittest.TestCase):
         Test upload_notebook when the notebook
         is successfully created (201 status code).
         """
-        # Arrange: Mock the payload conversion functions
-        mock_convert_notebook.return_value = "mock_notebook_base64"
-        mock_convert_platform.return_value = "mock_platform_base64"
-
         # Arrange: Mock a successful response from the post request
         mock_response = MagicMock()
         mock_response.status_code = 201
+        mock_response.content = b'{"id": "mock_notebook_id"}'
         mock_post.return_value = mock_response
 
         # Act: Call the upload_notebook function
-        result = upload_notebook(
-            display_name="Test Notebook",
-            description="Test Description",
-            notebook_definition="mock_notebook_content",
-            platform_definition="mock_platform_content",
-            workspace_id="mock_workspace_id",
-            token_string="mock_token",
-        )
+        with self.assertLogs("fabrictesting.notebook.upload", level="DEBUG") as logs:
+            result = upload_notebook(
+                display_name="Test Notebook",
+                description="Test Description",
+                notebook_definition="mock_notebook_content",
+                platform_definition="mock_platform_content",
+                workspace_id="mock_workspace_id",
+                token_string="mock_token",
+            )
 
         # Assert: Ensure that the response returns the correct values
         self.assertEqual(result["status_code"], 201)
+        self.assertEqual(result["item_id"], "mock_notebook_id")
         mock_post.assert_called_once()
 
-        # Assert that the correct print statements were called
-        expected_print_calls = [
-            call("Prepare uploading notebook..."),
-            call("    Display Name: Test Notebook"),
-            call("    To workspace with id: mock_workspace_id"),
-            call("Converting notebook payload to base64..."),
-            call("Converting platform payload to base64..."),
-            call("Posting notebook..."),
-            call("Posting finished!"),
-            call("Notebook was successfully created!"),
+        # Assert: The streamed body is the JSON request with base64 payloads
+        body = json.loads(mock_post.call_args.kwargs["data"].read())
+        self.assertEqual(body["displayName"], "Test Notebook")
+        self.assertEqual(body["description"], "Test Description")
+        self.assertEqual(
+            [
+                base64.b64decode(part["payload"]).decode("utf-8")
+                for part in body["definition"]["parts"]
+            ],
+            ["mock_notebook_content", "mock_platform_content"],
+        )
+
+        # Assert that the expected messages were logged in order
+        expected_messages = [
+            "Uploading notebook Test Notebook to workspace with id "
+            "mock_workspace_id...",
+            "Streaming notebook and platform payloads as base64...",
+            "Posting notebook...",
+            "Posting finished!",
+            "Notebook was successfully created!",
         ]
-        mock_print.assert_has_calls(expected_print_calls, any_order=False)
+        self.assertEqual(
+            [record.getMessage() for record in logs.records], expected_messages
+        )
 
+    @patch(
+        "fabrictesting.notebook.upload.get_notebook_upload_result",
+        return_value="mock_notebook_id",
+    )
     @patch("fabrictesting.notebook.upload.poll_notebook_upload_status")
-    @patch("fabrictesting.notebook.upload.requests.post")
-    @patch("fabrictesting.notebook.upload.convert_notebook_into_inlinebase64")
-    @patch("fabrictesting.notebook.upload.convert_platform_into_inlinebase64")
-    @patch("builtins.print")  # Mock the print function
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.post")
     def test_upload_notebook_in_progress(
         self,
-        mock_print,
-        mock_convert_platform,
-        mock_convert_notebook,
         mock_post,
         mock_poll,
+        mock_get_result,
     ):
         """
         Test upload_notebook when the notebook is in progress (202 status code).
         """
-        # Arrange: Mock the payload conversion functions
-        mock_convert_notebook.return_value = "mock_notebook_base64"
-        mock_convert_platform.return_value = "mock_platform_base64"
-
         # Arrange: Mock a 202 response from the post request and a poll response
         mock_response = MagicMock()
         mock_response.status_code = 202
@@ -108,50 +115,46 @@ class TestUploadNotebook(unittest.TestCase):
         mock_poll.return_value = mock_poll_response
 
         # Act: Call the upload_notebook function
-        result = upload_notebook(
-            display_name="Test Notebook",
-            description="Test Description",
-            notebook_definition="mock_notebook_content",
-            platform_definition="mock_platform_content",
-            workspace_id="mock_workspace_id",
-            token_string="mock_token",
-        )
+        with self.assertLogs("fabrictesting.notebook.upload", level="DEBUG") as logs:
+            result = upload_notebook(
+                display_name="Test Notebook",
+                description="Test Description",
+                notebook_definition="mock_notebook_content",
+                platform_definition="mock_platform_content",
+                workspace_id="mock_workspace_id",
+                token_string="mock_token",
+            )
 
         # Assert: Ensure that the polling was called and the response is correct
         self.assertEqual(result["status_code"], 200)
         self.assertEqual(result["content"], b"Notebook polling completed")
         mock_post.assert_called_once()
         mock_poll.assert_called_once_with("mock_location_url", 10, "mock_token")
-
-        # Assert that the correct print statements were called
-        expected_print_calls = [
-            call("Prepare uploading notebook..."),
-            call("    Display Name: Test Notebook"),
-            call("    To workspace with id: mock_workspace_id"),
-            call("Converting notebook payload to base64..."),
-            call("Converting platform payload to base64..."),
-            call("Posting notebook..."),
-            call("Posting finished!"),
-            call("Notebook Request accepted, notebook provisioning in progress..."),
-            call("To check the status, polling the following URL: mock_location_url"),
+        mock_get_result.assert_called_once_with(
+            "mock_location_url", mock_poll_response, "mock_token"
+        )
+        self.assertEqual(result["item_id"], "mock_notebook_id")
+
+        # Assert that the expected messages were logged in order
+        expected_messages = [
+            "Uploading notebook Test Notebook to workspace with id "
+            "mock_workspace_id...",
+            "Streaming notebook and platform payloads as base64...",
+            "Posting notebook...",
+            "Posting finished!",
+            "Notebook request accepted, notebook provisioning in progress...",
+            "To check the status, polling the following URL: mock_location_url",
         ]
-        mock_print.assert_has_calls(expected_print_calls, any_order=False)
-
-    @patch("fabrictesting.notebook.upload.requests.post")
-    @patch("fabrictesting.notebook.upload.convert_notebook_into_inlinebase64")
-    @patch("fabrictesting.notebook.upload.convert_platform_into_inlinebase64")
-    @patch("builtins.print")  # Mock the print function
-    def test_upload_notebook_failure(
-        self, mock_print, mock_convert_platform, mock_convert_notebook, mock_post
-    ):
+        self.assertEqual(
+            [record.getMessage() for record in logs.records], expected_messages
+        )
+
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.post")
+    def test_upload_notebook_failure(self, mock_post):
         """
         Test upload_notebook when the notebook
          upload fails with a non-201/202 status code.
         """
-        # Arrange: Mock the payload conversion functions
-        mock_convert_notebook.return_value = "mock_notebook_base64"
-        mock_convert_platform.return_value = "mock_platform_base64"
-
         # Arrange: Mock a failed response from the post request
         mock_response = MagicMock()
         mock_response.status_code = 500
@@ -159,7 +162,10 @@ class TestUploadNotebook(unittest.TestCase):
         mock_post.return_value = mock_response
 
         # Act & Assert: Ensure that an exception is raised for the failed upload
-        with self.assertRaises(Exception) as context:
+        with (
+            self.assertLogs("fabrictesting.notebook.upload", level="DEBUG") as logs,
+            self.assertRaises(Exception) as context,
+        ):
             upload_notebook(
                 display_name="Test Notebook",
                 description="Test Description",
@@ -174,14 +180,40 @@ class TestUploadNotebook(unittest.TestCase):
         )
         mock_post.assert_called_once()
 
-        # Assert that the correct print statements were called
-        expected_print_calls = [
-            call("Prepare uploading notebook..."),
-            call("    Display Name: Test Notebook"),
-            call("    To workspace with id: mock_workspace_id"),
-            call("Converting notebook payload to base64..."),
-            call("Converting platform payload to base64..."),
-            call("Posting notebook..."),
-            call("Posting finished!"),
+        # Assert that the expected messages were logged in order
+        expected_messages = [
+            "Uploading notebook Test Notebook to workspace with id "
+            "mock_workspace_id...",
+            "Streaming notebook and platform payloads as base64...",
+            "Posting notebook...",
+            "Posting finished!",
         ]
-        mock_print.assert_has_calls(expected_print_calls, any_order=False)
+        self.assertEqual(
+            [record.getMessage() for record in logs.records], expected_messages
+        )
+
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.get")
+    def test_get_notebook_upload_result(self, mock_get):
+        """
+        Test get_notebook_upload_result reads the id from the operation result.
+        """
+        # Arrange: The final poll response has no Location header
+        mock_poll_response = MagicMock()
+        mock_poll_response.headers = {}
+        mock_get.return_value = MagicMock(
+            status_code=200, content=b'{"id": "mock_notebook_id"}'
+        )
+
+        # Act
+        item_id = get_notebook_upload_result(
+            "https://api.fabric.microsoft.com/v1/operations/op-id",
+            mock_poll_response,
+            "mock_token",
+        )
+
+        # Assert: The result was fetched from the operation's result URL
+        self.assertEqual(item_id, "mock_notebook_id")
+        self.assertEqual(
+            mock_get.call_args.args[0],
+            "https://api.fabric.microsoft.com/v1/operations/op-id/result",
+        )
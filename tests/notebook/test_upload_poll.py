@@ -18,7 +18,7 @@ class TestPollNotebookUploadStatus(unittest.TestCase):
     """
 
     class TestPollNotebookUploadStatus(unittest.TestCase):
-        @patch("fabrictesting.notebook.upload.requests.get")
+        @patch("fabrictesting.fabric_api.client.FabricApiClient.get")
         @patch("time.sleep", return_value=None)  # To avoid real sleep during tests
         @patch("builtins.print")  # Mock the print function
         def test_poll_notebook_upload_in_progress(
@@ -63,7 +63,7 @@ class TestPollNotebookUploadStatus(unittest.TestCase):
             self.assertEqual(result.status_code, 200)
             self.assertEqual(json.loads(result.content), {"percentComplete": 100})
 
-            # Ensure requests.get was called 3 times (2 retries and then success)
+            # Ensure the client GET was called 3 times (2 retries and then success)
             self.assertEqual(mock_get.call_count, 3)
             mock_sleep.assert_called_with(5)
 
@@ -78,10 +78,9 @@ class TestPollNotebookUploadStatus(unittest.TestCase):
             ]
             mock_print.assert_has_calls(expected_print_calls, any_order=False)
 
-    @patch("fabrictesting.notebook.upload.requests.get")
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.get")
     @patch("time.sleep", return_value=None)  # To avoid real sleep during tests
-    @patch("builtins.print")  # Mock the print function
-    def test_poll_notebook_upload_completed(self, mock_print, mock_sleep, mock_get):
+    def test_poll_notebook_upload_completed(self, mock_sleep, mock_get):
         """
         Test poll_notebook_upload_status where the notebook creation is completed.
         It should return the response once the progress reaches 100%.
@@ -95,33 +94,30 @@ class TestPollNotebookUploadStatus(unittest.TestCase):
 
         # Act: Call the function with the completed response
         mock_get.return_value = mock_completed_response
-        result = poll_notebook_upload_status(
-            location_url="https://api.fabric.microsoft.com/v1/notebooks/status",
-            retry_after=5,
-            token_string="test_token",
-        )
+        with self.assertLogs("fabrictesting.notebook.upload", level="INFO") as logs:
+            result = poll_notebook_upload_status(
+                location_url="https://api.fabric.microsoft.com/v1/notebooks/status",
+                retry_after=5,
+                token_string="test_token",
+            )
 
         # Assert: Ensure that the function returns the response after completion
         self.assertEqual(result.status_code, 200)
         self.assertEqual(json.loads(result.content), {"percentComplete": 100})
         mock_get.assert_called_once()
 
-        # Assert that the correct print statements were called
-        expected_print_calls = [
-            call("Notebook creation is at 100/100 %!"),
-            call("Notebook creation completed."),
-        ]
-        mock_print.assert_has_calls(expected_print_calls, any_order=False)
+        # Assert that the completion was logged
+        self.assertEqual(
+            [record.getMessage() for record in logs.records],
+            ["Notebook creation completed after 1 polls."],
+        )
 
-    @patch("fabrictesting.notebook.upload.requests.get")
+    @patch("fabrictesting.fabric_api.client.FabricApiClient.get")
     @patch("time.sleep", return_value=None)  # To avoid real sleep during tests
-    @patch("builtins.print")  # Mock the print function
-    def test_poll_notebook_upload_unexpected_status_code(
-        self, mock_print, mock_sleep, mock_get
-    ):
+    def test_poll_notebook_upload_unexpected_status_code(self, mock_sleep, mock_get):
         """
         Test poll_notebook_upload_status where an unexpected status code is returned.
-        It should break the loop and stop retrying, and print an appropriate message.
+        It should break the loop and stop retrying, and log a warning.
         """
         # Arrange: Mock an unexpected status code response
         mock_unexpected_response = MagicMock()
@@ -130,11 +126,12 @@ class TestPollNotebookUploadStatus(unittest.TestCase):
 
         # Act: Call the function with the unexpected response
         mock_get.return_value = mock_unexpected_response
-        result = poll_notebook_upload_status(
-            location_url="https://api.fabric.microsoft.com/v1/notebooks/status",
-            retry_after=5,
-            token_string="test_token",
-        )
+        with self.assertLogs("fabrictesting.notebook.upload", level="WARNING") as logs:
+            result = poll_notebook_upload_status(
+                location_url="https://api.fabric.microsoft.com/v1/notebooks/status",
+                retry_after=5,
+                token_string="test_token",
+            )
 
         # Assert: Ensure that the function breaks out
         # and returns the response with the unexpected status code and content
@@ -142,7 +139,8 @@ class TestPollNotebookUploadStatus(unittest.TestCase):
         self.assertEqual(result.content, b"Internal Server Error")
         mock_get.assert_called_once()
 
-        # Assert that the print statement was called for the JSONDecodeError handling
-        mock_print.assert_has_calls(
-            [call("Unexpected status code: 500, details: b'Internal Server Error'")]
+        # Assert that the unexpected status code was logged as a warning
+        self.assertEqual(
+            [record.getMessage() for record in logs.records],
+            ["Unexpected status code: 500, details: b'Internal Server Error'"],
         )
@@ -1,3 +1,4 @@
+import os
 import unittest
 from unittest.mock import MagicMock, patch
 
@@ -57,6 +58,44 @@ class TestGetServiceClient(unittest.TestCase):
             credential=mock_credential_instance,
         )
 
+    @patch("fabrictesting.onelake_api.api_access.DataLakeServiceClient")
+    @patch("fabrictesting.onelake_api.api_access.DefaultAzureCredential")
+    def test_get_service_client_with_credential(
+        self, mock_default_credential, mock_datalake_client
+    ):
+        """
+        Test get_service_client uses the given credential, e.g. a token provider.
+        """
+        # Arrange: A credential shared with the Fabric API calls
+        mock_token_provider = MagicMock()
+
+        # Act: Call the function with the credential
+        get_service_client(mock_token_provider)
+
+        # Assert: The default credential is not created
+        mock_default_credential.assert_not_called()
+        mock_datalake_client.assert_called_once_with(
+            "https://onelake.dfs.fabric.microsoft.com",
+            credential=mock_token_provider,
+        )
+
+    @patch.dict(os.environ, {"FABRIC_TESTING_ONELAKE_URL": "https://localhost:8443"})
+    @patch("fabrictesting.onelake_api.api_access.DataLakeServiceClient")
+    def test_get_service_client_account_url_override(self, mock_datalake_client):
+        """
+        Test get_service_client uses the account URL of the environment variable.
+        """
+        # Arrange
+        mock_token_provider = MagicMock()
+
+        # Act
+        get_service_client(mock_token_provider)
+
+        # Assert: The client points to the local stand-in of OneLake
+        mock_datalake_client.assert_called_once_with(
+            "https://localhost:8443", credential=mock_token_provider
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,234 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from fabrictesting.onelake_api.api_file import (
+    copy_file_in_onelake,
+    upload_folder_to_onelake,
+)
+
+_FILES_DIRECTORY = "mock_lakehouse.Lakehouse/Files/fabric-testing"
+
+
+class TestIncrementalUpload(unittest.TestCase):
+    """
+    Test Plan:
+    Test 1: An unchanged bundle reuses the previous folder without uploading.
+    Test 2: Unchanged files are copied, changed files are uploaded,
+    and the manifest is stored alongside the bundle.
+    Test 3: Files that fail to copy are uploaded instead.
+    Test 4: copy_file_in_onelake copies through the Blob endpoint.
+    Test 5: copy_file_in_onelake raises a RuntimeError when the copy fails.
+    Test 6: Files missing from both manifests are uploaded, not copied.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        for name in ["a.py", "b.py"]:
+            with open(os.path.join(self.temp_dir.name, name), "wb") as file:
+                file.write(name.encode("utf-8"))
+        self.manifest = {"a.py": "digest-a", "b.py": "digest-b"}
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _upload(self, previous_manifest):
+        return upload_folder_to_onelake(
+            temp_folder=self.temp_dir.name,
+            workspace_name="mock_workspace",
+            lakehouse_name="mock_lakehouse",
+            custom_folder="new_folder",
+            manifest=self.manifest,
+            previous_submit_folder="old_folder",
+            previous_manifest=previous_manifest,
+        )
+
+    @patch("fabrictesting.onelake_api.api_file.upload_files_to_onelake")
+    @patch("fabrictesting.onelake_api.api_file.get_service_client")
+    def test_unchanged_bundle_is_reused(
+        self, mock_get_service_client, mock_upload_files
+    ):
+        """
+        Test upload_folder_to_onelake returns the previous folder
+        when no file changed.
+        """
+        # Arrange: The previous manifest exists in OneLake
+        mock_file_system_client = (
+            mock_get_service_client.return_value.get_file_system_client.return_value
+        )
+        mock_file_system_client.get_file_client.return_value.exists.return_value = True
+
+        # Act
+        result = self._upload(previous_manifest=dict(self.manifest))
+
+        # Assert: Nothing was uploaded
+        self.assertEqual(result, "old_folder")
+        mock_upload_files.assert_not_called()
+        mock_file_system_client.get_file_client.assert_called_once_with(
+            f"{_FILES_DIRECTORY}/old_folder/fabric-testing-manifest.json"
+        )
+
+    @patch("fabrictesting.onelake_api.api_file.copy_files_in_onelake")
+    @patch("fabrictesting.onelake_api.api_file.upload_files_to_onelake")
+    @patch("fabrictesting.onelake_api.api_file.get_service_client")
+    def test_changed_files_are_uploaded_and_unchanged_copied(
+        self, mock_get_service_client, mock_upload_files, mock_copy_files
+    ):
+        """
+        Test upload_folder_to_onelake copies unchanged files
+        and uploads changed files and the manifest.
+        """
+        # Arrange
+        mock_file_system_client = (
+            mock_get_service_client.return_value.get_file_system_client.return_value
+        )
+        mock_upload_files.return_value = {}
+        mock_copy_files.return_value = {}
+
+        # Act: b.py changed since the previous bundle
+        result = self._upload(
+            previous_manifest={"a.py": "digest-a", "b.py": "old-digest-b"}
+        )
+
+        # Assert
+        self.assertEqual(result, "new_folder")
+        _, copied = mock_copy_files.call_args.args
+        self.assertEqual(
+            copied,
+            [
+                (
+                    f"{_FILES_DIRECTORY}/old_folder/a.py",
+                    f"{_FILES_DIRECTORY}/new_folder/a.py",
+                )
+            ],
+        )
+        _, uploaded = mock_upload_files.call_args.args
+        self.assertEqual(
+            uploaded,
+            [
+                (
+                    os.path.join(self.temp_dir.name, "b.py"),
+                    f"{_FILES_DIRECTORY}/new_folder/b.py",
+                )
+            ],
+        )
+
+        # Assert: The manifest is stored alongside the bundle
+        mock_file_system_client.get_file_client.assert_called_with(
+            f"{_FILES_DIRECTORY}/new_folder/fabric-testing-manifest.json"
+        )
+        upload_data = mock_file_system_client.get_file_client.return_value.upload_data
+        self.assertEqual(json.loads(upload_data.call_args.args[0]), self.manifest)
+
+    @patch("fabrictesting.onelake_api.api_file.copy_files_in_onelake")
+    @patch("fabrictesting.onelake_api.api_file.upload_files_to_onelake")
+    @patch("fabrictesting.onelake_api.api_file.get_service_client")
+    def test_failed_copies_are_uploaded(
+        self, mock_get_service_client, mock_upload_files, mock_copy_files
+    ):
+        """
+        Test upload_folder_to_onelake uploads the files that could not be copied.
+        """
+        # Arrange: The copy of a.py fails
+        mock_upload_files.return_value = {}
+        mock_copy_files.return_value = {
+            f"{_FILES_DIRECTORY}/old_folder/a.py": "Copy failed"
+        }
+
+        # Act: b.py changed since the previous bundle
+        self._upload(previous_manifest={"a.py": "digest-a", "b.py": "old-digest-b"})
+
+        # Assert: Both files are uploaded
+        _, uploaded = mock_upload_files.call_args.args
+        self.assertEqual(
+            sorted(destination for _, destination in uploaded),
+            [
+                f"{_FILES_DIRECTORY}/new_folder/a.py",
+                f"{_FILES_DIRECTORY}/new_folder/b.py",
+            ],
+        )
+
+    @patch("fabrictesting.onelake_api.api_file.copy_files_in_onelake")
+    @patch("fabrictesting.onelake_api.api_file.upload_files_to_onelake")
+    @patch("fabrictesting.onelake_api.api_file.get_service_client")
+    def test_files_missing_from_manifests_are_uploaded(
+        self, mock_get_service_client, mock_upload_files, mock_copy_files
+    ):
+        """
+        Test upload_folder_to_onelake uploads a file that is in neither manifest
+        instead of copying it from the previous bundle.
+        """
+        # Arrange: b.py is in the bundle, but in neither manifest
+        mock_file_system_client = (
+            mock_get_service_client.return_value.get_file_system_client.return_value
+        )
+        mock_file_system_client.get_file_client.return_value.exists.return_value = False
+        mock_upload_files.return_value = {}
+        mock_copy_files.return_value = {}
+        self.manifest = {"a.py": "digest-a"}
+
+        # Act
+        self._upload(previous_manifest={"a.py": "digest-a"})
+
+        # Assert: Only a.py is copied, b.py is uploaded
+        _, copied = mock_copy_files.call_args.args
+        self.assertEqual(
+            [source for source, _ in copied], [f"{_FILES_DIRECTORY}/old_folder/a.py"]
+        )
+        _, uploaded = mock_upload_files.call_args.args
+        self.assertEqual(
+            [destination for _, destination in uploaded],
+            [f"{_FILES_DIRECTORY}/new_folder/b.py"],
+        )
+
+    @patch("fabrictesting.onelake_api.api_file.BlobClient")
+    def test_copy_file_in_onelake(self, mock_blob_client):
+        """
+        Test copy_file_in_onelake starts a server-side copy through the Blob endpoint.
+        """
+        # Arrange
+        mock_file_system_client = MagicMock()
+        mock_file_system_client.get_file_client.side_effect = lambda path: MagicMock(
+            url=f"https://onelake.dfs.fabric.microsoft.com/ws/{path}"
+        )
+        mock_blob = mock_blob_client.from_blob_url.return_value
+        mock_blob.start_copy_from_url.return_value = {"copy_status": "success"}
+
+        # Act
+        copy_file_in_onelake(mock_file_system_client, "old/a.py", "new/a.py")
+
+        # Assert
+        mock_blob_client.from_blob_url.assert_called_once_with(
+            "https://onelake.blob.fabric.microsoft.com/ws/new/a.py",
+            credential=mock_file_system_client.credential,
+        )
+        mock_blob.start_copy_from_url.assert_called_once_with(
+            "https://onelake.blob.fabric.microsoft.com/ws/old/a.py"
+        )
+
+    @patch("fabrictesting.onelake_api.api_file.BlobClient")
+    def test_copy_file_in_onelake_failure(self, mock_blob_client):
+        """
+        Test copy_file_in_onelake raises a RuntimeError when the copy fails.
+        """
+        # Arrange: The copy is pending, then fails
+        mock_file_system_client = MagicMock()
+        mock_file_system_client.get_file_client.return_value.url = (
+            "https://onelake.dfs.fabric.microsoft.com/ws/a.py"
+        )
+        mock_blob = mock_blob_client.from_blob_url.return_value
+        mock_blob.start_copy_from_url.return_value = {"copy_status": "pending"}
+        mock_blob.get_blob_properties.return_value.copy.status = "failed"
+
+        # Act & Assert
+        with self.assertRaises(RuntimeError) as context:
+            copy_file_in_onelake(
+                mock_file_system_client, "old/a.py", "new/a.py", poll_interval=0
+            )
+        self.assertIn("Copy ended with status failed", str(context.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+import mmap
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from fabrictesting.onelake_api.api_file import (
+    upload_files_to_onelake,
+    upload_folder_to_onelake,
+)
+
+
+class TestUploadFilesToOneLake(unittest.TestCase):
+    """
+    Test Plan:
+    Test 1: All files are uploaded and no failures are returned.
+    Test 2: A failing file is reported while the other files are still uploaded.
+    Test 3: Large files are uploaded in chunks.
+    Test 4: Large files are read through a memory map when requested.
+    Test 5: An invalid number of workers raises a ValueError.
+    Test 6: upload_folder_to_onelake raises a RuntimeError listing failed files.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.files = []
+        for i in range(5):
+            local_file_path = os.path.join(self.temp_dir.name, f"test_{i}.py")
+            with open(local_file_path, "wb") as file:
+                file.write(b"x" * 10)
+            self.files.append((local_file_path, f"target/test_{i}.py"))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_upload_files_to_onelake_success(self):
+        """
+        Test upload_files_to_onelake uploads every file.
+        """
+        # Arrange: Mock the file system client
+        mock_file_system_client = MagicMock()
+
+        # Act: Upload the files
+        failures = upload_files_to_onelake(
+            mock_file_system_client, self.files, max_workers=3
+        )
+
+        # Assert: No failures and one file client per file
+        self.assertEqual(failures, {})
+        requested_paths = sorted(
+            c.args[0] for c in mock_file_system_client.get_file_client.call_args_list
+        )
+        self.assertEqual(requested_paths, sorted(dest for _, dest in self.files))
+
+    def test_upload_files_to_onelake_reports_failure_per_file(self):
+        """
+        Test upload_files_to_onelake returns the failing file
+        and still uploads the remaining files.
+        """
+        # Arrange: Let the upload of one specific path fail
+        failing_client = MagicMock()
+        failing_client.upload_data.side_effect = Exception("Upload failed")
+        mock_file_system_client = MagicMock()
+        mock_file_system_client.get_file_client.side_effect = lambda path: (
+            failing_client if path == "target/test_2.py" else MagicMock()
+        )
+
+        # Act: Upload the files
+        failures = upload_files_to_onelake(
+            mock_file_system_client, self.files, max_workers=2
+        )
+
+        # Assert: Only the failing file is reported
+        failing_local_path = self.files[2][0]
+        self.assertEqual(list(failures), [failing_local_path])
+        self.assertIn("Upload failed", failures[failing_local_path])
+        self.assertEqual(mock_file_system_client.get_file_client.call_count, 5)
+
+    def test_upload_files_to_onelake_chunks_large_files(self):
+        """
+        Test upload_files_to_onelake uploads files larger than chunk_size in chunks.
+        """
+        # Arrange: Mock the file client
+        mock_file_system_client = MagicMock()
+        mock_file_client = mock_file_system_client.get_file_client.return_value
+
+        # Act: Upload a file larger than the chunk size
+        failures = upload_files_to_onelake(
+            mock_file_system_client, self.files[:1], chunk_size=4
+        )
+
+        # Assert: The chunk size was passed to the DataLake client
+        self.assertEqual(failures, {})
+        _, kwargs = mock_file_client.upload_data.call_args
+        self.assertEqual(kwargs["chunk_size"], 4)
+        self.assertEqual(kwargs["length"], 10)
+        self.assertTrue(kwargs["overwrite"])
+
+    def test_upload_files_to_onelake_memory_map(self):
+        """
+        Test upload_files_to_onelake reads large files through a memory map.
+        """
+        # Arrange: Capture the data passed to the DataLake client
+        mock_file_system_client = MagicMock()
+        mock_file_client = mock_file_system_client.get_file_client.return_value
+        uploaded = {}
+
+        def _upload_data(data, **kwargs):
+            uploaded["type"] = type(data)
+            uploaded["content"] = data.read()
+
+        mock_file_client.upload_data.side_effect = _upload_data
+
+        # Act: Upload a file larger than the chunk size
+        failures = upload_files_to_onelake(
+            mock_file_system_client, self.files[:1], chunk_size=4, memory_map=True
+        )
+
+        # Assert: The content was read through a memory map
+        self.assertEqual(failures, {})
+        self.assertIs(uploaded["type"], mmap.mmap)
+        self.assertEqual(uploaded["content"], b"x" * 10)
+
+    def test_upload_files_to_onelake_invalid_workers(self):
+        """
+        Test upload_files_to_onelake raises ValueError when max_workers is below 1.
+        """
+        with self.assertRaises(ValueError):
+            upload_files_to_onelake(MagicMock(), self.files, max_workers=0)
+
+    @patch("fabrictesting.onelake_api.api_file.upload_files_to_onelake")
+    @patch("fabrictesting.onelake_api.api_file.get_service_client")
+    def test_upload_folder_to_onelake_lists_failed_files(
+        self, mock_get_service_client, mock_upload_files
+    ):
+        """
+        Test upload_folder_to_onelake raises RuntimeError listing every failed file.
+        """
+        # Arrange: Simulate one failed file
+        mock_upload_files.return_value = {self.files[0][0]: "Upload failed"}
+
+        # Act & Assert: A RuntimeError with the failed file is raised
+        with self.assertRaises(RuntimeError) as context:
+            upload_folder_to_onelake(
+                temp_folder=self.temp_dir.name,
+                workspace_name="mock_workspace",
+                lakehouse_name="mock_lakehouse",
+                custom_folder="mock_folder",
+                max_workers=4,
+            )
+
+        self.assertIn("1 of 5 files failed to upload", str(context.exception))
+        self.assertIn(self.files[0][0], str(context.exception))
+
+        # Assert: The files were passed on with their target paths
+        _, files = mock_upload_files.call_args.args
+        self.assertIn(
+            (
+                self.files[0][0],
+                "mock_lakehouse.Lakehouse/Files/fabric-testing/mock_folder/test_0.py",
+            ),
+            files,
+        )
+        self.assertEqual(mock_upload_files.call_args.kwargs["max_workers"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,210 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock, patch
+
+from azure.core.exceptions import ResourceNotFoundError
+from fabrictesting.onelake_api.api_progress import (
+    ProgressLog,
+    follow_test_progress,
+    read_test_progress,
+)
+
+_RESULTS_URL = (
+    "abfss://mock_workspace@onelake.dfs.fabric.microsoft.com/"
+    "mock_lakehouse.Lakehouse/Files/fabric-testing/folder/results"
+)
+
+
+def _mock_file_client(content: bytes) -> MagicMock:
+    file_client = MagicMock()
+    file_client.get_file_properties.return_value.size = len(content)
+    file_client.download_file.side_effect = lambda offset, length: MagicMock(
+        readall=MagicMock(return_value=content[offset : offset + length])
+    )
+    return file_client
+
+
+class TestProgressLog(unittest.TestCase):
+    """
+    Test Plan:
+    Test 1: The progress log of the results folder is read.
+    Test 2: Only complete lines are consumed, and each byte is downloaded once.
+    Test 3: A missing progress log returns no events.
+    Test 4: A log that shrank is read again from the start.
+    """
+
+    @patch("fabrictesting.onelake_api.api_progress.get_service_client")
+    def test_progress_log_path(self, mock_get_service_client):
+        """
+        Test the progress log next to the results folder is read.
+        """
+        # Act
+        ProgressLog(results_url=_RESULTS_URL)
+
+        # Assert
+        file_system_client = mock_get_service_client.return_value.get_file_system_client
+        file_system_client.assert_called_once_with(file_system="mock_workspace")
+        file_system_client.return_value.get_file_client.assert_called_once_with(
+            "mock_lakehouse.Lakehouse/Files/fabric-testing/folder/results-progress.ndjson"
+        )
+
+    @patch("fabrictesting.onelake_api.api_progress.get_service_client")
+    def test_read_events_ranged(self, mock_get_service_client):
+        """
+        Test a partly written line is kept for the next read.
+        """
+        # Arrange
+        first = b'{"event": "collected", "count": 2}\n{"event": "pass'
+        second = first + b'ed", "test": "test_a.py::test_a"}\n'
+        file_client = _mock_file_client(first)
+        file_system_client = mock_get_service_client.return_value.get_file_system_client
+        get_file_client = file_system_client.return_value.get_file_client
+        get_file_client.return_value = file_client
+        progress_log = ProgressLog(results_url=_RESULTS_URL)
+
+        # Act
+        first_events = progress_log.read_events()
+        file_client.get_file_properties.return_value.size = len(second)
+        file_client.download_file.side_effect = lambda offset, length: MagicMock(
+            readall=MagicMock(return_value=second[offset : offset + length])
+        )
+        second_events = progress_log.read_events()
+        third_events = progress_log.read_events()
+
+        # Assert
+        self.assertEqual(first_events, [{"event": "collected", "count": 2}])
+        self.assertEqual(
+            second_events, [{"event": "passed", "test": "test_a.py::test_a"}]
+        )
+        self.assertEqual(third_events, [])
+        self.assertEqual(progress_log.offset, len(second))
+        file_client.download_file.assert_called_with(
+            offset=first.index(b"\n") + 1,
+            length=len(second) - first.index(b"\n") - 1,
+        )
+        self.assertEqual(file_client.download_file.call_count, 2)
+
+    @patch("fabrictesting.onelake_api.api_progress.get_service_client")
+    def test_read_events_replaced(self, mock_get_service_client):
+        """
+        Test the events of a log that was replaced by a shorter one are read.
+        """
+        # Arrange
+        previous = (
+            b'{"event": "collected", "count": 2}\n'
+            b'{"event": "failed", "test": "test_a.py::test_a"}\n'
+        )
+        replaced = b'{"event": "collected", "count": 1}\n'
+        file_client = _mock_file_client(previous)
+        file_system_client = mock_get_service_client.return_value.get_file_system_client
+        file_system_client.return_value.get_file_client.return_value = file_client
+        progress_log = ProgressLog(results_url=_RESULTS_URL)
+        progress_log.read_events()
+
+        # Act
+        file_client.get_file_properties.return_value.size = len(replaced)
+        file_client.download_file.side_effect = lambda offset, length: MagicMock(
+            readall=MagicMock(return_value=replaced[offset : offset + length])
+        )
+        with self.assertLogs("fabrictesting.onelake_api.api_progress", level="WARNING"):
+            events = progress_log.read_events()
+
+        # Assert
+        self.assertEqual(events, [{"event": "collected", "count": 1}])
+        self.assertEqual(progress_log.offset, len(replaced))
+
+    @patch("fabrictesting.onelake_api.api_progress.get_service_client")
+    def test_read_events_missing(self, mock_get_service_client):
+        """
+        Test no events are returned before the notebook wrote the log.
+        """
+        # Arrange
+        file_system_client = mock_get_service_client.return_value.get_file_system_client
+        get_file_client = file_system_client.return_value.get_file_client
+        get_file_client.return_value.get_file_properties.side_effect = (
+            ResourceNotFoundError("missing")
+        )
+
+        # Act
+        events = ProgressLog(results_url=_RESULTS_URL).read_events()
+
+        # Assert
+        self.assertEqual(events, [])
+        self.assertEqual(ProgressLog(results_url=_RESULTS_URL).offset, 0)
+
+
+class TestFollowTestProgress(unittest.TestCase):
+    """
+    Test Plan:
+    Test 1: The finished tests are logged and the first failure is returned.
+    Test 2: Following fails fast at the first failed test.
+    """
+
+    def test_read_test_progress(self):
+        """
+        Test the finished tests of every job are logged with the job label.
+        """
+        # Arrange
+        progress_logs = {
+            "job-1": MagicMock(
+                read_events=MagicMock(
+                    return_value=[
+                        {"event": "started", "test": "test_a.py::test_a"},
+                        {"event": "passed", "test": "test_a.py::test_a", "duration": 1},
+                    ]
+                )
+            ),
+            "job-2": MagicMock(
+                read_events=MagicMock(
+                    return_value=[
+                        {"event": "failed", "test": "test_b.py::test_b", "duration": 2}
+                    ]
+                )
+            ),
+        }
+
+        # Act
+        with self.assertLogs(
+            "fabrictesting.onelake_api.api_progress", level="INFO"
+        ) as logs:
+            failure = read_test_progress(progress_logs=progress_logs)
+
+        # Assert
+        self.assertEqual(failure["job"], "job-2")
+        self.assertEqual(failure["test"], "test_b.py::test_b")
+        self.assertEqual(
+            [record.getMessage() for record in logs.records],
+            [
+                "[job-1] PASSED test_a.py::test_a (1s)",
+                "[job-2] FAILED test_b.py::test_b (2s)",
+            ],
+        )
+
+    def test_follow_test_progress_fail_fast(self):
+        """
+        Test following returns once a test failed.
+        """
+        # Arrange
+        progress_log = MagicMock(
+            read_events=MagicMock(
+                side_effect=[
+                    [],
+                    [{"event": "error", "test": "test_a.py::test_a", "duration": 0}],
+                ]
+            )
+        )
+
+        # Act
+        failure = asyncio.run(
+            follow_test_progress(
+                progress_logs={"job": progress_log}, fail_fast=True, interval=0
+            )
+        )
+
+        # Assert
+        self.assertEqual(failure["event"], "error")
+        self.assertEqual(progress_log.read_events.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from azure.core.exceptions import ResourceNotFoundError
+from fabrictesting.onelake_api.api_results import download_test_results
+
+_RESULTS_URL = (
+    "abfss://mock_workspace@onelake.dfs.fabric.microsoft.com/"
+    "mock_lakehouse.Lakehouse/Files/fabric-testing/folder/results"
+)
+_RESULTS_DIRECTORY = "mock_lakehouse.Lakehouse/Files/fabric-testing/folder/results"
+
+
+def _path(name: str, is_directory: bool = False) -> MagicMock:
+    path = MagicMock()
+    path.name = f"{_RESULTS_DIRECTORY}/{name}"
+    path.is_directory = is_directory
+    return path
+
+
+class TestDownloadTestResults(unittest.TestCase):
+    """
+    Test Plan:
+    Test 1: All result files are downloaded and the summary is returned.
+    Test 2: None is returned when the job wrote no results.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    @patch("fabrictesting.onelake_api.api_results.get_service_client")
+    def test_download_test_results(self, mock_get_service_client):
+        """
+        Test download_test_results writes every file and returns the summary.
+        """
+        # Arrange
+        contents = {
+            f"{_RESULTS_DIRECTORY}/summary.json": json.dumps({"total": 1}).encode(),
+            f"{_RESULTS_DIRECTORY}/junit.xml": b"<testsuites/>",
+        }
+        file_system_client = (
+            mock_get_service_client.return_value.get_file_system_client.return_value
+        )
+        file_system_client.get_paths.return_value = [
+            _path("junit.xml"),
+            _path("summary.json"),
+        ]
+
+        def _get_file_client(name):
+            file_client = MagicMock()
+            file_client.download_file.return_value.readinto.side_effect = (
+                lambda file: file.write(contents[name])
+            )
+            return file_client
+
+        file_system_client.get_file_client.side_effect = _get_file_client
+
+        # Act
+        summary = download_test_results(
+            results_url=_RESULTS_URL,
+            local_dir=self.temp_dir.name,
+            credential="mock-credential",
+        )
+
+        # Assert
+        self.assertEqual(summary, {"total": 1})
+        self.assertEqual(
+            sorted(os.listdir(self.temp_dir.name)), ["junit.xml", "summary.json"]
+        )
+        mock_get_service_client.assert_called_once_with("mock-credential")
+        mock_get_service_client.return_value.get_file_system_client.assert_called_once_with(
+            file_system="mock_workspace"
+        )
+        file_system_client.get_paths.assert_called_once_with(path=_RESULTS_DIRECTORY)
+
+    @patch("fabrictesting.onelake_api.api_results.get_service_client")
+    def test_download_test_results_not_found(self, mock_get_service_client):
+        """
+        Test download_test_results returns None if the results folder is missing.
+        """
+        # Arrange
+        file_system_client = (
+            mock_get_service_client.return_value.get_file_system_client.return_value
+        )
+        file_system_client.get_paths.side_effect = ResourceNotFoundError("missing")
+
+        # Act
+        summary = download_test_results(
+            results_url=_RESULTS_URL, local_dir=self.temp_dir.name
+        )
+
+        # Assert
+        self.assertIsNone(summary)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,16 @@
 import argparse
+import asyncio
+import os
+import signal
 import unittest
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
-from fabrictesting.test_job.fetch import fetch, fetch_args
+from fabrictesting.test_job.fetch import fetch, fetch_args, wait_for_jobs
+
+_RESULTS_URL = (
+    "abfss://workspace@onelake.dfs.fabric.microsoft.com/"
+    "lakehouse.Lakehouse/Files/fabric-testing/folder/results"
+)
 
 
 class TestFetchArgs(unittest.TestCase):
@@ -66,15 +74,20 @@ class TestFetchArgs(unittest.TestCase):
 
 
 class TestFetchFunction(unittest.TestCase):
-    @patch("fabrictesting.test_job.fetch.poll_notebook_run_status")
     @patch(
-        "fabrictesting.test_job.fetch.load_fetch_url",
-        return_value="https://example.com/fetch-url",
+        "fabrictesting.test_job.fetch.poll_notebook_runs",
+        return_value={
+            "https://example.com/fetch-url": {
+                "status_code": 200,
+                "content": b'{"status": "Completed"}',
+            }
+        },
     )
     @patch(
-        "fabrictesting.test_job.fetch.get_personal_fabric_token",
-        return_value="personal-token",
+        "fabrictesting.test_job.fetch.load_fetch_url_logs",
+        return_value=[("https://example.com/fetch-url", None, None)],
     )
+    @patch("fabrictesting.test_job.fetch.get_personal_token_provider")
     def test_fetch_personal_account(
         self, mock_get_token, mock_load_fetch_url, mock_poll_notebook
     ):
@@ -91,25 +104,41 @@ class TestFetchFunction(unittest.TestCase):
             retry_after=60,
             fetch_url_log_file_path="mock_fetch_url.txt",
             url=None,
+            token_cache_file_path=None,
+            timeout=0,
+            max_attempts=None,
+            results_dir="fabric-testing-results",
+            skip_results=False,
+            fail_fast=False,
+            skip_progress=True,
+            progress_interval=10,
+            keep_jobs=False,
+            cancel_timeout=120,
         )
 
         # Act
-        fetch(args)
+        exit_code = fetch(args)
 
-        # Assert: Ensure the correct token fetching and polling calls are made
-        mock_get_token.assert_called_once_with("some-tenant-id")
+        # Assert: Ensure the correct token provider and polling calls are made
+        self.assertEqual(exit_code, 0)
+        mock_get_token.assert_called_once_with("some-tenant-id", cache_file_path=None)
         mock_load_fetch_url.assert_called_once_with("mock_fetch_url.txt")
         mock_poll_notebook.assert_called_once_with(
-            fetch_url="https://example.com/fetch-url",
-            retry_after=60,
-            token_string="personal-token",
+            fetch_urls=[("https://example.com/fetch-url", 60)],
+            token_provider=mock_get_token.return_value,
+            polling_strategy=ANY,
         )
 
-    @patch("fabrictesting.test_job.fetch.poll_notebook_run_status")
     @patch(
-        "fabrictesting.test_job.fetch.get_client_fabric_token",
-        return_value="service-principal-token",
+        "fabrictesting.test_job.fetch.poll_notebook_runs",
+        return_value={
+            "https://example.com/fetch-url": {
+                "status_code": 200,
+                "content": b'{"status": "Completed"}',
+            }
+        },
     )
+    @patch("fabrictesting.test_job.fetch.get_client_token_provider")
     def test_fetch_service_principal(self, mock_get_token, mock_poll_notebook):
         """
         Test fetch function for service principal with a direct URL provided.
@@ -123,17 +152,295 @@ class TestFetchFunction(unittest.TestCase):
             retry_after=120,
             fetch_url_log_file_path=None,
             url="https://example.com/fetch-url",
+            token_cache_file_path="mock-token-cache.json",
+            timeout=0,
+            max_attempts=None,
+            results_dir="fabric-testing-results",
+            skip_results=False,
+            fail_fast=False,
+            skip_progress=True,
+            progress_interval=10,
+            keep_jobs=False,
+            cancel_timeout=120,
         )
 
         # Act
-        fetch(args)
+        exit_code = fetch(args)
 
-        # Assert: Ensure the correct token fetching and polling calls are made
+        # Assert: Ensure the correct token provider and polling calls are made
+        self.assertEqual(exit_code, 0)
         mock_get_token.assert_called_once_with(
-            "some-tenant-id", "some-client-id", "some-client-secret"
+            "some-tenant-id",
+            "some-client-id",
+            "some-client-secret",
+            cache_file_path="mock-token-cache.json",
         )
         mock_poll_notebook.assert_called_once_with(
-            fetch_url="https://example.com/fetch-url",
-            retry_after=120,
-            token_string="service-principal-token",
+            fetch_urls=[("https://example.com/fetch-url", 120)],
+            token_provider=mock_get_token.return_value,
+            polling_strategy=ANY,
+        )
+
+    @patch(
+        "fabrictesting.test_job.fetch.poll_notebook_runs",
+        return_value={
+            "https://example.com/fetch-url": {
+                "status_code": None,
+                "content": b"Stopped",
+                "timed_out": True,
+            }
+        },
+    )
+    @patch(
+        "fabrictesting.test_job.fetch.load_fetch_url_logs",
+        return_value=[("https://example.com/fetch-url", 20, None)],
+    )
+    @patch("fabrictesting.test_job.fetch.get_personal_token_provider")
+    @patch("fabrictesting.test_job.fetch.cancel_notebook_runs")
+    def test_fetch_logged_retry_after_and_timeout(
+        self,
+        mock_cancel_notebook_runs,
+        mock_get_token,
+        mock_load_fetch_url_logs,
+        mock_poll_notebook,
+    ):
+        """
+        Test fetch uses the logged polling interval and the deadline,
+        and returns a failing exit code when polling timed out.
+        """
+        # Arrange
+        args = argparse.Namespace(
+            service_principal=False,
+            tenant_id="some-tenant-id",
+            client_id=None,
+            client_secret=None,
+            retry_after=None,
+            fetch_url_log_file_path="mock_fetch_url.txt",
+            url=None,
+            token_cache_file_path=None,
+            timeout=600,
+            max_attempts=None,
+            results_dir="fabric-testing-results",
+            skip_results=False,
+            fail_fast=False,
+            skip_progress=True,
+            progress_interval=10,
+            keep_jobs=False,
+            cancel_timeout=120,
+        )
+
+        # Act
+        with self.assertLogs("fabrictesting", level="INFO") as logs:
+            exit_code = fetch(args)
+
+        # Assert
+        self.assertEqual(exit_code, 1)
+        kwargs = mock_poll_notebook.call_args.kwargs
+        self.assertEqual(kwargs["fetch_urls"], [("https://example.com/fetch-url", 20)])
+        self.assertEqual(kwargs["polling_strategy"].timeout, 600)
+        self.assertIn(
+            "    TimedOut: https://example.com/fetch-url",
+            [record.getMessage() for record in logs.records],
+        )
+        mock_cancel_notebook_runs.assert_called_once_with(
+            fetch_urls=["https://example.com/fetch-url"],
+            token_provider=mock_get_token.return_value,
+            timeout=120,
+        )
+
+    @patch(
+        "fabrictesting.test_job.fetch.poll_notebook_runs",
+        return_value={
+            "https://example.com/job-1": {
+                "status_code": 200,
+                "content": b'{"status": "Completed"}',
+            },
+            "https://example.com/job-2": {
+                "status_code": 200,
+                "content": b'{"status": "Failed"}',
+            },
+        },
+    )
+    @patch(
+        "fabrictesting.test_job.fetch.load_fetch_url_logs",
+        side_effect=[
+            [("https://example.com/job-1", 30, _RESULTS_URL)],
+            [("https://example.com/job-2", None, None)],
+        ],
+    )
+    @patch("fabrictesting.test_job.fetch.get_personal_token_provider")
+    @patch("fabrictesting.test_job.fetch.save_test_durations")
+    @patch(
+        "fabrictesting.test_job.fetch.download_test_results",
+        return_value={
+            "passed": 1,
+            "tests": [{"file": "test_a.py", "outcome": "passed", "duration": 2.0}],
+        },
+    )
+    def test_fetch_multiple_jobs(
+        self,
+        mock_download_test_results,
+        mock_save_test_durations,
+        mock_get_token,
+        mock_load_fetch_url_logs,
+        mock_poll_notebook,
+    ):
+        """
+        Test fetch polls the jobs of several logs together, downloads the
+        logged test results, and fails if any job did not complete.
+        """
+        # Arrange
+        args = argparse.Namespace(
+            service_principal=False,
+            tenant_id="some-tenant-id",
+            client_id=None,
+            client_secret=None,
+            retry_after=None,
+            fetch_url_log_file_path=["log-1.txt", "log-2.txt"],
+            url=None,
+            token_cache_file_path=None,
+            timeout=0,
+            max_attempts=None,
+            results_dir="fabric-testing-results",
+            skip_results=False,
+            fail_fast=False,
+            skip_progress=True,
+            progress_interval=10,
+            keep_jobs=False,
+            cancel_timeout=120,
+        )
+
+        # Act
+        with self.assertLogs("fabrictesting", level="INFO") as logs:
+            exit_code = fetch(args)
+
+        # Assert
+        self.assertEqual(exit_code, 1)
+        mock_poll_notebook.assert_called_once_with(
+            fetch_urls=[
+                ("https://example.com/job-1", 30),
+                ("https://example.com/job-2", 60),
+            ],
+            token_provider=mock_get_token.return_value,
+            polling_strategy=ANY,
+        )
+        self.assertIn(
+            "1 of 2 job(s) completed.", [record.getMessage() for record in logs.records]
+        )
+        mock_download_test_results.assert_called_once_with(
+            results_url=_RESULTS_URL,
+            local_dir=os.path.join("fabric-testing-results", "folder", "results"),
+            credential=mock_get_token.return_value,
+        )
+        mock_save_test_durations.assert_called_once_with(
+            {"test_a.py": 2.0},
+            os.path.join("fabric-testing-results", "test-durations.json"),
+        )
+
+    @patch("fabrictesting.test_job.fetch.poll_notebook_runs")
+    @patch(
+        "fabrictesting.test_job.fetch.load_fetch_url_logs",
+        return_value=[("https://example.com/fetch-url", 30, _RESULTS_URL)],
+    )
+    @patch("fabrictesting.test_job.fetch.get_personal_token_provider")
+    @patch("fabrictesting.test_job.fetch.download_test_results")
+    @patch("fabrictesting.test_job.fetch.ProgressLog")
+    @patch("fabrictesting.test_job.fetch.cancel_notebook_runs")
+    def test_fetch_fail_fast(
+        self,
+        mock_cancel_notebook_runs,
+        mock_progress_log,
+        mock_download_test_results,
+        mock_get_token,
+        mock_load_fetch_url_logs,
+        mock_poll_notebook,
+    ):
+        """
+        Test fetch stops polling, cancels the job and fails
+        at the first failed test.
+        """
+
+        # Arrange
+        async def poll_forever(**kwargs):
+            await asyncio.sleep(3600)
+
+        mock_poll_notebook.side_effect = poll_forever
+        mock_progress_log.return_value.read_events.return_value = [
+            {"event": "failed", "test": "test_a.py::test_a", "duration": 1}
+        ]
+        args = argparse.Namespace(
+            service_principal=False,
+            tenant_id="some-tenant-id",
+            client_id=None,
+            client_secret=None,
+            retry_after=None,
+            fetch_url_log_file_path="mock_fetch_url.txt",
+            url=None,
+            token_cache_file_path=None,
+            timeout=0,
+            max_attempts=None,
+            results_dir="fabric-testing-results",
+            skip_results=False,
+            fail_fast=True,
+            skip_progress=False,
+            progress_interval=0,
+            keep_jobs=False,
+            cancel_timeout=120,
+        )
+
+        # Act
+        with self.assertLogs("fabrictesting", level="INFO") as logs:
+            exit_code = fetch(args)
+
+        # Assert
+        self.assertEqual(exit_code, 1)
+        mock_progress_log.assert_called_once_with(
+            results_url=_RESULTS_URL, credential=mock_get_token.return_value
+        )
+        self.assertIn(
+            "Failing fast: test_a.py::test_a failed in https://example.com/fetch-url",
+            [record.getMessage() for record in logs.records],
+        )
+        mock_download_test_results.assert_not_called()
+        mock_cancel_notebook_runs.assert_called_once_with(
+            fetch_urls=["https://example.com/fetch-url"],
+            token_provider=mock_get_token.return_value,
+            timeout=120,
+        )
+
+
+class TestWaitForJobs(unittest.TestCase):
+    @patch("fabrictesting.test_job.fetch.poll_notebook_runs")
+    def test_wait_for_jobs_interrupted(self, mock_poll_notebook):
+        """
+        Test SIGINT stops polling instead of raising KeyboardInterrupt,
+        and the previous signal handler is restored.
+        """
+
+        # Arrange
+        async def interrupt(**kwargs):
+            os.kill(os.getpid(), signal.SIGINT)
+            await asyncio.sleep(3600)
+
+        mock_poll_notebook.side_effect = interrupt
+        previous_handler = signal.getsignal(signal.SIGINT)
+
+        # Act
+        with self.assertLogs("fabrictesting", level="INFO") as logs:
+            results, failure, interrupted = asyncio.run(
+                wait_for_jobs(
+                    fetch_urls=[("https://example.com/fetch-url", 60)],
+                    token_provider=None,
+                    polling_strategy=None,
+                )
+            )
+
+        # Assert
+        self.assertIsNone(results)
+        self.assertIsNone(failure)
+        self.assertTrue(interrupted)
+        self.assertIs(signal.getsignal(signal.SIGINT), previous_handler)
+        self.assertIn(
+            "Received SIGINT, stopping...",
+            [record.getMessage() for record in logs.records],
         )
@@ -0,0 +1,176 @@
+import argparse
+import os
+import tempfile
+import unittest
+from unittest.mock import ANY, MagicMock, call, patch
+
+from fabrictesting.test_job.run import run, run_args
+
+_JOB = (
+    "https://mock-fetch-url.com",
+    30,
+    "abfss://workspace@onelake.dfs.fabric.microsoft.com/"
+    "lakehouse.Lakehouse/Files/fabric-testing/folder/results",
+)
+
+
+class TestRunArgs(unittest.TestCase):
+    @patch("fabrictesting.test_job.run.validate_args")
+    def test_run_args_combines_submit_and_fetch(self, mock_validate_args):
+        """
+        Test run_args accepts the arguments of submit and of fetch.
+        """
+        # Arrange
+        argv = [
+            "run.py",
+            "--tenant-id=tenant",
+            "--tests-path=tests",
+            "--workspace-name=workspace",
+            "--workspace-id=workspace-id",
+            "--lakehouse-name=lakehouse",
+            "--lakehouse-id=lakehouse-id",
+            "--shards=2",
+            "--fail-fast",
+            "--timeout=600",
+        ]
+
+        # Act
+        with patch("sys.argv", argv):
+            args = run_args()
+
+        # Assert
+        self.assertEqual(args.shards, 2)
+        self.assertTrue(args.fail_fast)
+        self.assertEqual(args.timeout, 600)
+        self.assertFalse(hasattr(args, "url"))
+        mock_validate_args.assert_called_once_with(args, ANY)
+
+
+class TestRun(unittest.TestCase):
+    @patch("fabrictesting.test_job.run.save_fetch_url_log")
+    @patch("fabrictesting.test_job.run.fetch_jobs", return_value=0)
+    @patch(
+        "fabrictesting.test_job.run.submit_jobs",
+        return_value={
+            "notebook_name": "folder",
+            "notebook_id": "notebook-id",
+            "submit_folder": "folder",
+            "status_code": 202,
+            "sharded": False,
+            "jobs": [_JOB],
+        },
+    )
+    @patch("fabrictesting.test_job.run.create_token_provider")
+    def test_run_submits_and_fetches_with_one_login(
+        self,
+        mock_create_token_provider,
+        mock_submit_jobs,
+        mock_fetch_jobs,
+        mock_save_fetch_url_log,
+    ):
+        """
+        Test run authenticates once, passes the same token provider to submit
+        and fetch, and logs the stage timings.
+        """
+        # Arrange
+        token_provider = mock_create_token_provider.return_value
+        args = MagicMock(output_log_file_path="mock-log-path")
+
+        # Act
+        with self.assertLogs("fabrictesting", level="INFO") as logs:
+            exit_code = run(args)
+
+        # Assert
+        self.assertEqual(exit_code, 0)
+        mock_create_token_provider.assert_called_once_with(args)
+        token_provider.get_token_string.assert_has_calls(
+            [call(), call("https://storage.azure.com/.default")]
+        )
+        mock_submit_jobs.assert_called_once_with(
+            args, token_provider=token_provider, timer=ANY
+        )
+        mock_fetch_jobs.assert_called_once_with(
+            args,
+            jobs=[_JOB],
+            token_provider=token_provider,
+            timer=mock_submit_jobs.call_args.kwargs["timer"],
+        )
+        mock_save_fetch_url_log.assert_called_once_with(
+            _JOB[0],
+            file_name="mock-log-path",
+            retry_after=_JOB[1],
+            results_url=_JOB[2],
+        )
+        self.assertIn(
+            "Stage timings:", [record.getMessage() for record in logs.records]
+        )
+
+    @patch("fabrictesting.test_job.run.fetch_jobs")
+    @patch(
+        "fabrictesting.test_job.run.submit_jobs",
+        side_effect=RuntimeError("Failed to upload folder"),
+    )
+    @patch("fabrictesting.test_job.run.create_token_provider")
+    def test_run_logs_timings_on_failure(
+        self,
+        mock_create_token_provider,
+        mock_submit_jobs,
+        mock_fetch_jobs,
+    ):
+        """
+        Test run logs the stage timings when a stage fails.
+        """
+        # Arrange
+        args = argparse.Namespace(output_log_file_path=None)
+
+        # Act
+        with self.assertLogs("fabrictesting", level="INFO") as logs:
+            with self.assertRaises(RuntimeError):
+                run(args)
+
+        # Assert
+        mock_fetch_jobs.assert_not_called()
+        self.assertIn(
+            "Stage timings:", [record.getMessage() for record in logs.records]
+        )
+
+    @patch("fabrictesting.test_job.run.fetch_jobs", return_value=0)
+    @patch("fabrictesting.test_job.run.submit_jobs")
+    @patch("fabrictesting.test_job.run.create_token_provider")
+    def test_run_writes_fetch_urls_to_output_log_file_path(
+        self,
+        mock_create_token_provider,
+        mock_submit_jobs,
+        mock_fetch_jobs,
+    ):
+        """
+        Test run writes the fetch URLs of all shards to --output-log-file-path.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # Arrange
+            output_log_file_path = os.path.join(temp_dir, "custom.txt")
+            args = argparse.Namespace(output_log_file_path=output_log_file_path)
+            mock_submit_jobs.return_value = {
+                "notebook_name": "folder",
+                "notebook_id": "notebook-id",
+                "submit_folder": "folder",
+                "status_code": 202,
+                "sharded": True,
+                "jobs": [_JOB, ("https://mock-fetch-url-2.com", None, None)],
+            }
+
+            # Act
+            with self.assertLogs("fabrictesting", level="INFO"):
+                run(args)
+
+            # Assert
+            self.assertEqual(os.listdir(temp_dir), ["custom.txt"])
+            with open(output_log_file_path, "r") as file:
+                lines = file.read().splitlines()
+            self.assertEqual(len(lines), 2)
+            self.assertTrue(lines[0].startswith(_JOB[0]))
+            self.assertTrue(lines[1].startswith("https://mock-fetch-url-2.com"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,19 +1,37 @@
 import argparse
+import threading
 import unittest
-from unittest.mock import MagicMock, call, patch
+from unittest.mock import ANY, MagicMock, patch
 
 from fabrictesting.test_job.submit import submit, submit_args
 
 
 class TestSubmitFlow(unittest.TestCase):
+    @patch(
+        "fabrictesting.test_job.submit.create_results_name",
+        return_value="results-mock",
+    )
+    @patch(
+        "fabrictesting.test_job.submit.create_submit_folder_name",
+        return_value="mock-folder-name",
+    )
     @patch(
         "fabrictesting.test_job.submit.run_notebook",
-        return_value={"status_code": 202, "fetch_url": "https://mock-fetch-url.com"},
+        return_value={
+            "status_code": 202,
+            "fetch_url": "https://mock-fetch-url.com",
+            "retry_after": 30,
+        },
     )
+    @patch("fabrictesting.test_job.submit.wait_for_notebook_id")
     @patch(
-        "fabrictesting.test_job.submit.get_notebook_id", return_value="mock-notebook-id"
+        "fabrictesting.test_job.submit.upload_notebook",
+        return_value={
+            "status_code": 201,
+            "content": b"",
+            "item_id": "mock-notebook-id",
+        },
     )
-    @patch("fabrictesting.test_job.submit.upload_notebook")
     @patch(
         "fabrictesting.test_job.submit.load_default_notebook",
         return_value="mock-notebook-content",
@@ -23,39 +41,43 @@ class TestSubmitFlow(unittest.TestCase):
         return_value="mock-platform-content",
     )
     @patch(
-        "fabrictesting.test_job.submit.upload_folder_to_onelake",
+        "fabrictesting.test_job.submit.upload_bundle_to_onelake",
         return_value="mock-folder-name",
     )
     @patch(
-        "fabrictesting.test_job.submit.create_temp_folder_with_files",
-        return_value=("mock-temp-dir", "mock-wheel-name", "mock-reqs.txt"),
-    )
-    @patch(
-        "fabrictesting.test_job.submit.get_personal_fabric_token",
-        return_value="mock-fabric-token",
+        "fabrictesting.test_job.submit.collect_bundle_files",
+        return_value=(
+            {"tests/test_a.py": "mock-tests-path/test_a.py"},
+            "mock-wheel-name",
+            "mock-reqs.txt",
+        ),
     )
+    @patch("fabrictesting.test_job.submit.get_personal_token_provider")
     @patch("fabrictesting.test_job.submit.save_fetch_url_log")
-    @patch("builtins.print")  # Mock print statements
     @patch("time.sleep", return_value=None)  # Mock sleep to avoid actual delay
     def test_submit_full_flow_personal_account(
         self,
         mock_sleep,
-        mock_print,
         mock_save_fetch_url_log,
-        mock_get_personal_fabric_token,
-        mock_create_temp_folder_with_files,
-        mock_upload_folder_to_onelake,
+        mock_get_personal_token_provider,
+        mock_collect_bundle_files,
+        mock_upload_bundle_to_onelake,
         mock_create_platform_file_content,
         mock_load_default_notebook,
         mock_upload_notebook,
-        mock_get_notebook_id,
+        mock_wait_for_notebook_id,
         mock_run_notebook,
+        mock_create_submit_folder_name,
+        mock_create_results_name,
     ):
         """
         Test the full flow of the submit function for a personal account.
         """
 
-        # Arrange: Set up the args
+        # Arrange: Set up the token provider and the args
+        mock_token_provider = mock_get_personal_token_provider.return_value
+        mock_token_provider.get_token_string.return_value = "mock-fabric-token"
+
         args = MagicMock(
             tenant_id="mock-tenant-id",
             whl_path="mock-whl-path",
@@ -69,19 +91,35 @@ class TestSubmitFlow(unittest.TestCase):
             service_principal=False,
             client_id=None,
             client_secret=None,
+            upload_workers=8,
+            incremental_upload=False,
+            bundle_archive=False,
+            memory_map=False,
+            token_cache_file_path=None,
+            notebook_cache_file_path=None,
+            persistent_runner=False,
+            shards=1,
+            test_workers=1,
+            dependency_cache=False,
+            bundle_copy_mode="sparkfiles",
+            notebook_template=None,
+            extra_cells=None,
         )
 
         # Act: Call the submit function
-        fetch_url = submit(args)
+        with self.assertLogs("fabrictesting.test_job.submit", level="INFO") as logs:
+            fetch_url = submit(args)
 
         # Assert: Ensure that the functions were called in the
         # correct order and with the right parameters
 
-        # Token fetching
-        mock_get_personal_fabric_token.assert_called_once_with("mock-tenant-id")
+        # Token provider
+        mock_get_personal_token_provider.assert_called_once_with(
+            "mock-tenant-id", cache_file_path=None
+        )
 
-        # Temp folder creation
-        mock_create_temp_folder_with_files.assert_called_once_with(
+        # Bundle collection
+        mock_collect_bundle_files.assert_called_once_with(
             whl_path="mock-whl-path",
             tests_path="mock-tests-path",
             requirements_file="mock-reqs-path",
@@ -92,11 +130,18 @@ class TestSubmitFlow(unittest.TestCase):
             description="This is a fabric-testing notebook",
         )
 
-        # Folder upload
-        mock_upload_folder_to_onelake.assert_called_once_with(
-            temp_folder="mock-temp-dir",
+        # Bundle upload
+        mock_upload_bundle_to_onelake.assert_called_once_with(
+            files={"tests/test_a.py": "mock-tests-path/test_a.py"},
             workspace_name="mock-workspace-name",
             lakehouse_name="mock-lakehouse-name",
+            custom_folder="mock-folder-name",
+            max_workers=8,
+            memory_map=False,
+            manifest=None,
+            previous_submit_folder=None,
+            previous_manifest=None,
+            credential=mock_token_provider,
         )
 
         # Notebook content creation
@@ -109,6 +154,13 @@ class TestSubmitFlow(unittest.TestCase):
             wheel_name="mock-wheel-name",
             requirements_file_name="mock-reqs.txt",
             unittest_folder_name="tests",
+            bundle_archive_name=None,
+            test_workers=1,
+            dependency_cache=False,
+            bundle_copy_mode="sparkfiles",
+            results_name="results-mock",
+            template_path=None,
+            extra_cells=None,
         )
 
         # Notebook upload
@@ -121,37 +173,505 @@ class TestSubmitFlow(unittest.TestCase):
             token_string="mock-fabric-token",
         )
 
-        # Get notebook ID
-        mock_get_notebook_id.assert_called_once_with(
-            notebook_name="mock-folder-name",
-            workspace_id="mock-workspace-id",
-            token_string="mock-fabric-token",
-        )
+        # The notebook ID is taken from the upload, no lookup needed
+        mock_wait_for_notebook_id.assert_not_called()
 
         # Run notebook
         mock_run_notebook.assert_called_once_with(
             item_id="mock-notebook-id",
             workspace_id="mock-workspace-id",
             token_string="mock-fabric-token",
+            parameters=None,
         )
 
         # Save fetch URL log
-        mock_save_fetch_url_log.assert_called_once_with("https://mock-fetch-url.com")
+        mock_save_fetch_url_log.assert_called_once_with(
+            "https://mock-fetch-url.com",
+            file_name="mock-log-path",
+            retry_after=30,
+            results_url="abfss://mock-workspace-name@onelake.dfs.fabric.microsoft.com/"
+            "mock-lakehouse-name.Lakehouse/Files/fabric-testing/mock-folder-name/"
+            "results-mock",
+        )
 
         # Assert the returned URL is correct
         self.assertEqual(fetch_url, "https://mock-fetch-url.com")
 
-        # Assert the correct print statements were made
-        expected_print_calls = [
-            call("Starting fabric-testing submit..."),
-            call("Give Fabric API 5 seconds to upload notebook..."),
-            call("Notebook triggered with status 202"),
-            call("Notebook has the name: mock-folder-name"),
-            call("Notebook has id mock-notebook-id"),
-            call("Fetch results at https://mock-fetch-url.com"),
-            call("Fabric-testing submit ran successfully!"),
-        ]
-        mock_print.assert_has_calls(expected_print_calls, any_order=False)
+        # Assert the expected messages were logged in order
+        self.assertEqual(
+            [record.getMessage() for record in logs.records],
+            [
+                "Starting fabric-testing submit...",
+                "Notebook triggered with status 202",
+                "Notebook has the name: mock-folder-name",
+                "Notebook has id mock-notebook-id",
+                "Fetch results at https://mock-fetch-url.com",
+                "Fabric-testing submit ran successfully!",
+            ],
+        )
+        mock_sleep.assert_not_called()
+
+    @patch(
+        "fabrictesting.test_job.submit.create_results_name",
+        return_value="results-mock",
+    )
+    @patch(
+        "fabrictesting.test_job.submit.create_submit_folder_name",
+        return_value="mock-folder-name",
+    )
+    @patch(
+        "fabrictesting.test_job.submit.run_notebook",
+        return_value={"status_code": 202, "fetch_url": "https://mock-fetch-url.com"},
+    )
+    @patch(
+        "fabrictesting.test_job.submit.wait_for_notebook_id",
+        return_value="mock-notebook-id",
+    )
+    @patch(
+        "fabrictesting.test_job.submit.upload_notebook",
+        return_value={"status_code": 202, "content": b"", "item_id": None},
+    )
+    @patch("fabrictesting.test_job.submit.load_default_notebook")
+    @patch("fabrictesting.test_job.submit.create_platform_file_content")
+    @patch(
+        "fabrictesting.test_job.submit.upload_bundle_to_onelake",
+        return_value="mock-folder-name",
+    )
+    @patch(
+        "fabrictesting.test_job.submit.collect_bundle_files",
+        return_value=({}, None, None),
+    )
+    @patch("fabrictesting.test_job.submit.get_personal_token_provider")
+    def test_submit_looks_up_notebook_id_when_missing(
+        self,
+        mock_get_personal_token_provider,
+        mock_collect_bundle_files,
+        mock_upload_bundle_to_onelake,
+        mock_create_platform_file_content,
+        mock_load_default_notebook,
+        mock_upload_notebook,
+        mock_wait_for_notebook_id,
+        mock_run_notebook,
+        mock_create_submit_folder_name,
+        mock_create_results_name,
+    ):
+        """
+        Test submit looks up the notebook by name when the upload
+        did not return the notebook id.
+        """
+        # Arrange
+        mock_token_provider = mock_get_personal_token_provider.return_value
+        mock_token_provider.get_token_string.return_value = "mock-fabric-token"
+        args = MagicMock(
+            workspace_id="mock-workspace-id",
+            workspace_name="mock-workspace",
+            lakehouse_name="mock-lakehouse",
+            output_log_file_path=None,
+            service_principal=False,
+            notebook_cache_file_path=None,
+            persistent_runner=False,
+            shards=1,
+            test_workers=1,
+            dependency_cache=False,
+            bundle_copy_mode="sparkfiles",
+            incremental_upload=False,
+            bundle_archive=False,
+        )
+
+        # Act
+        submit(args)
+
+        # Assert: The notebook was looked up by name and run
+        mock_wait_for_notebook_id.assert_called_once_with(
+            notebook_name="mock-folder-name",
+            workspace_id="mock-workspace-id",
+            token_string="mock-fabric-token",
+        )
+        self.assertEqual(
+            mock_run_notebook.call_args.kwargs["item_id"], "mock-notebook-id"
+        )
+
+    @patch(
+        "fabrictesting.test_job.submit.create_results_name",
+        return_value="results-mock",
+    )
+    @patch(
+        "fabrictesting.test_job.submit.create_submit_folder_name",
+        return_value="mock-folder-name",
+    )
+    @patch(
+        "fabrictesting.test_job.submit.run_notebook",
+        return_value={"status_code": 202, "fetch_url": "https://mock-fetch-url.com"},
+    )
+    @patch("fabrictesting.test_job.submit.upload_notebook")
+    @patch("fabrictesting.test_job.submit.load_default_notebook")
+    @patch("fabrictesting.test_job.submit.create_platform_file_content")
+    @patch("fabrictesting.test_job.submit.upload_bundle_to_onelake")
+    @patch(
+        "fabrictesting.test_job.submit.collect_bundle_files",
+        return_value=({}, None, None),
+    )
+    @patch("fabrictesting.test_job.submit.get_personal_token_provider")
+    def test_submit_creates_notebook_during_upload(
+        self,
+        mock_get_personal_token_provider,
+        mock_collect_bundle_files,
+        mock_upload_bundle_to_onelake,
+        mock_create_platform_file_content,
+        mock_load_default_notebook,
+        mock_upload_notebook,
+        mock_run_notebook,
+        mock_create_submit_folder_name,
+        mock_create_results_name,
+    ):
+        """
+        Test the notebook is created while the bundle is uploading,
+        and the job is only triggered once the upload is done.
+        """
+        # Arrange: The upload only finishes once the notebook was created
+        notebook_created = threading.Event()
+        events = []
+
+        def _upload_bundle(**kwargs):
+            finished = notebook_created.wait(timeout=5)
+            events.append("bundle uploaded" if finished else "upload timed out")
+            return "mock-folder-name"
+
+        def _upload_notebook(**kwargs):
+            events.append("notebook created")
+            notebook_created.set()
+            return {"status_code": 201, "content": b"", "item_id": "mock-id"}
+
+        def _run_notebook(**kwargs):
+            events.append("job triggered")
+            return {"status_code": 202, "fetch_url": "https://mock-fetch-url.com"}
+
+        mock_upload_bundle_to_onelake.side_effect = _upload_bundle
+        mock_upload_notebook.side_effect = _upload_notebook
+        mock_run_notebook.side_effect = _run_notebook
+        args = MagicMock(
+            workspace_id="mock-workspace-id",
+            workspace_name="mock-workspace",
+            lakehouse_name="mock-lakehouse",
+            output_log_file_path=None,
+            service_principal=False,
+            notebook_cache_file_path=None,
+            persistent_runner=False,
+            shards=1,
+            test_workers=1,
+            dependency_cache=False,
+            bundle_copy_mode="sparkfiles",
+            incremental_upload=False,
+            bundle_archive=False,
+        )
+
+        # Act
+        submit(args)
+
+        # Assert
+        self.assertEqual(
+            events, ["notebook created", "bundle uploaded", "job triggered"]
+        )
+        self.assertIsNone(mock_run_notebook.call_args.kwargs["parameters"])
+
+    @patch(
+        "fabrictesting.test_job.submit.create_results_name",
+        return_value="results-mock",
+    )
+    @patch(
+        "fabrictesting.test_job.submit.create_submit_folder_name",
+        return_value="mock-new-folder",
+    )
+    @patch(
+        "fabrictesting.test_job.submit.run_notebook",
+        return_value={"status_code": 202, "fetch_url": "https://mock-fetch-url.com"},
+    )
+    @patch(
+        "fabrictesting.test_job.submit.upload_notebook",
+        return_value={"status_code": 201, "content": b"", "item_id": "mock-id"},
+    )
+    @patch("fabrictesting.test_job.submit.load_default_notebook")
+    @patch("fabrictesting.test_job.submit.create_platform_file_content")
+    @patch(
+        "fabrictesting.test_job.submit.upload_bundle_to_onelake",
+        return_value="mock-previous-folder",
+    )
+    @patch(
+        "fabrictesting.test_job.submit.collect_bundle_files",
+        return_value=({}, None, None),
+    )
+    @patch("fabrictesting.test_job.submit.get_personal_token_provider")
+    def test_submit_reused_bundle(
+        self,
+        mock_get_personal_token_provider,
+        mock_collect_bundle_files,
+        mock_upload_bundle_to_onelake,
+        mock_create_platform_file_content,
+        mock_load_default_notebook,
+        mock_upload_notebook,
+        mock_run_notebook,
+        mock_create_submit_folder_name,
+        mock_create_results_name,
+    ):
+        """
+        Test the notebook, created during the upload, runs the previous bundle
+        when the unchanged bundle is reused.
+        """
+        # Arrange
+        args = MagicMock(
+            workspace_id="mock-workspace-id",
+            workspace_name="mock-workspace",
+            lakehouse_name="mock-lakehouse",
+            output_log_file_path=None,
+            service_principal=False,
+            notebook_cache_file_path=None,
+            persistent_runner=False,
+            shards=1,
+            test_workers=1,
+            dependency_cache=False,
+            bundle_copy_mode="sparkfiles",
+            incremental_upload=False,
+            bundle_archive=False,
+        )
+
+        # Act
+        submit(args)
+
+        # Assert: The notebook keeps the new name, but runs the previous bundle
+        self.assertEqual(
+            mock_upload_bundle_to_onelake.call_args.kwargs["custom_folder"],
+            "mock-new-folder",
+        )
+        self.assertEqual(
+            mock_load_default_notebook.call_args.kwargs["submit_folder"],
+            "mock-new-folder",
+        )
+        self.assertEqual(
+            mock_upload_notebook.call_args.kwargs["display_name"], "mock-new-folder"
+        )
+        self.assertEqual(
+            mock_run_notebook.call_args.kwargs["parameters"],
+            {"submit_folder": "mock-previous-folder"},
+        )
+
+    @patch(
+        "fabrictesting.test_job.submit.create_results_name",
+        return_value="results-mock",
+    )
+    @patch(
+        "fabrictesting.test_job.submit.create_submit_folder_name",
+        return_value="mock-folder-name",
+    )
+    @patch(
+        "fabrictesting.test_job.submit.run_notebook",
+        return_value={"status_code": 202, "fetch_url": "https://mock-fetch-url.com"},
+    )
+    @patch(
+        "fabrictesting.test_job.submit.ensure_runner_notebook",
+        return_value="mock-runner-id",
+    )
+    @patch("fabrictesting.test_job.submit.upload_notebook")
+    @patch(
+        "fabrictesting.test_job.submit.load_default_notebook",
+        return_value="mock-runner-content",
+    )
+    @patch(
+        "fabrictesting.test_job.submit.upload_bundle_to_onelake",
+        return_value="mock-folder-name",
+    )
+    @patch(
+        "fabrictesting.test_job.submit.collect_bundle_files",
+        return_value=({}, "mock-wheel-name", None),
+    )
+    @patch("fabrictesting.test_job.submit.get_personal_token_provider")
+    def test_submit_persistent_runner(
+        self,
+        mock_get_personal_token_provider,
+        mock_collect_bundle_files,
+        mock_upload_bundle_to_onelake,
+        mock_load_default_notebook,
+        mock_upload_notebook,
+        mock_ensure_runner_notebook,
+        mock_run_notebook,
+        mock_create_submit_folder_name,
+        mock_create_results_name,
+    ):
+        """
+        Test submit runs the persistent runner notebook with execution parameters
+        instead of creating a notebook.
+        """
+        # Arrange
+        mock_token_provider = mock_get_personal_token_provider.return_value
+        mock_token_provider.get_token_string.return_value = "mock-fabric-token"
+        args = MagicMock(
+            workspace_id="mock-workspace-id",
+            workspace_name="mock-workspace",
+            lakehouse_name="mock-lakehouse",
+            output_log_file_path=None,
+            service_principal=False,
+            notebook_cache_file_path=None,
+            persistent_runner=True,
+            runner_notebook_name="mock-runner",
+            shards=1,
+            test_workers=1,
+            dependency_cache=False,
+            bundle_copy_mode="sparkfiles",
+            incremental_upload=False,
+            bundle_archive=False,
+        )
+
+        # Act
+        submit(args)
+
+        # Assert: The runner notebook was used instead of a new notebook
+        mock_upload_notebook.assert_not_called()
+        mock_ensure_runner_notebook.assert_called_once_with(
+            notebook_name="mock-runner",
+            notebook_definition="mock-runner-content",
+            workspace_id="mock-workspace-id",
+            token_string="mock-fabric-token",
+        )
+        self.assertEqual(
+            mock_load_default_notebook.call_args.kwargs["submit_folder"], ""
+        )
+        self.assertTrue(
+            mock_load_default_notebook.call_args.kwargs["guard_optional_cells"]
+        )
+        mock_run_notebook.assert_called_once_with(
+            item_id="mock-runner-id",
+            workspace_id="mock-workspace-id",
+            token_string="mock-fabric-token",
+            parameters={
+                "submit_folder": "mock-folder-name",
+                "wheel_name": "mock-wheel-name",
+                "requirements_file_name": "",
+                "test_folder": "tests",
+                "bundle_archive_name": "",
+                "test_files": "",
+                "test_workers": "1",
+                "dependency_cache": "",
+                "bundle_copy_mode": "sparkfiles",
+                "results_name": "results-mock",
+            },
+        )
+
+    @patch(
+        "fabrictesting.test_job.submit.create_results_name",
+        return_value="results-mock",
+    )
+    @patch(
+        "fabrictesting.test_job.submit.create_submit_folder_name",
+        return_value="mock-folder-name",
+    )
+    @patch(
+        "fabrictesting.test_job.submit.run_notebook",
+        side_effect=[
+            {"status_code": 202, "fetch_url": "https://mock-fetch-url.com/1"},
+            {"status_code": 202, "fetch_url": "https://mock-fetch-url.com/2"},
+        ],
+    )
+    @patch("fabrictesting.test_job.submit.save_fetch_url_logs")
+    @patch(
+        "fabrictesting.test_job.submit.load_test_durations",
+        return_value={"test_slow.py": 100.0, "test_a.py": 10.0, "test_b.py": 20.0},
+    )
+    @patch(
+        "fabrictesting.test_job.submit.upload_notebook",
+        return_value={"status_code": 201, "content": b"", "item_id": "mock-id"},
+    )
+    @patch("fabrictesting.test_job.submit.load_default_notebook")
+    @patch("fabrictesting.test_job.submit.create_platform_file_content")
+    @patch(
+        "fabrictesting.test_job.submit.upload_bundle_to_onelake",
+        return_value="mock-folder-name",
+    )
+    @patch(
+        "fabrictesting.test_job.submit.collect_bundle_files",
+        return_value=(
+            {
+                "tests/test_a.py": "mock/test_a.py",
+                "tests/test_b.py": "mock/test_b.py",
+                "tests/test_slow.py": "mock/test_slow.py",
+                "tests/conftest.py": "mock/conftest.py",
+            },
+            None,
+            None,
+        ),
+    )
+    @patch("fabrictesting.test_job.submit.get_personal_token_provider")
+    def test_submit_shards(
+        self,
+        mock_get_personal_token_provider,
+        mock_collect_bundle_files,
+        mock_upload_bundle_to_onelake,
+        mock_create_platform_file_content,
+        mock_load_default_notebook,
+        mock_upload_notebook,
+        mock_load_test_durations,
+        mock_save_fetch_url_logs,
+        mock_run_notebook,
+        mock_create_submit_folder_name,
+        mock_create_results_name,
+    ):
+        """
+        Test submit runs one notebook job per shard, balanced by duration,
+        and logs the fetch url of every shard.
+        """
+        # Arrange
+        mock_token_provider = mock_get_personal_token_provider.return_value
+        mock_token_provider.get_token_string.return_value = "mock-fabric-token"
+        args = MagicMock(
+            workspace_id="mock-workspace-id",
+            workspace_name="mock-workspace",
+            lakehouse_name="mock-lakehouse",
+            output_log_file_path="mock-log-path",
+            service_principal=False,
+            notebook_cache_file_path=None,
+            persistent_runner=False,
+            shards=2,
+            test_workers=1,
+            dependency_cache=False,
+            bundle_copy_mode="sparkfiles",
+            test_durations_file="mock-durations.json",
+            incremental_upload=False,
+            bundle_archive=False,
+        )
+
+        # Act
+        fetch_urls = submit(args)
+
+        # Assert: The same notebook was run once per shard
+        mock_load_test_durations.assert_called_once_with("mock-durations.json")
+        self.assertEqual(
+            sorted(
+                c.kwargs["parameters"]["test_files"]
+                for c in mock_run_notebook.call_args_list
+            ),
+            ["test_a.py,test_b.py", "test_slow.py"],
+        )
+        self.assertEqual(
+            {c.kwargs["item_id"] for c in mock_run_notebook.call_args_list},
+            {"mock-id"},
+        )
+        self.assertEqual(
+            sorted(fetch_urls),
+            ["https://mock-fetch-url.com/1", "https://mock-fetch-url.com/2"],
+        )
+        self.assertEqual(
+            sorted(
+                c.kwargs["parameters"]["results_name"]
+                for c in mock_run_notebook.call_args_list
+            ),
+            ["results-mock-shard-1", "results-mock-shard-2"],
+        )
+        mock_save_fetch_url_logs.assert_called_once_with(ANY, file_name="mock-log-path")
+        self.assertEqual(
+            sorted(
+                results_url.rsplit("/", 1)[-1]
+                for _, _, results_url in mock_save_fetch_url_logs.call_args.args[0]
+            ),
+            ["results-mock-shard-1", "results-mock-shard-2"],
+        )
 
 
 class TestSubmitArgsCombinations(unittest.TestCase):
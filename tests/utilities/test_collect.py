@@ -1,145 +1,174 @@
+import hashlib
+import os
+import tempfile
 import unittest
-from pathlib import Path
+import zipfile
 from unittest.mock import patch
 
-from fabrictesting.utilities.collect import create_temp_folder_with_files
+from fabrictesting.utilities.collect import (
+    collect_bundle_files,
+    create_bundle_archive,
+)
 
 
-class TestCreateTempFolderWithFiles(unittest.TestCase):
+class TestCollectBundleFiles(unittest.TestCase):
     """
-        Test Plan:
-    Test with all arguments (wheel file, test folder, and requirements file):
+    Test Plan:
+    1: Test with all arguments (wheel file, test folder, and requirements file).
+    Ensure the bundle maps every file to its original location
+    and that nothing is copied.
 
-    1: Mock all file system operations to simulate copying
-    the files without actually doing it.
-    Ensure that the function returns the expected paths.
-    Test without optional arguments (wheel file or requirements file):
+    2: Test the case where neither the wheel file nor the
+    requirements file is provided.
 
-    2: Test the case where either the wheel file or the
-    requirements file is not provided.
-    Test failure handling:
-
-    3: Simulate an exception during the copy operation and
-    ensure the temporary directory is cleaned up.
+    3: Test failure handling when the test folder or a file does not exist.
     """
 
-    @patch("fabrictesting.utilities.collect.shutil.rmtree")  # Mock rmtree for cleanup
-    @patch("fabrictesting.utilities.collect.shutil.copy2")  # Mock copy2 for file copy
-    @patch(
-        "fabrictesting.utilities.collect.shutil.copytree"
-    )  # Mock copytree for test folder copy
-    @patch(
-        "fabrictesting.utilities.collect.tempfile.mkdtemp"
-    )  # Mock mkdtemp to return a dummy temp dir
-    @patch("builtins.print")  # Mock print to suppress output
-    def test_create_temp_folder_with_all_files(
-        self, mock_print, mock_mkdtemp, mock_copytree, mock_copy2, mock_rmtree
-    ):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.tests_path = os.path.join(self.temp_dir.name, "my_tests")
+        os.makedirs(os.path.join(self.tests_path, "sub"))
+        self.test_file = os.path.join(self.tests_path, "sub", "test_a.py")
+        with open(self.test_file, "w") as file:
+            file.write("def test_a(): pass")
+        self.whl_path = os.path.join(self.temp_dir.name, "file.whl")
+        self.requirements_file = os.path.join(self.temp_dir.name, "requirements.txt")
+        for path in [self.whl_path, self.requirements_file]:
+            with open(path, "w") as file:
+                file.write("content")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    @patch("fabrictesting.utilities.collect.os.makedirs")
+    def test_collect_bundle_files_with_all_files(self, mock_makedirs):
         """
-        Test create_temp_folder_with_files with all
+        Test collect_bundle_files with all
         arguments (whl_path, tests_path, requirements_file).
         """
-        # Arrange: Mock mkdtemp to return a fake temp directory path
-        mock_mkdtemp.return_value = "/mock/temp/dir"
-
         # Act: Call the function with all arguments
-        temp_dir, whl_name, rqs_name = create_temp_folder_with_files(
-            tests_path="/mock/tests/path",
-            whl_path="/mock/wheel/file.whl",
-            requirements_file="/mock/requirements.txt",
-        )
+        with self.assertLogs("fabrictesting.utilities.collect", level="INFO") as logs:
+            files, whl_name, rqs_name = collect_bundle_files(
+                tests_path=self.tests_path,
+                whl_path=self.whl_path,
+                requirements_file=self.requirements_file,
+            )
 
         # Assert: Ensure the expected values are returned
-        self.assertEqual(temp_dir, "/mock/temp/dir")
+        self.assertEqual(
+            files,
+            {
+                "tests/sub/test_a.py": self.test_file,
+                "file.whl": self.whl_path,
+                "requirements.txt": self.requirements_file,
+            },
+        )
         self.assertEqual(whl_name, "file.whl")
         self.assertEqual(rqs_name, "requirements.txt")
 
-        # Assert that the necessary file operations were called
-        mock_mkdtemp.assert_called_once()
-        mock_copytree.assert_called_once_with(
-            "/mock/tests/path", Path("/mock/temp/dir/tests")
-        )
-        mock_copy2.assert_any_call(
-            "/mock/wheel/file.whl", Path("/mock/temp/dir/file.whl")
-        )
-        mock_copy2.assert_any_call(
-            "/mock/requirements.txt", Path("/mock/temp/dir/requirements.txt")
-        )
-        mock_print.assert_called_once_with(
-            "Temporary folder created at: /mock/temp/dir"
+        # Assert: No folders were created
+        mock_makedirs.assert_not_called()
+        self.assertEqual(
+            [record.getMessage() for record in logs.records],
+            ["Collected 3 files for the bundle"],
         )
 
-    @patch("fabrictesting.utilities.collect.shutil.rmtree")  # Mock rmtree for cleanup
-    @patch("fabrictesting.utilities.collect.shutil.copy2")  # Mock copy2 for file copy
-    @patch(
-        "fabrictesting.utilities.collect.shutil.copytree"
-    )  # Mock copytree for test folder copy
-    @patch(
-        "fabrictesting.utilities.collect.tempfile.mkdtemp"
-    )  # Mock mkdtemp to return a dummy temp dir
-    @patch("builtins.print")  # Mock print to suppress output
-    def test_create_temp_folder_without_optional_files(
-        self, mock_print, mock_mkdtemp, mock_copytree, mock_copy2, mock_rmtree
-    ):
+    def test_collect_bundle_files_without_optional_files(self):
         """
-        Test create_temp_folder_with_files without optional
-         arguments (no whl_path, no requirements_file).
+        Test collect_bundle_files without optional
+        arguments (no whl_path, no requirements_file).
         """
-        # Arrange: Mock mkdtemp to return a fake temp directory path
-        mock_mkdtemp.return_value = "/mock/temp/dir"
-
         # Act: Call the function without whl_path and requirements_file
-        temp_dir, whl_name, rqs_name = create_temp_folder_with_files(
-            tests_path="/mock/tests/path", whl_path=None, requirements_file=None
+        files, whl_name, rqs_name = collect_bundle_files(
+            tests_path=self.tests_path, whl_path=None, requirements_file=None
         )
 
         # Assert: Ensure the expected values are returned
-        self.assertEqual(temp_dir, "/mock/temp/dir")
+        self.assertEqual(files, {"tests/sub/test_a.py": self.test_file})
         self.assertIsNone(whl_name)
         self.assertIsNone(rqs_name)
 
-        # Assert that only the necessary file operations were called
-        mock_mkdtemp.assert_called_once()
-        mock_copytree.assert_called_once_with(
-            "/mock/tests/path", Path("/mock/temp/dir/tests")
-        )
-        # copy2 should not be called since there's no whl or requirements
-        mock_copy2.assert_not_called()
-        mock_print.assert_called_once_with(
-            "Temporary folder created at: /mock/temp/dir"
+    def test_collect_bundle_files_failure(self):
+        """
+        Test collect_bundle_files raises RuntimeError
+        when the test folder or the wheel file does not exist.
+        """
+        with self.assertRaises(RuntimeError) as context:
+            collect_bundle_files(tests_path="/mock/tests/path")
+        self.assertIn(
+            "Failed to collect files: The test folder /mock/tests/path does not exist",
+            str(context.exception),
         )
 
-    @patch("fabrictesting.utilities.collect.shutil.rmtree")  # Mock rmtree for cleanup
-    @patch(
-        "fabrictesting.utilities.collect.shutil.copytree"
-    )  # Mock copytree for test folder copy
-    @patch(
-        "fabrictesting.utilities.collect.tempfile.mkdtemp"
-    )  # Mock mkdtemp to return a dummy temp dir
-    def test_create_temp_folder_failure(self, mock_mkdtemp, mock_copytree, mock_rmtree):
+        with self.assertRaises(RuntimeError) as context:
+            collect_bundle_files(
+                tests_path=self.tests_path, whl_path="/mock/wheel/file.whl"
+            )
+        self.assertIn("/mock/wheel/file.whl does not exist", str(context.exception))
+
+
+class TestCreateBundleArchive(unittest.TestCase):
+    def test_create_bundle_archive(self):
         """
-        Test create_temp_folder_with_files raises RuntimeError
-        on failure and cleans up the temp folder.
+        Test create_bundle_archive packs every file of the bundle into one zip.
         """
-        # Arrange: Mock mkdtemp to return a fake temp directory path
-        mock_mkdtemp.return_value = "/mock/temp/dir"
+        with tempfile.TemporaryDirectory() as folder:
+            # Arrange: A bundle with a nested test file and a requirements file
+            test_file = os.path.join(folder, "test_a.py")
+            with open(test_file, "w") as file:
+                file.write("def test_a(): pass")
+            requirements_file = os.path.join(folder, "requirements.txt")
+            with open(requirements_file, "w") as file:
+                file.write("pytest")
+            archive_dir = os.path.join(folder, "archive")
+            os.makedirs(archive_dir)
+
+            # Act
+            files, archive_name = create_bundle_archive(
+                files={
+                    "tests/test_a.py": test_file,
+                    "requirements.txt": requirements_file,
+                },
+                archive_dir=archive_dir,
+            )
 
-        # Simulate an exception during copytree
-        mock_copytree.side_effect = Exception("Copy failed")
+            # Assert: The archive is the only file in the new bundle
+            archive_path = os.path.join(archive_dir, "fabric-testing-bundle.zip")
+            self.assertEqual(archive_name, "fabric-testing-bundle.zip")
+            self.assertEqual(files, {archive_name: archive_path})
 
-        # Act & Assert: Ensure that RuntimeError is raised and cleanup is performed
-        with self.assertRaises(RuntimeError) as context:
-            create_temp_folder_with_files(
-                tests_path="/mock/tests/path",
-                whl_path="/mock/wheel/file.whl",
-                requirements_file="/mock/requirements.txt",
-            )
+            with zipfile.ZipFile(archive_path) as archive:
+                self.assertEqual(
+                    archive.namelist(), ["requirements.txt", "tests/test_a.py"]
+                )
+                self.assertEqual(archive.read("tests/test_a.py"), b"def test_a(): pass")
 
-        # Assert: Ensure that rmtree is called to clean up the temp directory
-        mock_rmtree.assert_called_once_with("/mock/temp/dir")
-        self.assertIn(
-            "Failed to create temporary folder: Copy failed", str(context.exception)
-        )
+    def test_create_bundle_archive_is_reproducible(self):
+        """
+        Test create_bundle_archive gives the same archive for the same content,
+        whatever the modification time of the files.
+        """
+        with tempfile.TemporaryDirectory() as folder:
+            # Arrange
+            test_file = os.path.join(folder, "test_a.py")
+            with open(test_file, "w") as file:
+                file.write("def test_a(): pass")
+
+            digests = []
+            for modified_at in [1_600_000_000, 1_700_000_000]:
+                os.utime(test_file, (modified_at, modified_at))
+                archive_dir = os.path.join(folder, str(modified_at))
+                os.makedirs(archive_dir)
+
+                # Act
+                files, archive_name = create_bundle_archive(
+                    files={"tests/test_a.py": test_file}, archive_dir=archive_dir
+                )
+                with open(files[archive_name], "rb") as archive:
+                    digests.append(hashlib.sha256(archive.read()).hexdigest())
+
+            # Assert
+            self.assertEqual(digests[0], digests[1])
 
 
 if __name__ == "__main__":
@@ -1,7 +1,13 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import mock_open, patch
 
-from fabrictesting.utilities.load_fetch_url_log import load_fetch_url
+from fabrictesting.utilities.load_fetch_url_log import (
+    load_fetch_url,
+    load_fetch_url_log,
+    load_fetch_url_logs,
+)
 
 
 class TestLoadFetchUrl(unittest.TestCase):
@@ -49,3 +55,54 @@ class TestLoadFetchUrl(unittest.TestCase):
 
         # Ensure the file was attempted to be opened
         mock_file.assert_called_once_with("fetch_url.txt", "r")
+
+    @patch(
+        "builtins.open",
+        new_callable=mock_open,
+        read_data="https://api.fabric.microsoft.com/v1/jobs/instances/cccc-dddd 30\n",
+    )
+    def test_load_fetch_url_log_with_retry_after(self, mock_file):
+        """
+        Test load_fetch_url_log returns the URL and the logged polling interval.
+        """
+        # Act
+        fetch_url, retry_after = load_fetch_url_log("fetch_url.txt")
+
+        # Assert
+        self.assertEqual(
+            fetch_url, "https://api.fabric.microsoft.com/v1/jobs/instances/cccc-dddd"
+        )
+        self.assertEqual(retry_after, 30)
+        self.assertEqual(
+            load_fetch_url("fetch_url.txt"),
+            "https://api.fabric.microsoft.com/v1/jobs/instances/cccc-dddd",
+        )
+
+    def test_load_fetch_url_logs_from_directory(self):
+        """
+        Test load_fetch_url_logs reads every line of every log in a directory.
+        """
+        # Arrange
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "a.txt"), "w") as file:
+                file.write(
+                    "https://example.com/job-1 30 abfss://ws@onelake/results\n"
+                    "https://example.com/job-2\n"
+                )
+            with open(os.path.join(directory, "b.txt"), "w") as file:
+                file.write("\nhttps://example.com/job-3 45\n")
+
+            # Act
+            fetch_urls = load_fetch_url_logs(directory)
+            single_file_urls = load_fetch_url_logs(os.path.join(directory, "b.txt"))
+
+        # Assert
+        self.assertEqual(
+            fetch_urls,
+            [
+                ("https://example.com/job-1", 30, "abfss://ws@onelake/results"),
+                ("https://example.com/job-2", None, None),
+                ("https://example.com/job-3", 45, None),
+            ],
+        )
+        self.assertEqual(single_file_urls, [("https://example.com/job-3", 45, None)])
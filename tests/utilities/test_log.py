@@ -0,0 +1,126 @@
+import argparse
+import json
+import logging
+import unittest
+from unittest.mock import patch
+
+from fabrictesting.utilities.log import (
+    JsonFormatter,
+    ProgressLogger,
+    add_logging_arguments,
+    configure_logging,
+    configure_logging_from_args,
+)
+
+
+class TestLog(unittest.TestCase):
+    """
+    Test Plan:
+    Test 1: The JSON format holds the message and the extra fields of a record.
+    Test 2: Quiet, default and verbose output set the level of the package logger.
+    Test 3: An unknown log format is rejected.
+    Test 4: The logging arguments are parsed and --quiet excludes --verbose.
+    Test 5: The progress is summarized with files/s and MB/s, not per file.
+    """
+
+    def tearDown(self):
+        logger = logging.getLogger("fabrictesting")
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+        logger.setLevel(logging.NOTSET)
+
+    def test_json_formatter(self):
+        """
+        Test the JSON line holds the level, logger, message and extra fields.
+        """
+        # Arrange
+        record = logging.LogRecord(
+            "fabrictesting.test", logging.INFO, "", 0, "Uploaded %d files", (3,), None
+        )
+        record.files = 3
+
+        # Act
+        entry = json.loads(JsonFormatter().format(record))
+
+        # Assert
+        self.assertEqual(entry["level"], "INFO")
+        self.assertEqual(entry["logger"], "fabrictesting.test")
+        self.assertEqual(entry["message"], "Uploaded 3 files")
+        self.assertEqual(entry["files"], 3)
+
+    def test_configure_logging_levels(self):
+        """
+        Test the verbosity sets the level of the package logger.
+        """
+        logger = logging.getLogger("fabrictesting")
+
+        for verbosity, level in [
+            (-1, logging.WARNING),
+            (0, logging.INFO),
+            (1, logging.DEBUG),
+        ]:
+            # Act
+            configure_logging(verbosity=verbosity)
+
+            # Assert: Only one handler is attached, however often it is called
+            self.assertEqual(logger.level, level)
+            self.assertEqual(len(logger.handlers), 1)
+
+    def test_configure_logging_unknown_format(self):
+        """
+        Test an unknown log format raises a ValueError.
+        """
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            configure_logging(log_format="xml")
+
+    def test_logging_arguments(self):
+        """
+        Test the logging arguments configure the JSON format and verbose output.
+        """
+        # Arrange
+        parser = argparse.ArgumentParser()
+        add_logging_arguments(parser)
+
+        # Act
+        args = parser.parse_args(["--verbose", "--log-format", "json"])
+        configure_logging_from_args(args)
+
+        # Assert
+        logger = logging.getLogger("fabrictesting")
+        self.assertEqual(logger.level, logging.DEBUG)
+        self.assertIsInstance(logger.handlers[0].formatter, JsonFormatter)
+        with self.assertRaises(SystemExit), patch("sys.stderr"):
+            parser.parse_args(["--quiet", "--verbose"])
+
+    @patch(
+        "fabrictesting.utilities.log.time.monotonic",
+        side_effect=[100.0, 101.0, 106.0, 108.0],
+    )
+    def test_progress_logger(self, mock_monotonic):
+        """
+        Test a summary is logged once the interval passed and at the end.
+        """
+        # Arrange
+        logger = logging.getLogger("fabrictesting.test")
+        progress = ProgressLogger(logger, action="Uploaded", total=3, interval=5)
+
+        # Act: The second file finishes after the interval
+        with self.assertLogs("fabrictesting.test", level="INFO") as logs:
+            progress.update(size=1024 * 1024)
+            progress.update(size=1024 * 1024)
+            progress.finish()
+
+        # Assert
+        self.assertEqual(
+            [record.getMessage() for record in logs.records],
+            [
+                "Uploaded 2/3 files (2.0 MB) in 6.0 s, 0.3 files/s, 0.33 MB/s",
+                "Uploaded 2/3 files (2.0 MB) in 8.0 s, 0.2 files/s, 0.25 MB/s",
+            ],
+        )
+        self.assertEqual(logs.records[-1].files, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
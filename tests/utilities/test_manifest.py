@@ -0,0 +1,118 @@
+import hashlib
+import os
+import tempfile
+import unittest
+
+from fabrictesting.utilities.manifest import (
+    compute_file_digest,
+    create_manifest,
+    load_manifest_log,
+    save_manifest_log,
+)
+
+
+class TestManifest(unittest.TestCase):
+    """
+    Test Plan:
+    Test 1: The digest of a file is its SHA-256 hash.
+    Test 2: The manifest maps every bundle path to the digest of its source file.
+    Test 3: A saved manifest log is loaded again for the same workspace/lakehouse.
+    Test 4: A manifest log for another lakehouse, or a missing file, returns None.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self.temp_dir.name, "tests", "sub"))
+        with open(os.path.join(self.temp_dir.name, "tests", "sub", "a.py"), "wb") as f:
+            f.write(b"content a")
+        with open(os.path.join(self.temp_dir.name, "requirements.txt"), "wb") as f:
+            f.write(b"pytest")
+        self.log_file = os.path.join(self.temp_dir.name, "manifest-log.json")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_compute_file_digest(self):
+        """
+        Test compute_file_digest returns the SHA-256 digest of the file.
+        """
+        digest = compute_file_digest(
+            os.path.join(self.temp_dir.name, "requirements.txt")
+        )
+        self.assertEqual(digest, hashlib.sha256(b"pytest").hexdigest())
+
+    def test_create_manifest(self):
+        """
+        Test create_manifest maps bundle paths to digests.
+        """
+        manifest = create_manifest(
+            {
+                "tests/sub/a.py": os.path.join(
+                    self.temp_dir.name, "tests", "sub", "a.py"
+                ),
+                "requirements.txt": os.path.join(
+                    self.temp_dir.name, "requirements.txt"
+                ),
+            }
+        )
+        self.assertEqual(
+            manifest,
+            {
+                "tests/sub/a.py": hashlib.sha256(b"content a").hexdigest(),
+                "requirements.txt": hashlib.sha256(b"pytest").hexdigest(),
+            },
+        )
+
+    def test_save_and_load_manifest_log(self):
+        """
+        Test a saved manifest log is loaded for the same workspace and lakehouse.
+        """
+        save_manifest_log(
+            manifest={"a.py": "digest"},
+            submit_folder="fabric-testing-01012024-1200_abcdef12",
+            workspace_name="workspace",
+            lakehouse_name="lakehouse",
+            file_name=self.log_file,
+        )
+
+        result = load_manifest_log(
+            workspace_name="workspace",
+            lakehouse_name="lakehouse",
+            file_name=self.log_file,
+        )
+
+        self.assertEqual(
+            result["submit_folder"], "fabric-testing-01012024-1200_abcdef12"
+        )
+        self.assertEqual(result["files"], {"a.py": "digest"})
+
+    def test_load_manifest_log_other_lakehouse_or_missing(self):
+        """
+        Test load_manifest_log ignores logs for another lakehouse and missing files.
+        """
+        save_manifest_log(
+            manifest={"a.py": "digest"},
+            submit_folder="folder",
+            workspace_name="workspace",
+            lakehouse_name="lakehouse",
+            file_name=self.log_file,
+        )
+
+        self.assertIsNone(
+            load_manifest_log(
+                workspace_name="workspace",
+                lakehouse_name="other_lakehouse",
+                file_name=self.log_file,
+            )
+        )
+        self.assertIsNone(
+            load_manifest_log(
+                workspace_name="workspace",
+                lakehouse_name="lakehouse",
+                file_name=os.path.join(self.temp_dir.name, "missing.json"),
+            )
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
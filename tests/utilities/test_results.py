@@ -0,0 +1,117 @@
+import unittest
+
+from fabrictesting.utilities.results import (
+    create_results_name,
+    create_results_url,
+    log_test_summary,
+    merge_test_durations,
+    parse_results_url,
+)
+
+
+class TestResults(unittest.TestCase):
+    """
+    Test Plan:
+    Test 1: A results URL without whitespace is created and parsed back.
+    Test 2: Only OneLake abfss URLs are accepted.
+    Test 3: The durations of the tests are summed per test file.
+    Test 4: The counts and the tests that did not pass are logged.
+    Test 5: Every test run gets a results folder of its own.
+    """
+
+    def test_create_and_parse_results_url(self):
+        """
+        Test create_results_url encodes the names and parse_results_url decodes them.
+        """
+        # Act
+        results_url = create_results_url(
+            workspace_name="My Workspace",
+            lakehouse_name="lakehouse",
+            submit_folder="fabric-testing-123",
+            results_name="results-shard-1",
+        )
+
+        # Assert
+        self.assertNotIn(" ", results_url)
+        self.assertEqual(
+            parse_results_url(results_url),
+            (
+                "My Workspace",
+                "lakehouse.Lakehouse/Files/fabric-testing/"
+                "fabric-testing-123/results-shard-1",
+            ),
+        )
+
+    def test_create_results_name_is_unique(self):
+        """
+        Test create_results_name returns a new results folder name on every call.
+        """
+        # Act
+        names = {create_results_name() for _ in range(10)}
+
+        # Assert
+        self.assertEqual(len(names), 10)
+        self.assertTrue(all(name.startswith("results-") for name in names))
+
+    def test_parse_results_url_rejects_other_urls(self):
+        """
+        Test parse_results_url raises a ValueError for a URL outside OneLake.
+        """
+        with self.assertRaises(ValueError):
+            parse_results_url("https://example.com/results")
+
+    def test_merge_test_durations(self):
+        """
+        Test merge_test_durations sums the durations per file over all summaries.
+        """
+        # Arrange
+        summaries = [
+            {
+                "tests": [
+                    {"file": "test_a.py", "duration": 1.5},
+                    {"file": "test_a.py", "duration": 2.0},
+                ]
+            },
+            {"tests": [{"file": "sub/test_b.py", "duration": 4.0}]},
+        ]
+
+        # Act
+        durations = merge_test_durations(summaries)
+
+        # Assert
+        self.assertEqual(durations, {"test_a.py": 3.5, "sub/test_b.py": 4.0})
+
+    def test_log_test_summary(self):
+        """
+        Test log_test_summary logs the counts and the failed tests.
+        """
+        # Arrange
+        summary = {
+            "passed": 1,
+            "failed": 1,
+            "error": 0,
+            "skipped": 0,
+            "duration": 2.5,
+            "tests": [
+                {"file": "test_a.py", "name": "test_ok", "outcome": "passed"},
+                {"file": "test_a.py", "name": "test_bad", "outcome": "failed"},
+            ],
+        }
+
+        # Act
+        with self.assertLogs("fabrictesting.utilities.results", level="INFO") as logs:
+            log_test_summary(summary, label="job-1")
+
+        # Assert
+        self.assertEqual(
+            [record.getMessage() for record in logs.records],
+            [
+                "Test results of job-1: 1 passed, 1 failed, 0 errors, "
+                "0 skipped in 2.5 seconds",
+                "    FAILED: test_a.py::test_bad",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
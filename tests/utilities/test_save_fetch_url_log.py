@@ -1,7 +1,10 @@
 import unittest
 from unittest.mock import mock_open, patch
 
-from fabrictesting.utilities.save_fetch_url_log import save_fetch_url_log
+from fabrictesting.utilities.save_fetch_url_log import (
+    save_fetch_url_log,
+    save_fetch_url_logs,
+)
 
 
 class TestSaveFetchUrlLog(unittest.TestCase):
@@ -69,6 +72,42 @@ class TestSaveFetchUrlLog(unittest.TestCase):
         # Ensure the file was attempted to be opened
         mock_file.assert_called_once_with("fetch_url.txt", "w")
 
+    @patch("builtins.open", new_callable=mock_open)
+    def test_save_fetch_url_log_with_retry_after(self, mock_file):
+        """
+        Test save_fetch_url_log writes the polling interval after the URL.
+        """
+        # Act
+        save_fetch_url_log("https://mock-fetch-url.com", "fetch_url.txt", 30)
+
+        # Assert
+        mock_file().write.assert_called_once_with("https://mock-fetch-url.com 30")
+
+    @patch("builtins.open", new_callable=mock_open)
+    def test_save_fetch_url_logs(self, mock_file):
+        """
+        Test save_fetch_url_logs writes one line per URL.
+        """
+        # Act
+        save_fetch_url_logs(
+            [
+                ("https://mock-fetch-url.com/1", 30, "abfss://ws@onelake/results"),
+                ("https://mock-fetch-url.com/2", None, None),
+            ],
+            "fetch_url.txt",
+        )
+
+        # Assert
+        mock_file.assert_called_once_with("fetch_url.txt", "w")
+        mock_file().write.assert_has_calls(
+            [
+                unittest.mock.call(
+                    "https://mock-fetch-url.com/1 30 abfss://ws@onelake/results\n"
+                ),
+                unittest.mock.call("https://mock-fetch-url.com/2\n"),
+            ]
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,131 @@
+import json
+import os
+import tempfile
+import unittest
+
+from fabrictesting.utilities.shard import (
+    collect_test_files,
+    load_test_durations,
+    split_test_files,
+)
+
+
+class TestShard(unittest.TestCase):
+    """
+    Test Plan:
+    Test 1: Only test files of the test folder are collected.
+    Test 2: Without durations, the shards get the same number of files.
+    Test 3: With durations, the shards get roughly the same total duration.
+    Test 4: There are never more shards than test files.
+    Test 5: Durations are loaded from a JSON file, and a missing file is ignored.
+    Test 6: A JSON file that is not an object is ignored.
+    """
+
+    def test_collect_test_files(self):
+        """
+        Test collect_test_files lists the test files relative to the test folder.
+        """
+        # Arrange
+        bundle = {
+            "tests/test_a.py": "src/test_a.py",
+            "tests/sub/b_test.py": "src/sub/b_test.py",
+            "tests/conftest.py": "src/conftest.py",
+            "tests/data.csv": "src/data.csv",
+            "package.whl": "dist/package.whl",
+        }
+
+        # Act
+        test_files = collect_test_files(bundle)
+
+        # Assert
+        self.assertEqual(test_files, ["sub/b_test.py", "test_a.py"])
+
+    def test_split_by_file_count(self):
+        """
+        Test split_test_files balances the number of files without durations.
+        """
+        # Act
+        shards = split_test_files(
+            test_files=[f"test_{i}.py" for i in range(7)], shard_count=3
+        )
+
+        # Assert
+        self.assertEqual(sorted(len(shard) for shard in shards), [2, 2, 3])
+        self.assertEqual(
+            sorted(f for shard in shards for f in shard),
+            [f"test_{i}.py" for i in range(7)],
+        )
+
+    def test_split_by_duration(self):
+        """
+        Test split_test_files balances the total duration of the shards,
+        counting unknown files as the average duration.
+        """
+        # Arrange
+        durations = {"test_slow.py": 60, "test_a.py": 20, "test_b.py": 20}
+
+        # Act
+        shards = split_test_files(
+            test_files=["test_a.py", "test_b.py", "test_new.py", "test_slow.py"],
+            shard_count=2,
+            durations=durations,
+        )
+
+        # Assert: test_new.py counts as 33 seconds
+        self.assertEqual(
+            sorted(shards),
+            [["test_a.py", "test_b.py", "test_new.py"], ["test_slow.py"]],
+        )
+
+    def test_split_fewer_files_than_shards(self):
+        """
+        Test split_test_files never returns empty shards.
+        """
+        # Act
+        shards = split_test_files(test_files=["test_a.py"], shard_count=4)
+
+        # Assert
+        self.assertEqual(shards, [["test_a.py"]])
+
+    def test_load_test_durations(self):
+        """
+        Test load_test_durations reads the JSON file and ignores a missing file.
+        """
+        # Arrange
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "durations.json")
+            with open(file_name, "w") as file:
+                json.dump({"test_a.py": 12.5, "test_b.py": "slow"}, file)
+
+            # Act
+            durations = load_test_durations(file_name)
+            missing = load_test_durations(os.path.join(directory, "missing.json"))
+
+        # Assert
+        self.assertEqual(durations, {"test_a.py": 12.5})
+        self.assertEqual(missing, {})
+
+    def test_load_test_durations_not_an_object(self):
+        """
+        Test load_test_durations ignores a JSON file that holds a list or a number.
+        """
+        for content in [["test_a.py", 12.5], 12.5]:
+            # Arrange
+            with tempfile.TemporaryDirectory() as directory:
+                file_name = os.path.join(directory, "durations.json")
+                with open(file_name, "w") as file:
+                    json.dump(content, file)
+
+                # Act
+                with self.assertLogs(
+                    "fabrictesting.utilities.shard", level="WARNING"
+                ) as logs:
+                    durations = load_test_durations(file_name)
+
+            # Assert
+            self.assertEqual(durations, {})
+            self.assertIn("sharding by file count", logs.records[0].getMessage())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from unittest.mock import patch
+
+from fabrictesting.utilities.timing import StageTimer
+
+
+class TestStageTimer(unittest.TestCase):
+    """
+    Test Plan:
+    Test 1: Stages are recorded with their start and duration, in start order.
+    Test 2: A stage is recorded even if it raises.
+    Test 3: The summary logs every stage and the total.
+    """
+
+    @patch(
+        "fabrictesting.utilities.timing.time.monotonic",
+        side_effect=[100.0, 101.0, 102.0, 103.5, 106.0],
+    )
+    def test_stage_timer_records_stages(self, mock_monotonic):
+        """
+        Test overlapping stages are recorded in the order they started.
+        """
+        # Arrange
+        timer = StageTimer()
+
+        # Act: "upload" starts at 1 s, "render" runs from 2 s to 3.5 s
+        with timer.stage("upload"):
+            with timer.stage("render"):
+                pass
+
+        # Assert
+        self.assertEqual(timer.stages, [("upload", 1.0, 5.0), ("render", 2.0, 1.5)])
+
+    def test_stage_timer_records_failed_stage(self):
+        """
+        Test a stage that raises is still recorded.
+        """
+        # Arrange
+        timer = StageTimer()
+
+        # Act
+        with self.assertRaises(RuntimeError):
+            with timer.stage("upload"):
+                raise RuntimeError("Upload failed")
+
+        # Assert
+        self.assertEqual([name for name, _, _ in timer.stages], ["upload"])
+
+    def test_stage_timer_log_summary(self):
+        """
+        Test the summary logs a line per stage and the total duration.
+        """
+        # Arrange
+        timer = StageTimer()
+        with timer.stage("upload"):
+            pass
+
+        # Act
+        with self.assertLogs("fabrictesting.utilities.timing", level="INFO") as logs:
+            timer.log_summary()
+
+        # Assert
+        lines = [record.getMessage() for record in logs.records]
+        self.assertEqual(lines[0], "Stage timings:")
+        self.assertTrue(lines[1].strip().startswith("upload"))
+        self.assertTrue(lines[2].strip().startswith("total"))
+        self.assertEqual(logs.records[1].stage, "upload")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import json
+import os
+import tempfile
+import unittest
+
+from fabrictesting.utilities.tracing import (
+    Tracer,
+    configure_default_tracer,
+    get_default_tracer,
+    trace_to_file,
+)
+
+
+class TestTracer(unittest.TestCase):
+    """
+    Test Plan:
+    Test 1: Nested spans record their parent, attributes and duration.
+    Test 2: A span that raises records the error.
+    Test 3: A disabled tracer records nothing.
+    Test 4: The trace is exported in the OTLP/JSON format.
+    Test 5: trace_to_file writes the trace of the block, and nothing without a path.
+    """
+
+    def tearDown(self):
+        configure_default_tracer(enabled=False)
+
+    def test_nested_spans(self):
+        """
+        Test a span opened inside another span is its child.
+        """
+        # Arrange
+        tracer = Tracer()
+
+        # Act
+        with tracer.span("onelake.upload_bundle", files=2) as parent:
+            with tracer.span("onelake.upload_file") as child:
+                child.set_attribute("bytes", 1024)
+                child.set_attribute("http.response.status_code", None)
+
+        # Assert
+        self.assertEqual(
+            [span.name for span in tracer.spans], [parent.name, child.name]
+        )
+        self.assertIsNone(parent.parent_id)
+        self.assertEqual(child.parent_id, parent.span_id)
+        self.assertEqual(parent.attributes, {"files": 2})
+        self.assertEqual(child.attributes, {"bytes": 1024})
+        self.assertGreaterEqual(parent.duration, child.duration)
+
+    def test_span_records_error(self):
+        """
+        Test the error of a failed span is recorded and re-raised.
+        """
+        # Arrange
+        tracer = Tracer()
+
+        # Act
+        with self.assertRaises(RuntimeError):
+            with tracer.span("notebook.create"):
+                raise RuntimeError("Notebook upload failed")
+
+        # Assert
+        self.assertEqual(tracer.spans[0].error, "RuntimeError: Notebook upload failed")
+
+    def test_disabled_tracer(self):
+        """
+        Test the default tracer is disabled and records nothing.
+        """
+        # Act
+        with get_default_tracer().span("notebook.trigger") as span:
+            span.set_attribute("http.response.status_code", 202)
+
+        # Assert
+        self.assertFalse(span.recording)
+        self.assertEqual(get_default_tracer().spans, [])
+
+    def test_to_otlp(self):
+        """
+        Test the OTLP/JSON export of a trace.
+        """
+        # Arrange
+        tracer = Tracer()
+        with tracer.span("fabric-testing-submit"):
+            with tracer.span("HTTP POST", **{"http.response.status_code": 202}):
+                pass
+
+        # Act
+        trace = tracer.to_otlp()
+
+        # Assert
+        spans = trace["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        root, request = spans
+        self.assertEqual(len(root["traceId"]), 32)
+        self.assertEqual(len(root["spanId"]), 16)
+        self.assertNotIn("parentSpanId", root)
+        self.assertEqual(request["parentSpanId"], root["spanId"])
+        self.assertEqual(request["kind"], 3)
+        self.assertEqual(
+            request["attributes"],
+            [{"key": "http.response.status_code", "value": {"intValue": "202"}}],
+        )
+        self.assertLessEqual(
+            int(request["startTimeUnixNano"]), int(request["endTimeUnixNano"])
+        )
+
+    def test_trace_to_file(self):
+        """
+        Test trace_to_file records the block with the default tracer.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # Arrange
+            trace_file = os.path.join(temp_dir, "trace.json")
+
+            # Act
+            with trace_to_file(trace_file, name="fabric-testing-fetch"):
+                with get_default_tracer().span("notebook.status_poll"):
+                    pass
+            with trace_to_file(None, name="fabric-testing-fetch"):
+                pass
+
+            # Assert
+            with open(trace_file) as file:
+                trace = json.load(file)
+            self.assertEqual(
+                [span["name"] for span in trace["spans"]],
+                ["fabric-testing-fetch", "notebook.status_poll"],
+            )
+            self.assertFalse(get_default_tracer().enabled)
+
+
+if __name__ == "__main__":
+    unittest.main()
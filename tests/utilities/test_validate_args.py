@@ -113,3 +113,22 @@ class TestValidateArgs(unittest.TestCase):
         # Act & Assert: Call the function (should not raise an error)
         validate_args(args, self.mock_parser)
         self.mock_parser.error.assert_not_called()
+
+    def test_validate_args_fail_upload_workers_below_one(self):
+        """
+        Test validate_args raises an error when upload_workers is below 1.
+        """
+        # Arrange: Set up the args
+        args = argparse.Namespace(
+            client_id=None,
+            client_secret=None,
+            service_principal=False,
+            upload_workers=0,
+        )
+
+        # Act & Assert: Call the function (should raise an error)
+        with self.assertRaises(SystemExit):
+            validate_args(args, self.mock_parser)
+        self.mock_parser.error.assert_called_once_with(
+            "--upload-workers must be at least 1."
+        )